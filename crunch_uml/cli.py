@@ -1,4 +1,5 @@
 import argparse
+import contextlib
 import logging
 import os
 import sys
@@ -54,11 +55,17 @@ _TRANSLATE_ENV_MAP = [
     ("ollama_url", "CRUNCH_UML_OLLAMA_URL"),
     ("ollama_timeout", "CRUNCH_UML_OLLAMA_TIMEOUT"),
     ("translate_workers", "CRUNCH_UML_TRANSLATE_WORKERS"),
+    ("translation_memory", "CRUNCH_UML_TRANSLATION_MEMORY"),
+    ("translation_memory_max_entries", "CRUNCH_UML_TRANSLATION_MEMORY_MAX_ENTRIES"),
     # Pipeline backend (zie crunch_uml/translation en docs/technisch/vertaalpijplijn.md)
     ("termbanks", "CRUNCH_UML_TERMBANKS"),
     ("llm_workhorses", "CRUNCH_UML_LLM_WORKHORSES"),
     ("llm_heavy", "CRUNCH_UML_LLM_HEAVY"),
     ("nmt_model", "CRUNCH_UML_NMT_MODEL"),
+    ("nmt_batch_size", "CRUNCH_UML_NMT_BATCH_SIZE"),
+    ("nmt_device", "CRUNCH_UML_NMT_DEVICE"),
+    ("nmt_threads", "CRUNCH_UML_NMT_THREADS"),
+    ("llm_batch_size", "CRUNCH_UML_LLM_BATCH_SIZE"),
 ]
 
 
@@ -74,6 +81,8 @@ def _propagate_translate_args_to_env(args):
         os.environ["CRUNCH_UML_TRANSLATE_CONTEXT"] = "1"
     if getattr(args, "translate_allow_online", False):
         os.environ["CRUNCH_UML_TRANSLATE_ALLOW_ONLINE"] = "1"
+    if getattr(args, "ollama_async", False):
+        os.environ["CRUNCH_UML_OLLAMA_ASYNC"] = "1"
 
 
 def main(args=None):
@@ -144,6 +153,7 @@ def main(args=None):
                 args.database_url,
                 db_create=args.database_create_new,
                 on_version_mismatch=args.on_version_mismatch,
+                db_profile=args.database_profile,
             )
             schema = sch.Schema(database, schema_name=args.schema_name)
             # Run marker: row with completed_at NULL means "in progress or
@@ -154,7 +164,26 @@ def main(args=None):
                 # First open database, select parser and parse into database
                 logger.info(f"Starting parsing with inputtype {args.inputtype}")
                 parser = parsers.ParserRegistry.getinstance(args.inputtype)
-                parser.parse(args, schema)
+                writer = contextlib.nullcontext()
+                incremental = getattr(args, "incremental", False)
+                if incremental and not parser.supports_incremental:
+                    logger.warning(f"Inputtype {args.inputtype} does not support --incremental, option is ignored")
+                    incremental = False
+                if incremental:
+                    # The staging schema of an incremental import is always written with bulk inserts
+                    writer = schema.incremental_import(chunk_size=args.bulk_insert_chunk_size)
+                else:
+                    # Rows are written without fingerprints, the next incremental import must not trust them
+                    database.clear_fingerprints(args.schema_name)
+                    if getattr(args, "bulk_insert", False):
+                        if parser.supports_bulk_insert:
+                            writer = schema.bulk_insert(chunk_size=args.bulk_insert_chunk_size)
+                        else:
+                            logger.warning(
+                                f"Inputtype {args.inputtype} does not support --bulk_insert, option is ignored"
+                            )
+                with writer as incremental_import:
+                    parser.parse(args, schema if incremental_import is None else incremental_import.staging)
                 database.commit()
                 database.complete_import_run(run_id)
                 logger.info("Succes! parsed all data and saved it in database")
@@ -170,10 +199,16 @@ def main(args=None):
 
         # Do transformation
         elif args.command == const.CMD_TRANSFORM:
-            database = Database(args.database_url, db_create=False, on_version_mismatch=args.on_version_mismatch)
+            database = Database(
+                args.database_url,
+                db_create=False,
+                on_version_mismatch=args.on_version_mismatch,
+                db_profile=args.database_profile,
+            )
             logger.info("Starting transformation ")
             try:
                 transformer = transformers.TransformerRegistry.getinstance(args.transformationtype)
+                database.clear_fingerprints(args.schema_to)
                 transformer.transform(args, database)
                 database.commit()
                 logger.info(
@@ -192,11 +227,17 @@ def main(args=None):
 
         # Render Output
         elif args.command == const.CMD_EXPORT:
-            database = Database(args.database_url, db_create=False, on_version_mismatch=args.on_version_mismatch)
+            database = Database(
+                args.database_url,
+                db_create=False,
+                on_version_mismatch=args.on_version_mismatch,
+                db_profile=args.database_profile,
+            )
             schema = sch.Schema(database, schema_name=args.schema_name)
             logger.info(f"Starting rendering with outputtype {args.outputtype}")
             renderer = renderers.RendererRegistry.getinstance(args.outputtype)
-            renderer.render(args, schema)
+            with schema.package_scope():
+                renderer.render(args, schema)
             logger.info(f"Succes! rendered output from database wtih renderer {renderer}")
         else:
             logger.error("Unknown command: this should never happen!")
@@ -24,6 +24,12 @@ CMD_TRANSFORM = "transform"
 VERSION_MISMATCH_AUTO = "auto"
 VERSION_MISMATCH_FAIL = "fail"
 VERSION_MISMATCH_RECREATE = "recreate"
+# SQLite engine profiles, see db.DB_PROFILE_PRAGMAS. 'safe' keeps the SQLite
+# defaults, 'fast-import' trades durability of the last commits for throughput
+# (WAL), 'readonly' refuses all writes.
+DB_PROFILE_SAFE = "safe"
+DB_PROFILE_FAST_IMPORT = "fast-import"
+DB_PROFILE_READONLY = "readonly"
 # CMD_CHECK = 'check'
 # CMD_FIX = 'fix'
 
@@ -31,6 +37,8 @@ DEFAULT_LOD_NS = "http://example.org/myns/"
 DEFAULT_SCHEMA = "default"
 
 ORPHAN_CLASS = "<Orphan Class>"
+BULK_INSERT_CHUNK_SIZE = 1000  # Rows per executemany statement of the bulk import writer
+EXPORT_YIELD_PER = 1000  # Rows fetched per batch by streaming exports
 VERSION_STEP_MINOR = "minor"
 VERSION_STEP_MAJOR = "major"
 VERSION_STEP_NONE = "none"
@@ -3,6 +3,7 @@ import logging
 import re
 import uuid
 import warnings
+from contextlib import contextmanager
 from datetime import datetime, timezone
 
 import inflection
@@ -17,7 +18,10 @@ from sqlalchemy import (
     String,
     Table,
     Text,
+    bindparam,
     create_engine,
+    delete,
+    event,
 )
 from sqlalchemy import exc as sa_exc
 from sqlalchemy import insert, inspect, select
@@ -25,7 +29,7 @@ from sqlalchemy import text as sqlalchemy_text
 from sqlalchemy import update
 from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.hybrid import hybrid_property
-from sqlalchemy.orm import declarative_base, relationship, sessionmaker
+from sqlalchemy.orm import declarative_base, object_session, relationship, sessionmaker
 from sqlalchemy.orm.relationships import RelationshipProperty
 
 import crunch_uml.const as const
@@ -75,6 +79,45 @@ crunch_runs_table = Table(
     Column("datamodel_version", String, nullable=True),
 )
 
+# Content fingerprints of the rows written by incremental imports (import
+# --incremental), also outside Base.metadata. One row per model row of a
+# schema: the table, its primary key without schema_id (JSON list) and a hash
+# of all its column values. Written in the same transaction as the data;
+# anything else that writes a schema (regular import, transform, clean)
+# clears its fingerprints, so a fingerprint always describes the stored row.
+crunch_fingerprints_table = Table(
+    "crunch_uml_fingerprints",
+    _meta_metadata,
+    Column("schema_id", String, primary_key=True),
+    Column("table_name", String, primary_key=True),
+    Column("object_key", String, primary_key=True),
+    Column("content_hash", String, nullable=False),
+)
+
+
+# PRAGMAs per engine profile, applied to every new SQLite connection (other
+# dialects ignore the profile). Order matters: synchronous=NORMAL is only
+# safe in WAL mode, so it is skipped when journal_mode could not be switched
+# (in-memory databases, file systems without shared memory).
+SQLITE_CACHE_SIZE = -64 * 1024  # negative: KiB, so 64 MiB page cache
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+DB_PROFILE_PRAGMAS = {
+    const.DB_PROFILE_SAFE: {"synchronous": "FULL"},
+    const.DB_PROFILE_FAST_IMPORT: {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": SQLITE_CACHE_SIZE,
+        "mmap_size": SQLITE_MMAP_SIZE,
+        "temp_store": "MEMORY",
+    },
+    const.DB_PROFILE_READONLY: {
+        "query_only": "ON",
+        "cache_size": SQLITE_CACHE_SIZE,
+        "mmap_size": SQLITE_MMAP_SIZE,
+        "temp_store": "MEMORY",
+    },
+}
+
 
 def _crunch_version():
     try:
@@ -122,6 +165,19 @@ def add_args(argumentparser, subparser_dict):
         ),
         default=const.VERSION_MISMATCH_AUTO,
     )
+    argumentparser.add_argument(
+        "-db_profile",
+        "--database_profile",
+        type=str,
+        choices=list(DB_PROFILE_PRAGMAS),
+        help=(
+            "SQLite engine profile: 'safe' keeps the SQLite defaults (rollback journal, synchronous FULL),"
+            " 'fast-import' switches to WAL with synchronous NORMAL, a larger page cache, memory mapping and"
+            " in-memory temp storage for large imports and exports, 'readonly' opens the database query-only."
+            f" Ignored for other databases. Default is {const.DB_PROFILE_SAFE}."
+        ),
+        default=const.DB_PROFILE_SAFE,
+    )
 
 
 class BaseModel:
@@ -578,28 +634,43 @@ class Package(Base, UMLBase, UMLTagsDomain):  # type: ignore
             else:
                 return self.parent_package.get_root_package()
 
+    def get_packages_inscope(self):
+        """This package and all its subpackages, at any depth."""
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore" if suppress_warnings else "default", category=sa_exc.SAWarning)
+            packages, todo = [], [self]
+            while todo:
+                package = todo.pop()
+                packages.append(package)
+                todo.extend(package.subpackages)
+            return packages
+
+    def get_package_scope(self):
+        """The PackageScope of the session this package belongs to, None outside Schema.package_scope()."""
+        session = object_session(self)
+        return session.info.get(PACKAGE_SCOPE_KEY) if session is not None else None
+
     def get_classes_inscope(self):
+        scope = self.get_package_scope()
+        if scope is not None:
+            return scope.get_classes(self)
         with warnings.catch_warnings():
             warnings.simplefilter("ignore" if suppress_warnings else "default", category=sa_exc.SAWarning)
-            clazzes = {clazz for clazz in self.classes}
-            # for diagram in self.diagrams:
-            #    clazzes = clazzes.union({clazz for clazz in diagram.classes})
-            for subpackage in self.subpackages:
-                clazzes = clazzes.union(subpackage.get_classes_inscope())
-            return clazzes
+            return {clazz for package in self.get_packages_inscope() for clazz in package.classes}
 
     def get_enumerations_inscope(self):
+        scope = self.get_package_scope()
+        if scope is not None:
+            return scope.get_enumerations(self)
         with warnings.catch_warnings():
             warnings.simplefilter("ignore" if suppress_warnings else "default", category=sa_exc.SAWarning)
-            enums = {enum for enum in self.enumerations}
-            # for diagram in self.diagrams:
-            #    enums = enums.union({enum for enum in diagram.enumerations})
-            for subpackage in self.subpackages:
-                enums = enums.union(subpackage.get_enumerations_inscope())
-            return enums
+            return {enum for package in self.get_packages_inscope() for enum in package.enumerations}
 
     def get_associations_inscope(self):
         """Associations whose both endpoint classes are in scope of this package."""
+        scope = self.get_package_scope()
+        if scope is not None:
+            return scope.get_associations(self)
         with warnings.catch_warnings():
             warnings.simplefilter("ignore" if suppress_warnings else "default", category=sa_exc.SAWarning)
             clazzes = self.get_classes_inscope()
@@ -607,6 +678,9 @@ class Package(Base, UMLBase, UMLTagsDomain):  # type: ignore
 
     def get_generalizations_inscope(self):
         """Generalizations whose both endpoint classes are in scope of this package."""
+        scope = self.get_package_scope()
+        if scope is not None:
+            return scope.get_generalizations(self)
         with warnings.catch_warnings():
             warnings.simplefilter("ignore" if suppress_warnings else "default", category=sa_exc.SAWarning)
             clazzes = self.get_classes_inscope()
@@ -1378,20 +1452,115 @@ class Diagram(Base, UMLBase):  # type: ignore
         return copy_instance
 
 
+def package_subtree(schema_id, package_id, name="package_tree"):
+    """Recursive CTE with the ids of a package and all its subpackages, at any depth."""
+    tree = select(Package.id).where(Package.schema_id == schema_id, Package.id == package_id).cte(name, recursive=True)
+    # UNION instead of UNION ALL: a (corrupt) cycle in the tree ends the recursion instead of looping forever
+    return tree.union(select(Package.id).where(Package.schema_id == schema_id, Package.parent_package_id == tree.c.id))
+
+
+# Key of the PackageScope in Session.info while Schema.package_scope() is active.
+PACKAGE_SCOPE_KEY = "crunch_uml_package_scope"
+
+
+class PackageScope:
+    """
+    Resolves what is in scope of a package subtree for Package.get_*_inscope: one query per entity type, with a
+    recursive CTE over the package tree, instead of lazy loading the collections of every package. Results are
+    memoized per (schema, package), so the model must not change while the scope is active; Schema.package_scope()
+    installs one for the duration of a render.
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self.cache = {}
+        self.queries = 0
+
+    def _subtree(self, package):
+        return package_subtree(package.schema_id, package.id)
+
+    def _class_ids(self, package):
+        return select(Class.id).where(
+            Class.schema_id == package.schema_id, Class.package_id.in_(select(self._subtree(package).c.id))
+        )
+
+    def _query(self, kind, package):
+        if kind == Class:
+            statement = select(Class).where(
+                Class.schema_id == package.schema_id, Class.package_id.in_(select(self._subtree(package).c.id))
+            )
+        elif kind == Enumeratie:
+            statement = select(Enumeratie).where(
+                Enumeratie.schema_id == package.schema_id,
+                Enumeratie.package_id.in_(select(self._subtree(package).c.id)),
+            )
+        elif kind == Association:
+            class_ids = self._class_ids(package)
+            statement = select(Association).where(
+                Association.schema_id == package.schema_id,
+                Association.src_class_id.in_(class_ids),
+                Association.dst_class_id.in_(class_ids),
+            )
+        else:
+            class_ids = self._class_ids(package)
+            statement = select(Generalization).where(
+                Generalization.schema_id == package.schema_id,
+                Generalization.subclass_id.in_(class_ids),
+                Generalization.superclass_id.in_(class_ids),
+            )
+        self.queries += 1
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore" if suppress_warnings else "default", category=sa_exc.SAWarning)
+            return set(self.session.scalars(statement).unique())
+
+    def _get(self, kind, package):
+        key = (package.schema_id, package.id, kind)
+        if key not in self.cache:
+            self.cache[key] = self._query(kind, package)
+        return self.cache[key]
+
+    def get_classes(self, package):
+        return self._get(Class, package)
+
+    def get_enumerations(self, package):
+        return self._get(Enumeratie, package)
+
+    def get_associations(self, package):
+        return self._get(Association, package)
+
+    def get_generalizations(self, package):
+        return self._get(Generalization, package)
+
+
 class Database:
     _instance = None
 
-    def __new__(cls, db_url=const.DATABASE_URL, db_create=False, on_version_mismatch=const.VERSION_MISMATCH_AUTO):
+    def __new__(
+        cls,
+        db_url=const.DATABASE_URL,
+        db_create=False,
+        on_version_mismatch=const.VERSION_MISMATCH_AUTO,
+        db_profile=const.DB_PROFILE_SAFE,
+    ):
         if cls._instance is None:
             cls._instance = super(Database, cls).__new__(cls)
             # Setting up the database
+            cls._instance._db_profile = db_profile
             cls._instance.engine = create_engine(db_url)
+            if cls._instance.engine.dialect.name == "sqlite":
+                event.listen(cls._instance.engine, "connect", cls._instance._apply_profile)
             Session = sessionmaker(bind=cls._instance.engine)
             cls._instance.session = Session()
             cls._instance._db_url = db_url
+        elif cls._instance._db_profile != db_profile:
+            # PRAGMAs are applied per connection: drop the pooled ones
+            cls._instance._db_profile = db_profile
+            cls._instance.engine.dispose()
         # Policy may differ per invocation (CLI flag), so set it on every call.
         cls._instance._on_version_mismatch = on_version_mismatch
         if db_create:
+            if db_profile == const.DB_PROFILE_READONLY:
+                raise CrunchException("Cannot create a new database with the readonly database profile.")
             cls._instance._reset_database()
 
         cls._instance._check_and_create_database()  # Check if the database exists, if not create it
@@ -1402,18 +1571,62 @@ class Database:
         Base.metadata.create_all(bind=self.engine)  # Create all tables
         self._write_datamodel_version()
         # The model data the run markers vouched for is gone — stale
-        # "completed" rows would falsely promise consistent schemas.
+        # "completed" rows would falsely promise consistent schemas. The
+        # fingerprints described that data as well.
         self._clear_import_runs()
 
+    def _apply_profile(self, dbapi_connection, connection_record):
+        """Connect listener that applies the PRAGMAs of the current profile to a new SQLite connection."""
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma, value in DB_PROFILE_PRAGMAS[self._db_profile].items():
+                if pragma == "synchronous" and value != "FULL" and not self._wal_enabled(cursor):
+                    # A rollback journal can be corrupted by a power loss with synchronous below FULL
+                    continue
+                cursor.execute(f"PRAGMA {pragma}={value}")
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def _wal_enabled(cursor):
+        cursor.execute("PRAGMA journal_mode")
+        return cursor.fetchone()[0].lower() == "wal"
+
+    @contextmanager
+    def _durable_connection(self):
+        """Connection for the import-run markers whose commits are synced to disk, whatever the profile.
+
+        With 'fast-import' a commit in WAL mode is atomic and ordered, but the last ones may be lost on a
+        power failure. A marker must never be lost while the data it vouches for has already been reported as
+        complete, so the marker commits are written with synchronous FULL, which also syncs all earlier commits.
+        """
+        with self.engine.connect() as connection:
+            if connection.dialect.name != "sqlite":
+                yield connection
+                return
+            synchronous = connection.exec_driver_sql("PRAGMA synchronous").scalar()
+            connection.exec_driver_sql("PRAGMA synchronous=FULL")
+            connection.commit()
+            try:
+                yield connection
+            finally:
+                connection.rollback()
+                connection.exec_driver_sql(f"PRAGMA synchronous={synchronous}")
+                connection.commit()
+
     def _clear_import_runs(self):
         try:
             _meta_metadata.create_all(bind=self.engine, checkfirst=True)
             with self.engine.begin() as connection:
                 connection.execute(crunch_runs_table.delete())
+                connection.execute(crunch_fingerprints_table.delete())
         except OperationalError as e:
             logger.warning(f"Could not clear import run markers: {e}")
 
     def _check_and_create_database(self):
+        if self._db_profile == const.DB_PROFILE_READONLY:
+            self._check_readonly_database()
+            return
         try:
             inspector = inspect(self.engine)
             if Package.__tablename__ not in inspector.get_table_names():
@@ -1451,6 +1664,17 @@ class Database:
             Base.metadata.create_all(bind=self.engine)
         self._write_datamodel_version()
 
+    def _check_readonly_database(self):
+        """A readonly database cannot be created, migrated or recreated, only checked."""
+        if Package.__tablename__ not in inspect(self.engine).get_table_names():
+            raise CrunchException("Database has no crunch_uml tables and cannot be created with the readonly profile.")
+        stored_version = self._read_datamodel_version()
+        if stored_version is not None and stored_version != DATAMODEL_VERSION:
+            raise CrunchException(
+                f"Database has datamodel version {stored_version}, but this version of crunch_uml requires"
+                f" {DATAMODEL_VERSION}. It cannot be recreated with the readonly profile."
+            )
+
     def _resolve_version_mismatch_policy(self):
         """Effective mismatch policy: an explicit CLI choice wins; 'auto'
         recreates only the local default database and fails on anything else
@@ -1473,7 +1697,7 @@ class Database:
         run_id = str(uuid.uuid4())
         try:
             _meta_metadata.create_all(bind=self.engine, checkfirst=True)
-            with self.engine.begin() as connection:
+            with self._durable_connection() as connection:
                 connection.execute(
                     insert(crunch_runs_table).values(
                         run_id=run_id,
@@ -1484,6 +1708,7 @@ class Database:
                         datamodel_version=str(DATAMODEL_VERSION),
                     )
                 )
+                connection.commit()
             return run_id
         except OperationalError as e:
             logger.warning(f"Could not record import run start: {e}")
@@ -1496,15 +1721,82 @@ class Database:
         if run_id is None:
             return
         try:
-            with self.engine.begin() as connection:
+            with self._durable_connection() as connection:
                 connection.execute(
                     update(crunch_runs_table)
                     .where(crunch_runs_table.c.run_id == run_id)
                     .values(completed_at=datetime.now(timezone.utc).isoformat())
                 )
+                connection.commit()
         except OperationalError as e:
             logger.warning(f"Could not record import run completion: {e}")
 
+    def completed_import_run(self, schema_id):
+        """The run_id of the latest import run of a schema if that run completed, else None: the schema was never
+        imported with run markers, or its latest import is still running or was torn. A completed run_id thus
+        identifies the imported content of the schema."""
+        try:
+            with self.engine.connect() as connection:
+                row = connection.execute(
+                    select(crunch_runs_table.c.run_id, crunch_runs_table.c.completed_at)
+                    .where(crunch_runs_table.c.schema_id == schema_id)
+                    .order_by(crunch_runs_table.c.started_at.desc())
+                    .limit(1)
+                ).first()
+        except (OperationalError, sa_exc.ProgrammingError):
+            return None  # no crunch_uml_runs table yet
+        if row is None or row.completed_at is None:
+            return None
+        return row.run_id
+
+    def get_fingerprints(self, schema_id, table_name):
+        """Stored content hashes of the rows of a table in a schema, by object key."""
+        connection = self.session.connection()
+        _meta_metadata.create_all(bind=connection, checkfirst=True)
+        rows = connection.execute(
+            select(crunch_fingerprints_table.c.object_key, crunch_fingerprints_table.c.content_hash).where(
+                crunch_fingerprints_table.c.schema_id == schema_id,
+                crunch_fingerprints_table.c.table_name == table_name,
+            )
+        )
+        return dict(rows.all())
+
+    def write_fingerprints(self, schema_id, table_name, fingerprints, removed=()):
+        """Replaces the fingerprints of the given object keys and removes those of the removed keys.
+
+        Runs in the session transaction, so the fingerprints are committed or rolled back together with the rows
+        they describe.
+        """
+        connection = self.session.connection()
+        _meta_metadata.create_all(bind=connection, checkfirst=True)
+        stale = [{"b_key": key} for key in [*fingerprints, *removed]]
+        if stale:
+            connection.execute(
+                delete(crunch_fingerprints_table).where(
+                    crunch_fingerprints_table.c.schema_id == schema_id,
+                    crunch_fingerprints_table.c.table_name == table_name,
+                    crunch_fingerprints_table.c.object_key == bindparam("b_key"),
+                ),
+                stale,
+            )
+        if fingerprints:
+            connection.execute(
+                insert(crunch_fingerprints_table),
+                [
+                    {"schema_id": schema_id, "table_name": table_name, "object_key": key, "content_hash": value}
+                    for key, value in fingerprints.items()
+                ],
+            )
+
+    def clear_fingerprints(self, schema_id=None):
+        """Removes the fingerprints of a schema, or of all schemas, in the session transaction."""
+        connection = self.session.connection()
+        _meta_metadata.create_all(bind=connection, checkfirst=True)
+        stmt = delete(crunch_fingerprints_table)
+        if schema_id is not None:
+            stmt = stmt.where(crunch_fingerprints_table.c.schema_id == schema_id)
+        connection.execute(stmt)
+
     def _read_datamodel_version(self):
         """Version marker stored in the database, or None when the database
         predates the marker (or the value is unreadable)."""
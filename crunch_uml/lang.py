@@ -4,9 +4,10 @@ import time
 
 import translators as ts  # type: ignore
 
-from crunch_uml import ollama_translator
+from crunch_uml import ollama_translator, translation_memory
 
 logger = logging.getLogger()
+DEFAULT_TRANSLATOR = "alibaba"  # Standaard vertaalmachine van de translators-library
 ALTERNATIVE_TRANSLATOR = "google"  # Alternatieve vertaalmachine
 
 
@@ -26,6 +27,11 @@ def translate(value, to_language, from_language, *, context=None, max_retries=3,
     De optionele ``context``-dict wordt alleen door de Ollama-backend
     gebruikt; voor de externe API heeft het geen betekenis en wordt het
     genegeerd (compatibel met de bestaande call sites).
+
+    Met ``CRUNCH_UML_TRANSLATION_MEMORY`` gezet wordt elke vertaling eerst
+    opgezocht in het translation memory (zie :mod:`crunch_uml.translation_memory`)
+    en wordt elke nieuwe vertaling daarin bewaard, onder de vertaalmachine die
+    haar maakte.
     """
     backend = os.environ.get("CRUNCH_UML_TRANSLATE_BACKEND", "translators").lower()
     if backend == "ollama":
@@ -35,6 +41,13 @@ def translate(value, to_language, from_language, *, context=None, max_retries=3,
             logger.warning(f"Ollama-vertaling mislukt voor '{value}' ({e}); val terug op translators-API...")
             # door naar de bestaande translators-flow hieronder
 
+    memory = translation_memory.get_translation_memory()
+    if memory is not None:
+        for translator in (DEFAULT_TRANSLATOR, ALTERNATIVE_TRANSLATOR):
+            remembered = memory.get(value, from_language, to_language, "translators", model=translator)
+            if remembered is not None:
+                return remembered
+
     logger.debug(f"Translating text '{value}' from language '{from_language}' to '{to_language}'...")
     attempt = 0
     while attempt < max_retries:
@@ -46,7 +59,10 @@ def translate(value, to_language, from_language, *, context=None, max_retries=3,
                 from_language=from_language,
                 update_session_after_seconds=10,
                 if_ignore_limit_of_length=True,
+                translator=DEFAULT_TRANSLATOR,
             )
+            if memory is not None:
+                memory.put(value, from_language, to_language, "translators", translated_text, model=DEFAULT_TRANSLATOR)
             return translated_text  # Als de vertaling succesvol is, geef het resultaat terug
         except Exception:
             try:
@@ -62,6 +78,10 @@ def translate(value, to_language, from_language, *, context=None, max_retries=3,
                     update_session_after_seconds=10,
                     translator=ALTERNATIVE_TRANSLATOR,
                 )
+                if memory is not None:
+                    memory.put(
+                        value, from_language, to_language, "translators", translated_text, model=ALTERNATIVE_TRANSLATOR
+                    )
                 return translated_text  # Als de vertaling succesvol is, geef het resultaat terug
             except Exception as e:
                 attempt += 1
@@ -17,6 +17,10 @@ The implementation is deliberately small: a single ``requests.post`` to
 ``{OLLAMA_URL}/api/chat`` with a strict system prompt and a deterministic
 ``temperature=0`` + ``seed=42`` config.
 
+Translations are remembered in the optional on-disk translation memory
+(:mod:`crunch_uml.translation_memory`), keyed on the model and the prompt
+context, so a string is only sent to Ollama once.
+
 Identifier casing is a real source of LLM mistakes, so the response is
 post-processed by :func:`reconcile_case`: if the source is a camelCase /
 PascalCase / snake_case / kebab-case / ALL_CAPS token and the LLM gives
@@ -34,6 +38,8 @@ from typing import Any, Dict, List, Optional
 
 import requests
 
+from crunch_uml import translation_memory
+
 logger = logging.getLogger()
 
 
@@ -303,6 +309,13 @@ def translate(
     if _should_preserve_unchanged(value):
         return value
 
+    model = model or _env_model()
+    memory = translation_memory.get_translation_memory()
+    if memory is not None:
+        remembered = memory.get(value, from_language, to_language, "ollama", model=model, context=context)
+        if remembered is not None:
+            return remembered
+
     chat_url = f"{(url or _env_url()).rstrip('/')}/api/chat"
     # Cap the response length: a translation is never more than a small
     # multiple of the input, but without num_predict the LLM occasionally
@@ -313,7 +326,7 @@ def translate(
     num_predict = min(2048, 4 * estimated_in_tokens + 128)
 
     payload: Dict[str, Any] = {
-        "model": model or _env_model(),
+        "model": model,
         "messages": _build_messages(value, to_language, from_language, context),
         "stream": False,
         "options": {
@@ -334,4 +347,7 @@ def translate(
     data = resp.json()
     raw = (data.get("message") or {}).get("content", "")
     cleaned = _strip_response(raw)
-    return reconcile_case(value, cleaned) or value
+    translation = reconcile_case(value, cleaned) or value
+    if memory is not None:
+        memory.put(value, from_language, to_language, "ollama", translation, model=model, context=context)
+    return translation
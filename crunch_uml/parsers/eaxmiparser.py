@@ -1,13 +1,90 @@
+import functools
 import logging
+from collections import defaultdict
+
+from lxml import etree
+from sqlalchemy import bindparam, insert, select, update
 
 import crunch_uml.db as db
 import crunch_uml.schema as sch
 from crunch_uml import ea_geometry as geo
-from crunch_uml.parsers.parser import ParserRegistry, copy_values, fixtag
+from crunch_uml.parsers.parser import ParserRegistry, fixtag
 from crunch_uml.parsers.xmiparser import XMIParser
 
 logger = logging.getLogger()
 
+MSG_MISSING_EXTENSION = "Trying to parse input as EA XMI, no 'Extensions' node was found. Appears to strict XMI file."
+
+# Paths below extension elements, compiled once. None of them uses a namespace prefix, so they are
+# independent of the XMI version of the document.
+XPATH_EA_TYPES = etree.XPath("./properties/@ea_type")
+XPATH_SOURCE_ROLE = etree.XPath("./source/role")
+XPATH_TARGET_ROLE = etree.XPath("./target/role")
+XPATH_DIAGRAM_ELEMENTS = etree.XPath("./elements/element")
+
+# Kinds of extension elements in the order phase 3 applies them, with the label used for logging.
+PHASE3_ORDER = (
+    ("package", "packages"),
+    ("class", "classes"),
+    ("enumeration", "enumerations"),
+    ("attribute", "attributes"),
+    ("association", "associations"),
+    ("generalization", "generalizations"),
+    ("diagram", "diagrams"),
+)
+ELEMENT_KINDS = {
+    "uml:Package": "package",
+    "uml:Class": "class",
+    "uml:DataType": "class",
+    "uml:Enumeration": "enumeration",
+}
+CONNECTOR_KINDS = (("Association", "association"), ("Generalization", "generalization"))
+# Models whose rows phase 3 completes with the values of the extension.
+UPDATED_MODELS = (
+    db.Package,
+    db.Class,
+    db.Enumeratie,
+    db.Attribute,
+    db.EnumerationLiteral,
+    db.Association,
+    db.Generalization,
+)
+# Models of the diagrams and their members, in the order finish inserts them.
+DIAGRAM_MODELS = (
+    db.Diagram,
+    db.DiagramClass,
+    db.DiagramEnumeration,
+    db.DiagramAssociation,
+    db.DiagramGeneralization,
+)
+
+
+@functools.lru_cache(maxsize=None)
+def settable_column(model, name):
+    """
+    The column that setting the EA attribute or tag name on an object of model would set, None when model has no
+    such attribute. Primary key columns are never set.
+    """
+    key = fixtag(name)
+    if key not in model.__mapper__.column_attrs:
+        return None
+    columns = model.__mapper__.column_attrs[key].columns
+    if any(column.primary_key for column in columns):
+        return None
+    return columns[0].name
+
+
+def index_children(node, *tags):
+    """
+    Groups the direct children of an extension element by tag in a single pass, in document order. When tags are
+    given only those children are indexed, lxml skips the others without creating elements for them. Missing tags
+    give an empty list, just like the ./tag XPath expressions this replaces.
+    """
+    children = defaultdict(list)
+    for child in node.iterchildren(*tags):
+        children[child.tag].append(child)
+    return children
+
 
 def get_sorted_tags(tag_nodes):
     """
@@ -26,40 +103,146 @@ def get_sorted_tags(tag_nodes):
     return sorted(tag_nodes, key=tag_sort_key)
 
 
-@ParserRegistry.register(
-    "eaxmi",
-    descr="XMI-Parser that parses EA (Enterprise Architect) specific extensions. Tested on XMI v2.1 spec ",
-)
-class EAXMIParser(XMIParser):
-    def phase3_process_extra(self, node, ns, schema: sch.Schema):
-        """
-        third and last phase of parsing XMI-documents. Parsing extra propriatary data: addons to allready found data.
-        Starts at <xmi:Extension extender="Enterprise Architect" extenderID="6.5">
-        """
-        logger.info("Entering third phase parsing for EAParser: extras")
-        extensions = node.xpath("//xmi:Extension", namespaces=ns)
-        if len(extensions) < 1:
-            logger.warning(
-                "Trying to parse input as EA XMI, no 'Extensions' node was found. Appears to strict XMI file."
-            )
-            return
-        extension = extensions[0]  # type: ignore
+class EAExtensionProcessor:
+    """
+    Applies the data of the EA xmi:Extension to the objects read in phases 1 and 2.
 
-        # Pre-load identity maps once per phase. Each map matches the semantics
-        # of the corresponding ``schema.get_*`` helper so the existing logic
-        # stays correct, but we replace per-row DB queries (and per-row save +
-        # flush) with O(1) dict lookups + one terminal flush.
-        packages_by_id = {p.id: p for p in schema.get_all_packages()}
-        classes_by_id = {c.id: c for c in schema.get_all_classes()}
-        datatypes_by_id = {c.id: c for c in schema.get_all_datatypes()}
-        enums_by_id = {e.id: e for e in schema.get_all_enumerations()}
-        literals_by_id = {lit.id: lit for lit in schema.get_all_literals()}
-        attrs_by_id = {a.id: a for a in schema.get_all_attributes()}
-        assocs_by_id = {a.id: a for a in schema.get_all_associations()}
-        gens_by_id = {g.id: g for g in schema.get_all_generalizations()}
+    EAXMIParser.phase3_process_extra feeds it the whole extension at once, grouped per kind of element. In
+    streaming mode XMIParser.parse_streaming calls dispatch for every element with one of the tags below, as
+    soon as it has been read.
+    """
 
+    tags = ("element", "attribute", "connector", "diagram")
+
+    def __init__(self, ns, schema: sch.Schema):
+        self.ns = ns
+        self.schema = schema
+        self.xmi_id = "{" + ns["xmi"] + "}id"
+        self.xmi_idref = "{" + ns["xmi"] + "}idref"
+        self.xmi_type = "{" + ns["xmi"] + "}type"
+
+        # Phase 3 only adds values to rows that phases 1 and 2 wrote. Only the ids of those rows are loaded; the
+        # values are collected per row and written by finish with one executemany UPDATE per set of columns,
+        # instead of loading every row as an ORM object and flushing the changed attributes. The diagrams are
+        # new rows, collected the same way and inserted by finish.
+        self.ids = {model: self._ids(model) for model in UPDATED_MODELS}
+        self.updates = {model: {} for model in UPDATED_MODELS}  # type: ignore
+        self.inserts = {model: [] for model in DIAGRAM_MODELS}  # type: ignore
+
+        self.handlers = {
+            "package": self.process_package,
+            "class": self.process_class,
+            "enumeration": self.process_enumeration,
+            "attribute": self.process_attribute,
+            "association": self.process_association,
+            "generalization": self.process_generalization,
+            "diagram": self.process_diagram,
+        }
+
+    def _ids(self, model):
+        table = model.__table__
+        return set(
+            self.schema.database.session.execute(
+                select(table.c.id).where(table.c.schema_id == self.schema.schema_id)
+            ).scalars()
+        )
+
+    def _values(self, model, idref):
+        """The values collected for the row of model with id idref, None when phases 1 and 2 did not write it."""
+        if idref not in self.ids[model]:
+            return None
+        return self.updates[model].setdefault(idref, {})
+
+    def _copy_values(self, node, values, model):
+        """Like parser.copy_values, for the values of a row."""
+        if node is None:
+            return
+        for item in node if isinstance(node, list) else (node,):
+            for name, value in item.items():
+                column = settable_column(model, name)
+                if column is not None:
+                    values[column] = value
+
+    def _copy_tags(self, tags, values, model):
+        """Copies the tagged values of the indexed tags children, the elements ./tags/tag selects."""
+        for tag in get_sorted_tags([tag for node in tags for tag in node.iterchildren("tag")]):
+            column = settable_column(model, tag.get("name"))
+            if column is not None:
+                values[column] = tag.get("value")
+
+    def classify(self, node):
+        """
+        Returns the kinds of modifier an extension element holds, with the same selection as the XPath expressions
+        phase 3 used to run on the whole extension, like .//element[@xmi:type='uml:Package' and @xmi:idref].
+        """
+        if node.tag == "diagram":
+            return ("diagram",) if node.get(self.xmi_id) is not None else ()
+        if node.get(self.xmi_idref) is None:
+            return ()
+        if node.tag == "element":
+            kind = ELEMENT_KINDS.get(node.get(self.xmi_type))
+            return (kind,) if kind is not None else ()
+        if node.tag == "attribute":
+            return ("attribute",)
+        if node.tag == "connector":
+            ea_types = XPATH_EA_TYPES(node)
+            return tuple(kind for ea_type, kind in CONNECTOR_KINDS if ea_type in ea_types)
+        return ()
+
+    def index_extension(self, extension):
+        """Collects the modifiers of the whole extension per kind in one pass, each in document order."""
+        refs = {kind: [] for kind, _ in PHASE3_ORDER}  # type: ignore
+        for node in extension.iter(*self.tags):
+            for kind in self.classify(node):
+                refs[kind].append(node)
+        return refs
+
+    def dispatch(self, node):
+        """Processes one extension element, as selected by classify."""
+        for kind in self.classify(node):
+            self.handlers[kind](node)
+
+    def warn_missing_extension(self):
+        logger.warning(MSG_MISSING_EXTENSION)
+
+    def finish(self):
+        """
+        Writes the collected rows with one executemany statement per set of columns: an UPDATE of the rows of phases
+        1 and 2 per model, followed by an INSERT of the diagrams and their members.
+        """
+        session = self.schema.database.session
+        session.flush()
+        for model, rows in self.updates.items():
+            table = model.__table__
+            # The SET clause follows the columns of the parameters, the id is bound under another name
+            stmt = update(table).where(table.c.id == bindparam("b_id"), table.c.schema_id == self.schema.schema_id)
+            groups = {}  # type: ignore
+            for idref, values in rows.items():
+                if values:
+                    groups.setdefault(tuple(sorted(values)), []).append(values)
+                    values["b_id"] = idref
+            for params in groups.values():
+                session.execute(stmt, params)
+            rows.clear()
+
+        bulk_writer = self.schema.bulk_writer
+        for model, rows in self.inserts.items():
+            if bulk_writer is not None:
+                # Like Schema.add during a bulk insert: a diagram that already exists is updated
+                bulk_writer.insert_rows(model.__table__, rows)
+            else:
+                groups = {}
+                for row in rows:
+                    groups.setdefault(tuple(sorted(row)), []).append(row)
+                for group in groups.values():
+                    session.execute(insert(model.__table__), group)
+            rows.clear()
+        # The ORM session may hold the previous state of the updated rows
+        session.expire_all()
+
+    def process_package(self, packageref):
         """
-        First find all package modifiers that look like:
+        Applies a package modifier, that looks like:
             <element xmi:idref="EAPK_5B6708DC_CE09_4284_8DCE_DD1B744BB652" xmi:type="uml:Package" name="Diagram" scope="public">
                 <model package2="EAID_5B6708DC_CE09_4284_8DCE_DD1B744BB652" package="EAPK_45B88627_6F44_4b6d_BE77_3EC51BBE679E" tpos="0" ea_localid="41" ea_eleType="package"/>
                 <properties isSpecification="false" sType="Package" nType="0" scope="public"/>
@@ -76,29 +259,24 @@ class EAXMIParser(XMIParser):
             </element>
         and set value
         """
-        logger.info("Processing references to packages")
-        packagerefs = extension.xpath(".//element[@xmi:type='uml:Package' and @xmi:idref]", namespaces=ns)  # type: ignore
-        for packageref in packagerefs:
-            idref = packageref.get("{" + ns["xmi"] + "}idref")
-            package = packages_by_id.get(idref)
-            if package is None:
-                continue
+        package = self._values(db.Package, packageref.get(self.xmi_idref))
+        if package is None:
+            return
 
-            tags = get_sorted_tags(packageref.xpath("./tags/tag"))
-            for tag in tags:
-                if hasattr(package, fixtag(tag.get("name"))):
-                    setattr(package, fixtag(tag.get("name")), tag.get("value"))
+        children = index_children(packageref, "tags", "project", "properties")
+        self._copy_tags(children["tags"], package, db.Package)
 
-            project = packageref.xpath("./project")[0]
-            copy_values(project, package)
+        project = children["project"][0]
+        self._copy_values(project, package, db.Package)
 
-            properties = packageref.xpath("./properties")[0]
-            if properties is not None:
-                package.definitie = properties.get("documentation")
-            copy_values(properties, package)
+        properties = children["properties"][0]
+        if properties is not None:
+            package["definitie"] = properties.get("documentation")
+        self._copy_values(properties, package, db.Package)
 
+    def process_class(self, clazzref):
         """
-        Second find all class modifiers, like:
+        Applies a class modifier, like:
             <element xmi:idref="EAID_54944273_F312_44b2_A78D_43488F915429" xmi:type="uml:Class" name="Ambacht" scope="public">
                 <model package="EAPK_F7651B45_2B64_4197_A6E5_BFC56EC98466" tpos="0" ea_localid="382" ea_eleType="element"/>
                 <properties documentation="Beroep waarbij een handwerker met gereedschap eindproducten maakt." isSpecification="false" sType="Class" nType="0" scope="public" isRoot="false" isLeaf="false" isAbstract="false" isActive="false"/>
@@ -118,52 +296,36 @@ class EAXMIParser(XMIParser):
                 <xrefs/>
                 <extendedProperties tagged="0" package_name="Model Monumenten"/>
         """
+        clazz = self._values(db.Class, clazzref.get(self.xmi_idref))
+        if clazz is None:
+            return
 
-        logger.info("Processing references to classes")
-        clazzrefs = extension.xpath(
-            ".//element[(@xmi:type='uml:Class' or @xmi:type='uml:DataType') and @xmi:idref]",
-            namespaces=ns,
-        )  # type: ignore
-        for clazzref in clazzrefs:
-            idref = clazzref.get("{" + ns["xmi"] + "}idref")
-            clazz = classes_by_id.get(idref) or datatypes_by_id.get(idref)
-            if clazz is None:
-                continue
+        children = index_children(clazzref, "tags", "project", "properties")
+        self._copy_tags(children["tags"], clazz, db.Class)
 
-            tags = get_sorted_tags(clazzref.xpath("./tags/tag"))
-            for tag in tags:
-                if hasattr(clazz, fixtag(tag.get("name"))):
-                    setattr(clazz, fixtag(tag.get("name")), tag.get("value"))
-
-            properties = clazzref.xpath("./properties")[0]
-            if properties is not None:
-                clazz.definitie = properties.get("documentation")
-            project = clazzref.xpath("./project")
-            copy_values(project, clazz)
-            copy_values(properties, clazz)
-
-        logger.info("Processing references to enumerations")
-        enumrefs = extension.xpath(".//element[@xmi:type='uml:Enumeration' and @xmi:idref]", namespaces=ns)  # type: ignore
-        for enumref in enumrefs:
-            idref = enumref.get("{" + ns["xmi"] + "}idref")
-            enum = enums_by_id.get(idref)
-            if enum is None:
-                continue
+        properties = children["properties"][0]
+        if properties is not None:
+            clazz["definitie"] = properties.get("documentation")
+        self._copy_values(children["project"], clazz, db.Class)
+        self._copy_values(properties, clazz, db.Class)
 
-            tags = get_sorted_tags(enumref.xpath("./tags/tag"))
-            for tag in tags:
-                if hasattr(enum, fixtag(tag.get("name"))):
-                    setattr(enum, fixtag(tag.get("name")), tag.get("value"))
+    def process_enumeration(self, enumref):
+        enum = self._values(db.Enumeratie, enumref.get(self.xmi_idref))
+        if enum is None:
+            return
+
+        children = index_children(enumref, "tags", "project", "properties")
+        self._copy_tags(children["tags"], enum, db.Enumeratie)
 
-            properties = enumref.xpath("./properties")[0]
-            if properties is not None:
-                enum.definitie = properties.get("documentation")
-            project = enumref.xpath("./project")
-            copy_values(project, enum)
-            copy_values(properties, enum)
+        properties = children["properties"][0]
+        if properties is not None:
+            enum["definitie"] = properties.get("documentation")
+        self._copy_values(children["project"], enum, db.Enumeratie)
+        self._copy_values(properties, enum, db.Enumeratie)
 
+    def process_attribute(self, attrref):
         """
-        Third find all attributes, like
+        Applies an attribute or enumeration literal modifier, like
             <attribute xmi:idref="EAID_B2AE8AFC_C1D5_4d83_BFD3_EBF1663F3468" name="rijksmonument" scope="Public">
             <initial/>
             <documentation/>
@@ -180,84 +342,61 @@ class EAXMIParser(XMIParser):
             <xrefs/>
             </attribute>
         """
-        logger.info("Processing references to attributes")
-        attrrefs = extension.xpath(".//attribute[@xmi:idref]", namespaces=ns)  # type: ignore
-        for attrref in attrrefs:
-            idref = attrref.get("{" + ns["xmi"] + "}idref")
-            attr = attrs_by_id.get(idref)
-            if attr is not None:
-                properties = attrref.xpath("./properties")
-                copy_values(properties, attr)
-                documentation = attrref.xpath("./documentation")
-                attr.definitie = documentation[0].get("value") if documentation is not None else None
-                stereotype = attrref.xpath("./stereotype")
-                copy_values(stereotype, attr)
-
-                tags = get_sorted_tags(attrref.xpath("./tags/tag"))
-                for tag in tags:
-                    if hasattr(attr, fixtag(tag.get("name"))):
-                        setattr(attr, fixtag(tag.get("name")), tag.get("value"))
-                continue
+        idref = attrref.get(self.xmi_idref)
+        children = index_children(attrref, "properties", "documentation", "stereotype", "style", "tags")
+        attr = self._values(db.Attribute, idref)
+        if attr is not None:
+            self._copy_values(children["properties"], attr, db.Attribute)
+            documentation = children["documentation"]
+            attr["definitie"] = documentation[0].get("value") if documentation is not None else None
+            self._copy_values(children["stereotype"], attr, db.Attribute)
+            self._copy_tags(children["tags"], attr, db.Attribute)
+            return
 
-            literal = literals_by_id.get(idref)
-            if literal is not None:
-                properties = attrref.xpath("./properties")
-                copy_values(properties, literal)
-                documentation = attrref.xpath("./documentation")
-                literal.definitie = documentation[0].get("value") if documentation is not None else None
-                stereotype = attrref.xpath("./stereotype")
-                copy_values(stereotype, literal)
-                style = attrref.xpath("./style")
-                literal.alias = style[0].get("value") if style else None
-
-                tags = get_sorted_tags(attrref.xpath("./tags/tag"))
-                for tag in tags:
-                    if hasattr(literal, fixtag(tag.get("name"))):
-                        setattr(literal, fixtag(tag.get("name")), tag.get("value"))
-
-        logger.info("Processing references to associations")
-        connectorrefs = extension.xpath(".//connector[@xmi:idref and properties/@ea_type='Association']", namespaces=ns)  # type: ignore
-        for connectorref in connectorrefs:
-            idref = connectorref.get("{" + ns["xmi"] + "}idref")
-            association = assocs_by_id.get(idref)
-            if association is None:
-                continue
-            association.src_role = connectorref.xpath("./source/role", namespaces=ns)[0].get("name")
-            association.dst_role = connectorref.xpath("./target/role", namespaces=ns)[0].get("name")
-
-            documentation = connectorref.xpath("./documentation")
-            if len(documentation) == 1:
-                association.definitie = documentation[0].get("value")
-
-            tags = get_sorted_tags(connectorref.xpath("./tags/tag"))
-            for tag in tags:
-                if hasattr(association, fixtag(tag.get("name"))):
-                    setattr(association, fixtag(tag.get("name")), tag.get("value"))
-
-        logger.info("Processing references to generalizations")
-        genrefs = extension.xpath(".//connector[@xmi:idref and properties/@ea_type='Generalization']", namespaces=ns)  # type: ignore
-        for genref in genrefs:
-            idref = genref.get("{" + ns["xmi"] + "}idref")
-            generalization = gens_by_id.get(idref)
-            if generalization is None:
-                continue
+        literal = self._values(db.EnumerationLiteral, idref)
+        if literal is not None:
+            self._copy_values(children["properties"], literal, db.EnumerationLiteral)
+            documentation = children["documentation"]
+            literal["definitie"] = documentation[0].get("value") if documentation is not None else None
+            self._copy_values(children["stereotype"], literal, db.EnumerationLiteral)
+            style = children["style"]
+            literal["alias"] = style[0].get("value") if style else None
+            self._copy_tags(children["tags"], literal, db.EnumerationLiteral)
+
+    def process_association(self, connectorref):
+        association = self._values(db.Association, connectorref.get(self.xmi_idref))
+        if association is None:
+            return
+        association["src_role"] = XPATH_SOURCE_ROLE(connectorref)[0].get("name")
+        association["dst_role"] = XPATH_TARGET_ROLE(connectorref)[0].get("name")
+
+        children = index_children(connectorref, "documentation", "tags")
+        documentation = children["documentation"]
+        if len(documentation) == 1:
+            association["definitie"] = documentation[0].get("value")
+
+        self._copy_tags(children["tags"], association, db.Association)
+
+    def process_generalization(self, genref):
+        generalization = self._values(db.Generalization, genref.get(self.xmi_idref))
+        if generalization is None:
+            return
 
-            # EA carries the connector name in the middle-top label.
-            labels = genref.xpath("./labels")
-            if labels and labels[0].get("mt"):
-                generalization.name = labels[0].get("mt")
+        # EA carries the connector name in the middle-top label.
+        children = index_children(genref, "labels", "documentation", "tags")
+        labels = children["labels"]
+        if labels and labels[0].get("mt"):
+            generalization["name"] = labels[0].get("mt")
 
-            documentation = genref.xpath("./documentation")
-            if len(documentation) == 1 and documentation[0].get("value") is not None:
-                generalization.definitie = documentation[0].get("value")
+        documentation = children["documentation"]
+        if len(documentation) == 1 and documentation[0].get("value") is not None:
+            generalization["definitie"] = documentation[0].get("value")
 
-            tags = get_sorted_tags(genref.xpath("./tags/tag"))
-            for tag in tags:
-                if hasattr(generalization, fixtag(tag.get("name"))):
-                    setattr(generalization, fixtag(tag.get("name")), tag.get("value"))
+        self._copy_tags(children["tags"], generalization, db.Generalization)
 
+    def process_diagram(self, diagramref):
         """
-        Voorbeeld van Diagram
+        Reads a diagram including its members and their geometry. Voorbeeld van Diagram:
 
                     <diagram xmi:id="EAID_7429E175_1CBE_4336_BF92_6C5029395E69">
                         <model package="EAPK_5B6708DC_CE09_4284_8DCE_DD1B744BB652" localID="27" owner="EAPK_5B6708DC_CE09_4284_8DCE_DD1B744BB652"/>
@@ -282,97 +421,126 @@ class EAXMIParser(XMIParser):
                         </elements>
                     </diagram>
         """
+        idref = diagramref.get("{" + self.ns["xmi"] + "}id")
+        children = index_children(diagramref, "model", "properties", "project")
+        package_id = children["model"][0].get("package")
+        properties = children["properties"][0]
+        project = children["project"][0]
+        name = properties.get("name")
+        author = project.get("author")
+        version = project.get("version")
+        created = project.get("created")
+        modified = project.get("modified")
+        documentation = properties.get("documentation")
+        schema_id = self.schema.schema_id
+        self.inserts[db.Diagram].append(
+            {
+                "id": idref,
+                "schema_id": schema_id,
+                "name": name,
+                "package_id": package_id,
+                "author": author,
+                "version": version,
+                "created": created,
+                "modified": modified,
+                "definitie": documentation,
+            }
+        )
+
+        seen_element_ids = set()
+        for element in XPATH_DIAGRAM_ELEMENTS(diagramref):
+            element_id = element.get("subject")
+            logger.debug(f'Found element with id {element_id} in diagram {name}')
+            if element_id in seen_element_ids:
+                # EA (rarely) allows the same element twice on one
+                # diagram; the composite primary key cannot. Known
+                # limitation: the first instance wins.
+                logger.warning(
+                    f"Element {element_id} appears more than once on diagram {name}: keeping the"
+                    " first occurrence only."
+                )
+                continue
 
-        logger.info("Processing references to diagrams")
-        diagramrefs = extension.xpath(".//diagram[@xmi:id]", namespaces=ns)  # type: ignore
-        for diagramref in diagramrefs:
-            idref = diagramref.get("{" + ns["xmi"] + "}id")
-            package_id = diagramref.xpath("./model")[0].get("package")
-            name = diagramref.xpath("./properties")[0].get("name")
-            author = diagramref.xpath("./project")[0].get("author")
-            version = diagramref.xpath("./project")[0].get("version")
-            created = diagramref.xpath("./project")[0].get("created")
-            modified = diagramref.xpath("./project")[0].get("modified")
-            documentation = diagramref.xpath("./properties")[0].get("documentation")
-            diagram = db.Diagram(
-                id=idref,
-                name=name,
-                package_id=package_id,
-                author=author,
-                version=version,
-                created=created,
-                modified=modified,
-                definitie=documentation,
-            )
-            schema.add(diagram)
-
-            seen_element_ids = set()
-            for element in diagramref.xpath("./elements/element"):
-                element_id = element.get("subject")
-                logger.debug(f'Found element with id {element_id} in diagram {name}')
-                if element_id in seen_element_ids:
-                    # EA (rarely) allows the same element twice on one
-                    # diagram; the composite primary key cannot. Known
-                    # limitation: the first instance wins.
-                    logger.warning(
-                        f"Element {element_id} appears more than once on diagram {name}: keeping the"
-                        " first occurrence only."
-                    )
-                    continue
-
-                node = classes_by_id.get(element_id) or datatypes_by_id.get(element_id) or enums_by_id.get(element_id)
-                if node is not None:
-                    seen_element_ids.add(element_id)
-                    node_geometry = geo.parse_xmi_node_geometry(element.get("geometry")) or {}
-                    seqno = element.get("seqno")
-                    membership_kwargs = dict(
-                        diagram_id=diagram.id,
-                        schema_id=schema.schema_id,
-                        z_order=int(seqno) if seqno is not None else None,
-                        ea_style=element.get("style"),
-                        **node_geometry,
-                    )
-                    if element_id in enums_by_id:
-                        diagram.diagram_enumerations.append(
-                            db.DiagramEnumeration(enumeration_id=element_id, **membership_kwargs)
-                        )
-                    else:
-                        diagram.diagram_classes.append(db.DiagramClass(class_id=element_id, **membership_kwargs))
-                    continue
-
-                edge_is_assoc = element_id in assocs_by_id
-                if edge_is_assoc or element_id in gens_by_id:
-                    seen_element_ids.add(element_id)
-                    base_geometry, path = geo.split_path_from_xmi_geometry(element.get("geometry"))
-                    waypoints = geo.parse_path(path, geo.XMI_PATH_SEPARATOR)
-                    base_style, hidden = geo.split_hidden_from_style(element.get("style"))
-                    membership_kwargs = dict(
-                        diagram_id=diagram.id,
-                        schema_id=schema.schema_id,
-                        waypoints=geo.waypoints_to_json(waypoints),
-                        hidden=hidden,
-                        ea_geometry=base_geometry,
-                        ea_style=base_style,
-                    )
-                    if edge_is_assoc:
-                        diagram.diagram_associations.append(
-                            db.DiagramAssociation(association_id=element_id, **membership_kwargs)
-                        )
-                    else:
-                        diagram.diagram_generalizations.append(
-                            db.DiagramGeneralization(generalization_id=element_id, **membership_kwargs)
-                        )
-                    continue
-
-                logger.debug(
-                    f'Element {element_id} in diagram {name} is niet gevonden in de database. Kan een'
-                    ' niet geimplemneteerde type zijn zoals: Note of Constraint, of kan een relatie zij naar een'
-                    ' element buiten het model.'
+            is_enum = element_id in self.ids[db.Enumeratie]
+            if is_enum or element_id in self.ids[db.Class]:
+                seen_element_ids.add(element_id)
+                node_geometry = geo.parse_xmi_node_geometry(element.get("geometry")) or {}
+                seqno = element.get("seqno")
+                membership = dict(
+                    diagram_id=idref,
+                    schema_id=schema_id,
+                    z_order=int(seqno) if seqno is not None else None,
+                    ea_style=element.get("style"),
+                    **node_geometry,
+                )
+                if is_enum:
+                    membership["enumeration_id"] = element_id
+                    self.inserts[db.DiagramEnumeration].append(membership)
+                else:
+                    membership["class_id"] = element_id
+                    self.inserts[db.DiagramClass].append(membership)
+                continue
+
+            edge_is_assoc = element_id in self.ids[db.Association]
+            if edge_is_assoc or element_id in self.ids[db.Generalization]:
+                seen_element_ids.add(element_id)
+                base_geometry, path = geo.split_path_from_xmi_geometry(element.get("geometry"))
+                waypoints = geo.parse_path(path, geo.XMI_PATH_SEPARATOR)
+                base_style, hidden = geo.split_hidden_from_style(element.get("style"))
+                membership = dict(
+                    diagram_id=idref,
+                    schema_id=schema_id,
+                    waypoints=geo.waypoints_to_json(waypoints),
+                    hidden=hidden,
+                    ea_geometry=base_geometry,
+                    ea_style=base_style,
                 )
+                if edge_is_assoc:
+                    membership["association_id"] = element_id
+                    self.inserts[db.DiagramAssociation].append(membership)
+                else:
+                    membership["generalization_id"] = element_id
+                    self.inserts[db.DiagramGeneralization].append(membership)
+                continue
+
+            logger.debug(
+                f'Element {element_id} in diagram {name} is niet gevonden in de database. Kan een'
+                ' niet geimplemneteerde type zijn zoals: Note of Constraint, of kan een relatie zij naar een'
+                ' element buiten het model.'
+            )
+
+        logger.debug(f"Diagram {name} met id {idref} ingelezen met {len(seen_element_ids)} elementen")
 
-            logger.debug(f"Diagram {diagram.name} met id {diagram.id} ingelezen met inhoud: {diagram}")
-            schema.save(diagram)
 
-        # One flush at the end of phase 3 commits all in-place mutations to
-        # packages / classes / enums / attrs / literals / associations.
-        schema.database.session.flush()
+@ParserRegistry.register(
+    "eaxmi",
+    descr="XMI-Parser that parses EA (Enterprise Architect) specific extensions. Tested on XMI v2.1 spec ",
+)
+class EAXMIParser(XMIParser):
+    reads_extension = True
+
+    def phase3_process_extra(self, node, ns, schema: sch.Schema):
+        """
+        third and last phase of parsing XMI-documents. Parsing extra propriatary data: addons to allready found data.
+        Starts at <xmi:Extension extender="Enterprise Architect" extenderID="6.5">
+        """
+        logger.info("Entering third phase parsing for EAParser: extras")
+        extensions = node.xpath("//xmi:Extension", namespaces=ns)
+        if len(extensions) < 1:
+            logger.warning(MSG_MISSING_EXTENSION)
+            return
+        extension = extensions[0]  # type: ignore
+        processor = EAExtensionProcessor(ns, schema)
+
+        refs = processor.index_extension(extension)
+        for kind, label in PHASE3_ORDER:
+            logger.info(f"Processing references to {label}")
+            handler = processor.handlers[kind]
+            for ref in refs[kind]:
+                handler(ref)
+
+        processor.finish()
+
+    def create_extension_processor(self, ns, schema: sch.Schema):
+        logger.info("Entering third phase parsing for EAParser: extras")
+        return EAExtensionProcessor(ns, schema)
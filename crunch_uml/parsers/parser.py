@@ -35,6 +35,39 @@ def add_args(argumentparser, subparser_dict):
         action="store_true",
         help="Skip parsing relations for XMI files only)",
     )
+    import_subparser.add_argument(
+        "--xmi_streaming",
+        default=False,
+        action="store_true",
+        help=(
+            "Read XMI files incrementally instead of loading the whole document, keeps memory use bounded on very"
+            " large exports (XMI files only)"
+        ),
+    )
+    import_subparser.add_argument(
+        "--bulk_insert",
+        default=False,
+        action="store_true",
+        help=(
+            "Write new records with chunked bulk inserts instead of one by one, speeds up importing large models"
+            " (xmi, eaxmi and qea only)"
+        ),
+    )
+    import_subparser.add_argument(
+        "--bulk_insert_chunk_size",
+        type=int,
+        default=const.BULK_INSERT_CHUNK_SIZE,
+        help=f"Number of records per bulk insert statement. Default is {const.BULK_INSERT_CHUNK_SIZE}.",
+    )
+    import_subparser.add_argument(
+        "--incremental",
+        default=False,
+        action="store_true",
+        help=(
+            "Only write the records whose content changed since the previous incremental import into the schema:"
+            " inserts, updates and deletions (xmi, eaxmi and qea only)"
+        ),
+    )
     import_subparser.add_argument(
         "-lan",
         "--language",
@@ -96,6 +129,11 @@ def copy_values(node, obj):
 
 
 class Parser(ABC):
+    # Whether the parser can write through Schema.bulk_insert, see --bulk_insert
+    supports_bulk_insert = False
+    # Whether the parser reads a complete model, so it can import through Schema.incremental_import, see --incremental
+    supports_incremental = False
+
     @abstractmethod
     def parse(self, args, schema: sch.Schema):
         pass
@@ -1,14 +1,103 @@
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
 
 import sqlalchemy as sa
 
 import crunch_uml.db as db
 import crunch_uml.schema as sch
 from crunch_uml import ea_geometry as geo
+from crunch_uml.exceptions import CrunchException
 from crunch_uml.parsers.parser import Parser, ParserRegistry, fixtag
 
 logger = logging.getLogger()
 
+# Object types in t_object that are imported as classes, datatypes or enumerations
+MODEL_OBJECT_TYPES = ("Class", "DataType", "Enumeration")
+# Number of tables QEAReader fetches at the same time
+QEA_READ_WORKERS = 4
+
+# Source tables of the QEA parser: (key column, columns, ORDER BY). QEAReader reads each table once, the phases
+# share the result.
+QEA_TABLES = {
+    "t_package": (
+        "Package_ID",
+        ("Package_ID", "Name", "Parent_ID", "ea_guid", "Notes", "Version", "CreatedDate", "ModifiedDate"),
+        "Package_ID",
+    ),
+    "t_object": (
+        "Object_ID",
+        (
+            "Object_ID",
+            "Object_Type",
+            "Name",
+            "Package_ID",
+            "ea_guid",
+            "Note",
+            "Stereotype",
+            "Author",
+            "Version",
+            "CreatedDate",
+            "ModifiedDate",
+            "Status",
+            "Alias",
+        ),
+        "Object_ID",
+    ),
+    "t_attribute": (
+        "ID",
+        (
+            "ID",
+            "Object_ID",
+            "Name",
+            "Type",
+            "Classifier",
+            "LowerBound",
+            "UpperBound",
+            "Notes",
+            "ea_guid",
+            "Scope",
+            "Stereotype",
+        ),
+        "Object_ID, Pos",
+    ),
+    "t_connector": (
+        "Connector_ID",
+        (
+            "Connector_ID",
+            "Name",
+            "Connector_Type",
+            "SourceCard",
+            "DestCard",
+            "Start_Object_ID",
+            "End_Object_ID",
+            "ea_guid",
+            "Notes",
+            "Stereotype",
+        ),
+        "Connector_ID",
+    ),
+    "t_objectproperties": (None, ("Object_ID", "Property", "Value"), "Object_ID, PropertyID"),
+    "t_attributetag": (None, ("ElementID", "Property", "VALUE"), "ElementID, PropertyID"),
+    "t_connectortag": (None, ("ElementID", "Property", "VALUE"), "ElementID, PropertyID"),
+    "t_diagram": (
+        "Diagram_ID",
+        ("Diagram_ID", "ea_guid", "Name", "Package_ID", "Author", "Version", "CreatedDate", "ModifiedDate", "Notes"),
+        "Diagram_ID",
+    ),
+    "t_diagramobjects": (
+        None,
+        ("Diagram_ID", "Object_ID", "RectLeft", "RectTop", "RectRight", "RectBottom", "Sequence", "ObjectStyle"),
+        "Diagram_ID, Sequence",
+    ),
+    "t_diagramlinks": (
+        None,
+        ("DiagramID", "ConnectorID", "Geometry", "Style", "Hidden", "Path"),
+        "DiagramID, Instance_ID",
+    ),
+}
+
 # EA GUID format in QEA: {XXXXXXXX-XXXX-XXXX-XXXX-XXXXXXXXXXXX}
 # In XMI these become: EAID_XXXXXXXX_XXXX_XXXX_XXXX_XXXXXXXXXXXX (for objects)
 #                  and EAPK_XXXXXXXX_XXXX_XXXX_XXXX_XXXXXXXXXXXX (for packages)
@@ -45,6 +134,65 @@ def synth_attr_eaid(attr_id) -> str:
     return f"EAID_attr_{attr_id}"
 
 
+class QEATable:
+    """
+    Rows of one QEA table, stored as one array per column, with a lookup from the key column (Object_ID,
+    Connector_ID, ...) to the row number.
+    """
+
+    def __init__(self, name, columns, rows, key=None):
+        self.name = name
+        self.columns = {column: [row[i] for row in rows] for i, column in enumerate(columns)}
+        self.index = {value: i for i, value in enumerate(self.columns[key])} if key else {}
+
+    def __len__(self):
+        return len(next(iter(self.columns.values()), []))
+
+    def rows(self, *columns):
+        """Iterates over the values of the given columns, row by row."""
+        return zip(*(self.columns[column] for column in columns))
+
+    def get(self, key, column):
+        """Value of column in the row with the given key, or None for an unknown key."""
+        i = self.index.get(key)
+        return None if i is None else self.columns[column][i]
+
+
+class QEAReader:
+    """
+    Reads the source tables of a QEA repository, each exactly once, on read-only connections. The tables are
+    fetched concurrently: SQLite releases the GIL while it steps through a query.
+    """
+
+    def __init__(self, inputfile, workers=QEA_READ_WORKERS):
+        self.inputfile = inputfile
+        self.workers = workers
+
+    def read(self):
+        """Returns a dict of table name to QEATable for all tables in QEA_TABLES."""
+        if not os.path.isfile(self.inputfile):
+            msg = f"QEA repository {self.inputfile} not found."
+            logger.error(msg)
+            raise CrunchException(msg)
+        uri = f"file:{quote(os.path.abspath(self.inputfile))}?mode=ro&uri=true"
+        engine = sa.create_engine(f"sqlite:///{uri}", pool_size=self.workers)
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                tables = list(pool.map(lambda name: self._read_table(engine, name), QEA_TABLES))
+        finally:
+            engine.dispose()
+        for table in tables:
+            logger.debug(f"Read {len(table)} rows from {table.name}")
+        return {table.name: table for table in tables}
+
+    @staticmethod
+    def _read_table(engine, name):
+        key, columns, order_by = QEA_TABLES[name]
+        with engine.connect() as conn:
+            rows = conn.execute(sa.text(f"SELECT {', '.join(columns)} FROM {name} ORDER BY {order_by}")).fetchall()
+        return QEATable(name, columns, rows, key=key)
+
+
 def normalize_newlines(text):
     """EA stores Windows line endings in Notes columns. The XMI export of the
     same model yields plain \\n because the XML spec normalizes CR/LF in
@@ -59,19 +207,20 @@ def normalize_newlines(text):
     descr="Parser for Enterprise Architect repository files (.qea/.qeax). These are SQLite databases.",
 )
 class QEAParser(Parser):
+    supports_bulk_insert = True
+    supports_incremental = True
+
     def parse(self, args, schema: sch.Schema):
         inputfile = args.inputfile
         logger.info(f"Opening QEA repository: {inputfile}")
 
-        engine = sa.create_engine(f"sqlite:///{inputfile}")
-
-        with engine.connect() as conn:
-            self._phase1_packages(conn, schema)
-            self._phase2_objects(conn, schema)
-            self._phase3_attributes(conn, schema)
-            self._phase4_connectors(conn, schema)
-            self._phase5_tagged_values(conn, schema)
-            self._phase6_diagrams(conn, schema)
+        tables = QEAReader(inputfile).read()
+        self._phase1_packages(tables, schema)
+        self._phase2_objects(tables, schema)
+        self._phase3_attributes(tables, schema)
+        self._phase4_connectors(tables, schema)
+        self._phase5_tagged_values(tables, schema)
+        self._phase6_diagrams(tables, schema)
 
         logger.info(
             f"QEA import done: {schema.count_package()} packages, "
@@ -84,15 +233,10 @@ class QEAParser(Parser):
             f"{schema.count_diagrams()} diagrams."
         )
 
-    def _phase1_packages(self, conn, schema: sch.Schema):
+    def _phase1_packages(self, tables, schema: sch.Schema):
         """Parse t_package into Package objects."""
         logger.info("Phase 1: parsing packages")
-        rows = conn.execute(
-            sa.text(
-                "SELECT Package_ID, Name, Parent_ID, ea_guid, Notes, Version, "
-                "CreatedDate, ModifiedDate FROM t_package ORDER BY Package_ID"
-            )
-        ).fetchall()
+        rows = list(tables["t_package"].rows(*QEA_TABLES["t_package"][1]))
 
         # Build lookup: Package_ID -> ea_guid (EAPK_ format id)
         self._pkg_id_map = {}  # Package_ID (int) -> EAPK_ string
@@ -122,19 +266,10 @@ class QEAParser(Parser):
 
         logger.info(f"Phase 1 done: {schema.count_package()} packages")
 
-    def _phase2_objects(self, conn, schema: sch.Schema):
+    def _phase2_objects(self, tables, schema: sch.Schema):
         """Parse t_object into Class and Enumeratie objects."""
         logger.info("Phase 2: parsing classes and enumerations")
-        rows = conn.execute(
-            sa.text(
-                "SELECT Object_ID, Object_Type, Name, Package_ID, ea_guid, "
-                "Note, Stereotype, Author, Version, CreatedDate, ModifiedDate, "
-                "Status, Alias "
-                "FROM t_object "
-                "WHERE Object_Type IN ('Class', 'DataType', 'Enumeration') "
-                "ORDER BY Object_ID"
-            )
-        ).fetchall()
+        rows = [row for row in tables["t_object"].rows(*QEA_TABLES["t_object"][1]) if row[1] in MODEL_OBJECT_TYPES]
 
         # Build lookup: Object_ID (int) -> EAID_ string
         self._obj_id_map = {}  # Object_ID -> EAID_ string
@@ -199,21 +334,16 @@ class QEAParser(Parser):
 
         logger.info(f"Phase 2 done: {schema.count_class()} classes, " f"{schema.count_enumeratie()} enumerations")
 
-    def _phase3_attributes(self, conn, schema: sch.Schema):
+    def _phase3_attributes(self, tables, schema: sch.Schema):
         """Parse t_attribute into Attribute and EnumerationLiteral objects."""
         logger.info("Phase 3: parsing attributes and enumeration literals")
 
-        rows = conn.execute(
-            sa.text(
-                "SELECT a.ID, a.Object_ID, a.Name, a.Type, a.Classifier, "
-                "a.LowerBound, a.UpperBound, a.Notes, a.ea_guid, a.Scope, "
-                "a.Stereotype, o.Object_Type "
-                "FROM t_attribute a "
-                "JOIN t_object o ON a.Object_ID = o.Object_ID "
-                "WHERE o.Object_Type IN ('Class', 'DataType', 'Enumeration') "
-                "ORDER BY a.Object_ID, a.Pos"
-            )
-        ).fetchall()
+        objects = tables["t_object"]
+        rows = [
+            row + (objects.get(row[1], "Object_Type"),)
+            for row in tables["t_attribute"].rows(*QEA_TABLES["t_attribute"][1])
+            if objects.get(row[1], "Object_Type") in MODEL_OBJECT_TYPES
+        ]
 
         # Attribute numeric ID -> eaid (used by phase 5 to apply tagged values)
         self._attr_id_map = {}
@@ -262,14 +392,12 @@ class QEAParser(Parser):
                 if classifier and classifier != 0:
                     classifier_eaid = self._obj_id_map.get(int(classifier))
                     if classifier_eaid is not None:
-                        # Determine if classifier is Class or Enumeration
-                        classifier_obj = schema.get_class(classifier_eaid)
-                        if classifier_obj is not None:
+                        # Classifier is a Class or an Enumeration imported in phase 2; datatypes stay primitive
+                        classifier_type = objects.get(int(classifier), "Object_Type")
+                        if classifier_type == "Class":
                             type_class_id = classifier_eaid
-                        else:
-                            enum_obj = schema.get_enumeration(classifier_eaid)
-                            if enum_obj is not None:
-                                enumeration_id = classifier_eaid
+                        elif classifier_type == "Enumeration":
+                            enumeration_id = classifier_eaid
 
                 attribute = db.Attribute(
                     id=eaid,
@@ -293,19 +421,15 @@ class QEAParser(Parser):
             f"{schema.count_enumeratieliteral()} enumeration literals"
         )
 
-    def _phase4_connectors(self, conn, schema: sch.Schema):
+    def _phase4_connectors(self, tables, schema: sch.Schema):
         """Parse t_connector into Association and Generalization objects."""
         logger.info("Phase 4: parsing connectors")
 
-        rows = conn.execute(
-            sa.text(
-                "SELECT Connector_ID, Name, Connector_Type, SourceCard, DestCard, "
-                "Start_Object_ID, End_Object_ID, ea_guid, Notes, Stereotype "
-                "FROM t_connector "
-                "WHERE Connector_Type IN ('Association', 'Generalization', 'Realisation') "
-                "ORDER BY Connector_ID"
-            )
-        ).fetchall()
+        rows = [
+            row
+            for row in tables["t_connector"].rows(*QEA_TABLES["t_connector"][1])
+            if row[2] in ("Association", "Generalization", "Realisation")
+        ]
 
         # Imported connector ids, used by phase 6 to route diagram links to
         # the right junction table (and skip links to connectors that were
@@ -377,7 +501,7 @@ class QEAParser(Parser):
             f"{schema.count_generalizations()} generalizations"
         )
 
-    def _phase5_tagged_values(self, conn, schema: sch.Schema):
+    def _phase5_tagged_values(self, tables, schema: sch.Schema):
         """Apply tagged values from t_objectproperties, t_attributetag, t_connectortag.
 
         Performance note: previously this phase did ``schema.get_*(id)`` + a
@@ -397,25 +521,14 @@ class QEAParser(Parser):
         attrs_by_id = {a.id: a for a in schema.get_all_attributes()}
         assocs_by_id = {a.id: a for a in schema.get_all_associations()}
 
-        # Pre-resolve connector numeric ID -> ea_guid once (was a per-row
-        # subquery before).
-        connector_eaid_by_id = {
-            row[0]: guid_to_eaid(row[1])
-            for row in conn.execute(sa.text("SELECT Connector_ID, ea_guid FROM t_connector")).fetchall()
-        }
+        objects = tables["t_object"]
+        attributes = tables["t_attribute"]
+        connectors = tables["t_connector"]
 
         # Object tagged values (classes, datatypes, enumerations).
-        rows = conn.execute(
-            sa.text(
-                "SELECT op.Object_ID, op.Property, op.Value "
-                "FROM t_objectproperties op "
-                "JOIN t_object o ON op.Object_ID = o.Object_ID "
-                "WHERE o.Object_Type IN ('Class', 'DataType', 'Enumeration') "
-                "ORDER BY op.Object_ID, op.PropertyID"
-            )
-        ).fetchall()
-
-        for obj_id, prop, value in rows:
+        for obj_id, prop, value in tables["t_objectproperties"].rows("Object_ID", "Property", "Value"):
+            if objects.get(obj_id, "Object_Type") not in MODEL_OBJECT_TYPES:
+                continue
             eaid = self._obj_id_map.get(obj_id)
             if eaid is None:
                 continue
@@ -425,18 +538,9 @@ class QEAParser(Parser):
                 setattr(obj, field, normalize_newlines(value))
 
         # Attribute tagged values.
-        attr_rows = conn.execute(
-            sa.text(
-                "SELECT at.ElementID, at.Property, at.VALUE "
-                "FROM t_attributetag at "
-                "JOIN t_attribute a ON at.ElementID = a.ID "
-                "JOIN t_object o ON a.Object_ID = o.Object_ID "
-                "WHERE o.Object_Type IN ('Class', 'DataType') "
-                "ORDER BY at.ElementID, at.PropertyID"
-            )
-        ).fetchall()
-
-        for elem_id, prop, value in attr_rows:
+        for elem_id, prop, value in tables["t_attributetag"].rows("ElementID", "Property", "VALUE"):
+            if objects.get(attributes.get(elem_id, "Object_ID"), "Object_Type") not in ("Class", "DataType"):
+                continue
             eaid = self._attr_id_map.get(elem_id)
             if eaid is None:
                 continue
@@ -446,18 +550,10 @@ class QEAParser(Parser):
                 setattr(attr, field, normalize_newlines(value))
 
         # Connector tagged values (associations / realisations).
-        conn_rows = conn.execute(
-            sa.text(
-                "SELECT ct.ElementID, ct.Property, ct.VALUE "
-                "FROM t_connectortag ct "
-                "JOIN t_connector c ON ct.ElementID = c.Connector_ID "
-                "WHERE c.Connector_Type IN ('Association', 'Realisation') "
-                "ORDER BY ct.ElementID, ct.PropertyID"
-            )
-        ).fetchall()
-
-        for elem_id, prop, value in conn_rows:
-            eaid = connector_eaid_by_id.get(elem_id)
+        for elem_id, prop, value in tables["t_connectortag"].rows("ElementID", "Property", "VALUE"):
+            if connectors.get(elem_id, "Connector_Type") not in ("Association", "Realisation"):
+                continue
+            eaid = guid_to_eaid(connectors.get(elem_id, "ea_guid"))
             if eaid is None:
                 continue
             field = fixtag(prop)
@@ -470,7 +566,7 @@ class QEAParser(Parser):
 
         logger.info("Phase 5 done: tagged values applied")
 
-    def _phase6_diagrams(self, conn, schema: sch.Schema):
+    def _phase6_diagrams(self, tables, schema: sch.Schema):
         """Parse t_diagram, t_diagramobjects and t_diagramlinks into Diagram
         objects with membership and geometry.
 
@@ -482,12 +578,9 @@ class QEAParser(Parser):
         """
         logger.info("Phase 6: parsing diagrams")
 
-        rows = conn.execute(
-            sa.text(
-                "SELECT Diagram_ID, ea_guid, Name, Package_ID, Author, Version, "
-                "CreatedDate, ModifiedDate, Notes FROM t_diagram ORDER BY Diagram_ID"
-            )
-        ).fetchall()
+        objects = tables["t_object"]
+        connectors = tables["t_connector"]
+        rows = tables["t_diagram"].rows(*QEA_TABLES["t_diagram"][1])
 
         diagrams_by_local_id = {}
         for row in rows:
@@ -514,19 +607,13 @@ class QEAParser(Parser):
         # Diagram objects (nodes): route to the class or enumeration junction
         # table based on the object type; other types (Notes, Packages, ...)
         # are not part of the model and are skipped.
-        object_rows = conn.execute(
-            sa.text(
-                "SELECT d.Diagram_ID, o.Object_Type, o.ea_guid, d.RectLeft, d.RectTop, "
-                "d.RectRight, d.RectBottom, d.Sequence, d.ObjectStyle "
-                "FROM t_diagramobjects d "
-                "JOIN t_object o ON o.Object_ID = d.Object_ID "
-                "ORDER BY d.Diagram_ID, d.Sequence"
-            )
-        ).fetchall()
-
         seen_nodes = set()
-        for row in object_rows:
-            diagram_id, obj_type, ea_guid, rect_left, rect_top, rect_right, rect_bottom, sequence, style = row
+        for row in tables["t_diagramobjects"].rows(*QEA_TABLES["t_diagramobjects"][1]):
+            diagram_id, obj_id, rect_left, rect_top, rect_right, rect_bottom, sequence, style = row
+            if obj_id not in objects.index:
+                continue
+            obj_type = objects.get(obj_id, "Object_Type")
+            ea_guid = objects.get(obj_id, "ea_guid")
             node_diagram = diagrams_by_local_id.get(diagram_id)
             element_id = guid_to_eaid(ea_guid)
             if node_diagram is None or element_id is None:
@@ -562,18 +649,12 @@ class QEAParser(Parser):
         # Diagram links (edges): only connectors that were imported in phase 4
         # get membership; others (NoteLinks, aggregations, connectors with
         # unknown endpoints) are skipped.
-        link_rows = conn.execute(
-            sa.text(
-                "SELECT l.DiagramID, c.ea_guid, l.Geometry, l.Style, l.Hidden, l.Path "
-                "FROM t_diagramlinks l "
-                "JOIN t_connector c ON c.Connector_ID = l.ConnectorID "
-                "ORDER BY l.DiagramID, l.Instance_ID"
-            )
-        ).fetchall()
-
         seen_edges = set()
-        for row in link_rows:
-            diagram_id, ea_guid, geometry, style, hidden, path = row
+        for row in tables["t_diagramlinks"].rows(*QEA_TABLES["t_diagramlinks"][1]):
+            diagram_id, connector_id, geometry, style, hidden, path = row
+            if connector_id not in connectors.index:
+                continue
+            ea_guid = connectors.get(connector_id, "ea_guid")
             edge_diagram = diagrams_by_local_id.get(diagram_id)
             element_id = guid_to_eaid(ea_guid)
             if edge_diagram is None or element_id is None:
@@ -1,3 +1,5 @@
+import codecs
+import copy
 import logging
 import re
 
@@ -45,6 +47,104 @@ def load_xmi(source):
         )
 
 
+# Chunk size used when streaming an XMI file (see iterparse_xmi).
+STREAM_CHUNK_SIZE = 1024 * 1024
+# Bytes read before the encoding of a streamed XMI file is determined.
+STREAM_HEAD_SIZE = 64 * 1024
+
+# Children of an XMI element that phase 2 needs in streaming mode; everything
+# else (documentation, EA extension data, ...) is dropped once it is read.
+STREAM_PHASE2_TAGS = ("ownedAttribute", "ownedEnd", "generalization", "memberEnd")
+STREAM_PHASE2_CHILD_TAGS = ("type", "lowerValue", "upperValue")
+
+
+def _iter_raw_chunks(source, chunk_size):
+    if source.startswith("http://") or source.startswith("https://"):
+        with requests.get(source, stream=True) as response:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                if chunk:
+                    yield chunk
+    else:
+        with open(source, "rb") as f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+
+
+def iter_xmi_utf8(source, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Streaming counterpart of load_xmi: yields the XMI document as UTF-8 encoded chunks.
+
+    The encoding is determined from the head of the file only (declared encoding, else chardet) and the
+    remainder is transcoded with an incremental decoder, so the file is never held in memory as a whole.
+    """
+    chunks = _iter_raw_chunks(source, chunk_size)
+    head = b""
+    for chunk in chunks:
+        head += chunk
+        if len(head) >= STREAM_HEAD_SIZE:
+            break
+    declared_encoding = extract_declared_encoding(head)
+    detected_encoding = None if declared_encoding else chardet.detect(head)["encoding"]
+    used_encoding = declared_encoding or detected_encoding or const.ENCODING
+
+    try:
+        decoder = codecs.getincrementaldecoder(used_encoding)()
+        text = decoder.decode(head).lstrip('\ufeff')
+        # Corrigeer header
+        text = re.sub(r'(<\?xml[^>]*encoding=["\'])([^"\']+)(["\'])', r'\1utf-8\3', text, count=1, flags=re.IGNORECASE)
+        yield text.encode(const.ENCODING)
+        for chunk in chunks:
+            yield decoder.decode(chunk).encode(const.ENCODING)
+        yield decoder.decode(b"", final=True).encode(const.ENCODING)
+    except (LookupError, UnicodeDecodeError) as e:
+        raise RuntimeError(
+            f"Probleem met XMI inlezen (declared: {declared_encoding}, detected: {detected_encoding}): {e}"
+        )
+
+
+def iterparse_xmi(source, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Yields (event, element) tuples for 'start' and 'end' events while the XMI document is read.
+
+    Callers are responsible for clearing elements they no longer need, see XMIParser.parse_streaming.
+    """
+    parser = etree.XMLPullParser(events=("start", "end"), recover=True, encoding=const.ENCODING)
+    for chunk in iter_xmi_utf8(source, chunk_size):
+        parser.feed(chunk)
+        yield from parser.read_events()
+    parser.close()
+    yield from parser.read_events()
+
+
+def _release(element):
+    """Frees an element that has been fully processed, including already processed preceding siblings."""
+    element.clear()
+    parent = element.getparent()
+    if parent is not None:
+        while element.getprevious() is not None:
+            del parent[0]
+
+
+def build_type_reference_index(node, ns):
+    """
+    Maps every referenced xmi:idref to the ownedAttribute properties that use it as type, in document order:
+    <ownedAttribute xmi:type="uml:Property" xmi:id="EAID_..." name="...">
+        <type xmi:idref="EAID_48A02EC8_683B_414f_B8A7_7518B789C8F5"/>
+    </ownedAttribute>
+    """
+    ns_xmi_idref = "{" + ns["xmi"] + "}idref"
+    ns_xmi_type = "{" + ns["xmi"] + "}type"
+    index = {}
+    for typenode in node.iter("type"):
+        idref = typenode.get(ns_xmi_idref)
+        if idref is None:
+            continue
+        property = typenode.getparent()
+        if property.tag == "ownedAttribute" and property.get(ns_xmi_type) == "uml:Property":
+            index.setdefault(idref, []).append(property)
+    return index
+
+
 def remove_EADatatype(input_string):
     pattern = r"^EA[\d\w]+_"
     return re.sub(pattern, "", input_string)
@@ -59,6 +159,10 @@ def zetOpLeeg():
     descr="XMI-Parser for strict XMI files. No extensions (like EA extensions) are parsed. Tested on XMI v2.1 spec ",
 )
 class XMIParser(Parser):
+    # Whether phase 3 reads the xmi:Extension, see create_extension_processor
+    reads_extension = False
+    supports_bulk_insert = True
+    supports_incremental = True
 
     # Recursieve functie om de parsetree te doorlopen
     def phase1_process_packages_classes(self, node, ns, schema: sch.Schema, parent_package_id=None):
@@ -84,69 +188,78 @@ class XMIParser(Parser):
                 logger.debug(f"Package with {name} does not have id value: discarded")
 
         elif tp in ["uml:Class", "uml:DataType"]:
-            clazz = db.Class(
-                id=node.get("{" + ns["xmi"] + "}id"),
-                name=node.get("name"),
-                package_id=parent_package_id,
-                is_datatype=(tp == "uml:DataType"),
-            )
-            logger.debug(f"Class {clazz.name} met id {clazz.id} ingelezen met inhoud: {clazz}")
-            schema.save(clazz)
-
-            for childnode in node:
-                sub_tp = childnode.get("{" + ns["xmi"] + "}type")
-                if sub_tp == "uml:Property":
-                    attribute = db.Attribute(
-                        id=childnode.get("{" + ns["xmi"] + "}id"),
-                        name=childnode.get("name"),
-                        clazz_id=clazz.id,
-                    )
-                    datatypes = childnode.xpath("./type")
-                    if len(datatypes) != 0:
-                        datatype = datatypes[0].get("{" + ns["xmi"] + "}idref")
-                        if datatype is None:
-                            pass
-                        elif datatype.startswith("EAID_"):
-                            # Reference to a classifier (Class / Enumeration) in the model
-                            # This is NOT a primitive EA datatype.
-                            # attribute.type_class_id = datatype
-                            attribute.primitive = zetOpLeeg()
-                        else:
-                            # EA primitive datatype (e.g. EAJava_int, EASomeProfile_String, etc.)
-                            attribute.primitive = remove_EADatatype(datatype)
-                    logger.debug(
-                        f"Attribute {attribute.name} met id {attribute.id} ingelezen met inhoud: {vars(attribute)}"
-                    )
-                    schema.save(attribute)
+            self.process_class(node, ns, schema, parent_package_id)
 
         elif tp == "uml:Enumeration":
-            enum = db.Enumeratie(
-                id=node.get("{" + ns["xmi"] + "}id"),
-                name=node.get("name"),
-                package_id=parent_package_id,
-            )
-            logger.debug(f"Enumeratie {enum.name} met id {enum.id} ingelezen met inhoud: {enum}")
-            schema.save(enum)
-
-            for childnode in node:
-                sub_tp = childnode.get("{" + ns["xmi"] + "}type")
-                if sub_tp == "uml:EnumerationLiteral":
-                    enumliteral = db.EnumerationLiteral(
-                        id=childnode.get("{" + ns["xmi"] + "}id"),
-                        name=childnode.get("name"),
-                        enumeratie_id=enum.id,
-                    )
-                    logger.debug(
-                        f"EnumerationLiteral {enumliteral.name} met id {enumliteral.id} ingelezen met inhoud:"
-                        f" {vars(enumliteral)}"
-                    )
-                    schema.save(enumliteral)
+            self.process_enumeration(node, ns, schema, parent_package_id)
 
         else:
             for childnode in node:
                 logger.debug(f"Parsing something with tag {node.tag}, no handling implemented yet values: {node}")
                 self.phase1_process_packages_classes(childnode, ns, schema, parent_package_id)
 
+    def process_class(self, node, ns, schema: sch.Schema, parent_package_id):
+        """Reads a uml:Class or uml:DataType node including its attributes."""
+        tp = node.get("{" + ns["xmi"] + "}type")
+        clazz = db.Class(
+            id=node.get("{" + ns["xmi"] + "}id"),
+            name=node.get("name"),
+            package_id=parent_package_id,
+            is_datatype=(tp == "uml:DataType"),
+        )
+        logger.debug(f"Class {clazz.name} met id {clazz.id} ingelezen met inhoud: {clazz}")
+        schema.save(clazz)
+
+        for childnode in node:
+            sub_tp = childnode.get("{" + ns["xmi"] + "}type")
+            if sub_tp == "uml:Property":
+                attribute = db.Attribute(
+                    id=childnode.get("{" + ns["xmi"] + "}id"),
+                    name=childnode.get("name"),
+                    clazz_id=clazz.id,
+                )
+                datatypes = childnode.xpath("./type")
+                if len(datatypes) != 0:
+                    datatype = datatypes[0].get("{" + ns["xmi"] + "}idref")
+                    if datatype is None:
+                        pass
+                    elif datatype.startswith("EAID_"):
+                        # Reference to a classifier (Class / Enumeration) in the model
+                        # This is NOT a primitive EA datatype.
+                        # attribute.type_class_id = datatype
+                        attribute.primitive = zetOpLeeg()
+                    else:
+                        # EA primitive datatype (e.g. EAJava_int, EASomeProfile_String, etc.)
+                        attribute.primitive = remove_EADatatype(datatype)
+                logger.debug(
+                    f"Attribute {attribute.name} met id {attribute.id} ingelezen met inhoud: {vars(attribute)}"
+                )
+                schema.save(attribute)
+
+    def process_enumeration(self, node, ns, schema: sch.Schema, parent_package_id):
+        """Reads a uml:Enumeration node including its literals."""
+        enum = db.Enumeratie(
+            id=node.get("{" + ns["xmi"] + "}id"),
+            name=node.get("name"),
+            package_id=parent_package_id,
+        )
+        logger.debug(f"Enumeratie {enum.name} met id {enum.id} ingelezen met inhoud: {enum}")
+        schema.save(enum)
+
+        for childnode in node:
+            sub_tp = childnode.get("{" + ns["xmi"] + "}type")
+            if sub_tp == "uml:EnumerationLiteral":
+                enumliteral = db.EnumerationLiteral(
+                    id=childnode.get("{" + ns["xmi"] + "}id"),
+                    name=childnode.get("name"),
+                    enumeratie_id=enum.id,
+                )
+                logger.debug(
+                    f"EnumerationLiteral {enumliteral.name} met id {enumliteral.id} ingelezen met inhoud:"
+                    f" {vars(enumliteral)}"
+                )
+                schema.save(enumliteral)
+
     def phase2_process_connectors(self, node, ns, schema: sch.Schema):
         """
         second phase of parsing XMI-documents. Parsing and connecting:
@@ -294,47 +407,41 @@ class XMIParser(Parser):
                 attribute.type_class_id = cls.id
             schema.save(attribute)
 
+        # One pass over all type references, shared by enumerations, classes and datatypes below
+        type_references = build_type_reference_index(node, ns)
+
         # Last of all set enumerations
         enums = schema.get_all_enumerations()
         for enum in enums:
-            enumverws = node.xpath(".//type[@xmi:idref='" + enum.id + "']", namespaces=ns)
-            for enumverw in enumverws:
-                property = enumverw.getparent()
-                if property.tag == "ownedAttribute" and property.get("{" + ns["xmi"] + "}type") == "uml:Property":
-                    id = property.get("{" + ns["xmi"] + "}id")
-                    attribute = schema.get_attribute(id)
-                    if attribute is not None:
-                        attribute.enumeration_id = enum.id
-                        attribute.primitive = enum.name
-                        schema.save(attribute)
+            for property in type_references.get(enum.id, []):
+                id = property.get("{" + ns["xmi"] + "}id")
+                attribute = schema.get_attribute(id)
+                if attribute is not None:
+                    attribute.enumeration_id = enum.id
+                    attribute.primitive = enum.name
+                    schema.save(attribute)
 
         # Last of all set object references
         classes = schema.get_all_classes()
         for clazz in classes:
-            classverws = node.xpath(".//type[@xmi:idref='" + clazz.id + "']", namespaces=ns)
-            for classverw in classverws:
-                property = classverw.getparent()
-                if property.tag == "ownedAttribute" and property.get("{" + ns["xmi"] + "}type") == "uml:Property":
-                    id = property.get("{" + ns["xmi"] + "}id")
-                    attribute = schema.get_attribute(id)
-                    if attribute is not None:
-                        attribute.type_class_id = clazz.id
-                        attribute.primitive = clazz.name
-                        schema.save(attribute)
+            for property in type_references.get(clazz.id, []):
+                id = property.get("{" + ns["xmi"] + "}id")
+                attribute = schema.get_attribute(id)
+                if attribute is not None:
+                    attribute.type_class_id = clazz.id
+                    attribute.primitive = clazz.name
+                    schema.save(attribute)
 
         # Last of all set object references
         datatypes = schema.get_all_datatypes()
         for dt in datatypes:
-            dtverws = node.xpath(".//type[@xmi:idref='" + dt.id + "']", namespaces=ns)
-            for dtverw in dtverws:
-                property = dtverw.getparent()
-                if property.tag == "ownedAttribute" and property.get("{" + ns["xmi"] + "}type") == "uml:Property":
-                    id = property.get("{" + ns["xmi"] + "}id")
-                    attribute = schema.get_attribute(id)
-                    if attribute is not None:
-                        attribute.type_class_id = dt.id
-                        attribute.primitive = dt.name
-                        schema.save(attribute)
+            for property in type_references.get(dt.id, []):
+                id = property.get("{" + ns["xmi"] + "}id")
+                attribute = schema.get_attribute(id)
+                if attribute is not None:
+                    attribute.type_class_id = dt.id
+                    attribute.primitive = dt.name
+                    schema.save(attribute)
 
     def phase3_process_extra(self, node, ns, schema: sch.Schema):
         """
@@ -358,6 +465,9 @@ class XMIParser(Parser):
             raise CrunchException("No input file or URL provided for parsing.")
 
         logger.info(f"Parsing from source {source}")
+        if getattr(args, "xmi_streaming", False):
+            self.parse_streaming(source, args, schema)
+            return
         root = load_xmi(source)
 
         ns = root.nsmap
@@ -379,11 +489,167 @@ class XMIParser(Parser):
         else:
             logger.warning("No content was read from XMI-file")
 
+    def parse_streaming(self, source, args, schema: sch.Schema):
+        """
+        Streaming variant of parse for very large XMI files, selected with --xmi_streaming.
+
+        Packages are saved on their start tag, classes and enumerations on their end tag, after which their
+        subtree is released. Only a compact skeleton of properties, association ends and generalizations is
+        kept for phase 2, which runs when the uml:Model element is closed. The (EA) extension is handled per
+        element by the processor returned by create_extension_processor. Peak memory therefore depends on
+        the size of the model, not on the size of the file.
+        """
+        ns = None
+        model_tag = extension_tag = None
+        skeleton = None
+        skeleton_stubs = {}  # type: ignore
+        extension_processor = None
+        model_depth = extension_depth = None
+        model_done = extension_seen = False
+        # One entry per open element: (children_active, package_id, emit, retain)
+        stack = []  # type: ignore
+        retain_depth = 0
+
+        for event, node in iterparse_xmi(source):
+            if event == "start":
+                if ns is None:
+                    ns = dict(node.nsmap)
+                    if "xmi" not in ns.keys():
+                        logger.warning(f'missing namespace "xmi" in file {source}: trying "{const.NS_XMI}"')
+                        ns["xmi"] = const.NS_XMI
+                    if "uml" not in ns.keys():
+                        logger.warning(f'missing namespace "uml" in file {source}: trying "{const.NS_UML}"')
+                        ns["uml"] = const.NS_UML
+                    model_tag = "{" + ns["uml"] + "}Model"
+                    extension_tag = "{" + ns["xmi"] + "}Extension"
+                if node.tag == "nestedClassifier":
+                    self.raise_unsupported_innerclass(node, ns)
+
+                parent_active, package_id = stack[-1][:2] if stack else (False, None)
+                tp = node.get("{" + ns["xmi"] + "}type")
+                children_active, emit, retain = False, False, False
+                if parent_active:
+                    if tp == "uml:Package":
+                        id = node.get("{" + ns["xmi"] + "}id")
+                        name = node.get("name")
+                        if id:
+                            package = db.Package(id=id, name=name, parent_package_id=package_id)
+                            logger.info(f"Package {package.name} ingelezen met id {package.id}")
+                            logger.debug(f"Package {package.name} met inhoud {vars(package)}")
+                            schema.save(package)
+                            children_active, package_id = True, id
+                        else:
+                            logger.debug(f"Package with {name} does not have id value: discarded")
+                    elif tp in ["uml:Class", "uml:DataType", "uml:Enumeration"]:
+                        emit = True
+                    else:
+                        children_active = True
+                elif node.tag == model_tag and tp == "uml:Model" and model_depth is None:
+                    logger.info("Streaming first phase parsing: packages, classes and enumerations")
+                    children_active = True
+                    model_depth = len(stack)
+                    skeleton = etree.Element("skeleton")
+
+                if skeleton is not None:
+                    # Inside the model: keep subtrees that phase 1 or the skeleton still has to read.
+                    retain = emit or node.tag in STREAM_PHASE2_TAGS
+                elif node.tag == extension_tag and not extension_seen:
+                    if not model_done and self.reads_extension:
+                        raise CrunchException(
+                            "Streaming import expects the xmi:Extension after the uml:Model element. Import this"
+                            " file without --xmi_streaming."
+                        )
+                    extension_seen = True
+                    extension_depth = len(stack)
+                elif extension_depth is not None and extension_processor is not None:
+                    retain = node.tag in extension_processor.tags
+                stack.append((children_active, package_id, emit, retain))
+                if retain:
+                    retain_depth += 1
+                continue
+
+            # event == "end": the start of the root element has set the namespaces
+            assert ns is not None
+            children_active, package_id, emit, retain = stack.pop()
+            if retain:
+                retain_depth -= 1
+
+            if skeleton is not None:
+                if emit:
+                    parent_package_id = stack[-1][1]
+                    if node.get("{" + ns["xmi"] + "}type") == "uml:Enumeration":
+                        self.process_enumeration(node, ns, schema, parent_package_id)
+                    else:
+                        self.process_class(node, ns, schema, parent_package_id)
+                if node.tag in STREAM_PHASE2_TAGS:
+                    self._add_to_skeleton(skeleton, skeleton_stubs, node, ns)
+                skeleton_stubs.pop(node, None)
+                if len(stack) == model_depth:
+                    model_done = True
+                    if not args.skip_xmi_relations:
+                        self.phase2_process_connectors(skeleton, ns, schema)
+                    skeleton = None
+                    skeleton_stubs.clear()
+                    extension_processor = self.create_extension_processor(ns, schema)
+            elif extension_depth is not None:
+                if extension_processor is not None and node.tag in extension_processor.tags:
+                    extension_processor.dispatch(node)
+                if len(stack) == extension_depth:
+                    extension_depth = None
+
+            if retain_depth == 0:
+                _release(node)
+
+        if ns is None:
+            logger.warning("No content was read from XMI-file")
+            return
+        if model_depth is None:
+            msg = f"No uml:Model element found in XMI-file {source}."
+            logger.error(msg)
+            raise CrunchException(msg)
+        if extension_processor is not None:
+            if not extension_seen:
+                extension_processor.warn_missing_extension()
+            extension_processor.finish()
+
+    def _add_to_skeleton(self, skeleton, skeleton_stubs, node, ns):
+        """
+        Copies the phase 2 relevant part of node into the skeleton, below a stub of its parent element that
+        carries the parent's tag, xmi:type, xmi:id and name.
+        """
+        parent = node.getparent()
+        if parent is None:
+            return
+        stub = skeleton_stubs.get(parent)
+        if stub is None:
+            attrib = {
+                key: parent.get(key)
+                for key in ("{" + ns["xmi"] + "}type", "{" + ns["xmi"] + "}id", "name")
+                if parent.get(key) is not None
+            }
+            stub = etree.SubElement(skeleton, parent.tag, attrib)
+            skeleton_stubs[parent] = stub
+        copied = etree.SubElement(stub, node.tag, dict(node.attrib))
+        for child in node:
+            if child.tag in STREAM_PHASE2_CHILD_TAGS:
+                copied.append(copy.deepcopy(child))
+
+    def create_extension_processor(self, ns, schema: sch.Schema):
+        """
+        Returns the object that handles the extension elements in streaming mode, or None when the parser does
+        not read extensions. Called once, after phase 2 has completed.
+        """
+        logger.info("Entering third phase parsing: extras")
+        return None
+
     def checkSupport(self, root, ns):
         innerclasses = root.xpath("//nestedClassifier", namespaces=ns)
         if len(innerclasses) > 0:
-            id = innerclasses[0].get("{" + ns["xmi"] + "}id")
-            name = innerclasses[0].get("name")
-            msg = f"Error innerclasses not supported, found innerclass with id {id} and name {name}."
-            logger.error(msg)
-            raise CrunchException(msg)
+            self.raise_unsupported_innerclass(innerclasses[0], ns)
+
+    def raise_unsupported_innerclass(self, innerclass, ns):
+        id = innerclass.get("{" + ns["xmi"] + "}id")
+        name = innerclass.get("name")
+        msg = f"Error innerclasses not supported, found innerclass with id {id} and name {name}."
+        logger.error(msg)
+        raise CrunchException(msg)
@@ -1,5 +1,8 @@
+import hashlib
 import inspect
+import json
 import logging
+import re
 from datetime import datetime
 
 from sqlalchemy import (
@@ -8,6 +11,7 @@ from sqlalchemy import (
     and_,
     bindparam,
     create_engine,
+    event,
     func,
     insert,
     or_,
@@ -32,6 +36,38 @@ from crunch_uml.renderers.renderer import ModelRenderer, RendererRegistry
 
 logger = logging.getLogger()
 
+# Formaat van het change-set-bestand van --ea_plan / --ea_apply
+CHANGESET_FORMAT = 1
+_DML = re.compile(r'^\s*(INSERT\s+INTO|UPDATE|DELETE\s+FROM)\s+["`\[]?(\w+)', re.IGNORECASE)
+
+
+class _SyncBatch:
+    """
+    De doelrijen van één batch uit process_batch, vooraf geladen op GUID met één IN-query, met hun tags.
+    Record-updates worden verzameld en per set gewijzigde kolommen met één executemany geschreven.
+    """
+
+    def __init__(self, table, guids, records):
+        self.table = table
+        self.records = records  # GUID (hoofdletters) -> rij
+        self.pending = {guid.upper() for guid in guids}
+        self.tags = {}  # Object_ID / attribuut-ID -> tagrijen
+        self.updates = {}  # gewijzigde kolommen -> parametersets
+
+    def take(self, guid_value):
+        """De vooraf geladen rij voor een GUID, eenmalig: komt de GUID in de batch nog eens voor, dan wordt hij
+        opnieuw opgezocht."""
+        key = guid_value.upper()
+        if key not in self.pending:
+            return False, None
+        self.pending.discard(key)
+        return True, self.records.get(key)
+
+    def defer_update(self, guid_value, changes):
+        params = {f"_v_{col}": value for col, value in changes.items()}
+        params["_ea_guid"] = guid_value
+        self.updates.setdefault(tuple(sorted(changes)), []).append(params)
+
 
 @RendererRegistry.register(
     "earepo",
@@ -424,6 +460,7 @@ class EARepoUpdater(ModelRenderer):
         tag_strategy=const.TAG_STRATEGY_REPLACE,
         recordtype=None,
         allow_insert=False,
+        batch=None,
     ):
         ea_guid = const.EA_REPO_MAPPER["id"]
         guid_value = None
@@ -449,8 +486,14 @@ class EARepoUpdater(ModelRenderer):
 
             guid_value = util.fromEAGuid(data_dict[ea_guid])
 
-            # Zoek naar het bestaande record op basis van GUID
-            existing_record = session.query(table).filter_by(**{ea_guid: guid_value}).first()
+            # Zoek naar het bestaande record op basis van GUID, bij voorkeur in de vooraf geladen batch
+            preloaded, existing_record = batch.take(guid_value) if batch is not None else (False, None)
+            if not preloaded:
+                if batch is not None:
+                    # GUID komt opnieuw voor in de batch: eerst de uitgestelde updates schrijven
+                    self.flush_batch(batch, session)
+                    batch = None
+                existing_record = session.query(table).filter_by(**{ea_guid: guid_value}).first()
 
             if existing_record:
                 self.update_existing_record(
@@ -463,6 +506,8 @@ class EARepoUpdater(ModelRenderer):
                     tag_table,
                     tag_strategy,
                     recordtype=recordtype,
+                    existing_record=existing_record,
+                    batch=batch,
                 )
             elif allow_insert:
                 logger.debug(f"No record found with GUID {guid_value} in table {table_name}. Inserting new record.")
@@ -486,6 +531,8 @@ class EARepoUpdater(ModelRenderer):
         tag_table=None,
         tag_strategy=const.TAG_STRATEGY_REPLACE,
         recordtype=None,
+        existing_record=None,
+        batch=None,
     ):
         ea_guid = const.EA_REPO_MAPPER["id"]
         logger.debug(f"Updating recordtype '{recordtype}' in table '{table_name}'...")
@@ -493,7 +540,8 @@ class EARepoUpdater(ModelRenderer):
             table = self.get_table_structure(table_name, metadata)
             columns = table.columns.keys()
             guid_value = util.fromEAGuid(data_dict[ea_guid])
-            existing_record = session.query(table).filter_by(**{ea_guid: guid_value}).first()
+            if existing_record is None:
+                existing_record = session.query(table).filter_by(**{ea_guid: guid_value}).first()
 
             # --- Handle non-primitive datatypes for attributes (Enumeration/Class) ---
             # The Excel sheet `attributes` can contain `enumeration_id` and/or `type_class_id` (EA GUIDs like EAID_...).
@@ -564,12 +612,16 @@ class EARepoUpdater(ModelRenderer):
                     # Voor andere recordtypes, gebruik de standaard UMLTags
                     uml_tag_names = []
 
-                # Haal de bestaande tags op uit de database
-                db_tags_query = (
-                    session.query(self.get_table_structure(tag_table, metadata))
-                    .filter_by(**{tag_id_child_column: getattr(existing_record, tag_id_parent_column)})
-                    .all()
-                )
+                # Haal de bestaande tags op uit de batch of anders uit de database
+                tag_owner_id = getattr(existing_record, tag_id_parent_column)
+                if batch is not None:
+                    db_tags_query = batch.tags.get(tag_owner_id, [])
+                else:
+                    db_tags_query = (
+                        session.query(self.get_table_structure(tag_table, metadata))
+                        .filter_by(**{tag_id_child_column: tag_owner_id})
+                        .all()
+                    )
                 db_tags = {getattr(tag, tag_property_column): getattr(tag, tag_value_column) for tag in db_tags_query}
                 db_tags = {util.map_field_name_from_EARepo(k, const.EA_REPO_MAPPER): v for k, v in db_tags.items()}
 
@@ -577,10 +629,22 @@ class EARepoUpdater(ModelRenderer):
                 db_tags_keys = {
                     util.map_field_name_from_EARepo(k, const.EA_REPO_MAPPER): v for k, v in db_tags_keys.items()
                 }
-                # Nog even de veldnaam in de goed stijl zetten
-                for name, guid in db_tags_keys.items():
-                    session.query(self.get_table_structure(tag_table, metadata)).filter_by(ea_guid=guid).update(
-                        {tag_property_column: util.map_field_name_to_EARepo(name)}
+                # Nog even de veldnaam in de goed stijl zetten, alleen waar die afwijkt
+                db_tags_properties = {
+                    getattr(tag, 'ea_guid'): getattr(tag, tag_property_column) for tag in db_tags_query
+                }
+                renames = [
+                    {"_ea_guid": guid, "_property": util.map_field_name_to_EARepo(name)}
+                    for name, guid in db_tags_keys.items()
+                    if db_tags_properties[guid] != util.map_field_name_to_EARepo(name)
+                ]
+                if renames:
+                    tag_table_structure = self.get_table_structure(tag_table, metadata)
+                    session.execute(
+                        update(tag_table_structure)
+                        .where(tag_table_structure.c.ea_guid == bindparam("_ea_guid"))
+                        .values({tag_property_column: bindparam("_property")}),
+                        renames,
                     )
 
                 # Bepaal welke tags zijn gewijzigd
@@ -667,7 +731,9 @@ class EARepoUpdater(ModelRenderer):
                     new_version = self.increment_version(current_version, version_type)
                     changes[const.EA_REPO_MAPPER["version"]] = new_version
 
-                if len(changes) > 0:
+                if len(changes) > 0 and batch is not None:
+                    batch.defer_update(guid_value, changes)
+                elif len(changes) > 0:
                     session.query(table).filter_by(**{ea_guid: guid_value}).update(changes)
                     logger.debug(f"Record with GUID {guid_value} has been updated with version info.")
                 else:
@@ -693,9 +759,12 @@ class EARepoUpdater(ModelRenderer):
         recordtype=None,
         allow_insert=False,
     ):
-        # Verwerk de data in batches
+        # Verwerk de data in batches: doelrijen en tags per batch in één keer laden, updates per batch schrijven
         for i in range(0, len(source_data), batch_size):
             batch = source_data[i : i + batch_size]
+            preloaded = self.preload_batch(
+                batch, target_table_name, target_session, target_metadata, field_mapper, tag_table
+            )
             for record in batch:
                 self.check_and_update_record(
                     record,
@@ -708,7 +777,58 @@ class EARepoUpdater(ModelRenderer):
                     tag_strategy=tag_strategy,
                     recordtype=recordtype,
                     allow_insert=allow_insert,
+                    batch=preloaded,
                 )
+            if preloaded is not None:
+                self.flush_batch(preloaded, target_session)
+
+    def preload_batch(self, batch, table_name, session, metadata, field_mapper=None, tag_table=None):
+        """
+        Laadt de bestaande doelrijen van een batch met één IN-query op ea_guid, en hun tags uit tag_table
+        (t_objectproperties of t_attributetag) met één IN-query op de eigenaar. Geeft None als de tabel
+        ontbreekt; check_and_update_record zoekt dan zelf per record.
+        """
+        ea_guid = const.EA_REPO_MAPPER["id"]
+        table = self.get_table_structure(table_name, metadata)
+        if table is None or ea_guid not in table.columns:
+            return None
+
+        guids = set()
+        for data_dict in batch:
+            if field_mapper:
+                data_dict = self.map_fields(data_dict, field_mapper)
+            if data_dict.get(ea_guid):
+                guids.add(util.fromEAGuid(data_dict[ea_guid]))
+        # EA GUID-kolommen zijn COLLATE NOCASE: de sleutels in hoofdletters
+        records = {}
+        if guids:
+            for row in session.query(table).filter(table.c[ea_guid].in_(guids)).all():
+                records.setdefault(getattr(row, ea_guid).upper(), row)
+        preloaded = _SyncBatch(table, guids, records)
+
+        tag_id_parent_column, tag_id_child_column, _property, _value, _guid = self.get_tablefields(tag_table)
+        tag_table_structure = self.get_table_structure(tag_table, metadata) if tag_id_child_column else None
+        if tag_table_structure is not None and records:
+            owner_ids = {getattr(row, tag_id_parent_column) for row in records.values()}
+            for tag in (
+                session.query(tag_table_structure)
+                .filter(tag_table_structure.c[tag_id_child_column].in_(owner_ids))
+                .all()
+            ):
+                preloaded.tags.setdefault(getattr(tag, tag_id_child_column), []).append(tag)
+        return preloaded
+
+    def flush_batch(self, batch, session):
+        """Schrijft de uitgestelde record-updates van een batch: één executemany per set gewijzigde kolommen."""
+        ea_guid = const.EA_REPO_MAPPER["id"]
+        for columns, params in batch.updates.items():
+            stmt = (
+                update(batch.table)
+                .where(batch.table.c[ea_guid] == bindparam("_ea_guid"))
+                .values({col: bindparam(f"_v_{col}") for col in columns})
+            )
+            session.execute(stmt, params)
+        batch.updates = {}
 
     def deduplicate_tags(
         self, session, metadata, tag_table, tag_id_child_column, tag_property_column, tag_value_column
@@ -1202,7 +1322,112 @@ class EARepoUpdater(ModelRenderer):
 
         logger.info(f"Deleted {len(stale_records)} stale {connector_type} connector(s).")
 
+    # ------------------------------------------------------------------
+    # Change sets (--ea_plan / --ea_apply)
+    # ------------------------------------------------------------------
+    def repository_fingerprint(self, session):
+        """SHA-256 van het repository-bestand (alleen SQLite), om een change set niet op een gewijzigde
+        repository toe te passen. None voor andere databases."""
+        url = session.get_bind().url
+        if url.get_backend_name() != "sqlite" or not url.database or url.database == ":memory:":
+            return None
+        digest = hashlib.sha256()
+        with open(url.database, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return f"sha256:{digest.hexdigest()}"
+
+    def record_changes(self, session):
+        """
+        Registreert elke INSERT, UPDATE en DELETE die via de sessie naar de repository gaat, in volgorde.
+        Opeenvolgende identieke opdrachten worden samengevoegd tot één entry met meerdere parametersets,
+        die bij het toepassen als één executemany wordt uitgevoerd.
+        """
+        statements = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            match = _DML.match(statement)
+            if not match:
+                return
+            rows = list(parameters) if executemany else [parameters]
+            rows = [list(row) if isinstance(row, tuple) else row for row in rows]
+            if statements and statements[-1]["sql"] == statement:
+                statements[-1]["params"].extend(rows)
+            else:
+                kind = match.group(1).split()[0].lower()
+                statements.append({"table": match.group(2), "kind": kind, "sql": statement, "params": rows})
+
+        event.listen(session.get_bind(), "before_cursor_execute", _record)
+        return statements
+
+    def write_changeset(self, changeset_file, repository, fingerprint, statements):
+        summary = {}
+        for entry in statements:
+            counts = summary.setdefault(entry["table"], {})
+            counts[entry["kind"]] = counts.get(entry["kind"], 0) + len(entry["params"])
+        changeset = {
+            "format": CHANGESET_FORMAT,
+            "repository": repository,
+            "fingerprint": fingerprint,
+            "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "summary": summary,
+            "statements": statements,
+        }
+        with open(changeset_file, "w", encoding="utf-8") as f:
+            json.dump(changeset, f, default=str, indent=1)
+        for table, counts in sorted(summary.items()):
+            logger.info(f"Change set {table}: " + ", ".join(f"{n} {kind}" for kind, n in sorted(counts.items())))
+        logger.info(
+            f"Change set met {sum(len(entry['params']) for entry in statements)} wijzigingen in "
+            f"{len(statements)} opdrachten geschreven naar {changeset_file}; repository {repository} is niet gewijzigd."
+        )
+
+    def apply_changeset(self, changeset_file, database_url):
+        """Past een change set van --ea_plan toe op de repository, in één transactie."""
+        try:
+            with open(changeset_file, encoding="utf-8") as f:
+                changeset = json.load(f)
+        except (OSError, ValueError) as e:
+            msg = f"Change set {changeset_file} kan niet gelezen worden: {e}"
+            logger.error(msg)
+            raise CrunchException(msg)
+        if changeset.get("format") != CHANGESET_FORMAT:
+            msg = f"Change set {changeset_file} heeft onbekend formaat {changeset.get('format')}."
+            logger.error(msg)
+            raise CrunchException(msg)
+
+        session, _metadata = self.get_database_session(database_url)
+        fingerprint = self.repository_fingerprint(session)
+        if changeset.get("fingerprint") and fingerprint != changeset["fingerprint"]:
+            msg = (
+                f"Repository {database_url} is gewijzigd sinds change set {changeset_file} werd gemaakt; "
+                "maak een nieuwe change set met --ea_plan."
+            )
+            logger.error(msg)
+            raise CrunchException(msg)
+
+        logger.info(f"Applying change set {changeset_file} to EA Repository {database_url}...")
+        try:
+            connection = session.connection()
+            for entry in changeset["statements"]:
+                params = [tuple(row) if isinstance(row, list) else row for row in entry["params"]]
+                connection.exec_driver_sql(entry["sql"], params if len(params) > 1 else params[0])
+            session.commit()
+        except Exception as e:
+            msg = f"Rolling back changes.... Error while applying change set {changeset_file} with message: {e}."
+            logger.error(msg)
+            session.rollback()
+            raise CrunchException(msg)
+        logger.info(
+            f"Change set met {sum(len(entry['params']) for entry in changeset['statements'])} wijzigingen "
+            f"toegepast op {database_url}."
+        )
+
     def render(self, args, schema: sch.Schema):
+        changeset_file = getattr(args, "ea_apply", None)
+        if changeset_file:
+            self.apply_changeset(changeset_file, args.outputfile)
+            return
 
         # Check to see if a list of Package ids is provided
         # if self.enforce_output_package_ids and args.output_package_ids is None:
@@ -1211,6 +1436,11 @@ class EARepoUpdater(ModelRenderer):
         #    raise CrunchException(msg)
         target_session, target_metadata = self.get_database_session(args.outputfile)
         if target_session and target_metadata:
+            plan_file = getattr(args, "ea_plan", None)
+            if plan_file:
+                # Planmodus: alles doorrekenen en registreren, daarna terugdraaien
+                fingerprint = self.repository_fingerprint(target_session)
+                statements = self.record_changes(target_session)
             version_type = args.version_type
             tag_strategy = args.tag_strategy
             allow_insert = getattr(args, "ea_allow_insert", False)
@@ -1414,6 +1644,10 @@ class EARepoUpdater(ModelRenderer):
                     self.delete_stale_objects(enum_guids, target_session, target_metadata, "Enumeration")
                     self.delete_stale_packages(package_guids, target_session, target_metadata)
 
+                if plan_file:
+                    target_session.rollback()
+                    self.write_changeset(plan_file, args.outputfile, fingerprint, statements)
+                    return
                 logger.info(f"All data updated in repo {args.outputfile}, commiting...")
                 target_session.commit()
             except Exception as e:
@@ -1501,6 +1735,8 @@ class EAMIMRepoUpdater(EARepoUpdater):
         tag_table=None,
         tag_strategy=const.TAG_STRATEGY_REPLACE,
         recordtype=None,
+        existing_record=None,
+        batch=None,
         profiel="MIM",
     ):
         if recordtype == const.RECORDTYPE_CLASS:
@@ -1597,7 +1833,9 @@ class EAMIMRepoUpdater(EARepoUpdater):
             # Skip values that point to a datatype
             datatype_input = data_dict.get("Type", None).lower().strip() if data_dict.get("Type", None) else None
             table = metadata.tables["t_attribute"]
-            record = session.query(table).filter_by(ea_guid=util.fromEAGuid(data_dict.get("ea_guid"))).first()
+            record = existing_record
+            if record is None:
+                record = session.query(table).filter_by(ea_guid=util.fromEAGuid(data_dict.get("ea_guid"))).first()
 
             if datatype_input is not None and (
                 record.Classifier is None or record.Classifier == 0 or record.Classifier == "0"
@@ -1736,6 +1974,8 @@ class EAMIMRepoUpdater(EARepoUpdater):
             tag_table,
             tag_strategy,
             recordtype=recordtype,
+            existing_record=existing_record,
+            batch=batch,
         )
         # Speciaal voor Enumeratiewaarde: Style updaten en Type op None zetten in t_attribute
         if recordtype == const.RECORDTYPE_LITERAL:
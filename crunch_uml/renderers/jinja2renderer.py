@@ -1,9 +1,11 @@
 import html
 import json
 import logging
+import multiprocessing
 import os
 import re
 import warnings
+from concurrent.futures import ProcessPoolExecutor
 
 import inflection
 import validators
@@ -316,6 +318,35 @@ def fix_and_format_text(text: str, mode: str = "markdown", depth: int = 1) -> st
         raise ValueError("Unsupported mode. Use 'markdown', 'alert' or 'table'.")
 
 
+# State of a worker process of a parallel render, set up once by _init_render_worker.
+_render_worker: dict = {}
+
+
+def _init_render_worker(renderer_class, args, db_url, schema_id, template, templatedir):
+    """
+    Sets up a worker process of Jinja2Renderer.renderModels: its own read-only session on the database and the
+    template compiled once, with the filters and model methods of the renderer.
+    """
+    database = db.Database(db_url, db_profile=const.DB_PROFILE_READONLY)
+    # The worker only reads the model, so the package scope lasts as long as the worker (see Schema.package_scope)
+    database.session.info[db.PACKAGE_SCOPE_KEY] = db.PackageScope(database.session)
+    renderer = renderer_class()
+    renderer.addModelMethods()
+    _render_worker.update(
+        args=args,
+        schema=sch.Schema(database, schema_name=schema_id),
+        template=renderer.getEnvironment(templatedir).get_template(template),
+    )
+
+
+def _render_package(package_id, outputfilename):
+    package = _render_worker["schema"].get_package(package_id)
+    output = _render_worker["template"].render(package=package, args=_render_worker["args"])
+    with open(outputfilename, "w") as file:
+        file.write(output)
+    return outputfilename
+
+
 @RendererRegistry.register(
     "jinja2",
     descr="Renderer that uses Jinja2 to renders one file per model in the database, "
@@ -443,22 +474,84 @@ class Jinja2Renderer(ModelRenderer):
             "\n".join(["> " + line for line in s.splitlines()]) if isinstance(s, str) else s
         )
 
+    def addModelMethods(self):
+        """Adds the methods the templates of this renderer call on the model classes, see SQLARenderer."""
+
+    def removeModelMethods(self):
+        """Removes the methods added by addModelMethods."""
+
+    def getEnvironment(self, templatedir):
+        env = Environment(loader=FileSystemLoader(templatedir))
+        self.addFilters(env)
+        return env
+
     def getFilename(self, inputfilename, extension, uml_generic):
         return f"{inputfilename}_{uml_generic.name}{extension}"
 
-    def render(self, args, schema: sch.Schema):
-        # setup output filename
-        filename, extension = os.path.splitext(args.outputfile)
+    def getWorkerContext(self):
+        """
+        Workers are started from a fresh process, so they share no database connections or threads with this one.
+        The forkserver imports the renderer once and forks every worker from it; where there is no forkserver
+        (Windows) every worker is spawned and imports it itself.
+        """
+        if "forkserver" not in multiprocessing.get_all_start_methods():
+            return multiprocessing.get_context("spawn")
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([type(self).__module__])
+        return context
 
-        # get template and templatedir
+    def renderModels(self, args, schema: sch.Schema, models, extension=None):
+        """
+        Renders every model package to its own file and returns the names of the files written. With --jobs > 1 the
+        packages are divided over a pool of processes; each worker opens its own read-only session on the database
+        and compiles the template once.
+        """
+        filename, output_extension = os.path.splitext(args.outputfile)
+        extension = output_extension if extension is None else extension
         template, templatedir = self.getTemplateAndDir(args)
+        outputfilenames = [
+            (
+                self.getFilename(filename, extension, package)
+                if package.name is not None
+                else f"{filename}_{index}{extension}"
+            )
+            for index, package in enumerate(models)
+        ]
 
-        # sourcery skip: raise-specific-error
-        # Settup environment for rendering using Jinja2
-        file_loader = FileSystemLoader(templatedir)
-        env = Environment(loader=file_loader)
-        self.addFilters(env)
+        processes = min(getattr(args, "jobs", None) or 1, len(models))
+        url = schema.database.engine.url
+        if processes > 1 and url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+            logger.warning("An in-memory database cannot be shared with worker processes, rendering in one process.")
+            processes = 1
+        if processes > 1:
+            logger.info(f"Rendering {len(models)} packages with {processes} processes")
+            with ProcessPoolExecutor(
+                max_workers=processes,
+                mp_context=self.getWorkerContext(),
+                initializer=_init_render_worker,
+                initargs=(
+                    type(self),
+                    args,
+                    url.render_as_string(hide_password=False),
+                    schema.schema_id,
+                    template,
+                    templatedir,
+                ),
+            ) as pool:
+                # Packages with the same file name would overwrite each other in turn: as in one process, the last
+                # one is written
+                last = {outputfilename: package.id for package, outputfilename in zip(models, outputfilenames)}
+                list(pool.map(_render_package, last.values(), last.keys()))
+            return outputfilenames
+
+        template_obj = self.getEnvironment(templatedir).get_template(template)
+        for package, outputfilename in zip(models, outputfilenames):
+            output = template_obj.render(package=package, args=args)
+            with open(outputfilename, "w") as file:
+                file.write(output)
+        return outputfilenames
 
+    def render(self, args, schema: sch.Schema):
         # Check to see if a list of Package ids is provided
         # if self.enforce_output_package_ids and args.output_package_ids is None:
         #    msg = "Usage of parameter --output_package_ids is enforced for this renderer. Not provided, exiting."
@@ -473,18 +566,7 @@ class Jinja2Renderer(ModelRenderer):
             raise CrunchException(msg)
 
         # Render all packages that are named
-        for index, package in enumerate(models):
-            # Render output
-            template = env.get_template(template)
-            output = template.render(package=package, args=args)
-
-            outputfilename = (
-                self.getFilename(filename, extension, package)
-                if package.name is not None
-                else f"{filename}_{index}{extension}"
-            )
-            with open(outputfilename, "w") as file:
-                file.write(output)
+        self.renderModels(args, schema, models)
 
 
 @RendererRegistry.register(
@@ -655,28 +737,13 @@ class PlainHTMLRenderer(Jinja2Renderer):
         """
         Render the model packages into simple HTML files.
         """
-        filename, extension = os.path.splitext(args.outputfile)
-        template, templatedir = self.getTemplateAndDir(args)
-
-        file_loader = FileSystemLoader(templatedir)
-        env = Environment(loader=file_loader)
-        self.addFilters(env)
-
         models = self.getModels(args, schema)
         if not models:
             msg = "No packages found to render for PlainHTMLRenderer"
             logger.error(msg)
             raise CrunchException(msg)
 
-        for index, package in enumerate(models):
-            template_obj = env.get_template(template)
-            output = template_obj.render(package=package, args=args)
-
-            outputfilename = (
-                self.getFilename(filename, ".html", package) if package.name is not None else f"{filename}_{index}.html"
-            )
-            with open(outputfilename, "w") as file:
-                file.write(output)
+        for outputfilename in self.renderModels(args, schema, models, ".html"):
             logger.info(f"Plain HTML documentation generated: {outputfilename}")
 
 
@@ -737,28 +804,13 @@ class ERDiagramRenderer(Jinja2Renderer):
         Render ER diagrams in DOT format for each model package.
         The output can then be processed with Graphviz tools to produce images.
         """
-        filename, extension = os.path.splitext(args.outputfile)
-        template, templatedir = self.getTemplateAndDir(args)
-
-        file_loader = FileSystemLoader(templatedir)
-        env = Environment(loader=file_loader)
-        self.addFilters(env)
-
         models = self.getModels(args, schema)
         if not models:
             msg = "No packages found to render for ERDiagramRenderer"
             logger.error(msg)
             raise CrunchException(msg)
 
-        for index, package in enumerate(models):
-            template_obj = env.get_template(template)
-            output = template_obj.render(package=package, args=args)
-
-            outputfilename = (
-                self.getFilename(filename, ".dot", package) if package.name is not None else f"{filename}_{index}.dot"
-            )
-            with open(outputfilename, "w") as file:
-                file.write(output)
+        for outputfilename in self.renderModels(args, schema, models, ".dot"):
             logger.info(f"ER diagram DOT file generated: {outputfilename}")
 
 
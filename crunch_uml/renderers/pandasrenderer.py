@@ -1,50 +1,70 @@
+import functools
 import itertools
 import json
 import logging
 import os
+import threading
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Set
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 import pandas as pd
 import sqlalchemy
 from sqlalchemy.ext.hybrid import hybrid_property
 
 import crunch_uml.schema as sch
-from crunch_uml import const, db, lang, util
+from crunch_uml import const, db, lang, translation_memory, util
 from crunch_uml.renderers.renderer import Renderer, RendererRegistry
 
 logger = logging.getLogger()
 
+_MISSING = object()
 
-def object_as_dict(obj, session):
+
+@functools.lru_cache(maxsize=None)
+def export_attributes(model):
     """
-    Converteert een SQLAlchemy-modelobject naar een dictionary, inclusief hybride attributen en kolommen.
-    :param obj: Het SQLAlchemy-object.
-    :return: Dictionary met alle kolom- en hybride attributen.
+    Namen van de kolom- en hybride attributen die object_as_dict van een model exporteert, in de volgorde van dir().
+    Wordt eenmalig per model bepaald.
     """
-    # Haal kolom-attributen op
-    col_attrs = {attr.key for attr in sqlalchemy.inspect(obj).mapper.column_attrs}
+    mapper = sqlalchemy.inspect(model)
+    col_attrs = {attr.key for attr in mapper.column_attrs}
     hyb_attrs = {
-        attr
-        for attr in dir(obj.__class__)
-        if hasattr(getattr(obj.__class__, attr), 'descriptor')
-        and isinstance(getattr(obj.__class__, attr).descriptor, hybrid_property)
+        key for key, descriptor in mapper.all_orm_descriptors.items() if isinstance(descriptor, hybrid_property)
     }
-    attrs = col_attrs | hyb_attrs
+    return tuple(sorted(col_attrs | hyb_attrs))
 
-    dict_obj = {key: getattr(obj, key) for key in dir(obj) if key in attrs and hasattr(obj, key)}
+
+def object_as_dict(obj, session, domains=None, export_time=None):
+    """
+    Converteert een SQLAlchemy-modelobject naar een dictionary, inclusief hybride attributen en kolommen.
+    :param obj: Het SQLAlchemy-object.
+    :param domains: Domeinnamen per package-id (zie Schema.get_package_domains); zonder wordt het package per object opgevraagd.
+    :param export_time: Tijdstip van de export; zonder wordt het huidige tijdstip gebruikt.
+    :return: Dictionary met alle kolom- en hybride attributen.
+    """
+    attrs = export_attributes(obj.__class__)
+    dict_obj = {}
+    for key in attrs:
+        value = getattr(obj, key, _MISSING)
+        if value is not _MISSING:
+            dict_obj[key] = value
 
     # Dirty hack, but only way: set package domain name to domain_iv3
     if const.COLUMN_DOMEIN_IV3 in attrs and (isinstance(obj, db.Class) or isinstance(obj, db.Enumeratie)):
-        package = (
-            session.query(db.Package)
-            .filter(db.Package.id == obj.package_id, db.Package.schema_id == obj.schema_id)
-            .one_or_none()
-        )
-        dict_obj[const.COLUMN_DOMEIN_IV3] = package.domain_name if package is not None else obj.domein_iv3
+        if domains is None:
+            package = (
+                session.query(db.Package)
+                .filter(db.Package.id == obj.package_id, db.Package.schema_id == obj.schema_id)
+                .one_or_none()
+            )
+            dict_obj[const.COLUMN_DOMEIN_IV3] = package.domain_name if package is not None else obj.domein_iv3
+        elif obj.package_id in domains:
+            dict_obj[const.COLUMN_DOMEIN_IV3] = domains[obj.package_id]
+        else:
+            dict_obj[const.COLUMN_DOMEIN_IV3] = obj.domein_iv3
     dict_obj[const.COLUMN_DOMEIN_GGM_UML_TYPE] = obj.__class__.__name__
-    dict_obj[const.COLUMN_DOMEIN_DATUM_TIJD_EXPORT] = util.current_time_export()
+    dict_obj[const.COLUMN_DOMEIN_DATUM_TIJD_EXPORT] = export_time or util.current_time_export()
 
     return dict_obj
 
@@ -67,6 +87,8 @@ class JSONRenderer(Renderer):
         # Define the list of column names to include in the output
         # If this list is empty, all columns will be included
         included_columns = self.get_included_columns(args)
+        domains = schema.get_package_domains()
+        export_time = util.current_time_export()
 
         for table_name, table in models.items():
             # Model class associated with the table
@@ -77,7 +99,7 @@ class JSONRenderer(Renderer):
                 continue
 
             records = session.query(model).filter(model.schema_id == schema.schema_id).all()
-            data = [object_as_dict(record, session) for record in records]
+            data = [object_as_dict(record, session, domains, export_time) for record in records]
 
             # Filter columns based on included_columns, unless included_columns is empty
             filtered_data = []
@@ -137,6 +159,37 @@ class JSONRenderer(Renderer):
             json.dump(all_data, json_file, default=str, indent=4, sort_keys=True)
 
 
+class _PipelineSetup:
+    """Het werk dat de pipeline-backend deelt tussen de doeltalen van één export: de brontaal, de contextkaart uit
+    het schema en de preflight (modellen en termbanken, geladen voor alle talen samen). De preflight draait pas
+    wanneer een taal hem nodig heeft, en dan één keer."""
+
+    def __init__(self, from_language, to_languages, schema):
+        from crunch_uml.translation.context import build_context_map
+
+        # The pipeline needs a concrete source language (termbank lookup and
+        # prompts): 'auto' falls back to the model's default language.
+        self.from_language = from_language if from_language and from_language != "auto" else const.DEFAULT_LANGUAGE
+        if self.from_language != from_language:
+            logger.info(
+                f"Brontaal 'auto' wordt door de pijplijn niet ondersteund; brontaal '{self.from_language}' aangenomen."
+            )
+        # Alleen de talen van deze run laden: dat houdt grote termbanken
+        # (volledige IATE-export) geheugen-begrensd.
+        self.languages = {self.from_language, *to_languages}
+        self.context_map = build_context_map(schema) if schema is not None else {}
+        self._preflight = None
+        self._lock = threading.Lock()
+
+    def preflight(self):
+        from crunch_uml.translation.preflight import run_preflight
+
+        with self._lock:
+            if self._preflight is None:
+                self._preflight = run_preflight(languages=self.languages)
+        return self._preflight
+
+
 @RendererRegistry.register(
     "i18n",
     descr=(
@@ -170,7 +223,16 @@ class I18nRenderer(JSONRenderer):
             existing_index[section] = sec_idx
         return existing_index
 
-    def translate_data(self, data, to_language, from_language="auto", update_i18n=True, original_i18n={}, schema=None):
+    def translate_data(
+        self,
+        data,
+        to_language,
+        from_language="auto",
+        update_i18n=True,
+        original_i18n={},
+        schema=None,
+        setup: Optional[_PipelineSetup] = None,
+    ):
         """Translate every string field of ``data`` into ``to_language``.
 
         Backend selection via ``CRUNCH_UML_TRANSLATE_BACKEND``: the value
@@ -193,6 +255,9 @@ class I18nRenderer(JSONRenderer):
         Behaviour-preserving: when ``update_i18n=True`` and a previous
         translation for a (section, key, field) exists in ``original_i18n``,
         that value is reused unchanged, just like the old code.
+
+        ``setup`` is the pipeline work shared with the other languages of the
+        same export (see :meth:`translate_languages`).
         """
         logger.info(
             f"Starting Translating data to language '{to_language}'. This may take a while:"
@@ -201,7 +266,9 @@ class I18nRenderer(JSONRenderer):
 
         backend = os.environ.get("CRUNCH_UML_TRANSLATE_BACKEND", "translators").lower()
         if backend == "pipeline":
-            return self._translate_data_pipeline(data, to_language, from_language, update_i18n, original_i18n, schema)
+            if setup is None:
+                setup = _PipelineSetup(from_language, [to_language], schema)
+            return self._translate_data_pipeline(data, to_language, update_i18n, original_i18n, setup)
 
         existing_index = self._index_existing_i18n(original_i18n, to_language)
 
@@ -280,6 +347,10 @@ class I18nRenderer(JSONRenderer):
                 results = list(pool.map(_do_translate, unique_list))
             translations = dict(zip(unique_list, results))
 
+            memory = translation_memory.get_translation_memory()
+            if memory is not None:
+                memory.log_stats()
+
         # Pass 3 — rebuild the output structure, preserving the exact shape
         # and ordering of the original implementation (one entry per input
         # entry, keyed by the entry's last key).
@@ -308,7 +379,36 @@ class I18nRenderer(JSONRenderer):
         logger.info(f"Finished translating data to language '{to_language}'.")
         return translated_data
 
-    def _translate_data_pipeline(self, data, to_language, from_language, update_i18n, original_i18n, schema):
+    def translate_languages(
+        self, data, to_languages, from_language="auto", update_i18n=True, original_i18n={}, schema=None
+    ) -> Dict[str, Any]:
+        """Translate ``data`` into every language of ``to_languages``: language -> translated data.
+
+        The work all languages share happens once: the caller reads the data once, and with the ``pipeline``
+        backend the context map, the preflight and the termbank load are shared too. The translation passes of the
+        languages then run concurrently, each with its own worker pool and, with the pipeline, its own concurrency
+        controllers per model.
+        """
+        backend = os.environ.get("CRUNCH_UML_TRANSLATE_BACKEND", "translators").lower()
+        setup = _PipelineSetup(from_language, to_languages, schema) if backend == "pipeline" else None
+        if len(to_languages) == 1:
+            return {
+                to_languages[0]: self.translate_data(
+                    data, to_languages[0], from_language, update_i18n, original_i18n, schema, setup
+                )
+            }
+
+        logger.info(f"Vertalen naar {len(to_languages)} talen tegelijk: {', '.join(to_languages)}.")
+        with ThreadPoolExecutor(max_workers=len(to_languages), thread_name_prefix="i18n") as executor:
+            futures = {
+                to_language: executor.submit(
+                    self.translate_data, data, to_language, from_language, update_i18n, original_i18n, schema, setup
+                )
+                for to_language in to_languages
+            }
+            return {to_language: future.result() for to_language, future in futures.items()}
+
+    def _translate_data_pipeline(self, data, to_language, update_i18n, original_i18n, setup: _PipelineSetup):
         """Element-based translation via the layered pipeline (backend
         ``pipeline``, see :mod:`crunch_uml.translation`).
 
@@ -318,23 +418,16 @@ class I18nRenderer(JSONRenderer):
         Elements are enriched with model/package/class context from the
         schema before translation.
         """
-        from crunch_uml.translation.context import build_context_map
         from crunch_uml.translation.llm import Element
         from crunch_uml.translation.pipeline import TranslationPipeline
-        from crunch_uml.translation.preflight import run_preflight
-
-        # The pipeline needs a concrete source language (termbank lookup and
-        # prompts): 'auto' falls back to the model's default language.
-        from_lang = from_language if from_language and from_language != "auto" else const.DEFAULT_LANGUAGE
-        if from_lang != from_language:
-            logger.info(f"Brontaal 'auto' wordt door de pijplijn niet ondersteund; brontaal '{from_lang}' aangenomen.")
 
+        from_lang = setup.from_language
         existing_index = self._index_existing_i18n(original_i18n, to_language) if update_i18n else {}
 
         def _existing(section: str, key: str, field: str):
             return existing_index.get(section, {}).get(key, {}).get(field)
 
-        context_map = build_context_map(schema) if schema is not None else {}
+        context_map = setup.context_map
 
         elements = []
         for section, entries in data.items():
@@ -357,9 +450,8 @@ class I18nRenderer(JSONRenderer):
         results: Dict[Any, Dict[str, str]] = {}
         if elements:
             logger.info(f"Vertaalpijplijn: {len(elements)} elementen met ontbrekende vertalingen...")
-            # Alleen de taal-paren van deze run laden: dat houdt grote
-            # termbanken (volledige IATE-export) geheugen-begrensd.
-            pipeline = TranslationPipeline(run_preflight(languages={from_lang, to_language}))
+            # Eigen pipeline per taal: eigen gelijktijdigheidsregeling per model.
+            pipeline = TranslationPipeline(setup.preflight())
             results = pipeline.translate_elements(elements, to_language, from_lang)
 
         # Rebuild the output structure, preserving the exact shape and
@@ -404,20 +496,26 @@ class I18nRenderer(JSONRenderer):
             if not isinstance(i18n_data, dict):
                 raise ValueError(f"The file {args.outputfile} does not contain a valid i18n structure.")
 
-        # Retrieve all data
+        # One or more target languages, comma-separated (en,de,fr)
+        languages = list(dict.fromkeys(code.strip() for code in args.language.split(",") if code.strip()))
+
+        # Retrieve all data, once for every language
         all_data = self.get_all_data(args, schema, empty_values=False)
         if args.translate:
-            all_data = self.translate_data(
+            translated = self.translate_languages(
                 all_data,
-                args.language,
+                languages,
                 from_language=args.from_language,
                 update_i18n=getattr(args, "update_i18n", True),
                 original_i18n=i18n_data,
                 schema=schema,
             )
+        else:
+            translated = {language: all_data for language in languages}
 
-        # Update the i18n data with the new language entry
-        i18n_data[args.language] = all_data
+        # Update the i18n data with the new language entries
+        for language in languages:
+            i18n_data[language] = translated[language]
 
         # Map fields
         i18n_data = self.rename_keys(i18n_data, json.loads(args.mapper))
@@ -444,6 +542,8 @@ class CSVRenderer(Renderer):
         models = base.metadata.tables
         session = schema.get_session()
         entity_name = args.entity_name
+        domains = schema.get_package_domains()
+        export_time = util.current_time_export()
 
         for table_name, table in models.items():
             # Model class associated with the table
@@ -457,7 +557,7 @@ class CSVRenderer(Renderer):
 
             # Retrieve data
             records = session.query(model).filter(model.schema_id == schema.schema_id).all()
-            df = pd.DataFrame([object_as_dict(record, session) for record in records])
+            df = pd.DataFrame([object_as_dict(record, session, domains, export_time) for record in records])
 
             # Map columns
             mapper = json.loads(args.mapper)
@@ -955,10 +1055,78 @@ def _clean_name(v: Any) -> str:
     return s
 
 
+class _DiffRow:
+    """Lightweight stand-in for an ORM entity in the schema diff.
+
+    Holds only the compared columns, read with a plain SELECT, and the
+    relations the diff follows (``package``, ``parent_package``, ``clazz``, …)
+    linked by id within the same schema. Stable keys are memoized on the row,
+    so every parent-package chain is walked once per entity instead of once
+    per lookup. ``_content`` holds the raw values of the compared fields that
+    are not references: two rows with equal content only differ, if at all,
+    in where their references point.
+    """
+
+    # The link columns and relations the diff reads (only those of the
+    # row's table are set); the compared fields are read with getattr.
+    id: Any
+    is_datatype: Any
+    parent_package_id: Any
+    package_id: Any
+    clazz_id: Any
+    enumeratie_id: Any
+    src_class_id: Any
+    dst_class_id: Any
+    subclass_id: Any
+    superclass_id: Any
+    parent_package: Optional["_DiffRow"]
+    package: Optional["_DiffRow"]
+    clazz: Optional["_DiffRow"]
+    enumeratie: Optional["_DiffRow"]
+    src_class: Optional["_DiffRow"]
+    dst_class: Optional["_DiffRow"]
+    subclass: Optional["_DiffRow"]
+    superclass: Optional["_DiffRow"]
+
+    def __init__(self, values: Dict[str, Any], content: tuple = ()):
+        self.__dict__.update(values)
+        self._stable_keys: Dict[str, str] = {}
+        self._content = content
+
+
+# Columns the diff follows between entities, read besides the compared fields.
+_DIFF_LINK_COLUMNS = [
+    "id",
+    "is_datatype",
+    "parent_package_id",
+    "package_id",
+    "clazz_id",
+    "enumeratie_id",
+    "src_class_id",
+    "dst_class_id",
+    "subclass_id",
+    "superclass_id",
+]
+
+
+def _load_diff_rows(schema: sch.Schema, model: Any, fields: List[str]) -> List[_DiffRow]:
+    """All entities of ``model`` in ``schema`` as _DiffRow, from one plain SELECT of the needed columns."""
+    table = model.__table__
+    names = [name for name in dict.fromkeys(_DIFF_LINK_COLUMNS + fields) if name in table.c]
+    content = [i for i, name in enumerate(names) if name in fields and not name.endswith("_id")]
+    stmt = sqlalchemy.select(*(table.c[name] for name in names)).where(table.c.schema_id == schema.schema_id)
+    return [
+        _DiffRow(dict(zip(names, row)), tuple(row[i] for i in content)) for row in schema.database.session.execute(stmt)
+    ]
+
+
 def _qualified_pkg_path(pkg: Any, max_depth: int = 32) -> str:
     """Walk parent_package chain and return 'Top/Sub/Leaf'."""
     if pkg is None:
         return ""
+    cache = getattr(pkg, "_stable_keys", None)
+    if cache is not None and "package" in cache:
+        return cache["package"]
     parts: List[str] = []
     seen: Set[int] = set()
     node = pkg
@@ -968,13 +1136,26 @@ def _qualified_pkg_path(pkg: Any, max_depth: int = 32) -> str:
         seen.add(id(node))
         parts.append(_clean_name(getattr(node, "name", None)))
         node = getattr(node, "parent_package", None)
-    return "/".join(reversed(parts))
+    path = "/".join(reversed(parts))
+    if cache is not None:
+        cache["package"] = path
+    return path
 
 
 def _stable_key(obj: Any, kind: str) -> str:
     """Build a name-based key that survives ea_guid regeneration."""
     if obj is None:
         return ""
+    cache = getattr(obj, "_stable_keys", None)
+    if cache is None:
+        return _build_stable_key(obj, kind)
+    key = cache.get(kind)
+    if key is None:
+        key = cache[kind] = _build_stable_key(obj, kind)
+    return key
+
+
+def _build_stable_key(obj: Any, kind: str) -> str:
     if kind == "package":
         return _qualified_pkg_path(obj)
     if kind in ("class", "enum"):
@@ -1084,10 +1265,84 @@ class SchemaDiffMarkdownRenderer(Renderer):
             raise ValueError("diff_md requires --compare_schema_name <schema_id/schema_name>.")
         return sch.Schema(schema.database, schema_name=other_name)
 
+    def _load_entities(self, schema: sch.Schema) -> Dict[str, List[Any]]:
+        """All entities of one schema as _DiffRow, with their relations linked by id.
+
+        ``classes`` holds the classes without the datatypes, like
+        ``Schema.get_all_classes``; datatypes are still loaded, as the parent of
+        their attributes and the target of type references.
+        """
+        entities, by_id = self._load_containers(schema)
+        for name in ("attrs", "literals", "assocs", "gens"):
+            entities[name] = self._load_members(schema, name, by_id)
+        return entities
+
+    def _load_containers(self, schema: sch.Schema) -> Tuple[Dict[str, List[Any]], Dict[str, Dict[Any, Any]]]:
+        """The packages, classes and enumerations of one schema, linked to
+        their packages, plus their id indexes for :meth:`_load_members`."""
+        packages = _load_diff_rows(schema, db.Package, _PACKAGE_FIELDS)
+        all_classes = _load_diff_rows(schema, db.Class, _CLASS_FIELDS)
+        enums = _load_diff_rows(schema, db.Enumeratie, _ENUM_FIELDS)
+
+        packages_by_id = {p.id: p for p in packages}
+        for p in packages:
+            p.parent_package = packages_by_id.get(p.parent_package_id)
+        for e in itertools.chain(all_classes, enums):
+            e.package = packages_by_id.get(e.package_id)
+
+        entities = {
+            "packages": packages,
+            "classes": [c for c in all_classes if c.is_datatype is False],
+            "enums": enums,
+        }
+        return entities, {"classes": {c.id: c for c in all_classes}, "enums": {e.id: e for e in enums}}
+
+    def _load_members(self, schema: sch.Schema, entities: str, by_id: Dict[str, Dict[Any, Any]]) -> List[Any]:
+        """The ``attrs``, ``literals``, ``assocs`` or ``gens`` of one schema,
+        linked to the classes and enumerations of :meth:`_load_containers`."""
+        classes_by_id = by_id["classes"]
+        if entities == "attrs":
+            attrs = _load_diff_rows(schema, db.Attribute, _ATTR_FIELDS)
+            for a in attrs:
+                a.clazz = classes_by_id.get(a.clazz_id)
+            return attrs
+        if entities == "literals":
+            literals = _load_diff_rows(schema, db.EnumerationLiteral, ["name"])
+            for lit in literals:
+                lit.enumeratie = by_id["enums"].get(lit.enumeratie_id)
+            return literals
+        if entities == "assocs":
+            try:
+                assocs = _load_diff_rows(schema, db.Association, _ASSOC_FIELDS)
+            except Exception:
+                return []
+            for a in assocs:
+                a.src_class = classes_by_id.get(a.src_class_id)
+                a.dst_class = classes_by_id.get(a.dst_class_id)
+            return assocs
+        try:
+            gens = _load_diff_rows(schema, db.Generalization, _GEN_FIELDS)
+        except Exception:
+            return []
+        for g in gens:
+            g.subclass = classes_by_id.get(g.subclass_id)
+            g.superclass = classes_by_id.get(g.superclass_id)
+        return gens
+
     # ------------------------------------------------------------------
     # FK resolution
     # ------------------------------------------------------------------
 
+    def _diff_context(self, a_side: Dict[str, List[Any]], b_side: Dict[str, List[Any]]) -> Dict[str, Any]:
+        """The id indexes of both sides that ``_resolve_target`` looks up."""
+        ctx: Dict[str, Any] = {}
+        for name, entities in (("packages_by_id", "packages"), ("classes_by_id", "classes"), ("enums_by_id", "enums")):
+            ctx[name] = {
+                side: {str(e.id): e for e in entities_of[entities] if getattr(e, "id", None)}
+                for side, entities_of in (("a", a_side), ("b", b_side))
+            }
+        return ctx
+
     def _resolve_target(
         self,
         field: str,
@@ -1123,6 +1378,9 @@ class SchemaDiffMarkdownRenderer(Renderer):
             return self._resolve_target(field, raw, side_a, ctx)
         return str(_norm(raw))
 
+    def _content_signature(self, obj: Any, fields: List[str], side_a: bool, ctx: Dict[str, Any]) -> tuple:
+        return tuple(self._value_for_diff(f, _safe_get(obj, f), side_a=side_a, ctx=ctx) for f in fields)
+
     def _diff_entity_fields(
         self,
         a: Any,
@@ -1130,11 +1388,21 @@ class SchemaDiffMarkdownRenderer(Renderer):
         fields: List[str],
         ctx: Dict[str, Any],
     ) -> List[Dict[str, str]]:
-        """Compare field-by-field. Returns list of {field, label, old, new}."""
+        """Compare field-by-field. Returns list of {field, label, old, new}.
+
+        The comparable values of both entities are computed once as a content
+        signature; an unchanged pair is done after one tuple comparison. Diff
+        rows with the same raw content only need their references resolved.
+        """
+        a_content = getattr(a, "_content", None)
+        if a_content and a_content == getattr(b, "_content", None):
+            fields = [f for f in fields if f.endswith("_id")]
+        a_signature = self._content_signature(a, fields, side_a=True, ctx=ctx)
+        b_signature = self._content_signature(b, fields, side_a=False, ctx=ctx)
+        if a_signature == b_signature:
+            return []
         out: List[Dict[str, str]] = []
-        for f in fields:
-            av = self._value_for_diff(f, _safe_get(a, f), side_a=True, ctx=ctx)
-            bv = self._value_for_diff(f, _safe_get(b, f), side_a=False, ctx=ctx)
+        for f, av, bv in zip(fields, a_signature, b_signature):
             if av != bv:
                 out.append(
                     {
@@ -1184,42 +1452,18 @@ class SchemaDiffMarkdownRenderer(Renderer):
         title = getattr(args, "compare_title", None) or f"Changes from {a_name} to {b_name}"
 
         # Load entities. NB: A = old (compare schema), B = new (current schema).
-        a_pkgs = list(other.get_all_packages())
-        b_pkgs = list(schema.get_all_packages())
-        a_classes = list(other.get_all_classes())  # includes datatypes
-        b_classes = list(schema.get_all_classes())
-        a_enums = list(other.get_all_enumerations())
-        b_enums = list(schema.get_all_enumerations())
-        a_attrs = list(other.get_all_attributes())
-        b_attrs = list(schema.get_all_attributes())
-        a_literals = list(other.get_all_literals())
-        b_literals = list(schema.get_all_literals())
-        try:
-            a_assocs = list(other.get_all_associations())
-            b_assocs = list(schema.get_all_associations())
-        except Exception:
-            a_assocs, b_assocs = [], []
-        try:
-            a_gens = list(other.get_all_generalizations())
-            b_gens = list(schema.get_all_generalizations())
-        except Exception:
-            a_gens, b_gens = [], []
+        a_side = self._load_entities(other)
+        b_side = self._load_entities(schema)
+        a_pkgs, b_pkgs = a_side["packages"], b_side["packages"]
+        a_classes, b_classes = a_side["classes"], b_side["classes"]
+        a_enums, b_enums = a_side["enums"], b_side["enums"]
+        a_attrs, b_attrs = a_side["attrs"], b_side["attrs"]
+        a_literals, b_literals = a_side["literals"], b_side["literals"]
+        a_assocs, b_assocs = a_side["assocs"], b_side["assocs"]
+        a_gens, b_gens = a_side["gens"], b_side["gens"]
 
         # Indexes used by FK resolution.
-        ctx: Dict[str, Any] = {
-            "packages_by_id": {
-                "a": {str(p.id): p for p in a_pkgs if getattr(p, "id", None)},
-                "b": {str(p.id): p for p in b_pkgs if getattr(p, "id", None)},
-            },
-            "classes_by_id": {
-                "a": {str(c.id): c for c in a_classes if getattr(c, "id", None)},
-                "b": {str(c.id): c for c in b_classes if getattr(c, "id", None)},
-            },
-            "enums_by_id": {
-                "a": {str(e.id): e for e in a_enums if getattr(e, "id", None)},
-                "b": {str(e.id): e for e in b_enums if getattr(e, "id", None)},
-            },
-        }
+        ctx = self._diff_context(a_side, b_side)
 
         # Match by id, then by qualified key.
         m_pkg = _match_by_key_or_id(a_pkgs, b_pkgs, "package")
@@ -1269,29 +1513,35 @@ class SchemaDiffMarkdownRenderer(Renderer):
         # Literals are diffed by name within each enum (using the matched pairs).
         lit_changes: Dict[str, Dict[str, List[str]]] = {}  # enum_stable_key -> {added, removed}
 
-        def _names_for_enum(lits: Iterable[Any], enum: Any) -> Set[str]:
-            eid = str(getattr(enum, "id", "") or "")
-            return {
-                str(getattr(lol, "name", "") or "").strip()
-                for lol in lits
-                if str(getattr(lol, "enumeratie_id", "") or "") == eid and getattr(lol, "name", None)
-            }
+        def _literal_names(lits: Iterable[Any]) -> Dict[str, Set[str]]:
+            names: Dict[str, Set[str]] = {}
+            for lol in lits:
+                if getattr(lol, "name", None):
+                    eid = str(getattr(lol, "enumeratie_id", "") or "")
+                    names.setdefault(eid, set()).add(str(getattr(lol, "name", "") or "").strip())
+            return names
+
+        a_literal_names = _literal_names(a_literals)
+        b_literal_names = _literal_names(b_literals)
+
+        def _names_for_enum(names_by_enum: Dict[str, Set[str]], enum: Any) -> Set[str]:
+            return names_by_enum.get(str(getattr(enum, "id", "") or ""), set())
 
         for a, b in m_enum["pairs"]:
-            a_names = _names_for_enum(a_literals, a)
-            b_names = _names_for_enum(b_literals, b)
+            a_names = _names_for_enum(a_literal_names, a)
+            b_names = _names_for_enum(b_literal_names, b)
             added = sorted(b_names - a_names)
             removed = sorted(a_names - b_names)
             if added or removed:
                 lit_changes[_stable_key(b, "enum")] = {"added": added, "removed": removed}
         # Literals for newly added enumerations: everything counts as added.
         for e in m_enum["added"]:
-            names = sorted(_names_for_enum(b_literals, e))
+            names = sorted(_names_for_enum(b_literal_names, e))
             if names:
                 lit_changes[_stable_key(e, "enum")] = {"added": names, "removed": []}
         # Literals for removed enumerations: everything counts as removed.
         for e in m_enum["removed"]:
-            names = sorted(_names_for_enum(a_literals, e))
+            names = sorted(_names_for_enum(a_literal_names, e))
             if names:
                 lit_changes[_stable_key(e, "enum")] = {"added": [], "removed": names}
 
@@ -1736,6 +1986,17 @@ class SchemaDiffMarkdownRenderer(Renderer):
                 continue
             orphan_class_keys.setdefault(k, cls)
 
+        orphans_added_by_key: Dict[str, List[Any]] = {}
+        orphans_removed_by_key: Dict[str, List[Any]] = {}
+        orphans_changed_by_key: Dict[str, List[Any]] = {}
+        for orphans, by_key in (
+            (attrs_added_orphans, orphans_added_by_key),
+            (attrs_removed_orphans, orphans_removed_by_key),
+            (attrs_changed_orphans, orphans_changed_by_key),
+        ):
+            for a in orphans:
+                by_key.setdefault(_parent_key(a), []).append(a)
+
         has_section_content = bool(added or removed or changed or orphan_class_keys)
         if not has_section_content:
             return
@@ -1782,9 +2043,9 @@ class SchemaDiffMarkdownRenderer(Renderer):
             self._emit_attrs_for_class(
                 lines,
                 cls,
-                [a for a in attrs_added_orphans if _stable_key(getattr(a, "clazz", None), stable_key_kind) == k],
-                [a for a in attrs_removed_orphans if _stable_key(getattr(a, "clazz", None), stable_key_kind) == k],
-                [a for a in attrs_changed_orphans if _stable_key(getattr(a, "clazz", None), stable_key_kind) == k],
+                orphans_added_by_key.get(k, []),
+                orphans_removed_by_key.get(k, []),
+                orphans_changed_by_key.get(k, []),
                 attr_changes_by_key,
             )
 
@@ -1909,3 +2170,133 @@ class SchemaDiffMarkdownRenderer(Renderer):
         for it in sorted(changed, key=lambda x: title_fn(x).lower()):
             _emit(it, "Changed")
         lines.append("")
+
+
+_DIFF_JSONL_FORMAT = 1
+
+# Entity kinds of the change feed: (key in _load_entities, stable-key kind,
+# compared fields, getter of the owning package).
+_DIFF_JSONL_KINDS = [
+    ("packages", "package", _PACKAGE_FIELDS, lambda r, obj: getattr(obj, "parent_package", None)),
+    ("classes", "class", _CLASS_FIELDS, SchemaDiffMarkdownRenderer._pkg_of_class),
+    ("enums", "enum", _ENUM_FIELDS, SchemaDiffMarkdownRenderer._pkg_of_enum),
+    ("attrs", "attribute", _ATTR_FIELDS, SchemaDiffMarkdownRenderer._pkg_of_attr),
+    ("assocs", "association", _ASSOC_FIELDS, SchemaDiffMarkdownRenderer._pkg_of_assoc),
+    ("gens", "generalization", _GEN_FIELDS, SchemaDiffMarkdownRenderer._pkg_of_gen),
+]
+
+
+@RendererRegistry.register(
+    "diff_jsonl",
+    descr="Schema diff as a JSON Lines change feed: one record per added/removed entity or changed field.",
+)
+class SchemaDiffJSONLRenderer(SchemaDiffMarkdownRenderer):
+    """Machine-readable diff between two schemas, as a change feed.
+
+    Entities are matched and compared exactly like ``diff_md``. Instead of
+    collecting every change for a report, each change is written as soon as it
+    is found: one JSON object per line for every added or removed entity and
+    literal, and one per changed field of a matched entity. The first line is
+    a header with the format version and both schemas. The packages, classes
+    and enumerations of both schemas are loaded first, as references resolve
+    to them; the attributes, literals, associations and generalizations are
+    then read one kind at a time, old and new, and released before the next
+    kind. Memory is thus bounded by those containers plus the largest kind,
+    not by the whole model.
+
+    Records carry ``entity``, ``change`` (``added``, ``removed`` or
+    ``changed``), the stable ``key``, the ``id`` in the new schema (the old one
+    for removals), the qualified ``package`` path and the ``name``; field
+    changes add ``field``, ``label``, ``old``, ``new`` and ``structural``.
+    """
+
+    def render(self, args, schema: sch.Schema):
+        other = self._get_other_schema(schema, args)
+        header = {
+            "format": _DIFF_JSONL_FORMAT,
+            "old": getattr(other, "schema_id", None) or "old",
+            "new": getattr(schema, "schema_id", None) or "new",
+        }
+        count = 0
+        with open(args.outputfile, "w", encoding="utf-8") as f:
+            f.write(json.dumps(header, ensure_ascii=False, default=str) + "\n")
+            for record in self.iter_changes(other, schema):
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                count += 1
+        logger.info(f"{count} wijzigingen van {header['old']} naar {header['new']} geschreven naar {args.outputfile}")
+
+    def iter_changes(self, old: sch.Schema, new: sch.Schema) -> Iterable[Dict[str, Any]]:
+        """Yield the change records from schema ``old`` to schema ``new``."""
+        (a_side, a_by_id), (b_side, b_by_id) = self._load_containers(old), self._load_containers(new)
+        ctx = self._diff_context(a_side, b_side)
+
+        def rows(entities: str) -> Tuple[List[Any], List[Any]]:
+            if entities in a_side:
+                return a_side[entities], b_side[entities]
+            return self._load_members(old, entities, a_by_id), self._load_members(new, entities, b_by_id)
+
+        for entities, kind, fields, pkg_of in _DIFF_JSONL_KINDS:
+            # The rows live only in the frame of _kind_records, which is
+            # gone before the next kind is read.
+            yield from self._kind_records(*rows(entities), kind, fields, pkg_of, ctx, rows)
+
+    def _kind_records(
+        self, a_rows: List[Any], b_rows: List[Any], kind: str, fields: List[str], pkg_of, ctx: Dict[str, Any], rows
+    ) -> Iterable[Dict[str, Any]]:
+        matched = _match_by_key_or_id(a_rows, b_rows, kind)
+        for obj in matched["removed"]:
+            yield self._entity_record(obj, kind, "removed", pkg_of)
+        for obj in matched["added"]:
+            yield self._entity_record(obj, kind, "added", pkg_of)
+        for a, b in matched["pairs"]:
+            changes = self._diff_entity_fields(a, b, fields, ctx)
+            if changes:
+                base = self._entity_record(b, kind, "changed", pkg_of)
+                for c in changes:
+                    yield {**base, **c, "structural": c["field"] in _STRUCTURAL_FIELDS}
+        if kind == "enum":
+            yield from self._literal_records(matched, *rows("literals"))
+
+    def _entity_record(self, obj: Any, kind: str, change: str, pkg_of) -> Dict[str, Any]:
+        return {
+            "entity": kind,
+            "change": change,
+            "key": _stable_key(obj, kind),
+            "id": getattr(obj, "id", None),
+            "package": _qualified_pkg_path(pkg_of(self, obj)),
+            "name": getattr(obj, "name", None),
+        }
+
+    def _literal_records(self, matched: Dict[str, Any], a_literals, b_literals) -> Iterable[Dict[str, Any]]:
+        """Literals are compared by name within each enumeration, as in ``diff_md``."""
+        a_names: Dict[str, Set[str]] = {}
+        b_names: Dict[str, Set[str]] = {}
+        for names, lits in ((a_names, a_literals), (b_names, b_literals)):
+            for lit in lits:
+                if getattr(lit, "name", None):
+                    eid = str(getattr(lit, "enumeratie_id", "") or "")
+                    names.setdefault(eid, set()).add(str(lit.name).strip())
+
+        def _records(enum: Any, change: str, names: Iterable[str]):
+            enum_key = _stable_key(enum, "enum")
+            package = _qualified_pkg_path(self._pkg_of_enum(enum))
+            for name in sorted(names):
+                yield {
+                    "entity": "literal",
+                    "change": change,
+                    "key": f"{enum_key}={name}",
+                    "id": None,
+                    "package": package,
+                    "name": name,
+                }
+
+        def _names(names_by_enum: Dict[str, Set[str]], enum: Any) -> Set[str]:
+            return names_by_enum.get(str(getattr(enum, "id", "") or ""), set())
+
+        for e in matched["removed"]:
+            yield from _records(e, "removed", _names(a_names, e))
+        for e in matched["added"]:
+            yield from _records(e, "added", _names(b_names, e))
+        for a, b in matched["pairs"]:
+            yield from _records(b, "removed", _names(a_names, a) - _names(b_names, b))
+            yield from _records(b, "added", _names(b_names, b) - _names(a_names, a))
@@ -132,13 +132,34 @@ def add_args(argumentparser, subparser_dict):
             "are permanently deleted from the EA repository. Use with caution."
         ),
     )
+    output_subparser.add_argument(
+        "--ea_plan",
+        type=str,
+        default=None,
+        help=(
+            "Used only for Enterprise Architect Repository Updater! "
+            "Computes all changes without writing to the EA repository and saves them as a change set "
+            "(JSON: per-table inserts, updates and deletes, tags included) in the given file."
+        ),
+    )
+    output_subparser.add_argument(
+        "--ea_apply",
+        type=str,
+        default=None,
+        help=(
+            "Used only for Enterprise Architect Repository Updater! "
+            "Applies a change set made with --ea_plan to the EA repository in a single transaction. "
+            "Refused when the repository changed since the change set was made."
+        ),
+    )
     output_subparser.add_argument(
         "-lan",
         "--language",
         type=str,
         default=const.DEFAULT_LANGUAGE,
-        help="Used only for i18n renderer. Defines the language of the output file."
-        + f" Default is {const.DEFAULT_LANGUAGE}.",
+        help="Used only for i18n renderer. Defines the language of the output file; a comma-separated list"
+        + " (e.g. en,de,fr) exports and translates several languages in one run, sharing the schema read and"
+        + f" translation setup. Default is {const.DEFAULT_LANGUAGE}.",
     )
     output_subparser.add_argument(
         "-frlan",
@@ -260,6 +281,34 @@ def add_args(argumentparser, subparser_dict):
             "net; {from}/{to} placeholders allowed. Overrides CRUNCH_UML_NMT_MODEL."
         ),
     )
+    output_subparser.add_argument(
+        "--nmt_batch_size",
+        type=int,
+        default=None,
+        help=(
+            "i18n renderer (pipeline backend): texts per NMT batch; texts are grouped by token length "
+            "and a batch never exceeds CRUNCH_UML_NMT_MAX_BATCH_TOKENS padded tokens. Default 16. "
+            "Overrides CRUNCH_UML_NMT_BATCH_SIZE."
+        ),
+    )
+    output_subparser.add_argument(
+        "--nmt_device",
+        type=str,
+        default=None,
+        help=(
+            "i18n renderer (pipeline backend): torch device for the NMT model, e.g. 'cpu' (default), "
+            "'cuda:0' or 'mps'. Overrides CRUNCH_UML_NMT_DEVICE."
+        ),
+    )
+    output_subparser.add_argument(
+        "--nmt_threads",
+        type=int,
+        default=None,
+        help=(
+            "i18n renderer (pipeline backend): CPU threads for the NMT model; 0 keeps the torch "
+            "default. Overrides CRUNCH_UML_NMT_THREADS."
+        ),
+    )
     output_subparser.add_argument(
         "--translate_allow_online",
         action="store_true",
@@ -270,6 +319,27 @@ def add_args(argumentparser, subparser_dict):
             "CRUNCH_UML_TRANSLATE_ALLOW_ONLINE=1."
         ),
     )
+    output_subparser.add_argument(
+        "--ollama_async",
+        action="store_true",
+        default=False,
+        help=(
+            "i18n renderer (pipeline backend): run the LLM passes on an asyncio client with pooled "
+            "keep-alive connections instead of one thread and connection per element. Equivalent to "
+            "CRUNCH_UML_OLLAMA_ASYNC=1."
+        ),
+    )
+    output_subparser.add_argument(
+        "--llm_batch_size",
+        type=int,
+        default=None,
+        help=(
+            "i18n renderer (pipeline backend): translate up to this many name-only attributes or "
+            "enumeration literals of the same owner in one LLM call; elements whose part of the "
+            "response does not validate are retried on their own. Default 1 (no batching). "
+            "Overrides CRUNCH_UML_LLM_BATCH_SIZE."
+        ),
+    )
     output_subparser.add_argument(
         "--ollama_model",
         type=str,
@@ -306,6 +376,26 @@ def add_args(argumentparser, subparser_dict):
             "Overrides CRUNCH_UML_TRANSLATE_WORKERS."
         ),
     )
+    output_subparser.add_argument(
+        "--translation_memory",
+        type=str,
+        default=None,
+        help=(
+            "i18n renderer ('translators' and 'ollama' backends): path of an SQLite file that remembers "
+            "translations across exports; strings found there are not sent to the backend again. "
+            "Overrides CRUNCH_UML_TRANSLATION_MEMORY."
+        ),
+    )
+    output_subparser.add_argument(
+        "--translation_memory_max_entries",
+        type=int,
+        default=None,
+        help=(
+            "i18n renderer: maximum number of entries in the translation memory, the least recently "
+            "used entries are evicted beyond it. Default 100000, 0 is unbounded. Overrides "
+            "CRUNCH_UML_TRANSLATION_MEMORY_MAX_ENTRIES."
+        ),
+    )
     output_subparser.add_argument(
         "--translate_context",
         action="store_true",
@@ -316,6 +406,16 @@ def add_args(argumentparser, subparser_dict):
         ),
     )
 
+    output_subparser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help=(
+            "jinja2, ggm_md, plain_html, er_diagram and sqla renderers: number of processes that render the model "
+            "packages in parallel, each with its own read-only session on the database. Default 1."
+        ),
+    )
+
     # Set the epilog help text
     entries = RendererRegistry.entries()
     items = [f'"{item}": {RendererRegistry.getDescription(item)}' for item in entries]
@@ -154,8 +154,7 @@ class SQLARenderer(Jinja2Renderer):
         models = super().getModels(args, schema)
         return [model for model in models if model.modelnaam_kort is not None]
 
-    def render(self, args, schema: sch.Schema):
-        # place to set up custom code
+    def addModelMethods(self):
         db.UML_Generic.getSQLAName = nameSnakeCase  # No error!
         db.Package.getPackageLst = getPackageLst
         db.Package.getPackageImports = getPackageImports
@@ -168,8 +167,7 @@ class SQLARenderer(Jinja2Renderer):
         db.EnumerationLiteral.getSQLAName = namePascalCase
         db.Association.getSQLAKoppelName = koppeltabelname
 
-        super().render(args, schema)
-
+    def removeModelMethods(self):
         del db.UML_Generic.getSQLAName  # No error!
         del db.Package.getPackageLst
         del db.Package.getPackageImports
@@ -181,3 +179,11 @@ class SQLARenderer(Jinja2Renderer):
         del db.Enumeratie.getSQLAAttrName
         del db.EnumerationLiteral.getSQLAName
         del db.Association.getSQLAKoppelName
+
+    def render(self, args, schema: sch.Schema):
+        # place to set up custom code
+        self.addModelMethods()
+        try:
+            super().render(args, schema)
+        finally:
+            self.removeModelMethods()
@@ -2,6 +2,7 @@ import json
 import logging
 
 from openpyxl import Workbook
+from sqlalchemy import select
 
 import crunch_uml.schema as sch
 from crunch_uml import const, db, util
@@ -17,8 +18,8 @@ logger = logging.getLogger()
 class XLSXRenderer(Renderer):
     def render(self, args, schema: sch.Schema):
         # sourcery skip: use-named-expression
-        wb = Workbook()
-        wb.remove(wb.active)  # type: ignore # Remove default sheet
+        # Write-only workbook: rows are streamed to a temporary file per sheet instead of kept in memory
+        wb = Workbook(write_only=True)
 
         # Retrieve all models dynamically
         base = db.Base
@@ -31,6 +32,9 @@ class XLSXRenderer(Renderer):
         # Bepaal welke kolommen moeten worden opgenomen in de uitvoer
         included_columns = self.get_included_columns(args)
 
+        # Domeinnaam per package, eenmalig opgehaald voor de kolom domein_iv3 van klassen en enumeraties
+        domains = schema.get_package_domains()
+
         for table_name, table in models.items():
             ws = wb.create_sheet(title=table_name)
 
@@ -48,27 +52,27 @@ class XLSXRenderer(Renderer):
             mapped_columns = util.sort_by_reference(mapped_columns, included_columns)
 
             # Schrijf de gemapte kolomnamen in de header
-            for col_num, mapped_column in enumerate(mapped_columns, 1):
-                ws.cell(row=1, column=col_num, value=mapped_column)
+            ws.append(mapped_columns)
 
             # Model class associated with the table
             model = base.model_lookup_by_table_name(table_name)
 
             if model:  # Ensure there's an associated model class
-                # Data
-                for row_num, record in enumerate(
-                    session.query(model).filter(model.schema_id == schema.schema_id).all(),
-                    2,
-                ):
-                    for col_num, column in enumerate(columns, 1):
-                        # Pas de mapper toe op de waarde als nodig
-                        if column == const.COLUMN_DOMEIN_IV3 and (
-                            isinstance(model, db.Class) or isinstance(model, db.Enumeratie)
-                        ):
-                            package = session.query(db.Package).filter(db.Package.id == record.package_id).one_or_none()
-                            value = package.domain_name if package is not None else None
-                        else:
-                            value = getattr(record, column)
-                        ws.cell(row=row_num, column=col_num, value=value)
+                # Data, in batches van plain rows zodat het geheugengebruik niet met het model meegroeit
+                domain_column = (
+                    columns.index(const.COLUMN_DOMEIN_IV3)
+                    if issubclass(model, (db.Class, db.Enumeratie)) and const.COLUMN_DOMEIN_IV3 in columns
+                    else None
+                )
+                rows = session.execute(
+                    select(*(table.c[column] for column in columns))
+                    .where(table.c.schema_id == schema.schema_id)
+                    .execution_options(yield_per=const.EXPORT_YIELD_PER)
+                )
+                for row in rows:
+                    values = list(row)
+                    if domain_column is not None and row.package_id in domains:
+                        values[domain_column] = domains[row.package_id]
+                    ws.append(values)
 
         wb.save(args.outputfile)
@@ -1,11 +1,54 @@
+import functools
+import hashlib
+import json
 import logging
+from contextlib import contextmanager
+
+from sqlalchemy import (
+    bindparam,
+    case,
+    create_engine,
+    delete,
+    event,
+    func,
+    insert,
+    inspect,
+    literal,
+    literal_column,
+    null,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import MANYTOMANY, MANYTOONE, ONETOMANY, sessionmaker
 
 import crunch_uml.const as const
 import crunch_uml.db as db
+import crunch_uml.util as util
 from crunch_uml.exceptions import CrunchException
 
 logger = logging.getLogger()
 
+# Order in which the bulk writer inserts its buffered rows, so that referenced rows are written first.
+BULK_INSERT_ORDER = (
+    db.Package,
+    db.Class,
+    db.Enumeratie,
+    db.Attribute,
+    db.EnumerationLiteral,
+    db.Association,
+    db.Generalization,
+    db.Diagram,
+    db.DiagramClass,
+    db.DiagramEnumeration,
+    db.DiagramAssociation,
+    db.DiagramGeneralization,
+)
+# Dialects with an INSERT .. ON CONFLICT DO UPDATE, needed to keep the merge semantics of Schema.save
+BULK_INSERT_DIALECTS = {"sqlite": sqlite_insert, "postgresql": postgresql_insert}
+
 
 def add_args(argumentparser, subparser_dict):
     # argumentparser.add_argument(
@@ -23,6 +66,495 @@ def add_args(argumentparser, subparser_dict):
     )
 
 
+class BulkWriter:
+    """
+    Write path for imports that buffers new objects per table and inserts them with chunked executemany
+    statements, instead of letting the ORM unit-of-work flush them object by object.
+
+    Only transient objects of the tables in BULK_INSERT_ORDER are buffered; their column values are read when the
+    buffer is written, so changes made after Schema.save are included. Rows that already exist are updated with
+    the columns that were set, like Session.merge does. The buffer is written before every query that reads one of the
+    buffered tables, so parsers keep reading their own writes.
+    """
+
+    def __init__(self, schema, chunk_size=const.BULK_INSERT_CHUNK_SIZE):
+        self.schema = schema
+        self.session = schema.database.session
+        self.chunk_size = chunk_size
+        self.insert = BULK_INSERT_DIALECTS[self.session.get_bind().dialect.name]
+        self.buffers = {model.__table__: {} for model in BULK_INSERT_ORDER}  # type: ignore
+        self.writing = False
+        self.rows_written = 0
+
+    def buffer(self, obj):
+        """Buffers obj when it is a new object of a bulk table, returns False if it has to go through the ORM."""
+        buffer = self.buffers.get(getattr(obj, "__table__", None))
+        if buffer is None:
+            return False
+        state = inspect(obj)
+        if not state.transient:
+            return False
+        key = state.mapper.identity_key_from_instance(obj)
+        if None in key[1] or key in self.session.identity_map:
+            return False
+        buffer.setdefault(key, []).append(obj)
+        return True
+
+    def _before_execute(self, orm_execute_state):
+        if self.writing:
+            return
+        if orm_execute_state.is_select and orm_execute_state.all_mappers:
+            tables = set().union(*(read_tables(mapper) for mapper in orm_execute_state.all_mappers))
+            if not any(self.buffers.get(table) for table in tables):
+                return
+        self.write()
+
+    def write(self):
+        """Writes all buffered rows, table by table in BULK_INSERT_ORDER."""
+        if not any(self.buffers.values()):
+            return
+        self.writing = True
+        try:
+            # Pending ORM changes were made before the buffered objects were saved
+            self.session.flush()
+            rows = {table: [] for table in self.buffers}  # type: ignore
+            for buffer in self.buffers.values():
+                for objects in buffer.values():
+                    self._collect(objects, rows)
+                buffer.clear()
+            for table, table_rows in rows.items():
+                self.insert_rows(table, table_rows)
+        finally:
+            self.writing = False
+
+    def _collect(self, objects, rows):
+        """Combines the objects saved under one primary key into one row, plus the rows of their members."""
+        row = {}
+        for obj in objects:
+            row.update(self._values(obj))
+            mapper = inspect(obj).mapper
+            for relation in mapper.relationships:
+                members = inspect(obj).dict.get(relation.key)
+                if not members or relation.viewonly:
+                    continue
+                if relation.direction is MANYTOMANY:
+                    raise CrunchException(
+                        f"Bulk insert cannot write relation {mapper.class_.__name__}.{relation.key}; import without"
+                        " --bulk_insert."
+                    )
+                if relation.direction is ONETOMANY and relation.mapper.local_table in rows:
+                    for member in members:
+                        if not inspect(member).transient:
+                            continue
+                        member_row = self._values(member)
+                        for local, remote in relation.local_remote_pairs:
+                            member_row.setdefault(remote.name, row.get(local.name))
+                        rows[relation.mapper.local_table].append(member_row)
+        rows[objects[0].__table__].append(row)
+
+    def _values(self, obj):
+        """Column values that were set on obj, completed with foreign keys of referenced objects."""
+        state = inspect(obj)
+        values = {
+            prop.columns[0].name: state.dict[prop.key] for prop in state.mapper.column_attrs if prop.key in state.dict
+        }
+        for relation in state.mapper.relationships:
+            target = state.dict.get(relation.key)
+            if relation.direction is MANYTOONE and target is not None:
+                target_state = inspect(target)
+                for local, remote in relation.local_remote_pairs:
+                    if local.name not in values:
+                        prop = target_state.mapper.get_property_by_column(remote)
+                        values[local.name] = target_state.dict.get(prop.key)
+        return values
+
+    def insert_rows(self, table, rows):
+        """Inserts rows into table; rows that already exist are updated with the columns of the row."""
+        if not rows:
+            return
+        primary_key = [column.name for column in table.primary_key.columns]
+        # A member can be buffered itself and through its parent, one statement may touch a row only once
+        merged = {}  # type: ignore
+        for row in rows:
+            merged.setdefault(tuple(row.get(column) for column in primary_key), {}).update(row)
+        rows = list(merged.values())
+        if table is db.Package.__table__:
+            rows = sort_parents_first(rows, "id", "parent_package_id")
+        # executemany needs the same columns in every row of a statement
+        groups = {}  # type: ignore
+        for row in rows:
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+        for columns, group in groups.items():
+            stmt = self.insert(table)
+            updates = {column: stmt.excluded[column] for column in columns if column not in primary_key}
+            if updates:
+                stmt = stmt.on_conflict_do_update(index_elements=primary_key, set_=updates)
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=primary_key)
+            for start in range(0, len(group), self.chunk_size):
+                self.session.execute(stmt, group[start : start + self.chunk_size])
+        self.rows_written += len(rows)
+        logger.debug(f"Bulk insert wrote {len(rows)} rows into table {table.name}")
+
+    def start(self):
+        event.listen(self.session, "do_orm_execute", self._before_execute)
+
+    def stop(self):
+        event.remove(self.session, "do_orm_execute", self._before_execute)
+
+
+class StagingDatabase:
+    """
+    Private in-memory SQLite database with the crunch_uml tables. An incremental import parses into it, so the
+    target database is only written with the differences.
+    """
+
+    def __init__(self):
+        self.engine = create_engine("sqlite://")
+        db.Base.metadata.create_all(bind=self.engine)
+        self.session = sessionmaker(bind=self.engine)()
+
+    def save(self, obj):
+        return self.session.merge(obj)
+
+    def add(self, obj):
+        return self.session.add(obj)
+
+    def close(self):
+        self.session.close()
+        self.engine.dispose()
+
+
+class IncrementalImport:
+    """
+    Import that only writes the rows of a schema whose content changed.
+
+    The parser fills a staging schema with the same name in a StagingDatabase. Every staged row gets a content hash
+    over all its columns, which is compared with the fingerprint stored for that row by the previous incremental
+    import. New rows are inserted, rows with another hash are updated, and fingerprinted rows that are no longer
+    in the import are deleted; unchanged rows are not touched. Rows of the schema without a fingerprint (written
+    by other imports) are updated when they are imported and otherwise left alone.
+    """
+
+    def __init__(self, schema, chunk_size=const.BULK_INSERT_CHUNK_SIZE):
+        self.schema = schema
+        self.database = schema.database
+        self.chunk_size = chunk_size
+        self.staging_database = StagingDatabase()
+        self.staging = Schema(self.staging_database, schema_name=schema.schema_id)
+        self.counts = {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+
+    def apply(self):
+        """Writes the differences between the staging schema and the stored schema, returns the counts."""
+        self.staging_database.session.flush()
+        session = self.database.session
+        session.flush()
+        connection = session.connection()
+        deletions = []
+        for model in BULK_INSERT_ORDER:
+            deletions.append(self._apply_table(connection, model.__table__))
+        # Rows that refer to deleted rows go first
+        for table, keys in reversed(deletions):
+            self._execute(connection, self._delete_statement(table), keys)
+            self.counts["deleted"] += len(keys)
+        # The ORM session may hold the previous state of the written rows
+        session.expire_all()
+        return self.counts
+
+    def _apply_table(self, connection, table):
+        key_columns = [column.name for column in table.primary_key.columns if column.name != "schema_id"]
+        content_columns = [column.name for column in table.columns if column.name != "schema_id"]
+        stored_keys = {
+            json.dumps(list(row))
+            for row in connection.execute(
+                select(*(table.c[column] for column in key_columns)).where(table.c.schema_id == self.schema.schema_id)
+            )
+        }
+        fingerprints = self.database.get_fingerprints(self.schema.schema_id, table.name)
+
+        inserts, updates, written, staged = [], [], {}, set()
+        for row in self.staging_database.session.execute(select(table)).mappings():
+            key = json.dumps([row[column] for column in key_columns])
+            staged.add(key)
+            content_hash = hashlib.sha1(repr([row[column] for column in content_columns]).encode("utf-8")).hexdigest()
+            if key not in stored_keys:
+                inserts.append(dict(row))
+            elif fingerprints.get(key) != content_hash:
+                updates.append({f"b_{column}": value for column, value in row.items()})
+            else:
+                self.counts["unchanged"] += 1
+                continue
+            written[key] = content_hash
+
+        if table is db.Package.__table__:
+            inserts = sort_parents_first(inserts, "id", "parent_package_id")
+        self._execute(connection, insert(table), inserts)
+        self._execute(connection, self._update_statement(table, content_columns), updates)
+        self.counts["inserted"] += len(inserts)
+        self.counts["updated"] += len(updates)
+
+        # Only rows this import wrote before are deleted; fingerprints of rows that are gone are dropped
+        deleted = [key for key in fingerprints if key in stored_keys and key not in staged]
+        removed = [key for key in fingerprints if key not in stored_keys and key not in written] + deleted
+        self.database.write_fingerprints(self.schema.schema_id, table.name, written, removed=removed)
+        return table, [dict(zip((f"b_{column}" for column in key_columns), json.loads(key))) for key in deleted]
+
+    def _update_statement(self, table, content_columns):
+        return (
+            update(table)
+            .where(*self._key_criteria(table))
+            .values({column: bindparam(f"b_{column}") for column in content_columns})
+        )
+
+    def _delete_statement(self, table):
+        return delete(table).where(*self._key_criteria(table))
+
+    def _key_criteria(self, table):
+        return [
+            table.c[column.name] == bindparam(f"b_{column.name}")
+            for column in table.primary_key.columns
+            if column.name != "schema_id"
+        ] + [table.c.schema_id == self.schema.schema_id]
+
+    def _execute(self, connection, stmt, rows):
+        for start in range(0, len(rows), self.chunk_size):
+            connection.execute(stmt, rows[start : start + self.chunk_size])
+
+    def close(self):
+        self.staging_database.close()
+
+
+@functools.lru_cache(maxsize=None)
+def read_tables(mapper):
+    """Tables a query for mapper can read, including the eagerly loaded relations and many-to-many tables."""
+    tables, mappers, todo = set(), set(), [mapper]
+    while todo:
+        mapper = todo.pop()
+        if mapper in mappers:
+            continue
+        mappers.add(mapper)
+        tables.update(mapper.tables)
+        for relation in mapper.relationships:
+            if relation.secondary is not None:
+                tables.add(relation.secondary)
+            if relation.lazy in ("joined", "selectin", "subquery", "immediate"):
+                todo.append(relation.mapper)
+    return frozenset(tables)
+
+
+def sort_parents_first(rows, id_column, parent_column):
+    """Orders rows of a self-referencing table so that a parent in the same batch is inserted before its children."""
+    by_id = {row.get(id_column): row for row in rows}
+    ordered, placed = [], set()
+    for row in rows:
+        chain = []
+        while row is not None and id(row) not in placed:
+            chain.append(row)
+            placed.add(id(row))
+            row = by_id.get(row.get(parent_column))
+        ordered.extend(reversed(chain))
+    return ordered
+
+
+class PackageCopy:
+    """
+    Copies a package and all its subpackages to another schema with INSERT .. SELECT statements, instead of copying
+    and saving object by object with Package.get_copy. The rows written are the same: every row keeps its id and gets
+    the schema_id of the target schema, the root package loses its parent, orphan classes are left out and relations
+    are copied when their far end is a (non-orphan) class under the same root package as the copied class.
+
+    Two situations make Package.get_copy copy more than the subtree: materialized generalizations and diagrams that
+    show classes or enumerations from outside the subtree. is_self_contained() tells whether the latter applies;
+    CopyTransformer uses the object copy for both.
+    """
+
+    def __init__(self, schema_from, schema_to, root_package_id):
+        self.session = schema_from.database.session
+        self.schema_from = schema_from.schema_id
+        self.schema_to = schema_to.schema_id
+        self.root_package_id = root_package_id
+
+        self.parents = dict(
+            self.session.execute(
+                select(db.Package.id, db.Package.parent_package_id).where(db.Package.schema_id == self.schema_from)
+            ).all()
+        )
+        self.subtree = db.package_subtree(self.schema_from, root_package_id, "copy_tree")
+        # Relations of a class are copied when their far end is in scope of the root package of the class
+        self.root_tree = db.package_subtree(self.schema_from, self._root_of(root_package_id), "copy_root_tree")
+
+        self.classes = self._class_ids(self.subtree, skip_orphans=True)
+        self.enumerations = select(db.Enumeratie.id).where(
+            db.Enumeratie.schema_id == self.schema_from, db.Enumeratie.package_id.in_(select(self.subtree.c.id))
+        )
+        self.associations = select(db.Association.id).where(
+            db.Association.schema_id == self.schema_from,
+            db.Association.src_class_id.in_(self.classes),
+            db.Association.dst_class_id.in_(self._class_ids(self.root_tree, skip_orphans=True)),
+        )
+        self.generalizations = select(db.Generalization.id).where(
+            db.Generalization.schema_id == self.schema_from,
+            db.Generalization.superclass_id.in_(self.classes),
+            db.Generalization.subclass_id.in_(self._class_ids(self.root_tree, skip_orphans=True)),
+        )
+        self.diagrams = select(db.Diagram.id).where(
+            db.Diagram.schema_id == self.schema_from, db.Diagram.package_id.in_(select(self.subtree.c.id))
+        )
+
+    def _root_of(self, package_id):
+        seen = set()
+        while self.parents.get(package_id) in self.parents and package_id not in seen:
+            seen.add(package_id)
+            package_id = self.parents[package_id]
+        return package_id
+
+    def _in_subtree(self, package_id, root_id):
+        seen = set()
+        while package_id in self.parents and package_id not in seen:
+            if package_id == root_id:
+                return True
+            seen.add(package_id)
+            package_id = self.parents[package_id]
+        return False
+
+    def _class_ids(self, tree, skip_orphans=False):
+        criteria = [db.Class.schema_id == self.schema_from, db.Class.package_id.in_(select(tree.c.id))]
+        if skip_orphans:
+            criteria.append(or_(db.Class.name.is_(None), db.Class.name != const.ORPHAN_CLASS))
+        return select(db.Class.id).where(*criteria)
+
+    def is_self_contained(self):
+        """False when a diagram in the subtree shows a class or enumeration from outside it."""
+        outside_classes = (
+            select(db.DiagramClass.class_id)
+            .join(
+                db.Class,
+                (db.Class.id == db.DiagramClass.class_id) & (db.Class.schema_id == db.DiagramClass.schema_id),
+            )
+            .where(
+                db.DiagramClass.schema_id == self.schema_from,
+                db.DiagramClass.diagram_id.in_(self.diagrams),
+                or_(db.Class.name.is_(None), db.Class.name != const.ORPHAN_CLASS),
+                db.Class.id.not_in(self._class_ids(self.subtree)),
+            )
+        )
+        outside_enumerations = (
+            select(db.DiagramEnumeration.enumeration_id)
+            .join(
+                db.Enumeratie,
+                (db.Enumeratie.id == db.DiagramEnumeration.enumeration_id)
+                & (db.Enumeratie.schema_id == db.DiagramEnumeration.schema_id),
+            )
+            .where(
+                db.DiagramEnumeration.schema_id == self.schema_from,
+                db.DiagramEnumeration.diagram_id.in_(self.diagrams),
+                db.Enumeratie.id.not_in(self.enumerations),
+            )
+        )
+        return (
+            self.session.execute(outside_classes.limit(1)).first() is None
+            and self.session.execute(outside_enumerations.limit(1)).first() is None
+        )
+
+    def _copy(self, model, *criteria, **values):
+        """INSERT .. SELECT of the rows of model in the source schema that match criteria, with values replaced."""
+        table = model.__table__
+        values["schema_id"] = literal(self.schema_to)
+        columns = [values[column.name] if column.name in values else column for column in table.columns]
+        rows = select(*columns).where(table.c.schema_id == self.schema_from, *criteria)
+        if self.session.get_bind().dialect.name == "sqlite":
+            # Keep the order of the source rows, renderers list rows in the order they are stored
+            rows = rows.order_by(literal_column(f"{table.name}.rowid"))
+        self.session.execute(insert(table).from_select([column.name for column in table.columns], rows))
+
+    def _copy_enumerations_outside_scope(self):
+        """
+        An attribute whose enumeration is not in the package subtree of its class gets a copy of that enumeration
+        with new ids in the package of the class, see Class.copy_attributes.
+        """
+        rows = self.session.execute(
+            select(db.Attribute.id, db.Class.package_id, db.Enumeratie.id, db.Enumeratie.package_id)
+            .join(db.Class, (db.Class.id == db.Attribute.clazz_id) & (db.Class.schema_id == db.Attribute.schema_id))
+            .join(
+                db.Enumeratie,
+                (db.Enumeratie.id == db.Attribute.enumeration_id) & (db.Enumeratie.schema_id == db.Attribute.schema_id),
+            )
+            .where(db.Attribute.schema_id == self.schema_from, db.Attribute.clazz_id.in_(self.classes))
+        ).all()
+        for attribute_id, class_package_id, enumeration_id, enumeration_package_id in rows:
+            if self._in_subtree(enumeration_package_id, class_package_id):
+                continue
+            copy_id = util.getEAGuid()
+            self._copy(
+                db.Enumeratie,
+                db.Enumeratie.id == enumeration_id,
+                id=literal(copy_id),
+                package_id=literal(class_package_id),
+            )
+            literal_ids = self.session.scalars(
+                select(db.EnumerationLiteral.id).where(
+                    db.EnumerationLiteral.schema_id == self.schema_from,
+                    db.EnumerationLiteral.enumeratie_id == enumeration_id,
+                )
+            ).all()
+            for literal_id in literal_ids:
+                self._copy(
+                    db.EnumerationLiteral,
+                    db.EnumerationLiteral.id == literal_id,
+                    id=literal(util.getEAGuid()),
+                    enumeratie_id=literal(copy_id),
+                )
+            self.session.execute(
+                update(db.Attribute.__table__)
+                .where(db.Attribute.schema_id == self.schema_to, db.Attribute.id == attribute_id)
+                .values(enumeration_id=copy_id)
+            )
+
+    def copy(self):
+        """Writes the copy and returns the number of rows per table in the target schema."""
+        package = db.Package.__table__
+        self._copy(
+            db.Package,
+            package.c.id.in_(select(self.subtree.c.id)),
+            parent_package_id=case((package.c.id == self.root_package_id, null()), else_=package.c.parent_package_id),
+        )
+        self._copy(db.Class, db.Class.id.in_(self.classes))
+        self._copy(db.Enumeratie, db.Enumeratie.id.in_(self.enumerations))
+        self._copy(db.Attribute, db.Attribute.clazz_id.in_(self.classes))
+        self._copy(db.EnumerationLiteral, db.EnumerationLiteral.enumeratie_id.in_(self.enumerations))
+        self._copy_enumerations_outside_scope()
+        self._copy(db.Association, db.Association.id.in_(self.associations))
+        self._copy(db.Generalization, db.Generalization.id.in_(self.generalizations))
+        self._copy(db.Diagram, db.Diagram.id.in_(self.diagrams))
+        self._copy(
+            db.DiagramClass,
+            db.DiagramClass.diagram_id.in_(self.diagrams),
+            db.DiagramClass.class_id.in_(self.classes),
+        )
+        self._copy(
+            db.DiagramEnumeration,
+            db.DiagramEnumeration.diagram_id.in_(self.diagrams),
+            db.DiagramEnumeration.enumeration_id.in_(self.enumerations),
+        )
+        self._copy(
+            db.DiagramAssociation,
+            db.DiagramAssociation.diagram_id.in_(self.diagrams),
+            db.DiagramAssociation.association_id.in_(self.associations),
+        )
+        self._copy(
+            db.DiagramGeneralization,
+            db.DiagramGeneralization.diagram_id.in_(self.diagrams),
+            db.DiagramGeneralization.generalization_id.in_(self.generalizations),
+        )
+        # The rowcount of an INSERT .. SELECT with a CTE is not reported by every driver, so count afterwards
+        return {
+            model.__tablename__: self.session.scalar(
+                select(func.count()).select_from(model).where(model.schema_id == self.schema_to)
+            )
+            for model in BULK_INSERT_ORDER
+        }
+
+
 class Schema:
     def __init__(self, database, schema_name=const.DEFAULT_SCHEMA):
         if not database:
@@ -30,10 +562,67 @@ class Schema:
         self.database = database
         self.schema_id = schema_name
         self.processed_objects = set()  # Houdt bij welke objecten al verwerkt zijn
+        self.bulk_writer = None
 
     def __str__(self):
         return f"Schema {self.schema_id}"
 
+    @contextmanager
+    def bulk_insert(self, chunk_size=const.BULK_INSERT_CHUNK_SIZE):
+        """
+        Routes Schema.save and Schema.add of new objects through a BulkWriter for the duration of the block. The
+        buffered rows are written when the block ends; after an exception they are discarded.
+        """
+        dialect = self.database.session.get_bind().dialect.name
+        if dialect not in BULK_INSERT_DIALECTS:
+            logger.warning(f"Bulk insert is not supported for database dialect {dialect}, saving objects one by one.")
+            yield
+            return
+
+        self.bulk_writer = BulkWriter(self, chunk_size=chunk_size)
+        self.bulk_writer.start()
+        try:
+            yield
+            self.bulk_writer.write()
+            logger.info(f"Bulk insert wrote {self.bulk_writer.rows_written} rows for {self}")
+        finally:
+            self.bulk_writer.stop()
+            self.bulk_writer = None
+
+    @contextmanager
+    def incremental_import(self, chunk_size=const.BULK_INSERT_CHUNK_SIZE):
+        """
+        Yields an IncrementalImport; parse into its staging schema. When the block ends, only the differences with
+        the stored schema are written and the counts are logged; after an exception nothing is written.
+        """
+        incremental = IncrementalImport(self, chunk_size=chunk_size)
+        try:
+            with incremental.staging.bulk_insert(chunk_size=chunk_size):
+                yield incremental
+            counts = incremental.apply()
+            logger.info(
+                f"Incremental import of {self}: {counts['inserted']} inserted, {counts['updated']} updated,"
+                f" {counts['deleted']} deleted, {counts['unchanged']} unchanged"
+            )
+        finally:
+            incremental.close()
+
+    @contextmanager
+    def package_scope(self):
+        """
+        Memoizes Package.get_*_inscope for the duration of the block (see db.PackageScope). Use it around code that
+        only reads the model, like a render; nested blocks share the outer scope.
+        """
+        info = self.database.session.info
+        if info.get(db.PACKAGE_SCOPE_KEY) is not None:
+            yield info[db.PACKAGE_SCOPE_KEY]
+            return
+        info[db.PACKAGE_SCOPE_KEY] = db.PackageScope(self.database.session)
+        try:
+            yield info[db.PACKAGE_SCOPE_KEY]
+        finally:
+            del info[db.PACKAGE_SCOPE_KEY]
+
     def add(self, obj, recursive=False, processed_objects=set()):
         self.save(obj, recursive=recursive, processed_objects=processed_objects, add=True)
 
@@ -48,6 +637,11 @@ class Schema:
         # Save object
         if hasattr(obj, "schema_id"):
             obj.schema_id = self.schema_id
+        if self.bulk_writer is not None:
+            if not recursive and self.bulk_writer.buffer(obj):
+                return
+            # Keep the order of writes when an object takes the regular route
+            self.bulk_writer.write()
         if add:
             self.database.add(obj)
         else:
@@ -140,6 +734,13 @@ class Schema:
     def get_all_generalizations(self):
         return self.database.session.query(db.Generalization).filter_by(schema_id=self.schema_id).all()
 
+    def get_package_domains(self):
+        """
+        Domain name of every package, by package id. All packages are loaded with one query, so the domains of parent
+        packages come from the identity map.
+        """
+        return {package.id: package.domain_name for package in self.get_all_packages()}
+
     def count_class(self):
         return self.database.session.query(db.Class).filter_by(schema_id=self.schema_id, is_datatype=False).count()
 
@@ -168,6 +769,7 @@ class Schema:
         return self.database.session
 
     def clean(self):
+        self.database.clear_fingerprints(self.schema_id)
         self.database.session.query(db.Package).filter_by(schema_id=self.schema_id).delete()
         self.database.session.query(db.Class).filter_by(schema_id=self.schema_id).delete()
         self.database.session.query(db.Enumeratie).filter_by(schema_id=self.schema_id).delete()
@@ -1,5 +1,6 @@
 import logging
 
+import crunch_uml.schema as sch
 from crunch_uml.transformers.transformer import Transformer, TransformerRegistry
 
 logger = logging.getLogger()
@@ -10,5 +11,12 @@ class CopyTransformer(Transformer):
     def transformLogic(self, args, root_package, schema_from, schema_to):
         logger.info(f"Transforming {root_package} from {schema_from} to {schema_to}")
         materialize_generalizations = True if args.materialize_generalizations == "True" else False
+        if not materialize_generalizations:
+            package_copy = sch.PackageCopy(schema_from, schema_to, root_package.id)
+            if package_copy.is_self_contained():
+                counts = package_copy.copy()
+                logger.info(f"Copied {sum(counts.values())} rows to {schema_to}")
+                return
+            logger.info(f"Diagrams in {root_package} show elements from outside the package, copying object by object")
         kopie = root_package.get_copy(None, materialize_generalizations=materialize_generalizations)
         schema_to.add(kopie, recursive=True)
@@ -0,0 +1,176 @@
+"""Adaptive concurrency for the LLM passes of the translation pipeline.
+
+A fixed number of workers is either too few for a small, fast workhorse
+(the server idles between requests) or too many for a heavy model (the
+queue on the server gets so deep that the slowest elements run into their
+read timeout). The saturation point differs per model and per machine, so
+the pipeline finds it at run time, per model tag, AIMD-style:
+
+* every successful call whose latency stays close to the best latency seen
+  so far raises the limit by ``1 / limit`` — about one extra request in
+  flight per round of ``limit`` calls (additive increase);
+* a failed call halves the limit, a call that took much longer than the
+  best latency lowers it by a quarter (multiplicative decrease). Only calls
+  that *started* after the previous decrease count, so one overload doesn't
+  collapse the limit once for every request that was already queued.
+
+Latency is compared per unit of work — seconds per source character plus a
+fixed prompt overhead — because a definition takes many times longer than
+a name even on an idle server.
+
+The :class:`AIMDController` of a model lives as long as the pipeline, so a
+later pass of the same model starts at the limit the previous pass found.
+:class:`PassMonitor` gates the calls of one pass (threads or coroutines)
+and collects the throughput, latency percentiles and retries for the run
+log.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import threading
+import time
+from typing import List, Optional
+
+logger = logging.getLogger()
+
+# A call slower than this multiple of the best latency (per unit of work)
+# signals a queue on the server.
+LATENCY_TOLERANCE = 2.0
+# The best latency creeps up slowly, so one lucky call or a server that got
+# slower for good doesn't pin the baseline forever.
+BASELINE_DRIFT = 0.01
+ERROR_DECREASE = 0.5
+LATENCY_DECREASE = 0.75
+# Fixed part of the work of a call: system prompt, context and glossary.
+PROMPT_OVERHEAD_CHARS = 200
+
+
+class AIMDController:
+    """The adaptive in-flight limit of one model tag."""
+
+    def __init__(self, model_tag: str, initial: int, maximum: int, minimum: int = 1):
+        self.model_tag = model_tag
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self._limit = float(min(self.maximum, max(self.minimum, initial)))
+        self.best_latency: Optional[float] = None
+        self._last_decrease = float("-inf")
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def record(self, started: float, latency: float, work: int, ok: bool):
+        """Adjust the limit after a call that started at ``started`` (monotonic)."""
+        with self._lock:
+            before = self.limit
+            if not ok:
+                self._decrease(started, ERROR_DECREASE)
+            else:
+                normalized = latency / max(1, work)
+                if self.best_latency is None or normalized < self.best_latency:
+                    self.best_latency = normalized
+                else:
+                    self.best_latency *= 1 + BASELINE_DRIFT
+                if normalized > self.best_latency * LATENCY_TOLERANCE:
+                    self._decrease(started, LATENCY_DECREASE)
+                else:
+                    self._limit = min(float(self.maximum), self._limit + 1 / self._limit)
+            if self.limit != before:
+                logger.debug(f"Gelijktijdigheid {self.model_tag}: {before} -> {self.limit}")
+
+    def _decrease(self, started: float, factor: float):
+        if started <= self._last_decrease:
+            return
+        self._limit = max(float(self.minimum), self._limit * factor)
+        self._last_decrease = time.monotonic()
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class PassMonitor:
+    """Gates the calls of one LLM pass on the controller's limit and keeps
+    the statistics of the pass."""
+
+    def __init__(self, controller: AIMDController, label: str):
+        self.controller = controller
+        self.label = label
+        self.latencies: List[float] = []
+        self.retries = 0
+        self.failures = 0
+        self.in_flight = 0
+        self.peak = 0
+        self.started = time.monotonic()
+        self._condition = threading.Condition()
+        self._async_condition: Optional[asyncio.Condition] = None
+
+    def _enter(self) -> float:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        return time.monotonic()
+
+    def _exit(self, started: float, work: int, ok: bool):
+        latency = time.monotonic() - started
+        self.in_flight -= 1
+        if ok:
+            self.latencies.append(latency)
+        else:
+            self.failures += 1
+        self.controller.record(started, latency, work + PROMPT_OVERHEAD_CHARS, ok)
+
+    @contextlib.contextmanager
+    def slot(self, work: int):
+        """One call from a worker thread; blocks while the limit is reached."""
+        with self._condition:
+            self._condition.wait_for(lambda: self.in_flight < self.controller.limit)
+            started = self._enter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            with self._condition:
+                self._exit(started, work, ok)
+                self._condition.notify_all()
+
+    @contextlib.asynccontextmanager
+    async def async_slot(self, work: int):
+        """One call from a coroutine; waits while the limit is reached."""
+        if self._async_condition is None:
+            self._async_condition = asyncio.Condition()
+        condition = self._async_condition
+        async with condition:
+            await condition.wait_for(lambda: self.in_flight < self.controller.limit)
+            started = self._enter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            async with condition:
+                self._exit(started, work, ok)
+                condition.notify_all()
+
+    def retry(self):
+        with self._condition:
+            self.retries += 1
+
+    def summary(self) -> str:
+        elapsed = time.monotonic() - self.started
+        calls = len(self.latencies)
+        throughput = calls / elapsed if elapsed > 0 else 0.0
+        return (
+            f"LLM-pass '{self.label}' ({self.controller.model_tag}) klaar: {calls} calls in {elapsed:.1f}s"
+            f" ({throughput:.2f}/s), latentie p50 {_percentile(self.latencies, 0.5):.2f}s"
+            f" p95 {_percentile(self.latencies, 0.95):.2f}s, {self.retries} herhalingen,"
+            f" {self.failures} mislukte calls, gelijktijdigheid max {self.peak} (nu {self.controller.limit})"
+        )
@@ -20,6 +20,8 @@ import os
 from dataclasses import dataclass, field
 from typing import Optional, Tuple
 
+from crunch_uml.translation import nmt
+
 logger = logging.getLogger()
 
 # Default workhorse matches the existing single-model Ollama backend so that
@@ -43,6 +45,7 @@ DEFAULT_SEED = 42
 
 ENV_TERMBANKS = "CRUNCH_UML_TERMBANKS"
 ENV_TERMBANK_MAX_AGE_DAYS = "CRUNCH_UML_TERMBANK_MAX_AGE_DAYS"
+ENV_TERMBANK_CACHE = "CRUNCH_UML_TERMBANK_CACHE"
 ENV_LLM_WORKHORSES = "CRUNCH_UML_LLM_WORKHORSES"
 ENV_LLM_HEAVY = "CRUNCH_UML_LLM_HEAVY"
 ENV_OLLAMA_URL = "CRUNCH_UML_OLLAMA_URL"
@@ -51,9 +54,16 @@ ENV_OLLAMA_MIN_VERSION = "CRUNCH_UML_OLLAMA_MIN_VERSION"
 ENV_OLLAMA_KEEP_ALIVE = "CRUNCH_UML_OLLAMA_KEEP_ALIVE"
 ENV_OLLAMA_NUM_CTX = "CRUNCH_UML_OLLAMA_NUM_CTX"
 ENV_NMT_MODEL = "CRUNCH_UML_NMT_MODEL"
+ENV_NMT_BATCH_SIZE = "CRUNCH_UML_NMT_BATCH_SIZE"
+ENV_NMT_MAX_BATCH_TOKENS = "CRUNCH_UML_NMT_MAX_BATCH_TOKENS"
+ENV_NMT_DEVICE = "CRUNCH_UML_NMT_DEVICE"
+ENV_NMT_THREADS = "CRUNCH_UML_NMT_THREADS"
 ENV_ALLOW_ONLINE = "CRUNCH_UML_TRANSLATE_ALLOW_ONLINE"
 ENV_WORKERS = "CRUNCH_UML_TRANSLATE_WORKERS"
+ENV_MAX_WORKERS = "CRUNCH_UML_TRANSLATE_MAX_WORKERS"
 ENV_SEED = "CRUNCH_UML_TRANSLATE_SEED"
+ENV_OLLAMA_ASYNC = "CRUNCH_UML_OLLAMA_ASYNC"
+ENV_LLM_BATCH_SIZE = "CRUNCH_UML_LLM_BATCH_SIZE"
 
 
 def _split_csv(raw: Optional[str]) -> Tuple[str, ...]:
@@ -89,6 +99,8 @@ class TranslationConfig:
 
     termbank_paths: Tuple[str, ...] = ()
     termbank_max_age_days: Optional[int] = None
+    # Gecompileerde cache naast elke bron; een warme run slaat het parsen over.
+    termbank_cache: bool = True
     workhorses: Tuple[str, ...] = field(default_factory=lambda: DEFAULT_WORKHORSES)
     heavy_model: Optional[str] = None
     ollama_url: str = DEFAULT_OLLAMA_URL
@@ -97,9 +109,20 @@ class TranslationConfig:
     ollama_keep_alive: str = DEFAULT_OLLAMA_KEEP_ALIVE
     ollama_num_ctx: int = DEFAULT_OLLAMA_NUM_CTX
     nmt_model: Optional[str] = None
+    nmt_batch_size: int = nmt.DEFAULT_BATCH_SIZE
+    # Bovengrens op teksten × langste tekst (in tokens) per NMT-batch.
+    nmt_max_batch_tokens: int = nmt.DEFAULT_MAX_BATCH_TOKENS
+    nmt_device: str = nmt.DEFAULT_DEVICE
+    # CPU-threads voor torch; 0 = de default van torch.
+    nmt_threads: int = 0
     allow_online: bool = False
     workers: int = DEFAULT_WORKERS
+    # Bovengrens van de adaptieve gelijktijdigheid per model; 0 = 2 × workers.
+    max_workers: int = 0
     seed: int = DEFAULT_SEED
+    ollama_async: bool = False
+    # Aantal korte zusterelementen per LLM-call; 1 = elk element een eigen call.
+    llm_batch_size: int = 1
 
     @classmethod
     def from_env(cls) -> "TranslationConfig":
@@ -107,10 +130,11 @@ class TranslationConfig:
         if not workhorses:
             workhorses = DEFAULT_WORKHORSES
         heavy = os.environ.get(ENV_LLM_HEAVY, "").strip() or None
-        nmt = os.environ.get(ENV_NMT_MODEL, "").strip() or None
+        nmt_model = os.environ.get(ENV_NMT_MODEL, "").strip() or None
         return cls(
             termbank_paths=_split_csv(os.environ.get(ENV_TERMBANKS)),
             termbank_max_age_days=_optional_int(os.environ.get(ENV_TERMBANK_MAX_AGE_DAYS), ENV_TERMBANK_MAX_AGE_DAYS),
+            termbank_cache=os.environ.get(ENV_TERMBANK_CACHE, "1").strip() != "0",
             workhorses=workhorses,
             heavy_model=heavy,
             ollama_url=os.environ.get(ENV_OLLAMA_URL, DEFAULT_OLLAMA_URL).rstrip("/"),
@@ -122,8 +146,22 @@ class TranslationConfig:
             ollama_num_ctx=_int_or_default(
                 os.environ.get(ENV_OLLAMA_NUM_CTX), DEFAULT_OLLAMA_NUM_CTX, ENV_OLLAMA_NUM_CTX
             ),
-            nmt_model=nmt,
+            nmt_model=nmt_model,
+            nmt_batch_size=max(
+                1, _int_or_default(os.environ.get(ENV_NMT_BATCH_SIZE), nmt.DEFAULT_BATCH_SIZE, ENV_NMT_BATCH_SIZE)
+            ),
+            nmt_max_batch_tokens=max(
+                1,
+                _int_or_default(
+                    os.environ.get(ENV_NMT_MAX_BATCH_TOKENS), nmt.DEFAULT_MAX_BATCH_TOKENS, ENV_NMT_MAX_BATCH_TOKENS
+                ),
+            ),
+            nmt_device=os.environ.get(ENV_NMT_DEVICE, "").strip() or nmt.DEFAULT_DEVICE,
+            nmt_threads=max(0, _int_or_default(os.environ.get(ENV_NMT_THREADS), 0, ENV_NMT_THREADS)),
             allow_online=os.environ.get(ENV_ALLOW_ONLINE, "0").strip() == "1",
             workers=max(1, _int_or_default(os.environ.get(ENV_WORKERS), DEFAULT_WORKERS, ENV_WORKERS)),
+            max_workers=max(0, _int_or_default(os.environ.get(ENV_MAX_WORKERS), 0, ENV_MAX_WORKERS)),
             seed=_int_or_default(os.environ.get(ENV_SEED), DEFAULT_SEED, ENV_SEED),
+            ollama_async=os.environ.get(ENV_OLLAMA_ASYNC, "0").strip() == "1",
+            llm_batch_size=max(1, _int_or_default(os.environ.get(ENV_LLM_BATCH_SIZE), 1, ENV_LLM_BATCH_SIZE)),
         )
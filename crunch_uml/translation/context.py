@@ -10,12 +10,17 @@ local models worse, not better.
 
 Any database problem degrades to an empty context map with a warning:
 translation then simply runs with less context, it never crashes.
+
+Built maps are kept per database, schema and latest completed import run
+(``crunch_uml_runs``), so exporting one schema to several languages queries
+it once. Schemas without a completed run (never imported with run markers,
+or an import in progress) are rebuilt on every call.
 """
 
 from __future__ import annotations
 
 import logging
-from typing import Dict, Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 
 from crunch_uml import db
 
@@ -26,13 +31,63 @@ MAX_SIBLINGS = 15
 ContextMap = Dict[Tuple[str, str], Dict[str, str]]
 
 
+# Built maps per (database URL, schema id, completed run id); the most
+# recent few only, a process rarely exports more than one schema.
+MAX_CACHED_MAPS = 4
+_cache: Dict[Tuple[str, str, str], ContextMap] = {}
+
+
 def build_context_map(schema) -> ContextMap:
-    """Build the (section, GUID) → context dict map for one schema."""
+    """Build the (section, GUID) → context dict map for one schema, or
+    return the one built earlier for the same imported content. The map is
+    shared: callers must not modify it."""
     try:
-        return _build(schema)
+        key = _cache_key(schema)
+        if key in _cache:
+            logger.debug(f"Contextkaart van {schema} uit de cache (importrun {key[2]}).")
+            return _cache[key]
+        context_map = _build(schema)
     except Exception as e:
         logger.warning(f"Contextverrijking uit het schema mislukt ({e}); er wordt zonder modelcontext vertaald.")
         return {}
+    if key is not None:
+        while len(_cache) >= MAX_CACHED_MAPS:
+            del _cache[next(iter(_cache))]
+        _cache[key] = context_map
+    return context_map
+
+
+def _cache_key(schema) -> Optional[Tuple[str, str, str]]:
+    run_id = schema.database.completed_import_run(schema.schema_id)
+    if run_id is None:
+        return None
+    return (str(schema.database.engine.url), schema.schema_id, run_id)
+
+
+def _package_roots(packages: Dict[Any, db.Package]) -> Dict[Any, db.Package]:
+    """The root package of every package, in one pass over the parent
+    chains: each chain is walked once and its result shared by every package
+    on it. In a parent cycle a package is its own root, and a package whose
+    chain runs into the cycle gets the package where it enters it."""
+    roots: Dict[Any, db.Package] = {}
+    for pkg in packages.values():
+        chain = []
+        on_chain = set()
+        while pkg.id not in roots and pkg.parent_package_id in packages and pkg.id not in on_chain:
+            chain.append(pkg)
+            on_chain.add(pkg.id)
+            pkg = packages[pkg.parent_package_id]
+        if pkg.id in on_chain:
+            entry = chain.index(pkg)
+            for member in chain[entry:]:
+                roots[member.id] = member
+            chain = chain[:entry]
+            root = pkg
+        else:
+            root = roots.setdefault(pkg.id, pkg)
+        for member in chain:
+            roots[member.id] = root
+    return roots
 
 
 def _build(schema) -> ContextMap:
@@ -47,24 +102,20 @@ def _build(schema) -> ContextMap:
     attributes = _all(db.Attribute)
     literals = _all(db.EnumerationLiteral)
 
-    def _root_of(package_id: Optional[str]):
-        pkg = packages.get(package_id)
-        seen = set()
-        while pkg is not None and pkg.parent_package_id in packages and pkg.id not in seen:
-            seen.add(pkg.id)
-            pkg = packages[pkg.parent_package_id]
-        return pkg
+    roots = _package_roots(packages)
 
     def _package_context(package_id: Optional[str]) -> Dict[str, str]:
         ctx: Dict[str, str] = {}
+        if package_id is None:
+            return ctx
         pkg = packages.get(package_id)
         if pkg is not None and pkg.name:
             ctx["package"] = pkg.name
-        root = _root_of(package_id)
+        root = roots.get(package_id)
         if root is not None and root.name and (pkg is None or root.id != pkg.id):
-            ctx["model"] = root.name
+            ctx["model"] = str(root.name)
             if root.definitie:
-                ctx["model_definition"] = root.definitie
+                ctx["model_definition"] = str(root.definitie)
         return ctx
 
     context_map: ContextMap = {}
@@ -3,12 +3,14 @@ that decide when a result is trusted.
 
 One model element (package, class, attribute, …) is translated in a single
 ``POST /api/chat`` call carrying *all* its translatable fields as one JSON
-object. Translating name and definition together is what keeps them
-consistent: the definition disambiguates the term, and the chosen term is
-guaranteed to be used inside the translated definition. The response format
-is enforced with Ollama's ``format`` parameter (a JSON schema over exactly
-the element's fields), ``temperature: 0`` and a configurable seed keep it
-reproducible.
+object. Short sibling elements (the names of the attributes of one class)
+can also be translated together in one batched call, which shares the
+context header and glossary between them. Translating name and definition
+together is what keeps them consistent: the definition disambiguates the
+term, and the chosen term is guaranteed to be used inside the translated
+definition. The response format is enforced with Ollama's ``format``
+parameter (a JSON schema over exactly the element's fields),
+``temperature: 0`` and a configurable seed keep it reproducible.
 
 The prompt carries a compact context header — deliberately *not* the whole
 model: model name + definition, package path, the owning class (for
@@ -39,6 +41,7 @@ import requests
 
 from crunch_uml.ollama_translator import _strip_response, reconcile_case
 from crunch_uml.translation.config import TranslationConfig
+from crunch_uml.translation.ollama_client import AsyncOllamaClient
 from crunch_uml.translation.termbank import Candidate
 
 logger = logging.getLogger()
@@ -66,14 +69,12 @@ class Element:
     candidates: List[Candidate] = field(default_factory=list)  # termbankkandidaten voor de naam
 
 
-SYSTEM_PROMPT_TEMPLATE = """\
+_PROMPT_TRANSLATOR = """\
 You are a professional translator specialising in technical Dutch government \
-data-modelling terminology (GEMMA, RSGB, BAG, BRP, RGBZ, ...). You translate \
-fields of one UML model element from {from_language} to {to_language}.
+data-modelling terminology (GEMMA, RSGB, BAG, BRP, RGBZ, ...). \
+"""
 
-Rules:
-- Respond with ONLY a JSON object containing exactly the same keys as the \
-input JSON; every value is the translation of the corresponding input value.
+_PROMPT_RULES = """\
 - The GLOSSARY is binding official terminology: use those exact translations \
 for those terms, both as standalone names and inside definitions.
 - When CANDIDATES are listed for the element name, choose the one whose \
@@ -88,6 +89,24 @@ values, translate every word and rejoin in the same style \
 "ConstructionActivity", "datum_opname" -> "recording_date").
 """
 
+SYSTEM_PROMPT_TEMPLATE = _PROMPT_TRANSLATOR + """\
+You translate fields of one UML model element from {from_language} to {to_language}.
+
+Rules:
+- Respond with ONLY a JSON object containing exactly the same keys as the \
+input JSON; every value is the translation of the corresponding input value.
+""" + _PROMPT_RULES
+
+BATCH_SYSTEM_PROMPT_TEMPLATE = _PROMPT_TRANSLATOR + """\
+You translate fields of several sibling UML model elements from {from_language} to {to_language}.
+
+Rules:
+- Respond with ONLY a JSON object containing exactly the same keys as the \
+input JSON (one per element); every value is an object with exactly the same \
+keys as the corresponding input object, holding the translations of its values.
+- Translate every element on its own; the siblings only give each other context.
+""" + _PROMPT_RULES
+
 
 def _json_schema_for(fields: Sequence[str]) -> Dict:
     """JSON schema forcing the response to contain exactly the element's
@@ -165,23 +184,18 @@ def build_messages(
     ]
 
 
-def translate_element_once(
+def build_payload(
     element: Element,
     to_language: str,
     from_language: str,
     model: str,
     config: TranslationConfig,
     glossary: Optional[Dict[str, str]] = None,
-) -> Dict[str, str]:
-    """One deterministic Ollama call translating all fields of one element.
-
-    Raises on transport errors (the pipeline handles degradation); malformed
-    or incomplete JSON degrades per-field to the source value with a warning
-    so a single bad response can never corrupt the batch.
-    """
+) -> Dict:
+    """The ``/api/chat`` request body translating all fields of one element."""
     field_names = list(element.fields.keys())
     source_chars = sum(len(v) for v in element.fields.values())
-    payload = {
+    return {
         "model": model,
         "messages": build_messages(element, to_language, from_language, glossary),
         "stream": False,
@@ -202,9 +216,15 @@ def translate_element_once(
             "num_predict": min(4096, source_chars + 512),
         },
     }
-    resp = requests.post(f"{config.ollama_url}/api/chat", json=payload, timeout=config.ollama_timeout)
-    resp.raise_for_status()
-    raw = (resp.json().get("message") or {}).get("content", "")
+
+
+def parse_response(element: Element, data: Dict) -> Dict[str, str]:
+    """Translated fields from an ``/api/chat`` response body.
+
+    Malformed or incomplete JSON degrades per-field to the source value with
+    a warning so a single bad response can never corrupt the batch.
+    """
+    raw = (data.get("message") or {}).get("content", "")
 
     try:
         parsed = json.loads(_strip_response(raw))
@@ -232,6 +252,172 @@ def translate_element_once(
     return result
 
 
+def translate_element_once(
+    element: Element,
+    to_language: str,
+    from_language: str,
+    model: str,
+    config: TranslationConfig,
+    glossary: Optional[Dict[str, str]] = None,
+) -> Dict[str, str]:
+    """One deterministic Ollama call translating all fields of one element.
+
+    Raises on transport errors (the pipeline handles degradation); malformed
+    or incomplete JSON degrades per-field to the source value with a warning
+    so a single bad response can never corrupt the batch.
+    """
+    payload = build_payload(element, to_language, from_language, model, config, glossary)
+    resp = requests.post(f"{config.ollama_url}/api/chat", json=payload, timeout=config.ollama_timeout)
+    resp.raise_for_status()
+    return parse_response(element, resp.json())
+
+
+async def translate_element_once_async(
+    client: AsyncOllamaClient,
+    element: Element,
+    to_language: str,
+    from_language: str,
+    model: str,
+    config: TranslationConfig,
+    glossary: Optional[Dict[str, str]] = None,
+) -> Dict[str, str]:
+    """:func:`translate_element_once` over the pooled connections of ``client``."""
+    payload = build_payload(element, to_language, from_language, model, config, glossary)
+    return parse_response(element, await client.chat(payload))
+
+
+# ---------------------------------------------------------------------------
+# Batched calls: several sibling elements in one request
+# ---------------------------------------------------------------------------
+
+
+def _batch_keys(elements: Sequence[Element]) -> List[str]:
+    """Short positional keys for the batch JSON: GUIDs would cost more
+    tokens than the names they carry."""
+    return [f"e{i}" for i in range(1, len(elements) + 1)]
+
+
+def build_batch_messages(
+    elements: Sequence[Element],
+    to_language: str,
+    from_language: str,
+    glossary: Optional[Dict[str, str]] = None,
+) -> List[Dict[str, str]]:
+    """Chat messages translating the fields of sibling elements at once:
+    the shared context header and glossary are sent once for the batch."""
+    system = BATCH_SYSTEM_PROMPT_TEMPLATE.format(from_language=from_language, to_language=to_language)
+
+    parts: List[str] = []
+    # Siblings staan zelf in de batch; de regel zou ze alleen herhalen.
+    shared = Element(
+        section=elements[0].section,
+        key=elements[0].key,
+        context={k: v for k, v in elements[0].context.items() if k != "siblings"},
+    )
+    context_lines = _context_lines(shared)
+    if context_lines:
+        parts.append("Context:\n" + "\n".join(context_lines))
+
+    if glossary:
+        glossary_lines = [f"- {src} -> {tgt}" for src, tgt in sorted(glossary.items())]
+        parts.append("GLOSSARY (binding):\n" + "\n".join(glossary_lines))
+
+    batch = {key: element.fields for key, element in zip(_batch_keys(elements), elements)}
+    parts.append(
+        f"Translate the values of the objects in this JSON object from {from_language} to {to_language}:\n"
+        + json.dumps(batch, ensure_ascii=False)
+    )
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": "\n\n".join(parts)},
+    ]
+
+
+def build_batch_payload(
+    elements: Sequence[Element],
+    to_language: str,
+    from_language: str,
+    model: str,
+    config: TranslationConfig,
+    glossary: Optional[Dict[str, str]] = None,
+) -> Dict:
+    """The ``/api/chat`` request body for a batch: one JSON schema with a
+    nested object per element."""
+    payload = build_payload(elements[0], to_language, from_language, model, config, glossary)
+    keys = _batch_keys(elements)
+    source_chars = sum(len(v) for element in elements for v in element.fields.values())
+    payload["messages"] = build_batch_messages(elements, to_language, from_language, glossary)
+    payload["format"] = {
+        "type": "object",
+        "properties": {key: _json_schema_for(list(e.fields)) for key, e in zip(keys, elements)},
+        "required": keys,
+        "additionalProperties": False,
+    }
+    payload["options"]["num_predict"] = min(4096, source_chars + 64 * len(elements) + 512)
+    return payload
+
+
+def parse_batch_response(elements: Sequence[Element], data: Dict) -> List[Optional[Dict[str, str]]]:
+    """Translated fields per element of a batch response; None for every
+    element whose part of the response does not validate, so the caller can
+    translate it on its own instead."""
+    raw = (data.get("message") or {}).get("content", "")
+    try:
+        parsed = json.loads(_strip_response(raw))
+        if not isinstance(parsed, dict):
+            raise ValueError("respons is geen JSON-object")
+    except (ValueError, json.JSONDecodeError) as e:
+        logger.info(f"LLM-respons voor een batch van {len(elements)} elementen is geen geldige JSON ({e}).")
+        return [None] * len(elements)
+
+    results: List[Optional[Dict[str, str]]] = []
+    for key, element in zip(_batch_keys(elements), elements):
+        translated = parsed.get(key)
+        fields: Dict[str, str] = {}
+        for name, source_value in element.fields.items():
+            value = translated.get(name) if isinstance(translated, dict) else None
+            if not isinstance(value, str) or not value.strip():
+                results.append(None)
+                break
+            value = value.strip()
+            fields[name] = reconcile_case(source_value, value) if name in NAME_FIELDS else value
+        else:
+            results.append(fields)
+    return results
+
+
+def translate_batch_once(
+    elements: Sequence[Element],
+    to_language: str,
+    from_language: str,
+    model: str,
+    config: TranslationConfig,
+    glossary: Optional[Dict[str, str]] = None,
+) -> List[Optional[Dict[str, str]]]:
+    """One Ollama call translating the fields of several sibling elements.
+
+    Raises on transport errors like :func:`translate_element_once`; see
+    :func:`parse_batch_response` for the per-element validation."""
+    payload = build_batch_payload(elements, to_language, from_language, model, config, glossary)
+    resp = requests.post(f"{config.ollama_url}/api/chat", json=payload, timeout=config.ollama_timeout)
+    resp.raise_for_status()
+    return parse_batch_response(elements, resp.json())
+
+
+async def translate_batch_once_async(
+    client: AsyncOllamaClient,
+    elements: Sequence[Element],
+    to_language: str,
+    from_language: str,
+    model: str,
+    config: TranslationConfig,
+    glossary: Optional[Dict[str, str]] = None,
+) -> List[Optional[Dict[str, str]]]:
+    """:func:`translate_batch_once` over the pooled connections of ``client``."""
+    payload = build_batch_payload(elements, to_language, from_language, model, config, glossary)
+    return parse_batch_response(elements, await client.chat(payload))
+
+
 # ---------------------------------------------------------------------------
 # Deterministic quality checks (voting + glossary compliance)
 # ---------------------------------------------------------------------------
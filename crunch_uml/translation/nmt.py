@@ -14,18 +14,36 @@ Configure via ``CRUNCH_UML_NMT_MODEL``; ``{from}``/``{to}`` placeholders are
 substituted with the language codes, e.g.::
 
     export CRUNCH_UML_NMT_MODEL="Helsinki-NLP/opus-mt-{from}-{to}"
+
+Texts are translated in batches of similar token length (see
+:func:`length_buckets`), so one long definition no longer pads a batch of
+short names, and no batch exceeds ``CRUNCH_UML_NMT_MAX_BATCH_TOKENS`` padded
+tokens. The texts are sorted by length per window of consecutive texts only,
+so the translations of a window stream out before the next one starts.
+``CRUNCH_UML_NMT_DEVICE`` and ``CRUNCH_UML_NMT_THREADS`` choose where and on
+how many CPU threads the model runs.
 """
 
 from __future__ import annotations
 
 import logging
-from typing import Dict, List
+import time
+from typing import Dict, Iterator, List, Tuple
 
 logger = logging.getLogger()
 
-# Loaded pipelines per resolved model name; a model load is expensive and
-# every batch reuses the same language pair.
-_pipelines: Dict[str, object] = {}
+DEFAULT_BATCH_SIZE = 16
+# Padded tokens per batch (texts × longest text): bounds the memory of one
+# forward pass, whatever the mix of names and definitions.
+DEFAULT_MAX_BATCH_TOKENS = 4096
+DEFAULT_DEVICE = "cpu"
+# Batches per window of consecutive texts that length_buckets sorts
+# together: a larger window pads less, a smaller one yields sooner.
+WINDOW_BATCHES = 8
+
+# Loaded pipelines per resolved model name and device; a model load is
+# expensive and every batch reuses the same language pair.
+_pipelines: Dict[Tuple[str, str], object] = {}
 
 
 def available() -> bool:
@@ -43,22 +61,100 @@ def resolve_model_name(template: str, from_lang: str, to_lang: str) -> str:
     return template.replace("{from}", from_lang).replace("{to}", to_lang)
 
 
-def _get_pipeline(model_name: str):
-    if model_name not in _pipelines:
+def _get_pipeline(model_name: str, device: str = DEFAULT_DEVICE, threads: int = 0):
+    if (model_name, device) not in _pipelines:
         from transformers import (  # type: ignore[import-not-found, import-untyped]
             pipeline,
         )
 
-        logger.info(f"NMT-model '{model_name}' wordt geladen (eenmalig per taalpaar)...")
-        _pipelines[model_name] = pipeline("translation", model=model_name)
-    return _pipelines[model_name]
-
-
-def translate_texts(texts: List[str], to_lang: str, from_lang: str, model_template: str) -> List[str]:
+        logger.info(f"NMT-model '{model_name}' wordt geladen op {device} (eenmalig per taalpaar)...")
+        if threads > 0:
+            import torch  # type: ignore[import-not-found, import-untyped]
+
+            torch.set_num_threads(threads)
+        _pipelines[(model_name, device)] = pipeline("translation", model=model_name, device=device)
+    return _pipelines[(model_name, device)]
+
+
+def _token_counts(translator, texts: List[str]) -> List[int]:
+    tokenizer = getattr(translator, "tokenizer", None)
+    if tokenizer is None:
+        # Only without a Hugging Face tokenizer (custom pipelines): words
+        # plus the end-of-sequence token as an estimate.
+        return [len(text.split()) + 1 for text in texts]
+    return [len(ids) for ids in tokenizer(texts)["input_ids"]]
+
+
+def length_buckets(lengths: List[int], batch_size: int, max_batch_tokens: int) -> List[List[int]]:
+    """Indexes of the texts per batch, shortest texts first: a batch holds at
+    most ``batch_size`` texts of similar length and, unless it is a single
+    text, at most ``max_batch_tokens`` tokens once padded to its longest."""
+    batches: List[List[int]] = []
+    batch: List[int] = []
+    for i in sorted(range(len(lengths)), key=lambda i: lengths[i]):
+        if batch and (len(batch) == batch_size or (len(batch) + 1) * lengths[i] > max_batch_tokens):
+            batches.append(batch)
+            batch = []
+        batch.append(i)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def iter_translations(
+    texts: List[str],
+    to_lang: str,
+    from_lang: str,
+    model_template: str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_batch_tokens: int = DEFAULT_MAX_BATCH_TOKENS,
+    device: str = DEFAULT_DEVICE,
+    threads: int = 0,
+) -> Iterator[str]:
+    """Translate ``texts`` and yield the translations in the order of
+    ``texts``, per window of ``WINDOW_BATCHES`` batches of consecutive texts:
+    within a window the texts are batched by length (see
+    :func:`length_buckets`). Raises like :func:`translate_texts`."""
+    if not texts:
+        return
+    model_name = resolve_model_name(model_template, from_lang, to_lang)
+    translator = _get_pipeline(model_name, device, threads)
+    batch_size = max(1, batch_size)
+    window = batch_size * WINDOW_BATCHES
+
+    started = time.perf_counter()
+    tokens = n_batches = 0
+    for start in range(0, len(texts), window):
+        chunk = texts[start : start + window]
+        lengths = _token_counts(translator, chunk)
+        translated: List[str] = [""] * len(chunk)
+        for batch in length_buckets(lengths, batch_size, max_batch_tokens):
+            results = translator([chunk[i] for i in batch], batch_size=len(batch))  # type: ignore[operator]
+            for i, result in zip(batch, results):
+                translated[i] = result["translation_text"]
+            n_batches += 1
+        tokens += sum(lengths)
+        yield from translated
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"NMT '{model_name}': {len(texts)} teksten in {n_batches} batches, {tokens} brontokens in"
+        f" {elapsed:.1f}s ({tokens / elapsed if elapsed else 0.0:.0f} tokens/s)"
+    )
+
+
+def translate_texts(
+    texts: List[str],
+    to_lang: str,
+    from_lang: str,
+    model_template: str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_batch_tokens: int = DEFAULT_MAX_BATCH_TOKENS,
+    device: str = DEFAULT_DEVICE,
+    threads: int = 0,
+) -> List[str]:
     """Translate ``texts`` with the configured NMT model. Raises when the
     optional dependency or the model itself is unavailable; the pipeline
     catches this and degrades."""
-    model_name = resolve_model_name(model_template, from_lang, to_lang)
-    translator = _get_pipeline(model_name)
-    results = translator(texts)  # type: ignore[operator]
-    return [r["translation_text"] for r in results]
+    return list(
+        iter_translations(texts, to_lang, from_lang, model_template, batch_size, max_batch_tokens, device, threads)
+    )
@@ -0,0 +1,76 @@
+"""Asyncio Ollama client for the LLM passes of the translation pipeline.
+
+The thread-based passes post every element with its own ``requests.post``:
+a new TCP connection per element, one blocked thread per in-flight request
+and retries that sleep inside the worker. With thousands of elements per
+pass that overhead, not Ollama, limits how busy the server can be kept.
+
+:class:`AsyncOllamaClient` keeps one ``httpx.AsyncClient`` with a pool of
+keep-alive connections for the whole pass and bounds the number of
+in-flight requests with a semaphore, so a pass can run every element as a
+coroutine on a single thread. Retry and backoff stay with the caller (see
+``TranslationPipeline._llm_pass``) and wait with ``asyncio.sleep``.
+
+Activate via ``CRUNCH_UML_OLLAMA_ASYNC=1`` (or ``--ollama_async``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+import httpx
+
+from crunch_uml.translation.config import TranslationConfig
+
+logger = logging.getLogger()
+
+
+class AsyncOllamaClient:
+    """Pooled, concurrency-bounded ``/api/chat`` client; use as ``async with``."""
+
+    def __init__(
+        self,
+        url: str,
+        timeout: float,
+        max_concurrency: int,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.max_concurrency = max(1, max_concurrency)
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @classmethod
+    def from_config(cls, config: TranslationConfig, max_concurrency: int) -> "AsyncOllamaClient":
+        return cls(config.ollama_url, config.ollama_timeout, max_concurrency)
+
+    async def __aenter__(self) -> "AsyncOllamaClient":
+        # Eén keep-alive verbinding per toegestane request: de pool groeit nooit
+        # voorbij wat de semaphore doorlaat.
+        limits = httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency)
+        self._client = httpx.AsyncClient(
+            base_url=self.url, timeout=self.timeout, limits=limits, transport=self._transport
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def chat(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST ``payload`` to ``/api/chat`` and return the JSON body.
+
+        Raises :class:`httpx.HTTPError` on transport errors and error status
+        codes, like ``requests`` does for the thread-based passes."""
+        if self._client is None or self._semaphore is None:
+            raise RuntimeError("AsyncOllamaClient wordt alleen binnen 'async with' gebruikt")
+        async with self._semaphore:
+            resp = await self._client.post("/api/chat", json=payload)
+            resp.raise_for_status()
+            return resp.json()
@@ -22,7 +22,10 @@ Per element the cascade is:
   source definition and domain context → an unambiguous hit fixes the name
   translation without any model (the concept URI is logged);
 * the LLM translates the remaining fields in one JSON call (workhorse A),
-  with workhorse B as an independent second vote on the *name*; the two
+  or — with ``llm_batch_size`` > 1 — bare attribute and literal names in one
+  call per group of siblings, with per-element calls for any element whose
+  part of the batch response does not validate. Workhorse B adds an
+  independent second vote on the *name*; the two
   agreeing → accepted, disagreeing → the heavy model arbitrates with both
   candidates in the prompt. Definitions are checked deterministically
   against the glossary instead (voting cannot work there) and escalate on
@@ -37,12 +40,15 @@ same output. There is no agent loop; this is a batch pipeline.
 
 from __future__ import annotations
 
+import asyncio
+import itertools
 import logging
 import time
 from concurrent.futures import ThreadPoolExecutor
-from typing import Dict, List, Tuple
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
 
 from crunch_uml.ollama_translator import reconcile_case
+from crunch_uml.translation.concurrency import AIMDController, PassMonitor
 from crunch_uml.translation.disambiguate import disambiguate
 from crunch_uml.translation.llm import (
     NAME_FIELDS,
@@ -50,8 +56,12 @@ from crunch_uml.translation.llm import (
     _term_in_text,
     glossary_violations,
     names_agree,
+    translate_batch_once,
+    translate_batch_once_async,
     translate_element_once,
+    translate_element_once_async,
 )
+from crunch_uml.translation.ollama_client import AsyncOllamaClient
 from crunch_uml.translation.preflight import PreflightResult
 
 logger = logging.getLogger()
@@ -70,7 +80,12 @@ DEFINITION_FIELDS = ("definitie", "toelichting", "src_documentation", "dst_docum
 # sorted alphabetically).
 MAX_GLOSSARY_ENTRIES = 30
 
+# Sections whose short, name-only elements can share one LLM call with
+# their siblings (see CRUNCH_UML_LLM_BATCH_SIZE).
+BATCH_SECTIONS = ("attributes", "enumerationliterals")
+
 ResultKey = Tuple[str, str]  # (section, key)
+T = TypeVar("T")
 
 # Transport errors (timeouts, refused connections) get retries with backoff:
 # a busy Ollama server recovers, and a silently failed element would end up
@@ -94,6 +109,8 @@ class TranslationPipeline:
         self.config = preflight.config
         # Accumulated name translations from higher levels: src name -> tgt.
         self.global_glossary: Dict[str, str] = {}
+        # Adaptive concurrency per model tag, kept across passes and levels.
+        self.controllers: Dict[str, AIMDController] = {}
 
     # -- glossary ----------------------------------------------------------
 
@@ -138,6 +155,126 @@ class TranslationPipeline:
 
     # -- LLM passes ----------------------------------------------------------
 
+    @staticmethod
+    def _sub_element(element: Element, pending: Dict[ResultKey, Dict[str, str]]) -> Element:
+        """The element restricted to its still pending fields."""
+        return Element(
+            section=element.section,
+            key=element.key,
+            fields=pending[(element.section, element.key)],
+            context=element.context,
+            candidates=element.candidates,
+        )
+
+    @staticmethod
+    def _retry_wait(label: str, what: str, attempt: int, error: Exception) -> Optional[int]:
+        """Log a failed LLM call for ``what`` (an element or a batch); returns
+        the backoff before the next attempt, or None when all attempts are
+        used up."""
+        if attempt < LLM_ATTEMPTS:
+            wait = LLM_RETRY_BACKOFF_SECONDS * attempt
+            logger.warning(
+                f"LLM-call ({label}) voor {what} mislukt bij poging"
+                f" {attempt}/{LLM_ATTEMPTS} ({error}); nieuwe poging over {wait}s..."
+            )
+            return wait
+        logger.warning(
+            f"LLM-call ({label}) voor {what} definitief mislukt na {LLM_ATTEMPTS} pogingen ({error});"
+            " bronwaarden behouden."
+        )
+        return None
+
+    def _with_retries(self, monitor: PassMonitor, what: str, work: int, call: Callable[[], T]) -> Optional[T]:
+        """``call`` in a slot of ``monitor``, retried with backoff on
+        transport errors; None when every attempt failed."""
+        for attempt in range(1, LLM_ATTEMPTS + 1):
+            try:
+                with monitor.slot(work):
+                    return call()
+            except Exception as e:
+                wait = self._retry_wait(monitor.label, what, attempt, e)
+                if wait is not None:
+                    monitor.retry()
+                    time.sleep(wait)
+        return None
+
+    async def _with_retries_async(
+        self, monitor: PassMonitor, what: str, work: int, call: Callable[[], Awaitable[T]]
+    ) -> Optional[T]:
+        """:meth:`_with_retries` for coroutines: the backoff doesn't hold a thread."""
+        for attempt in range(1, LLM_ATTEMPTS + 1):
+            try:
+                async with monitor.async_slot(work):
+                    return await call()
+            except Exception as e:
+                wait = self._retry_wait(monitor.label, what, attempt, e)
+                if wait is not None:
+                    monitor.retry()
+                    await asyncio.sleep(wait)
+        return None
+
+    def _batches(self, elements: List[Element], pending: Dict[ResultKey, Dict[str, str]]) -> List[List[Element]]:
+        """Group the elements of a pass into LLM calls.
+
+        Attributes and enumeration literals with only their name (and alias)
+        pending and no termbank candidates share a call with the siblings of
+        the same owner, ``llm_batch_size`` at a time: for such short values
+        the context header, glossary and schema outweigh the payload. Every
+        other element gets a call of its own."""
+        size = self.config.llm_batch_size
+        calls: List[List[Element]] = []
+        groups: Dict[Tuple[str, ...], List[Element]] = {}
+        for element in elements:
+            fields = pending[(element.section, element.key)]
+            if (
+                size > 1
+                and element.section in BATCH_SECTIONS
+                and set(fields) <= set(NAME_FIELDS)
+                and not element.candidates
+            ):
+                ctx = element.context
+                owner = (element.section, ctx.get("model", ""), ctx.get("package", ""), ctx.get("parent", ""))
+                groups.setdefault(owner, []).append(element)
+            else:
+                calls.append([element])
+        for group in groups.values():
+            calls.extend(group[i : i + size] for i in range(0, len(group), size))
+        return calls
+
+    @staticmethod
+    def _batch_glossary(batch: List[Element], glossaries: Dict[ResultKey, Dict[str, str]]) -> Dict[str, str]:
+        """The glossaries of the batch members combined, capped like the
+        glossary of a single element."""
+        entries: Dict[str, str] = {}
+        for element in batch:
+            entries.update(glossaries[(element.section, element.key)])
+        return dict(sorted(entries.items())[:MAX_GLOSSARY_ENTRIES])
+
+    @staticmethod
+    def _describe(batch: List[Element]) -> str:
+        first = batch[0]
+        if len(batch) == 1:
+            return f"{first.section}/{first.key}"
+        return f"batch van {len(batch)} {first.section} ({first.key}, ...)"
+
+    @staticmethod
+    def _log_batch_fallbacks(label: str, batch: List[Element], parsed: List[Optional[Dict[str, str]]]):
+        invalid = sum(1 for r in parsed if r is None)
+        if invalid:
+            logger.info(
+                f"LLM-call ({label}) voor {TranslationPipeline._describe(batch)}: {invalid} van de {len(batch)}"
+                " elementen zonder geldige vertaling; die worden afzonderlijk vertaald."
+            )
+
+    def _controller(self, model_tag: str, initial: int) -> AIMDController:
+        """The adaptive concurrency of ``model_tag``, kept across passes."""
+        controller = self.controllers.get(model_tag)
+        if controller is None:
+            maximum = self.config.max_workers or 2 * self.config.workers
+            controller = AIMDController(model_tag, initial=initial, maximum=maximum)
+            self.controllers[model_tag] = controller
+        return controller
+
     def _llm_pass(
         self,
         elements: List[Element],
@@ -151,53 +288,153 @@ class TranslationPipeline:
     ) -> Dict[ResultKey, Dict[str, str]]:
         """One model over the whole batch (see module docstring on passes).
 
-        ``max_workers`` begrenst de client-parallelliteit voor deze pass;
-        0 betekent de geconfigureerde standaard."""
+        Het aantal gelijktijdige requests wordt per model bijgestuurd (zie
+        :mod:`crunch_uml.translation.concurrency`); ``max_workers`` is de
+        startwaarde bij de eerste pass van het model, 0 betekent de
+        geconfigureerde standaard. Met ``ollama_async`` draait de pass als
+        coroutines op de gedeelde verbindingen van een
+        :class:`AsyncOllamaClient` in plaats van op een ThreadPool."""
         total = len(elements)
-        workers = max_workers or self.config.workers
-        logger.info(f"LLM-pass '{label}' ({model_tag}): {total} elementen ({workers} workers)...")
+        controller = self._controller(model_tag, max_workers or self.config.workers)
+        monitor = PassMonitor(controller, label)
+        calls = self._batches(elements, pending)
+        if len(calls) < total:
+            logger.info(
+                f"LLM-pass '{label}': {total} elementen gebundeld in {len(calls)} calls"
+                f" (batchgrootte {self.config.llm_batch_size})"
+            )
+        if self.config.ollama_async:
+            logger.info(
+                f"LLM-pass '{label}' ({model_tag}): {total} elementen ({controller.limit} gelijktijdige requests,"
+                f" max {controller.maximum})..."
+            )
+            results = asyncio.run(
+                self._llm_pass_async(calls, pending, glossaries, model_tag, to_language, from_language, monitor)
+            )
+            logger.info(monitor.summary())
+            return results
+        logger.info(
+            f"LLM-pass '{label}' ({model_tag}): {total} elementen ({controller.limit} workers, max"
+            f" {controller.maximum})..."
+        )
+        progress = itertools.count(1)
 
-        def _one(indexed: Tuple[int, Element]) -> Dict[str, str]:
-            i, element = indexed
+        def _single(element: Element) -> Dict[str, str]:
             key = (element.section, element.key)
-            sub_element = Element(
-                section=element.section,
-                key=element.key,
-                fields=pending[key],
-                context=element.context,
-                candidates=element.candidates,
+            sub_element = self._sub_element(element, pending)
+            result = self._with_retries(
+                monitor,
+                self._describe([element]),
+                sum(len(v) for v in sub_element.fields.values()),
+                lambda: translate_element_once(
+                    sub_element,
+                    to_language,
+                    from_language,
+                    model=model_tag,
+                    config=self.config,
+                    glossary=glossaries[key],
+                ),
             )
-            result: Dict[str, str] = dict(pending[key])  # fallback: bronwaarden
-            for attempt in range(1, LLM_ATTEMPTS + 1):
-                try:
-                    result = translate_element_once(
+            return result if result is not None else dict(pending[key])  # fallback: bronwaarden
+
+        def _one(batch: List[Element]) -> List[Dict[str, str]]:
+            if len(batch) == 1:
+                results = [_single(batch[0])]
+            else:
+                sub_elements = [self._sub_element(element, pending) for element in batch]
+                glossary = self._batch_glossary(batch, glossaries)
+                parsed = self._with_retries(
+                    monitor,
+                    self._describe(batch),
+                    sum(len(v) for e in sub_elements for v in e.fields.values()),
+                    lambda: translate_batch_once(
+                        sub_elements, to_language, from_language, model=model_tag, config=self.config, glossary=glossary
+                    ),
+                )
+                if parsed is None:
+                    results = [dict(pending[(e.section, e.key)]) for e in batch]
+                else:
+                    self._log_batch_fallbacks(label, batch, parsed)
+                    results = [r if r is not None else _single(e) for e, r in zip(batch, parsed)]
+            for element in batch:
+                logger.info(f"[{next(progress)}/{total}] ({label}) {element.section}/{element.key} vertaald")
+            return results
+
+        # Threads boven de actuele limiet wachten in monitor.slot.
+        with ThreadPoolExecutor(max_workers=controller.maximum) as pool:
+            batch_results = list(pool.map(_one, calls))
+        logger.info(monitor.summary())
+        return {(e.section, e.key): r for batch, rs in zip(calls, batch_results) for e, r in zip(batch, rs)}
+
+    async def _llm_pass_async(
+        self,
+        calls: List[List[Element]],
+        pending: Dict[ResultKey, Dict[str, str]],
+        glossaries: Dict[ResultKey, Dict[str, str]],
+        model_tag: str,
+        to_language: str,
+        from_language: str,
+        monitor: PassMonitor,
+    ) -> Dict[ResultKey, Dict[str, str]]:
+        """:meth:`_llm_pass` on one event loop: requests in flight are gated
+        by ``monitor`` and share pooled keep-alive connections; the backoff
+        between attempts waits without holding a thread."""
+        total = sum(len(batch) for batch in calls)
+        label = monitor.label
+        progress = itertools.count(1)
+
+        async with AsyncOllamaClient.from_config(self.config, monitor.controller.maximum) as client:
+
+            async def _single(element: Element) -> Dict[str, str]:
+                key = (element.section, element.key)
+                sub_element = self._sub_element(element, pending)
+                result = await self._with_retries_async(
+                    monitor,
+                    self._describe([element]),
+                    sum(len(v) for v in sub_element.fields.values()),
+                    lambda: translate_element_once_async(
+                        client,
                         sub_element,
                         to_language,
                         from_language,
                         model=model_tag,
                         config=self.config,
                         glossary=glossaries[key],
+                    ),
+                )
+                return result if result is not None else dict(pending[key])  # fallback: bronwaarden
+
+            async def _one(batch: List[Element]) -> List[Dict[str, str]]:
+                if len(batch) == 1:
+                    results = [await _single(batch[0])]
+                else:
+                    sub_elements = [self._sub_element(element, pending) for element in batch]
+                    glossary = self._batch_glossary(batch, glossaries)
+                    parsed = await self._with_retries_async(
+                        monitor,
+                        self._describe(batch),
+                        sum(len(v) for e in sub_elements for v in e.fields.values()),
+                        lambda: translate_batch_once_async(
+                            client,
+                            sub_elements,
+                            to_language,
+                            from_language,
+                            model=model_tag,
+                            config=self.config,
+                            glossary=glossary,
+                        ),
                     )
-                    break
-                except Exception as e:
-                    if attempt < LLM_ATTEMPTS:
-                        wait = LLM_RETRY_BACKOFF_SECONDS * attempt
-                        logger.warning(
-                            f"LLM-call ({label}) voor {element.section}/{element.key} mislukt bij poging"
-                            f" {attempt}/{LLM_ATTEMPTS} ({e}); nieuwe poging over {wait}s..."
-                        )
-                        time.sleep(wait)
+                    if parsed is None:
+                        results = [dict(pending[(e.section, e.key)]) for e in batch]
                     else:
-                        logger.warning(
-                            f"LLM-call ({label}) voor {element.section}/{element.key} definitief mislukt na"
-                            f" {LLM_ATTEMPTS} pogingen ({e}); bronwaarden behouden."
-                        )
-            logger.info(f"[{i + 1}/{total}] ({label}) {element.section}/{element.key} vertaald")
-            return result
+                        self._log_batch_fallbacks(label, batch, parsed)
+                        results = [r if r is not None else await _single(e) for e, r in zip(batch, parsed)]
+                for element in batch:
+                    logger.info(f"[{next(progress)}/{total}] ({label}) {element.section}/{element.key} vertaald")
+                return results
 
-        with ThreadPoolExecutor(max_workers=workers) as pool:
-            results = list(pool.map(_one, enumerate(elements)))
-        return {(e.section, e.key): r for e, r in zip(elements, results)}
+            batch_results = await asyncio.gather(*(_one(batch) for batch in calls))
+        return {(e.section, e.key): r for batch, rs in zip(calls, batch_results) for e, r in zip(batch, rs)}
 
     def _translate_level_with_llm(
         self,
@@ -262,8 +499,8 @@ class TranslationPipeline:
                     # Het zware model rekent lang per element; volle
                     # client-parallelliteit maakt de wachtrij zó diep dat de
                     # traagste elementen door hun read-timeout lopen
-                    # (waargenomen in de GGM-regeneratierun). De server is
-                    # toch de bottleneck: minder workers kost geen doorvoer.
+                    # (waargenomen in de GGM-regeneratierun). Start daarom
+                    # met minder requests; de adaptieve limiet stuurt bij.
                     max_workers=max(1, self.config.workers // 2),
                 )
                 results.update(heavy_results)
@@ -284,18 +521,30 @@ class TranslationPipeline:
         flat: List[Tuple[ResultKey, str, str]] = [
             (key, field_name, value) for key, fields in pending.items() for field_name, value in fields.items()
         ]
+        translations = nmt.iter_translations(
+            [value for _, _, value in flat],
+            to_language,
+            from_language,
+            self.config.nmt_model or "",
+            batch_size=self.config.nmt_batch_size,
+            max_batch_tokens=self.config.nmt_max_batch_tokens,
+            device=self.config.nmt_device,
+            threads=self.config.nmt_threads,
+        )
+        # Fields keep their source value until their translation arrives, so a window that fails only costs the
+        # texts that were not translated yet.
+        results: Dict[ResultKey, Dict[str, str]] = {key: dict(fields) for key, fields in pending.items()}
+        done = 0
         try:
-            translated = nmt.translate_texts(
-                [value for _, _, value in flat], to_language, from_language, self.config.nmt_model or ""
-            )
+            for (key, field_name, source_value), value in zip(flat, translations):
+                if field_name in NAME_FIELDS:
+                    value = reconcile_case(source_value, value)
+                results[key][field_name] = value
+                done += 1
         except Exception as e:
-            logger.warning(f"NMT-vertaling mislukt ({e}); bronwaarden behouden.")
-            return {key: dict(fields) for key, fields in pending.items()}
-        results: Dict[ResultKey, Dict[str, str]] = {key: {} for key in pending}
-        for (key, field_name, source_value), value in zip(flat, translated):
-            if field_name in NAME_FIELDS:
-                value = reconcile_case(source_value, value)
-            results[key][field_name] = value
+            logger.warning(
+                f"NMT-vertaling mislukt na {done} van {len(flat)} teksten ({e}); bronwaarden behouden voor de rest."
+            )
         return results
 
     def _translate_level_online(
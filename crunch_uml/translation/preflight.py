@@ -173,7 +173,7 @@ def _check_ollama(config: TranslationConfig) -> LLMStatus:
 def _check_termbanks(
     config: TranslationConfig, languages: Optional[set] = None
 ) -> Tuple[TermbankIndex, List[SourceReport]]:
-    index, reports = load_termbanks(config.termbank_paths, languages)
+    index, reports = load_termbanks(config.termbank_paths, languages, cache=config.termbank_cache)
 
     if config.termbank_max_age_days is not None:
         today = datetime.date.today()
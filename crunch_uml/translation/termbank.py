@@ -23,18 +23,30 @@ preflight; it is never configured per source.
 
 A missing or unreadable source yields a ``logging.warning`` and is skipped —
 never a crash, never silent wrong output.
+
+Parsing the full IATE export takes minutes, so ``load_termbanks`` can keep a
+compiled cache next to every source (see :class:`CompiledTermbank`), which
+later runs map instead of parsing as long as the source is unchanged.
 """
 
 from __future__ import annotations
 
+import bisect
 import difflib
+import heapq
+import json
 import logging
+import math
+import mmap
 import os
 import re
 import time
+from array import array
+from collections import Counter
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
 from lxml import etree
 from rdflib import Graph, URIRef
 from rdflib.namespace import DC, DCTERMS, OWL, RDFS, SKOS
@@ -357,11 +369,15 @@ def expand_paths(paths) -> List[str]:
     return expanded
 
 
+def _source_name(path: str) -> str:
+    return os.path.splitext(os.path.basename(path))[0]
+
+
 def load_source(
     path: str, priority: int, languages: Optional[set] = None
 ) -> Tuple[Optional[List[Concept]], SourceReport]:
     """Load one termbank file, auto-detecting TBX vs LOD."""
-    name = os.path.splitext(os.path.basename(path))[0]
+    name = _source_name(path)
     if not os.path.isfile(path):
         logger.warning(f"Termbank '{path}' bestaat niet of is geen bestand; bron overgeslagen.")
         return None, SourceReport(name=name, path=path, loaded=False, error="bestand niet gevonden")
@@ -384,14 +400,141 @@ def load_source(
 # ---------------------------------------------------------------------------
 
 FUZZY_CUTOFF = 0.85
+FUZZY_MATCHES = 5
+# Bigrams: longer postings than trigrams, but the bound of _NgramIndex loses
+# only one n-gram per matching block, so far fewer labels are left for
+# difflib to score. Measured faster on 1M labels
+# (tools/benchmark_termbank_lookup.py).
+NGRAM_SIZE = 2
+
+
+def _ngrams(text: str) -> List[str]:
+    return [text[i : i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)]
+
+
+def _min_matches(total: int, cutoff: float) -> int:
+    """The fewest matching characters for which difflib's ratio
+    ``2 * M / total`` reaches ``cutoff`` (with difflib's own float test)."""
+    matches = math.ceil(cutoff * total / 2)
+    while matches > 0 and 2.0 * (matches - 1) / total >= cutoff:
+        matches -= 1
+    while 2.0 * matches / total < cutoff:
+        matches += 1
+    return matches
+
+
+class _NgramIndex:
+    """Character n-gram inverted index over the labels of one language.
+
+    It narrows the labels ``difflib.get_close_matches`` has to score down to
+    those that can still reach the cutoff; the scoring itself is unchanged,
+    so the matches and their order are exactly those of a full scan.
+
+    Why nothing is lost: difflib's ratio is ``2 * M / (a + b)`` with ``M``
+    the characters in its ``k`` matching blocks. Consecutive blocks are
+    separated by an unmatched character in at least one of the strings, so
+    ``k <= (a - M) + (b - M) + 1``, and every block of length ``l`` holds
+    ``l - n + 1`` n-grams of the query that also occur in the label. A label
+    of length ``b`` therefore shares at least ``M - (n - 1) * k`` n-gram
+    positions with the query, ``M`` being at least :func:`_min_matches`, and
+    at least as many distinct query n-grams as it takes to cover that count
+    with the most frequent ones. The postings of the query n-grams give that
+    count for every label at once; labels of a length for which the bound
+    isn't positive (only very short ones) come from a per-length list
+    instead.
+
+    Postings are ``array('I')`` of label ids: compact while loading a full
+    IATE export, and counted without copying through ``numpy``."""
+
+    def __init__(self) -> None:
+        # CompiledTermbank._load_fuzzy puts its mapped columns in their place.
+        self.labels: Sequence[str] = []
+        self._lengths: Any = array("I")
+        self._postings: Dict[str, Any] = {}
+        self._by_length: Dict[int, Any] = {}
+
+    def add(self, label: str) -> None:
+        # Only an index built in memory grows; a mapped one is read-only.
+        assert isinstance(self.labels, list)
+        label_id = len(self.labels)
+        self.labels.append(label)
+        self._lengths.append(len(label))
+        self._by_length.setdefault(len(label), array("I")).append(label_id)
+        for gram in set(_ngrams(label)):
+            self._postings.setdefault(gram, array("I")).append(label_id)
+
+    def _required_grams(self, a: int, word_grams: Counter, cutoff: float) -> Tuple[List[int], Dict[int, int]]:
+        """The label lengths that can reach ``cutoff`` against a query of
+        length ``a``: those for which the bound isn't positive, and per other
+        length the number of distinct query n-grams such a label contains at
+        least."""
+        frequencies = sorted(word_grams.values(), reverse=True)
+        unbounded: List[int] = []
+        needed: Dict[int, int] = {}
+        for b in self._by_length:
+            matches = _min_matches(a + b, cutoff)
+            if matches > min(a, b):
+                continue
+            shared = matches - (NGRAM_SIZE - 1) * (a + b - 2 * matches + 1)
+            if shared <= 0:
+                unbounded.append(b)
+                continue
+            # The most repeated query n-grams cover the shared positions with
+            # the fewest distinct n-grams.
+            covered = distinct = 0
+            for frequency in frequencies:
+                if covered >= shared:
+                    break
+                covered += frequency
+                distinct += 1
+            if covered >= shared:
+                needed[b] = distinct
+        return unbounded, needed
+
+    def close_matches(self, word: str, n: int, cutoff: float) -> List[str]:
+        """``difflib.get_close_matches(word, self.labels, n, cutoff)``."""
+        return [label for _, label in self.scored_matches(word, n, cutoff)]
+
+    def scored_matches(self, word: str, n: int, cutoff: float) -> List[Tuple[float, str]]:
+        """The ``(ratio, label)`` pairs behind :meth:`close_matches`, so the
+        matches of several indexes can be merged in difflib's order."""
+        word_grams = Counter(_ngrams(word))
+        unbounded, needed = self._required_grams(len(word), word_grams, cutoff)
+        selected = [label_id for b in unbounded for label_id in self._by_length[b]]
+        postings = [self._postings[gram] for gram in word_grams if gram in self._postings]
+        if needed and postings:
+            # Distinct query n-grams per label, against the minimum for its
+            # length (out of reach for lengths that cannot match at all).
+            shared = np.bincount(np.concatenate([np.frombuffer(p, dtype=np.uintc) for p in postings]))
+            minimum = np.full(max(self._by_length) + 1, len(word_grams) + 1)
+            for b, distinct in needed.items():
+                minimum[b] = distinct
+            label_ids = np.flatnonzero(shared)
+            lengths = np.frombuffer(self._lengths, dtype=np.uintc)[: len(shared)][label_ids]
+            selected.extend(label_ids[shared[label_ids] >= minimum[lengths]].tolist())
+        # difflib.get_close_matches, keeping the scores.
+        scored = []
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(word)
+        for label_id in selected:
+            label = self.labels[label_id]
+            matcher.set_seq1(label)
+            if matcher.real_quick_ratio() >= cutoff and matcher.quick_ratio() >= cutoff and matcher.ratio() >= cutoff:
+                scored.append((matcher.ratio(), label))
+        return heapq.nlargest(n, scored)
 
 
 class TermbankIndex:
-    """All loaded concepts, indexed by (normalised label, language)."""
+    """All loaded concepts, indexed by (normalised label, language), plus a
+    character n-gram index per language for the fuzzy lookup. Sources read
+    from their compiled cache stay in a :class:`CompiledTermbank` and are
+    looked up alongside."""
 
     def __init__(self) -> None:
         self.concepts: List[Concept] = []
         self._by_label: Dict[Tuple[str, str], List[Concept]] = {}
+        self._fuzzy: Dict[str, _NgramIndex] = {}
+        self._compiled: List[CompiledTermbank] = []
 
     def add_concepts(self, concepts: List[Concept]) -> None:
         for concept in concepts:
@@ -399,12 +542,24 @@ class TermbankIndex:
             for lang, labels in concept.labels.items():
                 for label in labels:
                     key = (_norm(label), lang)
-                    bucket = self._by_label.setdefault(key, [])
+                    bucket = self._by_label.get(key)
+                    if bucket is None:
+                        bucket = self._by_label[key] = []
+                        self._fuzzy.setdefault(lang, _NgramIndex()).add(key[0])
                     if concept not in bucket:
                         bucket.append(concept)
 
+    def add_compiled(self, compiled: CompiledTermbank) -> None:
+        self._compiled.append(compiled)
+
     def __len__(self) -> int:
-        return len(self.concepts)
+        return len(self.concepts) + sum(len(compiled) for compiled in self._compiled)
+
+    def _concepts_for_label(self, label: str, lang: str) -> List[Concept]:
+        concepts = list(self._by_label.get((label, lang), []))
+        for compiled in self._compiled:
+            concepts.extend(compiled.concepts_for(label, lang))
+        return concepts
 
     def _candidates_for(self, concepts: List[Concept], source_term: str, to_lang: str, exact: bool) -> List[Candidate]:
         candidates = []
@@ -430,43 +585,417 @@ class TermbankIndex:
 
     def lookup(self, term: str, from_lang: str, to_lang: str) -> List[Candidate]:
         """Find translation candidates: exact match on the normalised source
-        label first, otherwise deterministic fuzzy matching (difflib). The
-        result is sorted by (source priority, reliability desc, uri) so equal
-        inputs always yield the same candidate order."""
+        label first, otherwise deterministic fuzzy matching (difflib, over the
+        labels the n-gram index preselects). The result is sorted by (source
+        priority, reliability desc, uri) so equal inputs always yield the
+        same candidate order."""
         if not term or not term.strip():
             return []
-        key = (_norm(term), from_lang)
-        exact_concepts = self._by_label.get(key, [])
+        exact_concepts = self._concepts_for_label(_norm(term), from_lang)
         candidates = self._candidates_for(exact_concepts, term, to_lang, exact=True)
 
         if not candidates:
-            same_lang_keys = [label for (label, lang) in self._by_label.keys() if lang == from_lang]
-            for match in difflib.get_close_matches(_norm(term), same_lang_keys, n=5, cutoff=FUZZY_CUTOFF):
-                concepts = self._by_label.get((match, from_lang), [])
+            indexes = [self._fuzzy[from_lang]] if from_lang in self._fuzzy else []
+            indexes.extend(index for index in (c.fuzzy(from_lang) for c in self._compiled) if index is not None)
+            # A label found in several indexes has the same ratio in each, so
+            # the best of the union are the matches of one scan over all labels.
+            scored = {m for index in indexes for m in index.scored_matches(_norm(term), FUZZY_MATCHES, FUZZY_CUTOFF)}
+            for _, match in heapq.nlargest(FUZZY_MATCHES, scored):
+                concepts = self._concepts_for_label(match, from_lang)
                 candidates.extend(self._candidates_for(concepts, term, to_lang, exact=False))
 
         candidates.sort(key=lambda c: (c.priority, -(c.reliability or 0), c.uri))
         return candidates
 
 
-def load_termbanks(paths, languages: Optional[set] = None) -> Tuple[TermbankIndex, List[SourceReport]]:
+# ---------------------------------------------------------------------------
+# Compiled cache
+# ---------------------------------------------------------------------------
+
+CACHE_EXTENSION = ".crunchtb"
+# Bump when the layout below changes: caches in an older layout are then
+# simply recompiled.
+CACHE_FORMAT = 1
+_CACHE_MAGIC = b"CRUNCHTB"
+_NO_RELIABILITY = np.iinfo(np.int64).min
+
+
+def cache_path(path: str, languages: Optional[set] = None) -> str:
+    """The compiled cache of a source: next to it, one per language filter,
+    so runs for different language pairs keep their own."""
+    suffix = "-".join(sorted(languages)) if languages is not None else "all"
+    return f"{path}.{suffix}{CACHE_EXTENSION}"
+
+
+def _cache_key(path: str, languages: Optional[set]) -> Dict[str, object]:
+    """What a cache must have been compiled from to be used: the source file
+    as it is now, the language filter and the cache layout."""
+    stat = os.stat(path)
+    return {
+        "format": CACHE_FORMAT,
+        "ngram_size": NGRAM_SIZE,
+        "source": os.path.abspath(path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "languages": sorted(languages) if languages is not None else None,
+    }
+
+
+def _offsets(counts: List[int]) -> np.ndarray:
+    """Start offsets of consecutive runs of ``counts`` items, plus the end."""
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(np.asarray(counts, dtype=np.int64), out=offsets[1:])
+    return offsets
+
+
+def _string_columns(name: str, strings: List[str]) -> Dict[str, np.ndarray]:
+    encoded = [string.encode() for string in strings]
+    return {
+        f"{name}_blob": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        f"{name}_offsets": _offsets([len(item) for item in encoded]),
+    }
+
+
+class _Strings(Sequence):
+    """A string column of the cache: UTF-8 bytes back to back plus their
+    offsets, decoded per item, so only what a lookup touches is read."""
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray, start: int = 0, stop: Optional[int] = None) -> None:
+        self._blob = blob
+        self._offsets = offsets
+        self._start = start
+        self._stop = len(offsets) - 1 if stop is None else stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __getitem__(self, i):
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        i += self._start
+        return self._blob[self._offsets[i] : self._offsets[i + 1]].tobytes().decode()
+
+    def slice(self, start: int, stop: int) -> _Strings:
+        return _Strings(self._blob, self._offsets, self._start + start, self._start + stop)
+
+
+def compile_termbank(concepts: List[Concept], target: str, header: Dict[str, object]) -> None:
+    """Write ``concepts`` as the compiled cache ``target``: the concepts
+    column by column, every (language, normalised label) key in sorted order
+    with the concepts it belongs to, and per language the n-gram postings
+    and per-length lists of :class:`_NgramIndex`. Source name and priority
+    are left out; they come from the run that opens the cache.
+
+    The file is written next to ``target`` and renamed into place, so a
+    concurrent run reads either the old cache or the new one."""
+    languages = sorted({lang for c in concepts for lang in (*c.labels, *c.definitions)})
+    lang_ids = {lang: i for i, lang in enumerate(languages)}
+    labels: List[str] = []
+    label_langs: List[int] = []
+    label_counts: List[int] = []
+    definitions: List[str] = []
+    definition_langs: List[int] = []
+    domains: List[str] = []
+    keys: Dict[Tuple[str, str], List[int]] = {}
+    for concept_id, concept in enumerate(concepts):
+        label_counts.append(sum(len(concept_labels) for concept_labels in concept.labels.values()))
+        for lang, concept_labels in concept.labels.items():
+            for label in concept_labels:
+                labels.append(label)
+                label_langs.append(lang_ids[lang])
+                ids = keys.setdefault((lang, _norm(label)), [])
+                if not ids or ids[-1] != concept_id:
+                    ids.append(concept_id)
+        for lang, definition in concept.definitions.items():
+            definitions.append(definition)
+            definition_langs.append(lang_ids[lang])
+        domains.extend(concept.domains)
+
+    sorted_keys = sorted(keys)
+    by_lang: Dict[str, List[str]] = {lang: [] for lang in languages}
+    for lang, label in sorted_keys:
+        by_lang[lang].append(label)
+    grams: List[str] = []
+    gram_keys: List[np.ndarray] = []
+    length_values: List[int] = []
+    length_keys: List[np.ndarray] = []
+    gram_lang_counts: List[int] = []
+    length_lang_counts: List[int] = []
+    for lang in languages:
+        # Label ids in the postings are positions within the language's
+        # block of sorted keys.
+        fuzzy = _NgramIndex()
+        for label in by_lang[lang]:
+            fuzzy.add(label)
+        for gram in sorted(fuzzy._postings):
+            grams.append(gram)
+            gram_keys.append(np.frombuffer(fuzzy._postings[gram], dtype=np.uintc))
+        for length in sorted(fuzzy._by_length):
+            length_values.append(length)
+            length_keys.append(np.frombuffer(fuzzy._by_length[length], dtype=np.uintc))
+        gram_lang_counts.append(len(fuzzy._postings))
+        length_lang_counts.append(len(fuzzy._by_length))
+
+    columns: Dict[str, np.ndarray] = {
+        **_string_columns("uri", [c.uri for c in concepts]),
+        **_string_columns("label", labels),
+        **_string_columns("definition", definitions),
+        **_string_columns("domain", domains),
+        **_string_columns("key", [label for _, label in sorted_keys]),
+        **_string_columns("gram", grams),
+        "reliability": np.array(
+            [_NO_RELIABILITY if c.reliability is None else c.reliability for c in concepts], dtype=np.int64
+        ),
+        "concept_label_offsets": _offsets(label_counts),
+        "label_lang": np.array(label_langs, dtype=np.uint16),
+        "concept_definition_offsets": _offsets([len(c.definitions) for c in concepts]),
+        "definition_lang": np.array(definition_langs, dtype=np.uint16),
+        "concept_domain_offsets": _offsets([len(c.domains) for c in concepts]),
+        "key_lang_offsets": _offsets([len(by_lang[lang]) for lang in languages]),
+        "key_lengths": np.array([len(label) for _, label in sorted_keys], dtype=np.uintc),
+        "key_concept_offsets": _offsets([len(keys[key]) for key in sorted_keys]),
+        "key_concepts": np.array([i for key in sorted_keys for i in keys[key]], dtype=np.uintc),
+        "gram_lang_offsets": _offsets(gram_lang_counts),
+        "gram_key_offsets": _offsets([len(postings) for postings in gram_keys]),
+        "gram_keys": np.concatenate(gram_keys) if gram_keys else np.zeros(0, dtype=np.uintc),
+        "length_lang_offsets": _offsets(length_lang_counts),
+        "length_values": np.array(length_values, dtype=np.uintc),
+        "length_key_offsets": _offsets([len(ids) for ids in length_keys]),
+        "length_keys": np.concatenate(length_keys) if length_keys else np.zeros(0, dtype=np.uintc),
+    }
+
+    # Every column starts on an 8-byte boundary, so it maps as-is.
+    layout: Dict[str, Tuple[int, str, int]] = {}
+    offset = 0
+    for name, column in columns.items():
+        layout[name] = (offset, column.dtype.str, len(column))
+        offset += -(-column.nbytes // 8) * 8
+    header_bytes = json.dumps(
+        {**header, "concepts": len(concepts), "label_languages": languages, "columns": layout}
+    ).encode()
+    start = -(-(len(_CACHE_MAGIC) + 8 + len(header_bytes)) // 8) * 8
+
+    tmp = f"{target}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(_CACHE_MAGIC)
+            f.write(len(header_bytes).to_bytes(8, "little"))
+            f.write(header_bytes)
+            for name, column in columns.items():
+                f.seek(start + layout[name][0])
+                column.tofile(f)
+        os.replace(tmp, target)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+class CompiledTermbank:
+    """One source read from its compiled cache through ``mmap``: opening it
+    reads only the header, lookups page in the parts of the columns they
+    touch and build :class:`Concept` objects for their hits alone."""
+
+    def __init__(self, buffer: mmap.mmap, header: Dict, start: int, source: str, priority: int) -> None:
+        self.header = header
+        self.source = source
+        self.priority = priority
+        self.languages: List[str] = header["label_languages"]
+        self._lang_ids = {lang: i for i, lang in enumerate(self.languages)}
+        self._buffer = buffer
+        self._columns: Dict[str, np.ndarray] = {}
+        for name, (offset, dtype, count) in header["columns"].items():
+            if count == 0:
+                self._columns[name] = np.zeros(0, dtype=dtype)
+            else:
+                self._columns[name] = np.frombuffer(buffer, dtype=dtype, count=count, offset=start + offset)
+        self._uris = self._strings("uri")
+        self._labels = self._strings("label")
+        self._definitions = self._strings("definition")
+        self._domains = self._strings("domain")
+        self._keys = self._strings("key")
+        self._grams = self._strings("gram")
+        self._concepts: Dict[int, Concept] = {}
+        self._fuzzy: Dict[str, Optional[_NgramIndex]] = {}
+
+    @classmethod
+    def open(cls, target: str, key: Dict[str, object], source: str, priority: int) -> Optional[CompiledTermbank]:
+        """The cache ``target`` if it was compiled for ``key``; None when it
+        is missing, stale or unreadable (the caller then parses the source)."""
+        try:
+            with open(target, "rb") as f:
+                if f.read(len(_CACHE_MAGIC)) != _CACHE_MAGIC:
+                    return None
+                header_size = int.from_bytes(f.read(8), "little")
+                header = json.loads(f.read(header_size))
+                if any(header.get(name) != value for name, value in key.items()):
+                    return None
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            start = -(-(len(_CACHE_MAGIC) + 8 + header_size) // 8) * 8
+            return cls(buffer, header, start, source, priority)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Termbank-cache '{target}' is onleesbaar ({e}); de bron wordt opnieuw ingelezen.")
+            return None
+
+    def _strings(self, name: str) -> _Strings:
+        return _Strings(self._columns[f"{name}_blob"], self._columns[f"{name}_offsets"])
+
+    def __len__(self) -> int:
+        return self.header["concepts"]
+
+    def report(self, path: str) -> SourceReport:
+        return SourceReport(
+            name=self.source,
+            path=path,
+            loaded=True,
+            concepts=len(self),
+            version=self.header.get("version"),
+            date=self.header.get("date"),
+        )
+
+    def _concept(self, concept_id: int) -> Concept:
+        concept = self._concepts.get(concept_id)
+        if concept is not None:
+            return concept
+        columns = self._columns
+        labels: Dict[str, List[str]] = {}
+        offsets = columns["concept_label_offsets"]
+        for i in range(offsets[concept_id], offsets[concept_id + 1]):
+            labels.setdefault(self.languages[columns["label_lang"][i]], []).append(self._labels[i])
+        offsets = columns["concept_definition_offsets"]
+        definitions = {
+            self.languages[columns["definition_lang"][i]]: self._definitions[i]
+            for i in range(offsets[concept_id], offsets[concept_id + 1])
+        }
+        offsets = columns["concept_domain_offsets"]
+        domains = [self._domains[i] for i in range(offsets[concept_id], offsets[concept_id + 1])]
+        reliability = int(columns["reliability"][concept_id])
+        concept = self._concepts[concept_id] = Concept(
+            uri=self._uris[concept_id],
+            source=self.source,
+            priority=self.priority,
+            labels=labels,
+            definitions=definitions,
+            domains=domains,
+            reliability=None if reliability == _NO_RELIABILITY else reliability,
+        )
+        return concept
+
+    def _lang_range(self, column: str, lang: str) -> Tuple[int, int]:
+        lang_id = self._lang_ids.get(lang)
+        if lang_id is None:
+            return 0, 0
+        offsets = self._columns[column]
+        return int(offsets[lang_id]), int(offsets[lang_id + 1])
+
+    def concepts_for(self, label: str, lang: str) -> List[Concept]:
+        """The concepts with normalised ``label`` in ``lang``."""
+        lo, hi = self._lang_range("key_lang_offsets", lang)
+        position = bisect.bisect_left(self._keys, label, lo, hi)
+        if position == hi or self._keys[position] != label:
+            return []
+        offsets = self._columns["key_concept_offsets"]
+        ids = self._columns["key_concepts"][offsets[position] : offsets[position + 1]]
+        return [self._concept(int(concept_id)) for concept_id in ids]
+
+    def fuzzy(self, lang: str) -> Optional[_NgramIndex]:
+        """The n-gram index over the labels of ``lang``, on the mapped
+        columns; built on first use, None without labels in ``lang``."""
+        if lang not in self._fuzzy:
+            self._fuzzy[lang] = self._load_fuzzy(lang)
+        return self._fuzzy[lang]
+
+    def _load_fuzzy(self, lang: str) -> Optional[_NgramIndex]:
+        lo, hi = self._lang_range("key_lang_offsets", lang)
+        if lo == hi:
+            return None
+        columns = self._columns
+        # _NgramIndex only indexes into these, so the mapped columns stand in
+        # for its lists and arrays.
+        index = _NgramIndex()
+        index.labels = self._keys.slice(lo, hi)
+        index._lengths = columns["key_lengths"][lo:hi]
+        offsets = columns["gram_key_offsets"]
+        index._postings = {
+            self._grams[g]: columns["gram_keys"][offsets[g] : offsets[g + 1]]
+            for g in range(*self._lang_range("gram_lang_offsets", lang))
+        }
+        offsets = columns["length_key_offsets"]
+        index._by_length = {
+            int(columns["length_values"][i]): columns["length_keys"][offsets[i] : offsets[i + 1]]
+            for i in range(*self._lang_range("length_lang_offsets", lang))
+        }
+        return index
+
+
+def _compile_source(
+    path: str,
+    priority: int,
+    languages: Optional[set],
+    key: Dict[str, object],
+    concepts: List[Concept],
+    report: SourceReport,
+) -> Optional[CompiledTermbank]:
+    target = cache_path(path, languages)
+    try:
+        compile_termbank(concepts, target, {**key, "version": report.version, "date": report.date})
+    except OSError as e:
+        logger.warning(
+            f"Termbank-cache '{target}' kon niet worden geschreven ({e}); de bron wordt elke run opnieuw ingelezen."
+        )
+        return None
+    return CompiledTermbank.open(target, key, report.name, priority)
+
+
+def load_termbanks(
+    paths, languages: Optional[set] = None, cache: bool = False
+) -> Tuple[TermbankIndex, List[SourceReport]]:
     """Load every source from the (already expanded or raw) path list into a
     single index. Sources that fail to load are reported and skipped.
 
     ``languages`` is the set of primary language subtags the current run
     actually needs (source + target). Passing it keeps huge sources like the
     full IATE export memory-bounded: only the relevant langSets are stored
-    and concepts without at least two of those languages are dropped."""
+    and concepts without at least two of those languages are dropped.
+
+    With ``cache`` every source is read from its compiled cache
+    (:func:`cache_path`) as long as the file, its size and mtime and the
+    language filter are unchanged, and compiled into it after parsing
+    otherwise."""
     if languages is not None:
         languages = {lang.lower().split("-")[0] for lang in languages}
     index = TermbankIndex()
     reports: List[SourceReport] = []
     for priority, path in enumerate(expand_paths(paths)):
         started = time.time()
+        # Keyed before parsing: a source that changes meanwhile is parsed
+        # again next run.
+        key = _cache_key(path, languages) if cache and os.path.isfile(path) else None
+        if key is not None:
+            compiled = CompiledTermbank.open(cache_path(path, languages), key, _source_name(path), priority)
+            if compiled is not None:
+                report = compiled.report(path)
+                reports.append(report)
+                index.add_compiled(compiled)
+                logger.info(
+                    f"Termbank '{report.name}': {report.concepts} concepten uit de cache geladen in"
+                    f" {time.time() - started:.2f}s"
+                )
+                continue
         concepts, report = load_source(path, priority, languages)
         reports.append(report)
-        if concepts:
+        compiled = None
+        if concepts is not None and key is not None:
+            # Also without concepts for these languages: that outcome is just
+            # as expensive to reach again.
+            compiled = _compile_source(path, priority, languages, key, concepts, report)
+        if compiled is not None:
+            index.add_compiled(compiled)
+        elif concepts:
             index.add_concepts(concepts)
+        if concepts:
             logger.info(
                 f"Termbank '{report.name}': {report.concepts} concepten geladen in {time.time() - started:.1f}s"
             )
@@ -0,0 +1,209 @@
+"""
+Persistent translation memory for the string-based translation backends.
+
+Activate via the env-var ``CRUNCH_UML_TRANSLATION_MEMORY`` (or the CLI flag
+``--translation_memory``) with the path of an SQLite file. When set,
+:func:`crunch_uml.lang.translate` and
+:func:`crunch_uml.ollama_translator.translate` look every string up in that
+file before calling a backend, and store each fresh translation in it.
+
+Why on disk?
+
+* The i18n file only remembers translations of elements that are still in
+  the model under the same GUID. A renamed class, a new model version with
+  fresh GUIDs or a second model sharing the same codelijsten pays again for
+  strings that were already translated before.
+* Calls to Google/Bing are rate limited and Ollama calls take seconds each;
+  an SQLite lookup takes microseconds.
+
+Entries are keyed by ``(source text, from, to, backend, model, context
+hash)``: a translation made by another backend, another Ollama model or
+with another prompt context is never reused. The file is bounded by
+``CRUNCH_UML_TRANSLATION_MEMORY_MAX_ENTRIES`` (default 100000, ``0`` is
+unbounded); when it grows beyond that the least recently used entries are
+evicted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger()
+
+ENV_TRANSLATION_MEMORY = "CRUNCH_UML_TRANSLATION_MEMORY"
+ENV_TRANSLATION_MEMORY_MAX_ENTRIES = "CRUNCH_UML_TRANSLATION_MEMORY_MAX_ENTRIES"
+DEFAULT_MAX_ENTRIES = 100000
+# Evict in batches down to this fraction of the maximum, so a full memory
+# doesn't run a DELETE for every single new translation.
+EVICT_TO_FRACTION = 0.9
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS translations (
+    source TEXT NOT NULL,
+    from_language TEXT NOT NULL,
+    to_language TEXT NOT NULL,
+    backend TEXT NOT NULL,
+    model TEXT NOT NULL,
+    context_hash TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (source, from_language, to_language, backend, model, context_hash)
+);
+CREATE INDEX IF NOT EXISTS ix_translations_last_used ON translations (last_used);
+"""
+
+
+def context_hash(context: Optional[Dict[str, Any]]) -> str:
+    """Stable hash of a prompt context dict; empty string without context."""
+    if not context:
+        return ""
+    return hashlib.sha1(json.dumps(context, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class TranslationMemory:
+    """SQLite backed translation memory, safe to share between threads."""
+
+    def __init__(self, path: str, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # The i18n renderer translates on a ThreadPool; all access goes
+        # through self._lock, so one shared connection is fine.
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(_SCHEMA)
+        self._size = self._connection.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def get(
+        self,
+        source: str,
+        from_language: str,
+        to_language: str,
+        backend: str,
+        model: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> Optional[str]:
+        """Return the remembered translation, or None when there is none."""
+        key = (source, from_language, to_language, backend, model or "", context_hash(context))
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT translation FROM translations WHERE source = ? AND from_language = ? AND to_language = ?"
+                " AND backend = ? AND model = ? AND context_hash = ?",
+                key,
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._connection.execute(
+                "UPDATE translations SET last_used = ? WHERE source = ? AND from_language = ? AND to_language = ?"
+                " AND backend = ? AND model = ? AND context_hash = ?",
+                (time.time(), *key),
+            )
+            self._connection.commit()
+            return row[0]
+
+    def put(
+        self,
+        source: str,
+        from_language: str,
+        to_language: str,
+        backend: str,
+        translation: str,
+        model: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None,
+    ):
+        """Remember ``translation`` and evict the least recently used entries when the memory is full."""
+        key = (source, from_language, to_language, backend, model or "", context_hash(context))
+        now = time.time()
+        with self._lock:
+            cursor = self._connection.execute(
+                "INSERT OR IGNORE INTO translations VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (*key, translation, now, now),
+            )
+            if cursor.rowcount == 1:
+                self._size += 1
+            else:
+                self._connection.execute(
+                    "UPDATE translations SET translation = ?, last_used = ? WHERE source = ? AND from_language = ?"
+                    " AND to_language = ? AND backend = ? AND model = ? AND context_hash = ?",
+                    (translation, now, *key),
+                )
+            self.stores += 1
+            if self.max_entries and self._size > self.max_entries:
+                self._evict(int(self.max_entries * EVICT_TO_FRACTION))
+            self._connection.commit()
+
+    def _evict(self, keep: int):
+        cursor = self._connection.execute(
+            "DELETE FROM translations WHERE rowid IN"
+            " (SELECT rowid FROM translations ORDER BY last_used ASC LIMIT ?)",
+            (self._size - keep,),
+        )
+        self.evictions += cursor.rowcount
+        self._size -= cursor.rowcount
+        logger.debug(f"Translation memory {self.path}: evicted {cursor.rowcount} least recently used entries")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "entries": self._size,
+        }
+
+    def log_stats(self):
+        lookups = self.hits + self.misses
+        if lookups:
+            logger.info(
+                f"Translation memory {self.path}: {self.hits} of {lookups} lookups served from memory"
+                f" ({self.hits / lookups:.0%}), {self.stores} new translations stored,"
+                f" {self.evictions} evicted, {self._size} entries"
+            )
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+_memory: Optional[TranslationMemory] = None
+_memory_lock = threading.Lock()
+
+
+def get_translation_memory() -> Optional[TranslationMemory]:
+    """Return the translation memory configured in the environment, or None
+    when ``CRUNCH_UML_TRANSLATION_MEMORY`` is not set."""
+    global _memory
+    path = os.environ.get(ENV_TRANSLATION_MEMORY, "").strip()
+    if not path:
+        return None
+    raw = os.environ.get(ENV_TRANSLATION_MEMORY_MAX_ENTRIES, "").strip()
+    try:
+        max_entries = int(raw) if raw else DEFAULT_MAX_ENTRIES
+    except ValueError:
+        logger.warning(f"Ongeldige waarde '{raw}' voor {ENV_TRANSLATION_MEMORY_MAX_ENTRIES}; gebruik default.")
+        max_entries = DEFAULT_MAX_ENTRIES
+    with _memory_lock:
+        if _memory is None or _memory.path != path:
+            if _memory is not None:
+                _memory.close()
+            _memory = TranslationMemory(path, max_entries=max_entries)
+        _memory.max_entries = max_entries
+        return _memory
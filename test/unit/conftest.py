@@ -1,9 +1,50 @@
 import os
+import re
 import shutil
 
 import pytest
+from sqlalchemy import event, select
 
 import crunch_uml.const as const
+import crunch_uml.db as db
+
+# Random ids that crunch_uml generates, e.g. for placeholder classes of associations with one unknown end.
+GENERATED_ID = re.compile(r"EAID_[0-9a-f]{8}_[0-9a-f]{4}_[0-9a-f]{4}_[0-9a-f]{4}_[0-9a-f]{12}")
+
+
+def schema_rows(database, schema_name):
+    """All rows of a schema per table, sorted and with generated ids masked, to compare two imports."""
+    result = {}
+    for table in db.Base.metadata.sorted_tables:
+        if "schema_id" not in table.c:
+            continue
+        columns = [column for column in table.columns if column.name != "schema_id"]
+        rows = database.session.execute(select(*columns).where(table.c.schema_id == schema_name)).all()
+        result[table.name] = sorted(
+            (tuple(GENERATED_ID.sub("<generated>", v) if isinstance(v, str) else v for v in row) for row in rows),
+            key=repr,
+        )
+    return result
+
+
+@pytest.fixture
+def count_queries():
+    """Run a function and return its result with the SQL statements it sent to the engine."""
+
+    def count(engine, func):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            result = func()
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+        return result, statements
+
+    return count
 
 
 @pytest.fixture
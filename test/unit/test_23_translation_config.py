@@ -21,6 +21,10 @@ def _clean_env(monkeypatch):
         cfg.ENV_OLLAMA_TIMEOUT,
         cfg.ENV_OLLAMA_MIN_VERSION,
         cfg.ENV_NMT_MODEL,
+        cfg.ENV_NMT_BATCH_SIZE,
+        cfg.ENV_NMT_MAX_BATCH_TOKENS,
+        cfg.ENV_NMT_DEVICE,
+        cfg.ENV_NMT_THREADS,
         cfg.ENV_ALLOW_ONLINE,
         cfg.ENV_WORKERS,
         cfg.ENV_SEED,
@@ -40,6 +44,7 @@ def test_defaults_when_no_env_set(monkeypatch):
     assert c.ollama_timeout == cfg.DEFAULT_OLLAMA_TIMEOUT
     assert c.ollama_min_version is None
     assert c.nmt_model is None
+    assert (c.nmt_batch_size, c.nmt_device, c.nmt_threads) == (16, "cpu", 0)
     assert c.allow_online is False
     assert c.workers == cfg.DEFAULT_WORKERS
     assert c.seed == cfg.DEFAULT_SEED
@@ -78,12 +83,17 @@ def test_numeric_settings_and_online_flag(monkeypatch):
     monkeypatch.setenv(cfg.ENV_WORKERS, "4")
     monkeypatch.setenv(cfg.ENV_SEED, "7")
     monkeypatch.setenv(cfg.ENV_ALLOW_ONLINE, "1")
+    monkeypatch.setenv(cfg.ENV_NMT_BATCH_SIZE, "32")
+    monkeypatch.setenv(cfg.ENV_NMT_MAX_BATCH_TOKENS, "2048")
+    monkeypatch.setenv(cfg.ENV_NMT_DEVICE, "cuda:0")
+    monkeypatch.setenv(cfg.ENV_NMT_THREADS, "6")
     c = cfg.TranslationConfig.from_env()
     assert c.termbank_max_age_days == 365
     assert c.ollama_timeout == 30
     assert c.workers == 4
     assert c.seed == 7
     assert c.allow_online is True
+    assert (c.nmt_batch_size, c.nmt_max_batch_tokens, c.nmt_device, c.nmt_threads) == (32, 2048, "cuda:0", 6)
 
 
 def test_invalid_numbers_degrade_with_warning(monkeypatch, caplog):
@@ -316,13 +316,14 @@ def test_persistent_llm_failure_keeps_source_after_all_attempts(monkeypatch, cap
 
 
 def test_without_llm_the_nmt_safety_net_translates(monkeypatch):
-    def fake_nmt(texts, to_lang, from_lang, template):
+    def fake_nmt(texts, to_lang, from_lang, template, **options):
         assert template == "nmt-model"
-        return [f"NMT:{t}" for t in texts]
+        assert options["batch_size"] == 16 and options["device"] == "cpu"
+        return iter([f"NMT:{t}" for t in texts])
 
     from crunch_uml.translation import nmt
 
-    monkeypatch.setattr(nmt, "translate_texts", fake_nmt)
+    monkeypatch.setattr(nmt, "iter_translations", fake_nmt)
     pipe = TranslationPipeline(_preflight(llm_enabled=False, termbanks=(), nmt_enabled=True))
     element = Element(section="classes", key="E1", fields={"definitie": "Het bouwen."})
 
@@ -330,6 +331,29 @@ def test_without_llm_the_nmt_safety_net_translates(monkeypatch):
     assert results[("classes", "E1")]["definitie"] == "NMT:Het bouwen."
 
 
+def test_nmt_failure_keeps_the_translations_of_earlier_windows(monkeypatch, caplog):
+    def failing_nmt(texts, to_lang, from_lang, template, **options):
+        yield from (f"NMT:{t}" for t in texts[:2])
+        raise RuntimeError("out of memory")
+
+    from crunch_uml.translation import nmt
+
+    monkeypatch.setattr(nmt, "iter_translations", failing_nmt)
+    pipe = TranslationPipeline(_preflight(llm_enabled=False, termbanks=(), nmt_enabled=True))
+    elements = [
+        Element(section="classes", key="E1", fields={"definitie": "Het bouwen."}),
+        Element(section="classes", key="E2", fields={"definitie": "Het slopen.", "toelichting": "Met een kraan."}),
+    ]
+
+    with caplog.at_level("WARNING"):
+        results = pipe.translate_elements(elements, "en", "nl")
+
+    assert results[("classes", "E1")]["definitie"] == "NMT:Het bouwen."
+    assert results[("classes", "E2")]["definitie"] == "NMT:Het slopen."
+    assert results[("classes", "E2")]["toelichting"] == "Met een kraan."
+    assert any("na 2 van 3 teksten" in m for m in caplog.messages)
+
+
 def test_without_llm_and_nmt_online_runs_only_when_allowed(monkeypatch):
     calls = []
 
@@ -3,11 +3,13 @@ Tests for crunch_uml.translation.nmt — the optional NMT safety net.
 
 The 'transformers' dependency is optional and not installed in CI: the
 module must import cleanly without it, report unavailability, and work
-against a mocked transformers pipeline when it is present.
+against a mocked transformers pipeline when it is present, translating in
+length buckets and streaming the results in input order.
 """
 
 from __future__ import annotations
 
+import logging
 import sys
 import types
 
@@ -38,11 +40,11 @@ def test_resolve_model_name_substitutes_placeholders():
 def test_translate_texts_uses_pipeline_and_caches_per_model(monkeypatch):
     created = []
 
-    def fake_pipeline(task, model):
-        assert task == "translation"
+    def fake_pipeline(task, model, device):
+        assert task == "translation" and device == "cpu"
         created.append(model)
 
-        def run(texts):
+        def run(texts, batch_size):
             return [{"translation_text": f"VERTAALD:{t}"} for t in texts]
 
         return run
@@ -58,3 +60,55 @@ def test_translate_texts_uses_pipeline_and_caches_per_model(monkeypatch):
     # Tweede batch met hetzelfde taalpaar: het model wordt niet opnieuw geladen.
     nmt.translate_texts(["nogmaals"], "en", "nl", "Helsinki-NLP/opus-mt-{from}-{to}")
     assert created == ["Helsinki-NLP/opus-mt-nl-en"]
+
+
+def test_length_buckets_sort_and_cap_batches():
+    lengths = [3, 40, 2, 5, 2, 300, 4]
+    assert nmt.length_buckets(lengths, batch_size=3, max_batch_tokens=100) == [[2, 4, 0], [6, 3], [1], [5]]
+    # Within the token cap only the batch size splits.
+    assert nmt.length_buckets(lengths, batch_size=4, max_batch_tokens=10_000) == [[2, 4, 0, 6], [3, 1, 5]]
+    assert nmt.length_buckets([], batch_size=4, max_batch_tokens=100) == []
+
+
+def test_translations_stream_in_input_order(monkeypatch, caplog):
+    calls = []
+
+    class FakeTokenizer:
+        def __call__(self, texts):
+            return {"input_ids": [[0] * (len(text.split()) + 1) for text in texts]}
+
+    class FakeTranslator:
+        tokenizer = FakeTokenizer()
+
+        def __call__(self, texts, batch_size):
+            calls.append(list(texts))
+            return [{"translation_text": text.upper()} for text in texts]
+
+    monkeypatch.setattr(nmt, "_pipelines", {("opus-nl-en", "cpu"): FakeTranslator()})
+    monkeypatch.setattr(nmt, "WINDOW_BATCHES", 1)
+    texts = ["een lange definitie van een begrip " * 10, "pand", "de kadastrale grens", "perceel"]
+
+    with caplog.at_level(logging.INFO):
+        stream = nmt.iter_translations(texts, "en", "nl", "opus-{from}-{to}", batch_size=2, max_batch_tokens=64)
+        assert next(stream) == texts[0].upper()
+        # Only the window of the first two texts ran, sorted by length.
+        assert calls == [["pand"], [texts[0]]]
+        assert list(stream) == [text.upper() for text in texts[1:]]
+        assert calls[2:] == [["perceel", "de kadastrale grens"]]
+
+    assert "4 teksten in 3 batches" in caplog.text and "tokens/s" in caplog.text
+
+
+def test_threads_are_set_once_per_pipeline(monkeypatch):
+    threads = []
+    fake_torch = types.ModuleType("torch")
+    fake_torch.set_num_threads = threads.append
+    fake = types.ModuleType("transformers")
+    fake.pipeline = lambda task, model, device: lambda texts, batch_size: [{"translation_text": t} for t in texts]
+    monkeypatch.setitem(sys.modules, "torch", fake_torch)
+    monkeypatch.setitem(sys.modules, "transformers", fake)
+    monkeypatch.setattr(nmt, "_pipelines", {})
+
+    for _ in range(2):
+        assert nmt.translate_texts(["pand"], "en", "nl", "opus-{from}-{to}", threads=2) == ["pand"]
+    assert threads == [2]
@@ -0,0 +1,50 @@
+import crunch_uml.db as db
+import crunch_uml.schema as sch
+from crunch_uml import cli, const
+from crunch_uml.parsers.xmiparser import iter_xmi_utf8
+
+from .conftest import schema_rows
+
+MONUMENTEN = "./test/data/GGM_Monumenten_EA2.1.xml"
+SCHULDHULP = "./test/data/Model Schuldhulpverlening.xml"
+
+
+def _import(inputfile, inputtype, schema_name, streaming):
+    args = ["-sch", schema_name, "import", "-f", inputfile, "-t", inputtype]
+    if streaming:
+        args.append("--xmi_streaming")
+    assert cli.main(args) == 0
+
+
+def test_transcoding_is_independent_of_chunk_size():
+    with open(MONUMENTEN, "rb") as f:
+        text = f.read().decode("windows-1252")
+    expected = text.replace("encoding='windows-1252'", "encoding='utf-8'", 1).encode("utf-8")
+
+    # Small chunks split multi-byte UTF-8 output and the XML declaration itself.
+    assert b"".join(iter_xmi_utf8(MONUMENTEN, chunk_size=7)) == expected
+    assert b"".join(iter_xmi_utf8(MONUMENTEN)) == expected
+
+
+def test_streaming_eaxmi_import_equals_regular_import():
+    _import(MONUMENTEN, "eaxmi", "regular", streaming=False)
+    _import(MONUMENTEN, "eaxmi", "streaming", streaming=True)
+
+    database = db.Database(const.DATABASE_URL, db_create=False)
+    schema = sch.Schema(database, schema_name="streaming")
+    assert schema.count_package() == 3
+    assert schema.count_class() == 11
+    assert schema.count_attribute() == 41
+    assert schema.count_diagrams() > 0
+    clazz = schema.get_class("EAID_4AD539EC_A308_43da_B025_17A1647303F3")
+    assert clazz.definitie == "Het bouwen van een bouwwerk."
+
+    assert schema_rows(database, "streaming") == schema_rows(database, "regular")
+
+
+def test_streaming_xmi_import_with_orphans_equals_regular_import():
+    _import(SCHULDHULP, "xmi", "regular_xmi", streaming=False)
+    _import(SCHULDHULP, "xmi", "streaming_xmi", streaming=True)
+
+    database = db.Database(const.DATABASE_URL, db_create=False)
+    assert schema_rows(database, "streaming_xmi") == schema_rows(database, "regular_xmi")
@@ -0,0 +1,38 @@
+from lxml import etree
+
+from crunch_uml.parsers.xmiparser import build_type_reference_index, load_xmi
+
+MONUMENTEN = "./test/data/GGM_Monumenten_EA2.1.xml"
+
+
+def test_type_reference_index_matches_per_type_xpath():
+    root = load_xmi(MONUMENTEN)
+    ns = root.nsmap
+    model = root.xpath('//uml:Model[@xmi:type="uml:Model"][1]', namespaces=ns)[0]
+
+    index = build_type_reference_index(model, ns)
+    assert len(index) > 0
+
+    idrefs = {node.get("{" + ns["xmi"] + "}idref") for node in model.iter("type")} - {None}
+    for idref in idrefs:
+        expected = [
+            typenode.getparent()
+            for typenode in model.xpath(".//type[@xmi:idref='" + idref + "']", namespaces=ns)
+            if typenode.getparent().tag == "ownedAttribute"
+            and typenode.getparent().get("{" + ns["xmi"] + "}type") == "uml:Property"
+        ]
+        assert index.get(idref, []) == expected
+
+
+def test_type_reference_index_skips_association_ends():
+    ns = {"xmi": "http://schema.omg.org/spec/XMI/2.1"}
+    node = etree.fromstring(
+        f'<model xmlns:xmi="{ns["xmi"]}">'
+        '<ownedAttribute xmi:type="uml:Property" xmi:id="a1"><type xmi:idref="C1"/></ownedAttribute>'
+        '<ownedEnd xmi:type="uml:Property" xmi:id="e1"><type xmi:idref="C1"/></ownedEnd>'
+        '<ownedAttribute xmi:type="uml:Property" xmi:id="a2"><type/></ownedAttribute>'
+        "</model>"
+    )
+    index = build_type_reference_index(node, ns)
+    assert list(index) == ["C1"]
+    assert [p.get("{" + ns["xmi"] + "}id") for p in index["C1"]] == ["a1"]
@@ -0,0 +1,47 @@
+import crunch_uml.db as db
+import crunch_uml.schema as sch
+from crunch_uml import const
+from crunch_uml.parsers.eaxmiparser import (
+    PHASE3_ORDER,
+    EAExtensionProcessor,
+    index_children,
+)
+from crunch_uml.parsers.xmiparser import load_xmi
+
+# The XPath expressions phase 3 used to run on the whole extension, per kind of modifier.
+LEGACY_QUERIES = {
+    "package": ".//element[@xmi:type='uml:Package' and @xmi:idref]",
+    "class": ".//element[(@xmi:type='uml:Class' or @xmi:type='uml:DataType') and @xmi:idref]",
+    "enumeration": ".//element[@xmi:type='uml:Enumeration' and @xmi:idref]",
+    "attribute": ".//attribute[@xmi:idref]",
+    "association": ".//connector[@xmi:idref and properties/@ea_type='Association']",
+    "generalization": ".//connector[@xmi:idref and properties/@ea_type='Generalization']",
+    "diagram": ".//diagram[@xmi:id]",
+}
+
+
+def test_extension_index_selects_same_elements_as_xpath():
+    database = db.Database(const.DATABASE_URL, db_create=False)
+    schema = sch.Schema(database, schema_name="extension_index")
+
+    for inputfile in ["./test/data/GGM_Monumenten_EA2.1.xml", "./test/data/InkomenMIM.xml"]:
+        root = load_xmi(inputfile)
+        ns = root.nsmap
+        extension = root.xpath("//xmi:Extension", namespaces=ns)[0]
+
+        refs = EAExtensionProcessor(ns, schema).index_extension(extension)
+        assert [kind for kind, _ in PHASE3_ORDER] == list(refs)
+        for kind, query in LEGACY_QUERIES.items():
+            assert refs[kind] == extension.xpath(query, namespaces=ns), kind
+        assert len(refs["class"]) > 0 and len(refs["attribute"]) > 0 and len(refs["diagram"]) > 0
+
+
+def test_index_children_groups_by_tag_in_document_order():
+    root = load_xmi("./test/data/GGM_Monumenten_EA2.1.xml")
+    for node in root.xpath("//xmi:Extension//element[@xmi:idref]", namespaces=root.nsmap)[:20]:
+        children = index_children(node)
+        for tag in ("model", "properties", "project", "tags", "missing"):
+            assert children[tag] == node.xpath(f"./{tag}")
+        assert dict(index_children(node, "tags", "missing")) == {
+            tag: nodes for tag, nodes in children.items() if tag == "tags"
+        }
@@ -0,0 +1,74 @@
+import pytest
+
+import crunch_uml.db as db
+import crunch_uml.schema as sch
+from crunch_uml import cli, const
+
+from .conftest import schema_rows
+
+
+def _import(inputfile, inputtype, schema_name, *extra):
+    assert cli.main(["-sch", schema_name, "import", "-f", inputfile, "-t", inputtype, *extra]) == 0
+
+
+@pytest.mark.parametrize(
+    "inputfile,inputtype",
+    [
+        ("./test/data/GGM_Monumenten_EA2.1.xml", "eaxmi"),
+        ("./test/data/Model Schuldhulpverlening.xml", "xmi"),
+        ("./test/data/Monumenten.qea", "qea"),
+    ],
+)
+def test_bulk_import_equals_regular_import(inputfile, inputtype):
+    _import(inputfile, inputtype, f"nonbulk_{inputtype}")
+    # A small chunk size makes every table span several statements
+    _import(inputfile, inputtype, f"bulk_{inputtype}", "--bulk_insert", "--bulk_insert_chunk_size", "7")
+
+    database = db.Database(const.DATABASE_URL, db_create=False)
+    bulk = schema_rows(database, f"bulk_{inputtype}")
+    assert bulk["classes"]
+    assert bulk == schema_rows(database, f"nonbulk_{inputtype}")
+
+
+def test_bulk_import_updates_existingschema_rows():
+    _import("./test/data/GGM_Monumenten_EA2.1.xml", "xmi", "bulk_twice", "--bulk_insert")
+    _import("./test/data/GGM_Monumenten_Changed_EA2.1.xml", "xmi", "bulk_twice", "--bulk_insert")
+    _import("./test/data/GGM_Monumenten_EA2.1.xml", "xmi", "regular_twice")
+    _import("./test/data/GGM_Monumenten_Changed_EA2.1.xml", "xmi", "regular_twice")
+
+    database = db.Database(const.DATABASE_URL, db_create=False)
+    assert schema_rows(database, "bulk_twice") == schema_rows(database, "regular_twice")
+
+
+def test_bulk_writer_flushes_before_queries():
+    database = db.Database(const.DATABASE_URL, db_create=False)
+    schema = sch.Schema(database, schema_name="bulk_writer")
+    with schema.bulk_insert(chunk_size=2):
+        schema.save(db.Package(id="P1", name="Root"))
+        schema.save(db.Package(id="P2", name="Child", parent_package_id="P1"))
+        schema.save(db.Class(id="C1", name="Klasse", package_id="P2"))
+        assert schema.bulk_writer.buffers[db.Class.__table__]
+
+        # A query sees the buffered rows, like it would see objects pending in the session
+        assert schema.get_class("C1").package.parent_package_id == "P1"
+        assert not any(schema.bulk_writer.buffers.values())
+
+        # Objects already in the session are saved the regular way
+        clazz = schema.get_class("C1")
+        clazz.definitie = "Aangepast"
+        schema.save(clazz)
+    database.commit()
+
+    assert schema.count_package() == 2
+    assert schema.get_class("C1").definitie == "Aangepast"
+
+
+def test_bulk_writer_discards_buffer_on_error():
+    database = db.Database(const.DATABASE_URL, db_create=False)
+    schema = sch.Schema(database, schema_name="bulk_error")
+    with pytest.raises(ValueError):
+        with schema.bulk_insert():
+            schema.save(db.Package(id="P1", name="Root"))
+            raise ValueError("afgebroken")
+    assert schema.bulk_writer is None
+    assert schema.count_package() == 0
@@ -0,0 +1,109 @@
+import sqlite3
+
+import pytest
+from sqlalchemy import exc as sa_exc
+
+import crunch_uml.db as db
+from crunch_uml import cli, const
+from crunch_uml.exceptions import CrunchException
+
+MONUMENTEN = "./test/data/GGM_Monumenten_EA2.1.xml"
+
+
+def _dispose_singleton():
+    inst = db.Database._instance
+    if inst is not None:
+        inst.session.close()
+        inst.engine.dispose()
+        db.Database._instance = None
+
+
+@pytest.fixture(autouse=True)
+def _reset_database_singleton():
+    """Every test opens its own database file with its own profile."""
+    _dispose_singleton()
+    yield
+    _dispose_singleton()
+
+
+def _pragmas(database):
+    with database.engine.connect() as connection:
+        return {
+            pragma: connection.exec_driver_sql(f"PRAGMA {pragma}").scalar()
+            for pragma in ("journal_mode", "synchronous", "cache_size", "mmap_size", "temp_store", "query_only")
+        }
+
+
+def _import(url, schema_name, profile):
+    args = ["-db_url", url, "-db_profile", profile, "-sch", schema_name, "import", "-f", MONUMENTEN, "-t", "eaxmi"]
+    assert cli.main(args) == 0
+
+
+def test_safe_profile_keeps_sqlite_defaults(tmp_path):
+    database = db.Database(f"sqlite:///{tmp_path / 'safe.db'}", db_create=True)
+    pragmas = _pragmas(database)
+    assert pragmas["journal_mode"] == "delete"
+    assert pragmas["synchronous"] == 2  # FULL
+    assert pragmas["query_only"] == 0
+
+
+def test_fast_import_profile(tmp_path):
+    path = tmp_path / "fast.db"
+    _import(f"sqlite:///{path}", "fast", const.DB_PROFILE_FAST_IMPORT)
+
+    database = db.Database(f"sqlite:///{path}", db_profile=const.DB_PROFILE_FAST_IMPORT)
+    assert _pragmas(database) == {
+        "journal_mode": "wal",
+        "synchronous": 1,  # NORMAL
+        "cache_size": db.SQLITE_CACHE_SIZE,
+        "mmap_size": db.SQLITE_MMAP_SIZE,
+        "temp_store": 2,  # MEMORY
+        "query_only": 0,
+    }
+    database.session.close()
+
+    # The run marker is written with synchronous FULL and completed after the data was committed
+    con = sqlite3.connect(path)
+    try:
+        runs = con.execute("SELECT schema_id, completed_at FROM crunch_uml_runs").fetchall()
+        classes = con.execute("SELECT count(*) FROM classes WHERE schema_id = 'fast'").fetchone()[0]
+    finally:
+        con.close()
+    assert len(runs) == 1 and runs[0][0] == "fast" and runs[0][1] is not None
+    assert classes == 11
+
+
+def test_fast_import_profile_without_wal_keeps_synchronous_full():
+    database = db.Database("sqlite://", db_create=True, db_profile=const.DB_PROFILE_FAST_IMPORT)
+    pragmas = _pragmas(database)
+    assert pragmas["journal_mode"] == "memory"
+    assert pragmas["synchronous"] == 2
+
+
+def test_readonly_profile(tmp_path):
+    path = tmp_path / "readonly.db"
+    url = f"sqlite:///{path}"
+    _import(url, "readonly", const.DB_PROFILE_SAFE)
+    _dispose_singleton()
+
+    database = db.Database(url, db_profile=const.DB_PROFILE_READONLY)
+    assert _pragmas(database)["query_only"] == 1
+    assert database.count_class() == 11
+    database.session.add(db.Package(id="P1", schema_id="readonly", name="Nieuw"))
+    with pytest.raises(sa_exc.OperationalError):
+        database.commit()
+    database.rollback()
+
+    with pytest.raises(CrunchException):
+        db.Database(url, db_create=True, db_profile=const.DB_PROFILE_READONLY)
+
+    # Exports work with the readonly profile
+    outputfile = tmp_path / "readonly.json"
+    args = ["-db_url", url, "-db_profile", "readonly", "-sch", "readonly", "export", "-f", str(outputfile)]
+    assert cli.main([*args, "-t", "json"]) == 0
+    assert outputfile.exists()
+
+
+def test_readonly_profile_does_not_create_database(tmp_path):
+    with pytest.raises(CrunchException):
+        db.Database(f"sqlite:///{tmp_path / 'missing.db'}", db_profile=const.DB_PROFILE_READONLY)
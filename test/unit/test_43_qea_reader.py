@@ -0,0 +1,42 @@
+import sqlite3
+
+import pytest
+
+from crunch_uml.exceptions import CrunchException
+from crunch_uml.parsers.qeaparser import QEA_TABLES, QEAReader, QEATable
+
+MONUMENTEN = "./test/data/Monumenten.qea"
+
+
+def test_qea_table_lookups():
+    table = QEATable("t_object", ("Object_ID", "Name"), [(3, "Monument"), (7, "Adres")], key="Object_ID")
+    assert len(table) == 2
+    assert table.get(7, "Name") == "Adres"
+    assert table.get(99, "Name") is None
+    assert list(table.rows("Name", "Object_ID")) == [("Monument", 3), ("Adres", 7)]
+
+
+def test_qea_reader_reads_every_table_once():
+    tables = QEAReader(MONUMENTEN).read()
+    assert set(tables) == set(QEA_TABLES)
+
+    con = sqlite3.connect(MONUMENTEN)
+    try:
+        for name, table in tables.items():
+            assert len(table) == con.execute(f"SELECT count(*) FROM {name}").fetchone()[0]
+        object_types = dict(con.execute("SELECT Object_ID, Object_Type FROM t_object").fetchall())
+    finally:
+        con.close()
+    assert {obj_id: tables["t_object"].get(obj_id, "Object_Type") for obj_id in object_types} == object_types
+
+    # Reading the tables one after the other gives the same result
+    sequential = QEAReader(MONUMENTEN, workers=1).read()
+    assert {name: table.columns for name, table in sequential.items()} == {
+        name: table.columns for name, table in tables.items()
+    }
+
+
+def test_qea_reader_does_not_create_missing_repository(tmp_path):
+    with pytest.raises(CrunchException, match="not found"):
+        QEAReader(str(tmp_path / "missing.qea")).read()
+    assert not (tmp_path / "missing.qea").exists()
@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+
+import crunch_uml.db as db
+import crunch_uml.schema as sch
+from crunch_uml import cli, const
+from crunch_uml.parsers.eaxmiparser import EAXMIParser
+
+from .conftest import schema_rows
+
+MONUMENTEN = "./test/data/GGM_Monumenten_EA2.1.xml"
+MONUMENTEN_CHANGED = "./test/data/GGM_Monumenten_Changed_EA2.1.xml"
+
+
+def _import(inputfile, schema_name, inputtype="eaxmi"):
+    assert cli.main(["-sch", schema_name, "import", "-f", inputfile, "-t", inputtype]) == 0
+
+
+def _incremental(database, schema_name, inputfile):
+    schema = sch.Schema(database, schema_name=schema_name)
+    with schema.incremental_import() as incremental:
+        EAXMIParser().parse(SimpleNamespace(inputfile=inputfile, skip_xmi_relations=False), incremental.staging)
+    database.commit()
+    return incremental.counts
+
+
+def test_incremental_import_only_writes_changes():
+    assert cli.main(["-sch", "incremental", "import", "-f", MONUMENTEN, "-t", "eaxmi", "--incremental"]) == 0
+    database = db.Database(const.DATABASE_URL, db_create=False)
+    rows = sum(len(table_rows) for table_rows in schema_rows(database, "incremental").values())
+
+    again = _incremental(database, "incremental", MONUMENTEN)
+    assert again == {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": rows}
+
+    changed = _incremental(database, "incremental", MONUMENTEN_CHANGED)
+    assert changed["inserted"] and changed["updated"] and changed["deleted"] and changed["unchanged"]
+
+    # The result is the same as importing the changed model into an empty schema
+    _import(MONUMENTEN_CHANGED, "incremental_fresh")
+    database = db.Database(const.DATABASE_URL, db_create=False)
+    assert schema_rows(database, "incremental") == schema_rows(database, "incremental_fresh")
+
+
+def test_regular_import_clears_fingerprints():
+    _import(MONUMENTEN, "incremental_regular")
+    database = db.Database(const.DATABASE_URL, db_create=False)
+    database.save(db.Class(id="EAID_extra", schema_id="incremental_regular", name="Extra"))
+
+    # Without fingerprints every imported row is rewritten, rows that were not imported incrementally stay
+    counts = _incremental(database, "incremental_regular", MONUMENTEN)
+    assert counts["updated"] > 0 and counts["inserted"] == counts["deleted"] == counts["unchanged"] == 0
+    assert sch.Schema(database, schema_name="incremental_regular").get_class("EAID_extra") is not None
+    assert database.get_fingerprints("incremental_regular", db.Class.__tablename__)
+    database.close()
+
+    _import(MONUMENTEN, "incremental_regular", "xmi")
+    database = db.Database(const.DATABASE_URL, db_create=False)
+    assert not database.get_fingerprints("incremental_regular", db.Class.__tablename__)
+
+
+def test_failed_incremental_import_writes_nothing():
+    database = db.Database(const.DATABASE_URL, db_create=False)
+    schema = sch.Schema(database, schema_name="incremental_failed")
+    try:
+        with schema.incremental_import() as incremental:
+            incremental.staging.save(db.Package(id="P1", name="Root"))
+            raise ValueError("afgebroken")
+    except ValueError:
+        pass
+    assert schema.count_package() == 0
+    assert not database.get_fingerprints("incremental_failed", db.Package.__tablename__)
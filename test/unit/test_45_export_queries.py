@@ -0,0 +1,59 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.ext.hybrid import hybrid_property
+
+import crunch_uml.schema as sch
+from crunch_uml import cli, const, db
+from crunch_uml.renderers.pandasrenderer import (
+    CSVRenderer,
+    JSONRenderer,
+    export_attributes,
+    object_as_dict,
+)
+
+
+@pytest.fixture(scope="module")
+def schema():
+    assert (
+        cli.main(["-sch", "export_queries", "import", "-f", "./test/data/GGM_Monumenten_EA2.1.xml", "-t", "eaxmi"]) == 0
+    )
+    database = db.Database(const.DATABASE_URL, db_create=False)
+    return sch.Schema(database, schema_name="export_queries")
+
+
+def test_export_attributes_match_columns_and_hybrids():
+    for model in (db.Package, db.Class, db.Attribute, db.Enumeratie, db.Association, db.DiagramClass):
+        hybrids = {
+            attr
+            for attr in dir(model)
+            if hasattr(getattr(model, attr), "descriptor")
+            and isinstance(getattr(model, attr).descriptor, hybrid_property)
+        }
+        assert export_attributes(model) == tuple(sorted({attr.key for attr in model.__mapper__.column_attrs} | hybrids))
+    assert {"domain", "domain_name", "is_domain"} < set(export_attributes(db.Package))
+
+
+def test_json_export_runs_one_query_per_table(schema, count_queries):
+    schema.database.session.expunge_all()
+    _, statements = count_queries(
+        schema.database.engine, lambda: JSONRenderer().get_all_data(SimpleNamespace(filter=None), schema)
+    )
+    # One query per model table, plus one for the package domains
+    assert len(statements) == len(db.Base.metadata.tables) + 1
+
+
+def test_csv_export_runs_one_query_per_table(schema, tmp_path, count_queries):
+    args = SimpleNamespace(entity_name=None, mapper="{}", outputfile=str(tmp_path / "export"))
+    schema.database.session.expunge_all()
+    _, statements = count_queries(schema.database.engine, lambda: CSVRenderer().render(args, schema))
+    assert len(statements) == len(db.Base.metadata.tables) + 1
+
+
+def test_domain_from_package_domains_matches_package_lookup(schema):
+    session = schema.get_session()
+    domains = {package.id: package.domain_name for package in schema.get_all_packages()}
+    for clazz in schema.get_all_classes():
+        assert object_as_dict(clazz, session, domains)[const.COLUMN_DOMEIN_IV3] == (
+            object_as_dict(clazz, session)[const.COLUMN_DOMEIN_IV3]
+        )
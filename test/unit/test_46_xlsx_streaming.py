@@ -0,0 +1,50 @@
+from types import SimpleNamespace
+
+import pytest
+from openpyxl import load_workbook
+from sqlalchemy import event
+
+import crunch_uml.schema as sch
+from crunch_uml import cli, const, db
+from crunch_uml.renderers.xlsxrenderer import XLSXRenderer
+
+
+@pytest.fixture(scope="module")
+def schema():
+    assert (
+        cli.main(["-sch", "xlsx_streaming", "import", "-f", "./test/data/GGM_Monumenten_EA2.1.xml", "-t", "eaxmi"]) == 0
+    )
+    database = db.Database(const.DATABASE_URL, db_create=False)
+    return sch.Schema(database, schema_name="xlsx_streaming")
+
+
+def test_xlsx_export_streams_rows(schema, tmp_path, monkeypatch):
+    # Small batches, so every table is fetched in several parts
+    monkeypatch.setattr(const, "EXPORT_YIELD_PER", 3)
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    outputfile = tmp_path / "export.xlsx"
+    schema.database.session.expunge_all()
+    event.listen(schema.database.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        XLSXRenderer().render(SimpleNamespace(mapper="{}", filter=None, outputfile=str(outputfile)), schema)
+    finally:
+        event.remove(schema.database.engine, "before_cursor_execute", before_cursor_execute)
+    # One query per table plus one for the package domains, however many rows
+    assert len(statements) == len(db.Base.metadata.tables) + 1
+
+    wb = load_workbook(outputfile, read_only=True)
+    assert wb.sheetnames == list(db.Base.metadata.tables)
+    header, *rows = wb["attributes"].values
+    assert len(rows) == schema.count_attribute()
+
+    header, *rows = wb["classes"].values
+    assert len(rows) == schema.count_class()
+    domains = schema.get_package_domains()
+    for row in rows:
+        clazz = schema.get_class(row[header.index("id")])
+        assert row[header.index(const.COLUMN_DOMEIN_IV3)] == domains.get(clazz.package_id, clazz.domein_iv3)
+        assert row[header.index("name")] == clazz.name
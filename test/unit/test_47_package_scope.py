@@ -0,0 +1,72 @@
+import pytest
+
+import crunch_uml.db as db
+import crunch_uml.schema as sch
+from crunch_uml import cli, const
+
+SCOPES = ("get_classes_inscope", "get_enumerations_inscope", "get_associations_inscope", "get_generalizations_inscope")
+
+
+@pytest.fixture(scope="module")
+def schema():
+    args = ["-sch", "package_scope", "import", "-f", "./test/data/GGM_Onderwijs_EA2.1.xml", "-t", "eaxmi"]
+    assert cli.main(args) == 0
+    database = db.Database(const.DATABASE_URL, db_create=False)
+    return sch.Schema(database, schema_name="package_scope")
+
+
+def test_package_scope_equals_recursive_scope(schema):
+    packages = schema.get_all_packages()
+    expected = {(package.id, name): getattr(package, name)() for package in packages for name in SCOPES}
+    assert any(expected[(package.id, "get_classes_inscope")] for package in packages)
+    assert any(expected[(package.id, "get_associations_inscope")] for package in packages)
+
+    with schema.package_scope() as scope:
+        for package in packages:
+            for name in SCOPES:
+                assert getattr(package, name)() == expected[(package.id, name)], f"{name} of {package.name}"
+    assert scope.queries == len(packages) * len(SCOPES)
+    assert db.PACKAGE_SCOPE_KEY not in schema.database.session.info
+
+
+def test_package_scope_memoizes_per_package(schema, count_queries):
+    root = schema.get_all_packages()[0].get_root_package()
+
+    with schema.package_scope() as scope:
+        classes, statements = count_queries(schema.database.engine, root.get_classes_inscope)
+        assert classes and len(statements) == 1
+        assert "WITH RECURSIVE" in statements[0].upper()
+
+        # Memoized for the rest of the block, also in a nested block
+        with schema.package_scope() as nested:
+            assert nested is scope
+            again, statements = count_queries(schema.database.engine, root.get_classes_inscope)
+        assert again is classes and statements == []
+
+        for name in SCOPES[1:]:
+            _, statements = count_queries(schema.database.engine, getattr(root, name))
+            assert len(statements) == 1
+    assert scope.queries == len(SCOPES)
+
+
+def test_package_scope_follows_the_package_tree(schema):
+    with schema.package_scope():
+        schema.save(db.Package(id="scope_root", name="Root"))
+        schema.save(db.Package(id="scope_child", name="Child", parent_package_id="scope_root"))
+        schema.save(db.Package(id="scope_grandchild", name="Grandchild", parent_package_id="scope_child"))
+        schema.save(db.Package(id="scope_other", name="Other"))
+        for clazz_id, package_id in (("A", "scope_root"), ("B", "scope_grandchild"), ("C", "scope_other")):
+            schema.save(db.Class(id=f"scope_{clazz_id}", name=clazz_id, package_id=package_id))
+        schema.save(db.Association(id="scope_AB", src_class_id="scope_A", dst_class_id="scope_B"))
+        schema.save(db.Association(id="scope_AC", src_class_id="scope_A", dst_class_id="scope_C"))
+        schema.save(db.Generalization(id="scope_BA", subclass_id="scope_B", superclass_id="scope_A"))
+        schema.database.session.flush()
+
+        root = schema.get_package("scope_root")
+        child = schema.get_package("scope_child")
+        assert {clazz.id for clazz in root.get_classes_inscope()} == {"scope_A", "scope_B"}
+        assert {clazz.id for clazz in child.get_classes_inscope()} == {"scope_B"}
+        assert {assoc.id for assoc in root.get_associations_inscope()} == {"scope_AB"}
+        assert {gener.id for gener in root.get_generalizations_inscope()} == {"scope_BA"}
+        assert child.get_associations_inscope() == set() and child.get_generalizations_inscope() == set()
+    schema.database.rollback()
@@ -0,0 +1,92 @@
+import pytest
+
+import crunch_uml.db as db
+import crunch_uml.schema as sch
+from crunch_uml import cli, const
+
+from .conftest import GENERATED_ID, schema_rows
+
+
+def _object_copy(database, schema_from, package_id, schema_name):
+    schema_to = sch.Schema(database, schema_name)
+    schema_to.clean()
+    kopie = schema_from.get_package(package_id).get_copy(None)
+    schema_to.add(kopie, recursive=True, processed_objects=set())
+    database.commit()
+    database.session.expire_all()
+
+
+def _transform(package_id, schema_from, schema_to):
+    args = ["transform", "-ttp", "copy", "-sch_from", schema_from, "-sch_to", schema_to, "-rt_pkg", package_id]
+    assert cli.main(args) == 0
+
+
+@pytest.mark.parametrize(
+    "inputfile,inputtype",
+    [
+        ("./test/data/GGM_Onderwijs_EA2.1.xml", "eaxmi"),
+        ("./test/data/Materialize_Generalizations.xml", "eaxmi"),
+        ("./test/data/Monumenten.qea", "qea"),
+    ],
+)
+def test_package_copy_equals_object_copy(inputfile, inputtype):
+    schema_name = f"copy_source_{inputtype}"
+    assert cli.main(["-sch", schema_name, "import", "-f", inputfile, "-t", inputtype]) == 0
+    database = db.Database(const.DATABASE_URL, db_create=False)
+    schema_from = sch.Schema(database, schema_name)
+
+    copied = 0
+    for package_id in [package.id for package in schema_from.get_all_packages()]:
+        package_copy = sch.PackageCopy(schema_from, sch.Schema(database, "copy_sql"), package_id)
+        if not package_copy.is_self_contained():
+            continue
+        _transform(package_id, schema_name, "copy_sql")
+        _object_copy(database, schema_from, package_id, "copy_orm")
+
+        rows = schema_rows(database, "copy_sql")
+        assert rows == schema_rows(database, "copy_orm"), package_id
+        copied += bool(rows["classes"])
+    assert copied
+
+
+def test_package_copy_writes_enumerations_outside_scope():
+    assert (
+        cli.main(
+            ["-sch", "copy_enum_source", "import", "-f", "./test/data/Materialize_Generalizations.xml", "-t", "eaxmi"]
+        )
+        == 0
+    )
+    database = db.Database(const.DATABASE_URL, db_create=False)
+    schema_from = sch.Schema(database, "copy_enum_source")
+    root = next(package for package in schema_from.get_all_packages() if package.parent_package is None)
+
+    counts = sch.PackageCopy(schema_from, sch.Schema(database, "copy_enum"), root.id).copy()
+    database.commit()
+    schema_to = sch.Schema(database, "copy_enum")
+    assert counts["classes"] == schema_to.count_class()
+    generated = [enum for enum in schema_to.get_all_enumerations() if GENERATED_ID.fullmatch(enum.id)]
+    assert generated
+    for enum in generated:
+        assert enum.literals and all(GENERATED_ID.fullmatch(literal.id) for literal in enum.literals)
+        assert [
+            attribute.clazz.package_id
+            for attribute in schema_to.get_all_attributes()
+            if attribute.enumeration_id == enum.id
+        ] == [enum.package_id]
+
+
+def test_copy_transformer_copies_diagram_elements_outside_tree():
+    assert cli.main(["-sch", "copy_diagram_source", "import", "-f", "./test/data/Test_models.xml", "-t", "eaxmi"]) == 0
+    database = db.Database(const.DATABASE_URL, db_create=False)
+    schema_from = sch.Schema(database, "copy_diagram_source")
+    package_id = next(
+        package.id
+        for package in schema_from.get_all_packages()
+        if not sch.PackageCopy(schema_from, sch.Schema(database, "copy_diagram"), package.id).is_self_contained()
+    )
+
+    _transform(package_id, "copy_diagram_source", "copy_diagram")
+    _object_copy(database, schema_from, package_id, "copy_diagram_orm")
+    rows = schema_rows(database, "copy_diagram")
+    assert rows["classes"]
+    assert rows == schema_rows(database, "copy_diagram_orm")
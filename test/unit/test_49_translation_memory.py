@@ -0,0 +1,149 @@
+"""
+Tests for the persistent translation memory.
+
+Mock-based like test_22: no translator service or Ollama server is
+contacted. Covered are the memory itself (keys, LRU eviction, statistics,
+persistence across instances) and the lookups in ``lang.translate`` and
+``ollama_translator.translate``.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+import pytest
+
+import crunch_uml.lang as lang
+import crunch_uml.ollama_translator as ot
+import crunch_uml.translation_memory as tm
+
+
+@pytest.fixture
+def memory_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "memory" / "translations.sqlite")
+    monkeypatch.setenv(tm.ENV_TRANSLATION_MEMORY, path)
+    monkeypatch.delenv(tm.ENV_TRANSLATION_MEMORY_MAX_ENTRIES, raising=False)
+    monkeypatch.delenv("CRUNCH_UML_TRANSLATE_BACKEND", raising=False)
+    yield path
+    if tm._memory is not None:
+        tm._memory.close()
+        tm._memory = None
+
+
+def test_memory_is_keyed_on_languages_backend_model_and_context(memory_path):
+    memory = tm.TranslationMemory(memory_path)
+    memory.put("hallo", "nl", "en", "ollama", "hello", model="a", context={"section": "classes"})
+
+    assert memory.get("hallo", "nl", "en", "ollama", model="a", context={"section": "classes"}) == "hello"
+    assert memory.get("hallo", "nl", "de", "ollama", model="a", context={"section": "classes"}) is None
+    assert memory.get("hallo", "nl", "en", "translators") is None
+    assert memory.get("hallo", "nl", "en", "ollama", model="b", context={"section": "classes"}) is None
+    assert memory.get("hallo", "nl", "en", "ollama", model="a") is None
+    assert memory.stats() == {"hits": 1, "misses": 4, "stores": 1, "evictions": 0, "entries": 1}
+
+    # Overwriting an entry does not grow the memory
+    memory.put("hallo", "nl", "en", "ollama", "hi", model="a", context={"section": "classes"})
+    assert memory.get("hallo", "nl", "en", "ollama", model="a", context={"section": "classes"}) == "hi"
+    assert len(memory) == 1
+    memory.close()
+
+    # Persisted on disk
+    reopened = tm.TranslationMemory(memory_path)
+    assert len(reopened) == 1
+    assert reopened.get("hallo", "nl", "en", "ollama", model="a", context={"section": "classes"}) == "hi"
+    reopened.close()
+
+
+def test_memory_evicts_least_recently_used_entries(memory_path):
+    memory = tm.TranslationMemory(memory_path, max_entries=10)
+    for i in range(10):
+        memory.put(f"woord{i}", "nl", "en", "translators", f"word{i}")
+    # Touch the oldest entry, it must survive the eviction
+    assert memory.get("woord0", "nl", "en", "translators") == "word0"
+
+    memory.put("woord10", "nl", "en", "translators", "word10")
+    assert len(memory) == int(10 * tm.EVICT_TO_FRACTION)
+    assert memory.stats()["evictions"] == 11 - len(memory)
+    assert memory.get("woord0", "nl", "en", "translators") == "word0"
+    assert memory.get("woord10", "nl", "en", "translators") == "word10"
+    assert memory.get("woord1", "nl", "en", "translators") is None
+    memory.close()
+
+
+def test_lang_translate_consults_memory_before_translators(memory_path, monkeypatch):
+    calls: List[str] = []
+
+    def fake_ts(value, to_language, from_language, **kw):
+        calls.append(value)
+        return f"TS:{value}"
+
+    monkeypatch.setattr(lang.ts, "translate_text", fake_ts)
+
+    assert lang.translate("hallo", "en", "nl") == "TS:hallo"
+    assert lang.translate("hallo", "en", "nl") == "TS:hallo"
+    assert lang.translate("hallo", "de", "nl") == "TS:hallo"
+    assert calls == ["hallo", "hallo"]
+    assert tm.get_translation_memory().stats()["hits"] == 1
+
+
+def test_lang_translate_remembers_per_translator(memory_path, monkeypatch):
+    translators: List[str] = []
+
+    def flaky_ts(value, to_language, from_language, translator=None, **kw):
+        translators.append(translator)
+        if translator == lang.DEFAULT_TRANSLATOR and value == "doei":
+            raise RuntimeError("rate limited")
+        return f"{translator}:{value}"
+
+    monkeypatch.setattr(lang.ts, "translate_text", flaky_ts)
+
+    assert lang.translate("hallo", "en", "nl") == f"{lang.DEFAULT_TRANSLATOR}:hallo"
+    assert lang.translate("doei", "en", "nl") == f"{lang.ALTERNATIVE_TRANSLATOR}:doei"
+    memory = tm.get_translation_memory()
+    assert memory.get("hallo", "nl", "en", "translators", model=lang.DEFAULT_TRANSLATOR) == "alibaba:hallo"
+    assert memory.get("doei", "nl", "en", "translators", model=lang.ALTERNATIVE_TRANSLATOR) == "google:doei"
+    assert memory.get("doei", "nl", "en", "translators", model=lang.DEFAULT_TRANSLATOR) is None
+
+    # Both are served from the memory
+    assert lang.translate("hallo", "en", "nl") == "alibaba:hallo"
+    assert lang.translate("doei", "en", "nl") == "google:doei"
+    assert translators == [lang.DEFAULT_TRANSLATOR, lang.DEFAULT_TRANSLATOR, lang.ALTERNATIVE_TRANSLATOR]
+
+
+def test_lang_translate_does_not_remember_failures(memory_path, monkeypatch):
+    def failing_ts(*a, **kw):
+        raise RuntimeError("rate limited")
+
+    monkeypatch.setattr(lang.ts, "translate_text", failing_ts)
+    assert lang.translate("hallo", "en", "nl", max_retries=1) == "hallo"
+    assert len(tm.get_translation_memory()) == 0
+
+
+def test_ollama_translate_consults_memory_per_model(memory_path, monkeypatch):
+    calls: List[Dict[str, Any]] = []
+
+    class _Response:
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {"message": {"content": "hello"}}
+
+    def fake_post(url, json=None, timeout=None, **kw):
+        calls.append(json)
+        return _Response()
+
+    monkeypatch.setattr(ot.requests, "post", fake_post)
+    monkeypatch.setenv("CRUNCH_UML_OLLAMA_MODEL", "model-a")
+
+    assert ot.translate("hallo", "en", "nl") == "hello"
+    assert ot.translate("hallo", "en", "nl") == "hello"
+    assert len(calls) == 1
+    assert ot.translate("hallo", "en", "nl", context={"section": "classes"}) == "hello"
+    assert ot.translate("hallo", "en", "nl", model="model-b") == "hello"
+    assert [call["model"] for call in calls] == ["model-a", "model-a", "model-b"]
+
+
+def test_memory_disabled_without_env(monkeypatch):
+    monkeypatch.delenv(tm.ENV_TRANSLATION_MEMORY, raising=False)
+    assert tm.get_translation_memory() is None
@@ -0,0 +1,119 @@
+"""
+Tests for the asyncio Ollama client and the async LLM passes.
+
+No Ollama server is needed: the client gets an ``httpx.MockTransport`` whose
+handler answers every ``/api/chat`` request. Covered:
+
+* the async pass yields the same results as the thread-based pass;
+* at most ``max_workers`` requests are in flight at the same time;
+* transient failures are retried with backoff, persistent ones keep the
+  source values.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Dict, List
+
+import httpx
+import pytest
+
+import crunch_uml.translation.pipeline as pipeline_mod
+from crunch_uml.translation.config import TranslationConfig
+from crunch_uml.translation.llm import Element
+from crunch_uml.translation.ollama_client import AsyncOllamaClient
+from crunch_uml.translation.pipeline import TranslationPipeline
+from crunch_uml.translation.preflight import LLMStatus, PreflightResult, ResolvedModel
+
+
+def _preflight(workers: int, ollama_async: bool = True, max_workers: int = 0) -> PreflightResult:
+    config = TranslationConfig(workers=workers, max_workers=max_workers, ollama_async=ollama_async)
+    result = PreflightResult(config=config)
+    result.llm = LLMStatus(
+        enabled=True, workhorses=[ResolvedModel(requested="wp1", tag="wp1")], heavy=None, voting_enabled=False
+    )
+    return result
+
+
+def _elements(n: int) -> List[Element]:
+    return [Element(section="attributes", key=f"E{i}", fields={"name": f"veld{i}"}) for i in range(n)]
+
+
+def _answer(request: httpx.Request) -> httpx.Response:
+    payload = json.loads(request.content)
+    fields = json.loads(payload["messages"][-1]["content"].rsplit("\n", 1)[-1])
+    content = json.dumps({name: value.replace("veld", "field") for name, value in fields.items()})
+    return httpx.Response(200, json={"message": {"content": content}})
+
+
+def _install_transport(monkeypatch, handler) -> None:
+    class MockedClient(AsyncOllamaClient):
+        @classmethod
+        def from_config(cls, config, max_concurrency):
+            return cls(
+                config.ollama_url, config.ollama_timeout, max_concurrency, transport=httpx.MockTransport(handler)
+            )
+
+    monkeypatch.setattr(pipeline_mod, "AsyncOllamaClient", MockedClient)
+
+
+def test_async_pass_equals_thread_pass(monkeypatch):
+    _install_transport(monkeypatch, _answer)
+    elements = _elements(20)
+
+    async_results = TranslationPipeline(_preflight(workers=4)).translate_elements(elements, "en", "nl")
+
+    def fake_post(url, json=None, timeout=None, **kw):
+        response = _answer(httpx.Request("POST", url, json=json))
+        response.request = httpx.Request("POST", url)
+        return response
+
+    monkeypatch.setattr("crunch_uml.translation.llm.requests.post", fake_post)
+    thread_results = TranslationPipeline(_preflight(workers=4, ollama_async=False)).translate_elements(
+        elements, "en", "nl"
+    )
+
+    assert async_results == thread_results
+    assert async_results[("attributes", "E7")] == {"name": "field7"}
+
+
+def test_async_pass_bounds_requests_in_flight(monkeypatch):
+    in_flight = {"now": 0, "max": 0}
+
+    async def slow_answer(request):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        return _answer(request)
+
+    _install_transport(monkeypatch, slow_answer)
+    results = TranslationPipeline(_preflight(workers=3, max_workers=3)).translate_elements(_elements(12), "en", "nl")
+
+    assert len(results) == 12
+    assert in_flight["max"] == 3
+
+
+@pytest.mark.parametrize("failures,expected", [(1, "field0"), (pipeline_mod.LLM_ATTEMPTS, "veld0")])
+def test_async_pass_retries_failed_requests(monkeypatch, failures, expected):
+    monkeypatch.setattr(pipeline_mod, "LLM_RETRY_BACKOFF_SECONDS", 0)
+    calls: Dict[str, int] = {"n": 0}
+
+    def flaky(request):
+        calls["n"] += 1
+        if calls["n"] <= failures:
+            return httpx.Response(503)
+        return _answer(request)
+
+    _install_transport(monkeypatch, flaky)
+    results = TranslationPipeline(_preflight(workers=2)).translate_elements(_elements(1), "en", "nl")
+
+    assert results[("attributes", "E0")] == {"name": expected}
+    assert calls["n"] == min(failures + 1, pipeline_mod.LLM_ATTEMPTS)
+
+
+def test_client_requires_context_manager():
+    client = AsyncOllamaClient("http://localhost:11434", 10, 2)
+    with pytest.raises(RuntimeError):
+        asyncio.run(client.chat({}))
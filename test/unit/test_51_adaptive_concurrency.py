@@ -0,0 +1,114 @@
+"""
+Tests for crunch_uml.translation.concurrency — the AIMD limit per model and
+the per-pass statistics of the translation pipeline. No model is called:
+the controller is fed latencies directly, the pipeline gets a fake
+``translate_element_once``.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import crunch_uml.translation.pipeline as pipeline_mod
+from crunch_uml.translation.concurrency import AIMDController, PassMonitor
+from crunch_uml.translation.config import TranslationConfig
+from crunch_uml.translation.llm import Element
+from crunch_uml.translation.pipeline import TranslationPipeline
+from crunch_uml.translation.preflight import LLMStatus, PreflightResult, ResolvedModel
+
+
+def test_steady_latency_increases_limit_additively():
+    controller = AIMDController("m", initial=2, maximum=4)
+    for _ in range(4):
+        controller.record(time.monotonic(), 1.0, 100, ok=True)
+    assert controller.limit == 3
+    for _ in range(100):
+        controller.record(time.monotonic(), 1.0, 100, ok=True)
+    assert controller.limit == 4
+
+
+def test_errors_halve_the_limit_once_per_round():
+    controller = AIMDController("m", initial=8, maximum=16)
+    queued = time.monotonic()
+    controller.record(queued, 1.0, 100, ok=False)
+    assert controller.limit == 4
+    # Started before the decrease: part of the same overload.
+    controller.record(queued, 1.0, 100, ok=False)
+    assert controller.limit == 4
+    controller.record(time.monotonic(), 1.0, 100, ok=False)
+    assert controller.limit == 2
+    for _ in range(3):
+        controller.record(time.monotonic(), 1.0, 100, ok=False)
+    assert controller.limit == 1
+
+
+def test_latency_is_compared_per_unit_of_work():
+    controller = AIMDController("m", initial=8, maximum=16)
+    controller.record(time.monotonic(), 1.0, 100, ok=True)
+    # Ten times the work in ten times the time: no queue.
+    controller.record(time.monotonic(), 10.0, 1000, ok=True)
+    assert controller.limit == 8
+    # The same work taking three times as long: queueing on the server.
+    controller.record(time.monotonic(), 3.0, 100, ok=True)
+    assert controller.limit == 6
+
+
+def test_pass_monitor_gates_threads_on_the_limit():
+    controller = AIMDController("m", initial=2, maximum=2)
+    monitor = PassMonitor(controller, "test")
+    lock = threading.Lock()
+    in_flight = {"now": 0, "max": 0}
+
+    def call(i):
+        with monitor.slot(10):
+            with lock:
+                in_flight["now"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            time.sleep(0.01)
+            with lock:
+                in_flight["now"] -= 1
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        list(pool.map(call, range(12)))
+    monitor.retry()
+
+    assert in_flight["max"] == 2 and monitor.peak == 2
+    assert len(monitor.latencies) == 12
+    summary = monitor.summary()
+    assert "12 calls" in summary and "p50" in summary and "p95" in summary and "1 herhalingen" in summary
+
+
+def test_pipeline_keeps_a_controller_per_model(monkeypatch, caplog):
+    monkeypatch.setattr(pipeline_mod.time, "sleep", lambda s: None)
+    attempts = {"n": 0}
+
+    def fake(element, to_language, from_language, model, config, glossary=None):
+        attempts["n"] += 1
+        if model == "wp1" and attempts["n"] == 1:
+            raise TimeoutError("read timed out")
+        # The workhorses disagree on every name, so every element escalates.
+        return {f: f"<{model}:{v}>" for f, v in element.fields.items()}
+
+    monkeypatch.setattr(pipeline_mod, "translate_element_once", fake)
+    result = PreflightResult(config=TranslationConfig(workers=4))
+    result.llm = LLMStatus(
+        enabled=True,
+        workhorses=[ResolvedModel(requested="wp1", tag="wp1"), ResolvedModel(requested="wp2", tag="wp2")],
+        heavy=ResolvedModel(requested="heavy", tag="heavy"),
+        voting_enabled=True,
+    )
+    pipe = TranslationPipeline(result)
+    elements = [Element(section="attributes", key=f"E{i}", fields={"name": f"veld{i}"}) for i in range(6)]
+
+    with caplog.at_level("INFO"):
+        results = pipe.translate_elements(elements, "en", "nl")
+
+    assert results[("attributes", "E0")]["name"] == "<heavy:veld0>"
+    assert set(pipe.controllers) == {"wp1", "wp2", "heavy"}
+    assert all(controller.maximum == 8 for controller in pipe.controllers.values())
+    summaries = [m for m in caplog.messages if "klaar:" in m]
+    assert len(summaries) == 3
+    assert "(wp1) klaar: 6 calls" in summaries[0] and "1 herhalingen" in summaries[0]
+    assert any("LLM-pass 'zwaar-model' (heavy): 6 elementen (2 workers" in m for m in caplog.messages)
@@ -0,0 +1,160 @@
+"""
+Tests for batched LLM prompts: several name-only siblings translated in one
+``/api/chat`` call. No Ollama server is needed: ``requests.post`` and the
+async client's transport are replaced by a handler that answers batch and
+single-element prompts alike. Covered:
+
+* which elements are grouped, per owner and batch size;
+* the batch payload (shared context, one JSON schema) and per-element
+  validation of the response;
+* the pipeline falls back to per-element calls for invalid entries, in the
+  thread-based and the async pass.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Callable, List, Optional
+
+import httpx
+
+import crunch_uml.translation.pipeline as pipeline_mod
+from crunch_uml.translation.config import TranslationConfig
+from crunch_uml.translation.llm import (
+    Element,
+    build_batch_payload,
+    parse_batch_response,
+)
+from crunch_uml.translation.ollama_client import AsyncOllamaClient
+from crunch_uml.translation.pipeline import TranslationPipeline
+from crunch_uml.translation.preflight import LLMStatus, PreflightResult, ResolvedModel
+from crunch_uml.translation.termbank import Candidate
+
+
+def _preflight(batch_size: int, ollama_async: bool = False) -> PreflightResult:
+    config = TranslationConfig(workers=2, llm_batch_size=batch_size, ollama_async=ollama_async)
+    result = PreflightResult(config=config)
+    result.llm = LLMStatus(
+        enabled=True, workhorses=[ResolvedModel(requested="wp1", tag="wp1")], heavy=None, voting_enabled=False
+    )
+    return result
+
+
+def _attribute(i: int, parent: str = "Pand", **fields) -> Element:
+    return Element(
+        section="attributes",
+        key=f"{parent}{i}",
+        fields=fields or {"name": f"veld{i}"},
+        context={"package": "Bouw", "parent": parent, "siblings": "veld1, veld2"},
+    )
+
+
+def _handler(calls: List[dict], skip: Optional[str] = None) -> Callable[[httpx.Request], httpx.Response]:
+    """Answer the prompt by replacing 'veld' with 'field'; in a batch the
+    element with source value ``skip`` gets an empty translation."""
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        calls.append(payload)
+        source = json.loads(payload["messages"][-1]["content"].rsplit("\n", 1)[-1])
+        if all(isinstance(v, dict) for v in source.values()):
+            content = {
+                k: {f: "" if v == skip else v.replace("veld", "field") for f, v in fields.items()}
+                for k, fields in source.items()
+            }
+        else:
+            content = {f: v.replace("veld", "field") for f, v in source.items()}
+        return httpx.Response(200, json={"message": {"content": json.dumps(content)}})
+
+    return handle
+
+
+def _patch_requests(monkeypatch, handler) -> None:
+    def fake_post(url, json=None, timeout=None, **kw):
+        response = handler(httpx.Request("POST", url, json=json))
+        response.request = httpx.Request("POST", url)
+        return response
+
+    monkeypatch.setattr("crunch_uml.translation.llm.requests.post", fake_post)
+
+
+def test_only_name_only_siblings_are_batched():
+    pipe = TranslationPipeline(_preflight(batch_size=2))
+    elements = [_attribute(i) for i in range(3)]
+    elements.append(_attribute(3, parent="Perceel"))
+    elements.append(_attribute(4, name="veld4", definitie="Een veld."))
+    with_candidates = _attribute(5)
+    with_candidates.candidates = [
+        Candidate(term="field5", source_term="veld5", uri="urn:t", source="test", priority=0, exact=True)
+    ]
+    elements.append(with_candidates)
+    elements.append(Element(section="classes", key="C1", fields={"name": "Pand"}))
+    pending = {(e.section, e.key): e.fields for e in elements}
+
+    calls = pipe._batches(elements, pending)
+
+    assert [[e.key for e in batch] for batch in calls] == [
+        ["Pand4"],
+        ["Pand5"],
+        ["C1"],
+        ["Pand0", "Pand1"],
+        ["Pand2"],
+        ["Perceel3"],
+    ]
+    assert all(len(batch) == 1 for batch in TranslationPipeline(_preflight(batch_size=1))._batches(elements, pending))
+
+
+def test_batch_payload_and_per_element_validation():
+    elements = [_attribute(1), _attribute(2, name="veld2", alias="v2")]
+    payload = build_batch_payload(elements, "en", "nl", "wp1", TranslationConfig(), glossary={"Pand": "Building"})
+
+    user = payload["messages"][-1]["content"]
+    assert "Belongs to: Pand" in user and "Sibling elements" not in user
+    assert user.count("GLOSSARY") == 1 and "- Pand -> Building" in user
+    assert json.loads(user.rsplit("\n", 1)[-1]) == {"e1": {"name": "veld1"}, "e2": {"name": "veld2", "alias": "v2"}}
+    assert payload["format"]["required"] == ["e1", "e2"]
+    assert payload["format"]["properties"]["e2"]["required"] == ["name", "alias"]
+
+    content = json.dumps({"e1": {"name": " field1 "}, "e2": {"name": "field2"}})
+    assert parse_batch_response(elements, {"message": {"content": content}}) == [{"name": "field1"}, None]
+    assert parse_batch_response(elements, {"message": {"content": "geen json"}}) == [None, None]
+
+
+def test_pipeline_falls_back_to_single_calls(monkeypatch, caplog):
+    calls: List[dict] = []
+    _patch_requests(monkeypatch, _handler(calls, skip="veld2"))
+    elements = [_attribute(i) for i in range(4)]
+
+    with caplog.at_level("INFO"):
+        results = TranslationPipeline(_preflight(batch_size=4)).translate_elements(elements, "en", "nl")
+
+    assert results == {("attributes", f"Pand{i}"): {"name": f"field{i}"} for i in range(4)}
+    # One batch, then veld2 on its own.
+    assert len(calls) == 2
+    assert "1 van de 4 elementen zonder geldige vertaling" in caplog.text
+    assert "4 elementen gebundeld in 1 calls" in caplog.text
+
+
+def test_async_batched_pass_equals_thread_pass(monkeypatch):
+    thread_calls: List[dict] = []
+    async_calls: List[dict] = []
+    _patch_requests(monkeypatch, _handler(thread_calls, skip="veld3"))
+
+    class MockedClient(AsyncOllamaClient):
+        @classmethod
+        def from_config(cls, config, max_concurrency):
+            transport = httpx.MockTransport(_handler(async_calls, skip="veld3"))
+            return cls(config.ollama_url, config.ollama_timeout, max_concurrency, transport=transport)
+
+    monkeypatch.setattr(pipeline_mod, "AsyncOllamaClient", MockedClient)
+    elements = [_attribute(i) for i in range(7)]
+
+    thread_results = TranslationPipeline(_preflight(batch_size=3)).translate_elements(elements, "en", "nl")
+    async_results = TranslationPipeline(_preflight(batch_size=3, ollama_async=True)).translate_elements(
+        elements, "en", "nl"
+    )
+
+    assert async_results == thread_results
+    assert thread_results[("attributes", "Pand3")] == {"name": "field3"}
+    # Batches of 3, 3 and 1, plus veld3 on its own.
+    assert len(thread_calls) == len(async_calls) == 4
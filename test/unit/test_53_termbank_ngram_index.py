@@ -0,0 +1,67 @@
+"""
+Tests for the n-gram index behind the fuzzy termbank lookup.
+
+The index only preselects the labels difflib scores, so its matches must be
+exactly those of ``difflib.get_close_matches`` over every label of the
+language — same labels, same order. Checked on random labels, including
+tiny alphabets (many repeated n-grams) and very short labels (the
+per-length fallback), at several cutoffs.
+"""
+
+from __future__ import annotations
+
+import difflib
+import random
+
+import pytest
+
+from crunch_uml.translation import termbank
+
+
+def _near_miss(label: str, alphabet: str, rnd: random.Random) -> str:
+    chars = list(label)
+    for _ in range(rnd.randint(0, 4)):
+        position = rnd.randint(0, len(chars))
+        edit = rnd.random()
+        if edit < 0.4 and chars:
+            del chars[min(position, len(chars) - 1)]
+        elif edit < 0.7:
+            chars.insert(position, rnd.choice(alphabet))
+        elif chars:
+            chars[min(position, len(chars) - 1)] = rnd.choice(alphabet)
+    return "".join(chars) or alphabet[0]
+
+
+@pytest.mark.parametrize("alphabet", ["ab", "aabdeeilnorst ", "abcdefghijklmnopqrstuvwxyz "])
+def test_ngram_index_matches_a_full_difflib_scan(alphabet):
+    rnd = random.Random(alphabet)
+    labels = sorted({"".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 30))) for _ in range(600)})
+    index = termbank._NgramIndex()
+    for label in labels:
+        index.add(label)
+
+    for _ in range(60):
+        word = _near_miss(rnd.choice(labels), alphabet, rnd)
+        for cutoff in (termbank.FUZZY_CUTOFF, 0.7, 0.5):
+            expected = difflib.get_close_matches(word, labels, n=termbank.FUZZY_MATCHES, cutoff=cutoff)
+            assert index.close_matches(word, termbank.FUZZY_MATCHES, cutoff) == expected, (word, cutoff)
+
+
+def test_lookup_indexes_labels_per_language_once():
+    index = termbank.TermbankIndex()
+    index.add_concepts(
+        [
+            termbank.Concept(uri="urn:1", source="a", priority=0, labels={"nl": ["Vergunning"], "en": ["permit"]}),
+            termbank.Concept(uri="urn:2", source="b", priority=1, labels={"nl": ["vergunning"], "en": ["licence"]}),
+        ]
+    )
+    index.add_concepts(
+        [termbank.Concept(uri="urn:3", source="c", priority=2, labels={"nl": ["bouwvergunning"], "en": ["b"]})]
+    )
+
+    assert index._fuzzy["nl"].labels == ["vergunning", "bouwvergunning"]
+    assert index._fuzzy["en"].labels == ["permit", "licence", "b"]
+    candidates = index.lookup("vergunnning", from_lang="nl", to_lang="en")
+    assert [c.term for c in candidates] == ["permit", "licence"]
+    assert not any(c.exact for c in candidates)
+    assert index.lookup("vergunnning", from_lang="de", to_lang="en") == []
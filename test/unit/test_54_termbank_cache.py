@@ -0,0 +1,87 @@
+"""
+Tests for the compiled termbank cache: ``load_termbanks(..., cache=True)``
+compiles every source next to it and reads it back through ``mmap`` on the
+next run. Covered:
+
+* a warm run reads the cache instead of parsing, with the same report and
+  the same lookups (exact and fuzzy) as the parsed source;
+* changing the source or the language filter compiles a new cache;
+* an unwritable or corrupt cache never breaks loading.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+
+import pytest
+
+from crunch_uml.translation import termbank
+
+TBX_FIXTURE = "./test/data/termbank_fixture.tbx"
+TTL_FIXTURE = "./test/data/termbank_fixture.ttl"
+QUERIES = ["bouwwerk", "Bouwwerken", "vergunning", "vergunnning", "perceel", "onbekend"]
+
+
+@pytest.fixture
+def sources(tmp_path):
+    for fixture in (TBX_FIXTURE, TTL_FIXTURE):
+        shutil.copy(fixture, tmp_path)
+    return [str(tmp_path / os.path.basename(fixture)) for fixture in (TBX_FIXTURE, TTL_FIXTURE)]
+
+
+def _lookups(index):
+    return [index.lookup(query, "nl", "en") for query in QUERIES]
+
+
+def test_warm_run_reads_the_cache(sources, monkeypatch):
+    parsed, parsed_reports = termbank.load_termbanks(sources, {"nl", "en"})
+    cold, cold_reports = termbank.load_termbanks(sources, {"nl", "en"}, cache=True)
+    assert all(os.path.isfile(termbank.cache_path(path, {"nl", "en"})) for path in sources)
+
+    def no_parsing(*args, **kwargs):
+        raise AssertionError("source parsed despite a current cache")
+
+    monkeypatch.setattr(termbank, "load_source", no_parsing)
+    warm, warm_reports = termbank.load_termbanks(sources, {"nl", "en"}, cache=True)
+
+    assert warm_reports == cold_reports == parsed_reports
+    assert len(warm) == len(cold) == len(parsed) == 5
+    assert _lookups(warm) == _lookups(cold) == _lookups(parsed)
+    assert any(candidates and not candidates[0].exact for candidates in _lookups(warm))
+
+
+def test_changed_source_or_languages_compile_a_new_cache(sources):
+    termbank.load_termbanks(sources, {"nl", "en"}, cache=True)
+    tbx = sources[0]
+    target = termbank.cache_path(tbx, {"nl", "en"})
+    key = termbank._cache_key(tbx, {"nl", "en"})
+    assert termbank.CompiledTermbank.open(target, key, "tbx", 0) is not None
+
+    stat = os.stat(tbx)
+    os.utime(tbx, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert termbank.CompiledTermbank.open(target, termbank._cache_key(tbx, {"nl", "en"}), "tbx", 0) is None
+    termbank.load_termbanks(sources, {"nl", "en"}, cache=True)
+    assert termbank.CompiledTermbank.open(target, termbank._cache_key(tbx, {"nl", "en"}), "tbx", 0) is not None
+
+    index, _ = termbank.load_termbanks([tbx], {"nl", "de"}, cache=True)
+    assert os.path.isfile(termbank.cache_path(tbx, {"nl", "de"}))
+    assert len(index) == 0 and index.lookup("bouwwerk", "nl", "en") == []
+
+
+def test_unusable_cache_falls_back_to_parsing(sources, monkeypatch, caplog):
+    tbx = sources[0]
+    with open(termbank.cache_path(tbx, {"nl", "en"}), "wb") as f:
+        f.write(termbank._CACHE_MAGIC + (10).to_bytes(8, "little") + b"{kapot")
+
+    def read_only(*args, **kwargs):
+        raise PermissionError("alleen-lezen")
+
+    monkeypatch.setattr(termbank, "compile_termbank", read_only)
+    with caplog.at_level("WARNING"):
+        index, reports = termbank.load_termbanks([tbx], {"nl", "en"}, cache=True)
+
+    assert reports[0].loaded and len(index) == 2
+    assert [c.term for c in index.lookup("bouwwerk", "nl", "en")] == ["structure"]
+    assert "is onleesbaar" in caplog.text
+    assert "kon niet worden geschreven" in caplog.text
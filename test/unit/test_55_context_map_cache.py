@@ -0,0 +1,106 @@
+"""
+Tests for the memoized context map of crunch_uml.translation.context.
+
+The map of a schema is built once per completed import run and shared by
+later calls (a multi-language export); a new import builds it again, and a
+schema without a completed run is never cached. The root packages are
+resolved in one pass with the same result as walking every parent chain.
+"""
+
+from __future__ import annotations
+
+import random
+from types import SimpleNamespace
+
+import pytest
+
+import crunch_uml.db as db
+from crunch_uml import cli, const
+from crunch_uml.schema import Schema
+from crunch_uml.translation import context
+
+MONUMENTEN = "./test/data/GGM_Monumenten_EA2.1.xml"
+
+
+def _dispose_singleton():
+    inst = db.Database._instance
+    if inst is not None:
+        inst.session.close()
+        inst.engine.dispose()
+        db.Database._instance = None
+
+
+@pytest.fixture(autouse=True)
+def _fresh_database_and_cache(monkeypatch):
+    _dispose_singleton()
+    monkeypatch.setattr(context, "_cache", {})
+    yield
+    _dispose_singleton()
+
+
+def _import(db_url):
+    assert cli.main(["-db_url", db_url, "import", "-f", MONUMENTEN, "-t", "eaxmi", "-db_create"]) == 0
+
+
+def test_context_map_is_built_once_per_import_run(tmp_path, monkeypatch):
+    db_url = f"sqlite:///{tmp_path / 'context.db'}"
+    _import(db_url)
+    builds = []
+    build = context._build
+    monkeypatch.setattr(context, "_build", lambda schema: builds.append(schema) or build(schema))
+
+    schema = Schema(db.Database(db_url), const.DEFAULT_SCHEMA)
+    first = context.build_context_map(schema)
+    for _ in range(4):
+        assert context.build_context_map(schema) is first
+    assert len(builds) == 1
+    assert any("model" in ctx for ctx in first.values())
+
+    _import(db_url)
+    schema = Schema(db.Database(db_url), const.DEFAULT_SCHEMA)
+    assert context.build_context_map(schema) == first
+    assert len(builds) == 2
+
+
+def test_schema_without_completed_run_is_not_cached(tmp_path, monkeypatch):
+    db_url = f"sqlite:///{tmp_path / 'context.db'}"
+    _import(db_url)
+    database = db.Database(db_url)
+    run_id = database.start_import_run(const.DEFAULT_SCHEMA)
+    builds = []
+    monkeypatch.setattr(context, "_build", lambda schema: builds.append(schema) or {})
+
+    schema = Schema(database, const.DEFAULT_SCHEMA)
+    context.build_context_map(schema)
+    context.build_context_map(schema)
+    assert len(builds) == 2 and context._cache == {}
+
+    database.complete_import_run(run_id)
+    context.build_context_map(schema)
+    context.build_context_map(schema)
+    assert len(builds) == 3
+    assert context.build_context_map(Schema(database, "zonder_import")) == {}
+    assert len(builds) == 4
+
+
+def _walked_root(packages, package_id):
+    """The former per-element walk up the parent chain."""
+    pkg = packages.get(package_id)
+    seen = set()
+    while pkg is not None and pkg.parent_package_id in packages and pkg.id not in seen:
+        seen.add(pkg.id)
+        pkg = packages[pkg.parent_package_id]
+    return pkg
+
+
+def test_package_roots_match_walking_every_chain():
+    rnd = random.Random(7)
+    for _ in range(50):
+        ids = [f"p{i}" for i in range(rnd.randint(1, 30))]
+        # Mostly trees, with the odd dangling parent or cycle.
+        packages = {
+            pkg_id: SimpleNamespace(id=pkg_id, parent_package_id=rnd.choice(ids + ["extern", None, None]))
+            for pkg_id in ids
+        }
+        roots = context._package_roots(packages)
+        assert {pkg_id: _walked_root(packages, pkg_id) for pkg_id in ids} == roots
@@ -0,0 +1,71 @@
+"""
+Tests for exporting several languages in one i18n run (``--language en,de,fr``).
+
+No network, no Ollama (see test_30). Covered:
+
+* the pipeline backend shares one context map and one preflight between the
+  target languages, while every language still gets its own translation;
+* the CLI writes one entry per language from a single read of the schema.
+"""
+
+from __future__ import annotations
+
+import json
+
+import requests
+
+import crunch_uml.translation.preflight as preflight
+from crunch_uml import cli
+from crunch_uml.renderers.pandasrenderer import I18nRenderer
+
+
+def _enable_pipeline(monkeypatch):
+    def fail_get(url, timeout=10):
+        raise requests.ConnectionError("geen ollama in tests")
+
+    monkeypatch.setattr(requests, "get", fail_get)
+    monkeypatch.setenv("CRUNCH_UML_TRANSLATE_BACKEND", "pipeline")
+    monkeypatch.setenv("CRUNCH_UML_TERMBANKS", "./test/data/termbank_fixture.ttl")
+    monkeypatch.delenv("CRUNCH_UML_TRANSLATE_ALLOW_ONLINE", raising=False)
+    monkeypatch.delenv("CRUNCH_UML_NMT_MODEL", raising=False)
+
+
+def test_languages_share_one_preflight(monkeypatch):
+    _enable_pipeline(monkeypatch)
+    runs = []
+    run_preflight = preflight.run_preflight
+    monkeypatch.setattr(preflight, "run_preflight", lambda **kwargs: runs.append(kwargs) or run_preflight(**kwargs))
+    data = {"classes": [{"id_1": {"name": "Vergunning"}}, {"id_2": {"name": "Partij"}}]}
+    original_i18n = {"fr": {"classes": [{"id_2": {"name": "Parti"}}]}}
+
+    out = I18nRenderer().translate_languages(data, ["en", "de", "fr"], from_language="nl", original_i18n=original_i18n)
+
+    assert len(runs) == 1 and runs[0]["languages"] == {"nl", "en", "de", "fr"}
+    assert list(out) == ["en", "de", "fr"]
+    assert out["en"]["classes"][0]["id_1"]["name"] == "Permit"
+    # Geen Duitse of Franse term in de termbank: bron behouden, behalve wat
+    # het i18n-bestand voor die taal al had.
+    assert out["de"]["classes"][0]["id_1"]["name"] == "Vergunning"
+    assert out["fr"]["classes"][1]["id_2"]["name"] == "Parti"
+    assert data["classes"][0]["id_1"]["name"] == "Vergunning"
+
+
+def test_cli_exports_every_language(tmp_path, monkeypatch):
+    db_url = f"sqlite:///{tmp_path / 'i18n.db'}"
+    outputfile = tmp_path / "Monumenten.i18n.json"
+    args = ["-db_url", db_url, "import", "-f", "./test/data/GGM_Monumenten_EA2.1.xml", "-t", "eaxmi", "-db_create"]
+    assert cli.main(args) == 0
+
+    calls = []
+    get_all_data = I18nRenderer.get_all_data
+    monkeypatch.setattr(
+        I18nRenderer,
+        "get_all_data",
+        lambda self, *args, **kwargs: calls.append(args) or get_all_data(self, *args, **kwargs),
+    )
+    cli.main(["-db_url", db_url, "export", "-f", str(outputfile), "-t", "i18n", "--language", "en, de,en"])
+
+    data = json.loads(outputfile.read_text())
+    assert list(data) == ["en", "de"]
+    assert data["en"] == data["de"] and data["en"]
+    assert len(calls) == 1
@@ -0,0 +1,100 @@
+"""Tests for the set-based sync of the EA repository updater.
+
+``process_batch`` loads the target rows of a batch and their tags with one
+IN query each and writes the record updates per batch. The repository it
+produces must equal the record-by-record route (``preload_batch`` returning
+None), for every tag strategy and with inserts and deletes enabled; a GUID
+that occurs twice in one batch falls back to a fresh lookup.
+"""
+
+import shutil
+import sqlite3
+
+import pytest
+from sqlalchemy import event
+
+import crunch_uml.renderers.earepoupdater as earepoupdater
+from crunch_uml import cli
+
+SOURCE_QEA = "./test/data/Monumenten.qea"
+SOURCE_MODEL = "./test/data/GGM_Monumenten_EA2.1.xml"
+# Columns that hold the time of the run or freshly generated GUIDs.
+VOLATILE = {"ModifiedDate", "XrefID"}
+TAG_TABLES = {"t_objectproperties", "t_attributetag", "t_xref"}
+
+
+def _dump(qea):
+    connection = sqlite3.connect(qea)
+    dump = {}
+    for (table,) in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'"):
+        cursor = connection.execute(f'SELECT * FROM "{table}"')
+        columns = [d[0] for d in cursor.description]
+        skip = VOLATILE | ({"ea_guid"} if table in TAG_TABLES else set())
+        dump[table] = sorted(
+            repr(sorted((c, v) for c, v in zip(columns, row) if c not in skip)) for row in cursor.fetchall()
+        )
+    connection.close()
+    return dump
+
+
+def _update(tmp_path, name, args):
+    qea = str(tmp_path / f"{name}.qea")
+    shutil.copy(SOURCE_QEA, qea)
+    assert cli.main(["-db_url", f"sqlite:///{tmp_path / 'model.db'}", "export", "-f", qea] + args) == 0
+    return _dump(qea)
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["-t", "earepo", "--tag_strategy", "update"],
+        ["-t", "earepo", "--tag_strategy", "upsert", "--ea_allow_insert"],
+        ["-t", "earepo", "--tag_strategy", "replace", "--ea_allow_insert", "--ea_allow_delete"],
+        ["-t", "eamimrepo"],
+    ],
+)
+def test_preloaded_batches_match_record_by_record(tmp_path, monkeypatch, args):
+    db_url = f"sqlite:///{tmp_path / 'model.db'}"
+    assert cli.main(["-db_url", db_url, "import", "-f", SOURCE_MODEL, "-t", "eaxmi", "-db_create"]) == 0
+
+    preloaded = _update(tmp_path, "preloaded", args)
+    monkeypatch.setattr(earepoupdater.EARepoUpdater, "preload_batch", lambda self, *args: None)
+    record_by_record = _update(tmp_path, "record_by_record", args)
+
+    assert preloaded == record_by_record
+    assert preloaded != _dump(SOURCE_QEA)
+
+
+def test_batch_is_read_once_and_duplicates_are_looked_up_again(tmp_path):
+    qea = str(tmp_path / "repo.qea")
+    shutil.copy(SOURCE_QEA, qea)
+
+    updater = earepoupdater.EARepoUpdater()
+    session, metadata = updater.get_database_session(qea)
+    rows = session.execute(
+        metadata.tables["t_object"].select().where(metadata.tables["t_object"].c.Object_Type == "Class")
+    )
+    classes = [{"id": "EAID_" + row.ea_guid[1:-1].replace("-", "_"), "name": f"{row.Name}-nieuw"} for row in rows]
+    assert len(classes) > 2
+    statements = []
+    event.listen(session.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    updater.process_batch(
+        classes + classes[:1],
+        "t_object",
+        session,
+        metadata,
+        field_mapper={"id": "ea_guid", "name": "Name"},
+        tag_table="t_objectproperties",
+        batch_size=len(classes) + 1,
+    )
+    selects = [s for s in statements if s.lstrip().startswith("SELECT")]
+    updates = [s for s in statements if s.lstrip().startswith("UPDATE t_object ")]
+    # One preload of rows and tags, plus the fresh lookups for the repeated GUID.
+    assert len(selects) == 4
+    # One executemany for the batch, written before the repeated GUID was looked
+    # up again: that record then finds nothing left to change.
+    assert len(updates) == 1
+    names = {row.Name for row in session.execute(metadata.tables["t_object"].select())}
+    assert {c["name"] for c in classes} <= names
+    session.rollback()
@@ -0,0 +1,83 @@
+"""Tests for the change sets of the EA repository updater.
+
+``--ea_plan`` computes every change of an update without writing to the
+repository and saves them in a change-set file; ``--ea_apply`` replays that
+file in one transaction. Applying the plan must give the same repository as
+updating directly, and a change set is refused on a repository that changed
+after it was made.
+"""
+
+import json
+import shutil
+import sqlite3
+
+import pytest
+
+from crunch_uml import cli
+from crunch_uml.exceptions import CrunchException
+from crunch_uml.renderers.earepoupdater import EARepoUpdater
+
+SOURCE_QEA = "./test/data/Monumenten.qea"
+SOURCE_MODEL = "./test/data/GGM_Monumenten_EA2.1.xml"
+TAG_TABLES = {"t_objectproperties", "t_attributetag", "t_xref"}
+
+
+def _dump(qea):
+    connection = sqlite3.connect(qea)
+    dump = {}
+    for (table,) in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'"):
+        cursor = connection.execute(f'SELECT * FROM "{table}"')
+        columns = [d[0] for d in cursor.description]
+        # The time of the run and freshly generated GUIDs differ per update.
+        skip = {"ModifiedDate", "XrefID"} | ({"ea_guid"} if table in TAG_TABLES else set())
+        dump[table] = sorted(
+            repr(sorted((c, v) for c, v in zip(columns, row) if c not in skip)) for row in cursor.fetchall()
+        )
+    connection.close()
+    return dump
+
+
+@pytest.fixture
+def export(tmp_path):
+    db_url = f"sqlite:///{tmp_path / 'model.db'}"
+    assert cli.main(["-db_url", db_url, "import", "-f", SOURCE_MODEL, "-t", "eaxmi", "-db_create"]) == 0
+
+    def run(name, *args):
+        qea = str(tmp_path / f"{name}.qea")
+        shutil.copy(SOURCE_QEA, qea)
+        options = ["-t", "earepo", "--tag_strategy", "upsert", "--ea_allow_insert", "--ea_allow_delete"]
+        assert cli.main(["-db_url", db_url, "export", "-f", qea] + options + list(args)) == 0
+        return qea
+
+    return run
+
+
+def test_plan_leaves_the_repository_alone_and_apply_replays_it(tmp_path, export):
+    direct = export("direct")
+    changeset_file = str(tmp_path / "changes.json")
+    planned = export("planned", "--ea_plan", changeset_file)
+
+    with open(SOURCE_QEA, "rb") as source, open(planned, "rb") as target:
+        assert source.read() == target.read()
+    with open(changeset_file) as f:
+        changeset = json.load(f)
+    assert changeset["summary"]["t_object"]["update"] > 0
+    assert set(changeset["summary"]) & {"t_objectproperties", "t_attributetag"}
+    assert sum(len(entry["params"]) for entry in changeset["statements"]) > len(changeset["statements"])
+
+    EARepoUpdater().apply_changeset(changeset_file, planned)
+    assert _dump(planned) == _dump(direct) != _dump(SOURCE_QEA)
+
+
+def test_apply_refuses_a_changed_repository(tmp_path, export):
+    changeset_file = str(tmp_path / "changes.json")
+    planned = export("planned", "--ea_plan", changeset_file)
+    connection = sqlite3.connect(planned)
+    connection.execute("UPDATE t_object SET Note = 'handmatig' WHERE Object_ID = 1")
+    connection.commit()
+    connection.close()
+    before = _dump(planned)
+
+    with pytest.raises(CrunchException, match="gewijzigd sinds"):
+        EARepoUpdater().apply_changeset(changeset_file, planned)
+    assert _dump(planned) == before
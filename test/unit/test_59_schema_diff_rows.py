@@ -0,0 +1,70 @@
+"""Tests for the row-based loading of the schema diff (``diff_md``).
+
+``SchemaDiffMarkdownRenderer`` reads both schemas as lightweight rows with
+memoized stable keys and compares precomputed content signatures. The
+Markdown it writes must equal the diff over full ORM entities, also when the
+shortcut over equal raw content is not taken.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+import crunch_uml.db as db
+import crunch_uml.renderers.pandasrenderer as pandasrenderer
+import crunch_uml.schema as sch
+from crunch_uml import cli
+from crunch_uml.renderers.pandasrenderer import SchemaDiffMarkdownRenderer
+
+
+class OrmEntities(SchemaDiffMarkdownRenderer):
+    def _load_entities(self, schema):
+        return {
+            "packages": list(schema.get_all_packages()),
+            "classes": list(schema.get_all_classes()),
+            "enums": list(schema.get_all_enumerations()),
+            "attrs": list(schema.get_all_attributes()),
+            "literals": list(schema.get_all_literals()),
+            "assocs": list(schema.get_all_associations()),
+            "gens": list(schema.get_all_generalizations()),
+        }
+
+
+@pytest.fixture
+def schemas(tmp_path):
+    db_url = f"sqlite:///{tmp_path / 'diff.db'}"
+    for name, source in (("new", "GGM_Monumenten_EA2.1.xml"), ("old", "GGM_Monumenten_Changed_EA2.1.xml")):
+        args = ["-db_url", db_url, "-sch", name, "import", "-f", f"./test/data/{source}", "-t", "eaxmi"]
+        assert cli.main(args + (["-db_create"] if name == "new" else [])) == 0
+    return db.Database(db_url)
+
+
+def _diff(renderer, database, outputfile):
+    database.session.expire_all()
+    args = SimpleNamespace(outputfile=str(outputfile), compare_schema_name="old", compare_title=None)
+    renderer.render(args, sch.Schema(database, schema_name="new"))
+    return outputfile.read_text(encoding="utf-8")
+
+
+def test_rows_give_the_same_diff_as_orm_entities(tmp_path, schemas, monkeypatch):
+    rows = _diff(SchemaDiffMarkdownRenderer(), schemas, tmp_path / "rows.md")
+    assert "Toegevoegd" in rows and "Verwijderd" in rows and "Gewijzigd" in rows
+    assert rows == _diff(OrmEntities(), schemas, tmp_path / "orm.md")
+
+    # Without the raw content every pair is compared field by field.
+    init = pandasrenderer._DiffRow.__init__
+    monkeypatch.setattr(pandasrenderer._DiffRow, "__init__", lambda self, values, content=(): init(self, values))
+    assert rows == _diff(SchemaDiffMarkdownRenderer(), schemas, tmp_path / "fields.md")
+
+
+def test_stable_keys_are_memoized_per_row(schemas, monkeypatch):
+    entities = SchemaDiffMarkdownRenderer()._load_entities(sch.Schema(schemas, schema_name="new"))
+    attr = next(a for a in entities["attrs"] if a.clazz is not None)
+    key = pandasrenderer._stable_key(attr, "attribute")
+
+    builds = []
+    build = pandasrenderer._build_stable_key
+    monkeypatch.setattr(pandasrenderer, "_build_stable_key", lambda *args: builds.append(args) or build(*args))
+    assert pandasrenderer._stable_key(attr, "attribute") == key
+    assert builds == []
+    assert key.startswith(pandasrenderer._stable_key(attr.clazz, "class"))
@@ -0,0 +1,59 @@
+"""Tests for the JSON Lines change feed of the schema diff (``diff_jsonl``).
+
+The feed matches and compares entities like ``diff_md``: its added, removed
+and changed entities must add up to the summary table of the Markdown diff of
+the same two schemas.
+"""
+
+import json
+import re
+
+import pytest
+
+from crunch_uml import cli
+
+SUMMARY_ROWS = {
+    "Classes": "class",
+    "Enumeraties": "enum",
+    "Attributen": "attribute",
+    "Associaties": "association",
+    "Generalisaties": "generalization",
+}
+
+
+@pytest.fixture
+def export(tmp_path):
+    db_url = f"sqlite:///{tmp_path / 'diff.db'}"
+    for name, source in (("new", "GGM_Monumenten_EA2.1.xml"), ("old", "GGM_Monumenten_Changed_EA2.1.xml")):
+        args = ["-db_url", db_url, "-sch", name, "import", "-f", f"./test/data/{source}", "-t", "eaxmi"]
+        assert cli.main(args + (["-db_create"] if name == "new" else [])) == 0
+
+    def run(renderer, outputfile):
+        args = ["-db_url", db_url, "-sch", "new", "export", "-t", renderer, "-f", str(tmp_path / outputfile)]
+        assert cli.main(args + ["--compare_schema_name", "old"]) == 0
+        return (tmp_path / outputfile).read_text(encoding="utf-8")
+
+    return run
+
+
+def test_feed_matches_the_markdown_summary(export):
+    header, *records = [json.loads(line) for line in export("diff_jsonl", "changes.jsonl").splitlines()]
+    markdown = export("diff_md", "changes.md")
+
+    assert header == {"format": 1, "old": "old", "new": "new"}
+    for label, entity in SUMMARY_ROWS.items():
+        row = re.search(rf"^\| {label} \| (\d+) \| (\d+) \| (\d+) \| (\d+) \|$", markdown, re.MULTILINE)
+        of_entity = [r for r in records if r["entity"] == entity]
+        changed = [r for r in of_entity if r["change"] == "changed"]
+        counts = (
+            sum(r["change"] == "added" for r in of_entity),
+            sum(r["change"] == "removed" for r in of_entity),
+            len({r["key"] for r in changed if r["structural"]}),
+            len({r["key"] for r in changed if not r["structural"]}),
+        )
+        assert counts == tuple(int(n) for n in row.groups()), label
+
+    literals = [(r["change"], r["key"]) for r in records if r["entity"] == "literal"]
+    assert literals == [("removed", "Monumenten/Model Monumenten::TypeMonument=test")]
+    version = next(r for r in records if r["entity"] == "package" and r["field"] == "version")
+    assert (version["old"], version["new"], version["structural"]) == ("1.0", "1.2", False)
@@ -0,0 +1,38 @@
+"""Tests for the parallel per-package rendering of the Jinja2 renderers (``--jobs``).
+
+With more than one job the model packages are rendered by a pool of worker
+processes, each with its own read-only session on the database. The files
+must be the same as those of a render in one process, also for ``sqla``,
+whose templates call methods that the renderer adds to the model classes, and
+when several packages map to the same file name.
+"""
+
+import os
+
+import pytest
+
+from crunch_uml import cli, db
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    db_url = f"sqlite:///{tmp_path / 'models.db'}"
+    args = ["-db_url", db_url, "import", "-f", "./test/data/Test_models.xml", "-t", "eaxmi", "-db_create"]
+    assert cli.main(args) == 0
+    return db_url
+
+
+def _export(db_url, outputdir, renderer, jobs):
+    os.makedirs(outputdir)
+    args = ["-db_url", db_url, "export", "-t", renderer, "-f", str(outputdir / "model.md"), "--jobs", str(jobs)]
+    assert cli.main(args) == 0
+    return {name: (outputdir / name).read_text() for name in os.listdir(outputdir)}
+
+
+@pytest.mark.parametrize("renderer", ["ggm_md", "sqla"])
+def test_parallel_render_writes_the_same_files(tmp_path, db_url, renderer):
+    serial = _export(db_url, tmp_path / "serial", renderer, 1)
+    parallel = _export(db_url, tmp_path / "parallel", renderer, 2)
+
+    assert serial and parallel == serial
+    assert not hasattr(db.Class, "getSQLAName")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Benchmark for the copy transformer.
+
+Imports a model — by default the synthetic QEA repository of
+``benchmark_qea_import.py`` — into a scratch SQLite database and copies its
+root package to another schema, once with the set-based ``PackageCopy``
+(INSERT .. SELECT) and once object by object with ``Package.get_copy``, and
+checks that both copies contain the same rows:
+
+    .venv/bin/python tools/benchmark_copy_transform.py --classes 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+
+import crunch_uml.db as db
+import crunch_uml.schema as sch
+from crunch_uml.parsers.qeaparser import QEAParser
+
+sys.path.insert(0, os.path.dirname(__file__))
+from benchmark_qea_import import generate_qea  # noqa: E402
+
+logging.basicConfig(level=logging.WARNING)
+logging.getLogger().setLevel(logging.WARNING)
+
+
+def _rows(database, schema_name):
+    result = {}
+    for table in db.Base.metadata.sorted_tables:
+        columns = [column for column in table.columns if column.name != "schema_id"]
+        rows = database.session.execute(select(*columns).where(table.c.schema_id == schema_name)).all()
+        result[table.name] = sorted(map(tuple, rows), key=repr)
+    return result
+
+
+def _copy_orm(schema_from, schema_to, root_package_id):
+    kopie = schema_from.get_package(root_package_id).get_copy(None)
+    schema_to.add(kopie, recursive=True, processed_objects=set())
+
+
+def _copy_sql(schema_from, schema_to, root_package_id):
+    sch.PackageCopy(schema_from, schema_to, root_package_id).copy()
+
+
+def run(source: Optional[str], n_classes: int, repeat: int) -> Dict[str, object]:
+    tmpdir = tempfile.mkdtemp(prefix="crunch_uml_bench_")
+    if source is None:
+        source = os.path.join(tmpdir, "benchmark.qea")
+        generate_qea(source, n_classes)
+    database = db.Database(f"sqlite:///{os.path.join(tmpdir, 'bench.db')}", db_create=True)
+    schema_from = sch.Schema(database, schema_name="source")
+    QEAParser().parse(SimpleNamespace(inputfile=source), schema_from)
+    database.commit()
+    root_package_id = next(package.id for package in schema_from.get_all_packages() if package.parent_package is None)
+
+    timings: Dict[str, List[float]] = {"orm": [], "sql": []}
+    for engine, copy in (("orm", _copy_orm), ("sql", _copy_sql)):
+        for _ in range(repeat):
+            schema_to = sch.Schema(database, schema_name=engine)
+            schema_to.clean()
+            database.commit()
+            database.session.expire_all()
+            start = time.perf_counter()
+            copy(schema_from, schema_to, root_package_id)
+            database.commit()
+            timings[engine].append(time.perf_counter() - start)
+
+    return {
+        "source": source if n_classes is None else f"synthetic:{n_classes}",
+        "classes": schema_from.count_class(),
+        "identical": _rows(database, "orm") == _rows(database, "sql"),
+        "orm_seconds": statistics.median(timings["orm"]),
+        "sql_seconds": statistics.median(timings["sql"]),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--file", help="QEA repository to benchmark instead of the synthetic one")
+    ap.add_argument("--classes", type=int, default=1000, help="Number of classes of the synthetic repository")
+    ap.add_argument("--repeat", type=int, default=3, help="Runs per measurement, the median is reported")
+    args = ap.parse_args()
+
+    result = run(args.file, None if args.file else args.classes, args.repeat)
+    print(
+        f"{result['source']}: {result['classes']} classes, object copy {result['orm_seconds']:.3f} s,"
+        f" set-based copy {result['sql_seconds']:.3f} s"
+        f" -> {result['orm_seconds'] / result['sql_seconds']:.1f}x faster"
+    )
+    if not result["identical"]:
+        sys.exit("The set-based copy differs from the object copy")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""Regression benchmark for phase 3 (the EA extension) of the EA-XMI parser.
+
+Reads an EA XMI export — by default a synthetic model the size of a full
+municipal data model (classes with tagged values, attributes, associations,
+generalizations and diagrams, all with their ``xmi:Extension`` counterparts)
+— runs phases 1 and 2 once and then times ``EAXMIParser.phase3_process_extra``
+a number of times on a fresh schema. Time spent writing to the database —
+SQLAlchemy flushes and the INSERT, UPDATE and DELETE statements executed
+outside them — is measured separately through session and engine events, so
+the remaining *extension parsing* time is what the XML side of phase 3 costs.
+
+Results can be stored with ``--save`` and compared with an earlier run with
+``--baseline``; together with ``--min-speedup`` the script exits non-zero
+when extension parsing is not at least that many times faster than the
+baseline, which makes it usable as a regression check between two commits:
+
+    git stash; .venv/bin/python tools/benchmark_eaxmi_phase3.py --save /tmp/phase3_before.json; git stash pop
+    .venv/bin/python tools/benchmark_eaxmi_phase3.py --baseline /tmp/phase3_before.json --min-speedup 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from lxml import etree
+from sqlalchemy import event
+
+import crunch_uml.db as db
+import crunch_uml.schema as sch
+from crunch_uml import const
+from crunch_uml.parsers.eaxmiparser import EAXMIParser
+
+logging.basicConfig(level=logging.WARNING)
+logging.getLogger().setLevel(logging.WARNING)
+
+ATTRIBUTES_PER_CLASS = 6
+TAGS_PER_CLASS = 8
+TAGS_PER_ATTRIBUTE = 3
+CLASSES_PER_DIAGRAM = 20
+
+
+def _id(kind: str, i: int) -> str:
+    return f"EAID_{kind}{i:08d}_0000_0000_0000_000000000000"
+
+
+def _tags(owner: str, kind: str, n: int) -> str:
+    tags = "".join(
+        f'<tag xmi:id="{_id(kind, i)}" name="tag-{i}" value="waarde {i}" modelElement="{owner}"/>' for i in range(n)
+    )
+    return f"<tags>{tags}</tags>"
+
+
+def generate_eaxmi(n_classes: int) -> bytes:
+    """Builds a synthetic EA XMI 2.1 export with ``n_classes`` classes and a matching xmi:Extension."""
+    project = '<project author="Benchmark" version="1.0" phase="1.0" created="2024-01-01 00:00:00" modified="2024-01-01 00:00:00" status="Proposed"/>'
+    model = [f'<packagedElement xmi:type="uml:Package" xmi:id="{_id("PKG", 0)}" name="Benchmark">']
+    extension = [
+        f'<element xmi:idref="{_id("PKG", 0)}" xmi:type="uml:Package" name="Benchmark" scope="public">'
+        f'<model package="{_id("PKG", 0)}"/><properties documentation="Package" sType="Package"/>{project}<tags/>'
+        "</element>"
+    ]
+    attributes, connectors, diagrams = [], [], []
+    for c in range(n_classes):
+        cls = _id("CLS", c)
+        target = _id("CLS", (c + 1) % n_classes)
+        model.append(f'<packagedElement xmi:type="uml:Class" xmi:id="{cls}" name="Class{c}">')
+        for a in range(ATTRIBUTES_PER_CLASS):
+            att = _id("ATT", c * ATTRIBUTES_PER_CLASS + a)
+            model.append(
+                f'<ownedAttribute xmi:type="uml:Property" xmi:id="{att}" name="attribuut{a}">'
+                '<type xmi:idref="EAJava_String"/></ownedAttribute>'
+            )
+            attributes.append(
+                f'<attribute xmi:idref="{att}" name="attribuut{a}" scope="Public"><initial/>'
+                f'<documentation value="Attribuut {a} van Class{c}."/><model ea_localid="{c}"/>'
+                '<properties type="String" derived="0" collection="false" length="0" static="0"/>'
+                '<coords ordered="0"/><stereotype stereotype="MIM-Attribuutsoort"/><bounds lower="1" upper="1"/>'
+                f'<options/><style/>{_tags(att, "ATG", TAGS_PER_ATTRIBUTE)}<xrefs/></attribute>'
+            )
+        model.append(
+            f'<ownedAttribute xmi:type="uml:Property" xmi:id="{_id("dst", c)}" name="verwijst"'
+            f' association="{_id("ASS", c)}"><type xmi:idref="{target}"/></ownedAttribute>'
+        )
+        if c % 5 == 4:
+            model.append(
+                f'<generalization xmi:type="uml:Generalization" xmi:id="{_id("GEN", c)}" general="{_id("CLS", c - 1)}"/>'
+            )
+            connectors.append(
+                f'<connector xmi:idref="{_id("GEN", c)}"><source xmi:idref="{cls}"/><target xmi:idref="{_id("CLS", c - 1)}"/>'
+                '<model ea_localid="1"/><properties ea_type="Generalization" direction="Source -&gt; Destination"/>'
+                f'<documentation value="Generalisatie {c}."/><labels mt="is een"/><tags/></connector>'
+            )
+        model.append("</packagedElement>")
+        model.append(
+            f'<packagedElement xmi:type="uml:Association" xmi:id="{_id("ASS", c)}" name="verwijst">'
+            f'<memberEnd xmi:idref="{_id("dst", c)}"/><memberEnd xmi:idref="{_id("src", c)}"/>'
+            f'<ownedEnd xmi:type="uml:Property" xmi:id="{_id("src", c)}" association="{_id("ASS", c)}">'
+            f'<type xmi:idref="{cls}"/></ownedEnd></packagedElement>'
+        )
+        extension.append(
+            f'<element xmi:idref="{cls}" xmi:type="uml:Class" name="Class{c}" scope="public">'
+            f'<model package="{_id("PKG", 0)}" ea_eleType="element"/>'
+            f'<properties documentation="Definitie van Class{c}." sType="Class" isAbstract="false"/>{project}'
+            f'<code gentype="Java"/><style appearance="BackColor=-1;"/>{_tags(cls, "CTG", TAGS_PER_CLASS)}<xrefs/>'
+            '<extendedProperties tagged="0" package_name="Benchmark"/></element>'
+        )
+        connectors.append(
+            f'<connector xmi:idref="{_id("ASS", c)}"><source xmi:idref="{cls}"><model ea_localid="1"/>'
+            '<role name="bron" visibility="Public"/><type multiplicity="1"/></source>'
+            f'<target xmi:idref="{target}"><model ea_localid="2"/><role name="doel" visibility="Public"/>'
+            '<type multiplicity="0..*"/></target><model ea_localid="3"/>'
+            '<properties ea_type="Association" direction="Source -&gt; Destination"/>'
+            f'<documentation value="Associatie {c}."/><labels/><tags/></connector>'
+        )
+    for d in range(0, n_classes, CLASSES_PER_DIAGRAM):
+        members = "".join(
+            f'<element geometry="Left={i * 10};Top=30;Right={i * 10 + 120};Bottom=90;" subject="{_id("CLS", c)}"'
+            f' seqno="{i + 1}" style="DUID=1;"/>'
+            f'<element geometry="SX=0;SY=0;EX=0;EY=0;EDGE=2;Path=;" subject="{_id("ASS", c)}" style="Hidden=0;"/>'
+            for i, c in enumerate(range(d, min(d + CLASSES_PER_DIAGRAM, n_classes)))
+        )
+        diagrams.append(
+            f'<diagram xmi:id="{_id("DIA", d)}"><model package="{_id("PKG", 0)}" owner="{_id("PKG", 0)}"/>'
+            f'<properties name="Diagram {d}" type="Logical"/>{project}<elements>{members}</elements></diagram>'
+        )
+    model.append("</packagedElement>")
+    return "\n".join(
+        [
+            "<?xml version='1.0' encoding='utf-8'?>",
+            f'<xmi:XMI xmi:version="2.1" xmlns:uml="{const.NS_UML}" xmlns:xmi="{const.NS_XMI}">',
+            '<uml:Model xmi:type="uml:Model" name="Benchmark">',
+            *model,
+            "</uml:Model>",
+            '<xmi:Extension extender="Enterprise Architect" extenderID="6.5">',
+            "<elements>",
+            *extension,
+            "</elements>",
+            "<attributes>",
+            *attributes,
+            "</attributes>",
+            "<connectors>",
+            *connectors,
+            "</connectors>",
+            "<diagrams>",
+            *diagrams,
+            "</diagrams>",
+            "</xmi:Extension>",
+            "</xmi:XMI>",
+        ]
+    ).encode("utf-8")
+
+
+class WriteTimer:
+    """
+    Accumulates the time spent writing to the database: flushes of the session, plus the INSERT, UPDATE and
+    DELETE statements that are executed outside a flush.
+    """
+
+    def __init__(self, session):
+        self.seconds = 0.0
+        self._start: Optional[float] = None
+        self._flushing = False
+        event.listen(session, "before_flush", self._before_flush)
+        event.listen(session, "after_flush_postexec", self._after_flush)
+        engine = session.get_bind()
+        event.listen(engine, "before_execute", self._before_execute)
+        event.listen(engine, "after_execute", self._after_execute)
+
+    def _before_flush(self, *args):
+        self._flushing = True
+        self._start = time.perf_counter()
+
+    def _after_flush(self, *args):
+        self._flushing = False
+        self._stop()
+
+    def _before_execute(self, conn, clauseelement, *args):
+        if not self._flushing and getattr(clauseelement, "is_dml", False):
+            self._start = time.perf_counter()
+
+    def _after_execute(self, *args):
+        if not self._flushing:
+            self._stop()
+
+    def _stop(self):
+        if self._start is not None:
+            self.seconds += time.perf_counter() - self._start
+            self._start = None
+
+
+def run(source: Optional[str], n_classes: int, repeat: int) -> Dict[str, float]:
+    tmpdir = tempfile.mkdtemp(prefix="crunch_uml_bench_")
+    database = db.Database(f"sqlite:///{os.path.join(tmpdir, 'bench.db')}", db_create=True)
+    writes = WriteTimer(database.session)
+    parser = EAXMIParser()
+
+    xml = open(source, "rb").read() if source else generate_eaxmi(n_classes)
+    root = etree.fromstring(xml)
+    ns = dict(root.nsmap)
+    model = root.xpath('//uml:Model[@xmi:type="uml:Model"][1]', namespaces=ns)[0]
+
+    totals: List[float] = []
+    parsing: List[float] = []
+    for i in range(repeat):
+        schema = sch.Schema(database, schema_name=f"bench_{i}")
+        parser.phase1_process_packages_classes(model, ns, schema)
+        parser.phase2_process_connectors(model, ns, schema)
+        # Like a regular import, phase 3 runs in the same transaction as phases 1 and 2.
+        database.session.flush()
+
+        writes.seconds = 0.0
+        start = time.perf_counter()
+        parser.phase3_process_extra(root, ns, schema)
+        total = time.perf_counter() - start
+        database.commit()
+        totals.append(total)
+        parsing.append(total - writes.seconds)
+
+    return {
+        "source": source or f"synthetic:{n_classes}",
+        "elements": sum(1 for _ in root.iter()),
+        "phase3_seconds": statistics.median(totals),
+        "parsing_seconds": statistics.median(parsing),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--file", help="EA XMI export to benchmark instead of the synthetic model")
+    ap.add_argument("--classes", type=int, default=800, help="Number of classes of the synthetic model")
+    ap.add_argument("--repeat", type=int, default=3, help="Runs per measurement, the median is reported")
+    ap.add_argument("--save", help="Write the results to this JSON file")
+    ap.add_argument("--baseline", help="JSON file of an earlier run to compare with")
+    ap.add_argument("--min-speedup", type=float, help="Fail unless extension parsing is this many times faster")
+    args = ap.parse_args()
+
+    result = run(args.file, args.classes, args.repeat)
+    print(
+        f"{result['source']}: {result['elements']} elements, phase 3 {result['phase3_seconds']:.3f} s,"
+        f" extension parsing {result['parsing_seconds']:.3f} s"
+    )
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline["source"] != result["source"]:
+            sys.exit(f"Baseline was measured on {baseline['source']}, not on {result['source']}")
+        speedup = baseline["parsing_seconds"] / result["parsing_seconds"]
+        print(
+            f"baseline: phase 3 {baseline['phase3_seconds']:.3f} s, extension parsing"
+            f" {baseline['parsing_seconds']:.3f} s -> {speedup:.1f}x faster"
+        )
+        if args.min_speedup is not None and speedup < args.min_speedup:
+            sys.exit(f"Extension parsing is {speedup:.1f}x faster than the baseline, expected {args.min_speedup}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Benchmark for the parallel per-package rendering (``--jobs``).
+
+Fills a scratch database with a number of model packages, each with classes,
+attributes and an enumeration, and times ``GGM_MDRenderer.render`` in one
+process and with a pool of worker processes. Both renders must write the same
+files. The speedup depends on the number of CPU cores; the pool costs a fixed
+start-up of about one import of crunch_uml:
+
+    .venv/bin/python tools/benchmark_parallel_render.py --packages 200 --jobs 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import filecmp
+import logging
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import Dict
+
+import crunch_uml.db as db
+import crunch_uml.schema as sch
+from crunch_uml.renderers.jinja2renderer import GGM_MDRenderer
+
+logging.basicConfig(level=logging.WARNING)
+logging.getLogger().setLevel(logging.WARNING)
+
+
+def generate(database: db.Database, n_packages: int, n_classes: int, n_attributes: int) -> None:
+    schema = sch.Schema(database)
+    schema.add(db.Package(id="EAPK_root", name="Gemeentelijk Gegevensmodel"))
+    for p in range(n_packages):
+        package_id = f"EAPK_{p}"
+        schema.add(db.Package(id=package_id, name=f"Model {p}", parent_package_id="EAPK_root", definitie="Domein"))
+        schema.add(db.Enumeratie(id=f"EAID_enum_{p}", name=f"Soort{p}", package_id=package_id))
+        for c in range(n_classes):
+            class_id = f"EAID_{p}_{c}"
+            schema.add(
+                db.Class(
+                    id=class_id,
+                    name=f"Klasse {p}.{c}",
+                    package_id=package_id,
+                    definitie=f"Een <b>klasse</b> van model {p}.\nMet een tweede regel.",
+                )
+            )
+            for a in range(n_attributes):
+                schema.add(
+                    db.Attribute(
+                        id=f"EAID_{p}_{c}_{a}",
+                        name=f"attribuut{a}",
+                        clazz_id=class_id,
+                        primitive="AN80",
+                        definitie=f"Attribuut {a} van klasse {c}.",
+                    )
+                )
+    database.commit()
+
+
+def _render(database: db.Database, outputdir: str, jobs: int) -> float:
+    os.makedirs(outputdir)
+    args = SimpleNamespace(
+        outputfile=os.path.join(outputdir, "model.md"),
+        output_jinja2_templatedir=None,
+        output_jinja2_template=None,
+        output_package_ids=None,
+        output_exclude_package_ids=None,
+        jobs=jobs,
+    )
+    schema = sch.Schema(database)
+    start = time.perf_counter()
+    with schema.package_scope():
+        GGM_MDRenderer().render(args, schema)
+    return time.perf_counter() - start
+
+
+def run(n_packages: int, n_classes: int, n_attributes: int, jobs: int) -> Dict[str, object]:
+    tmpdir = tempfile.mkdtemp(prefix="crunch_uml_bench_")
+    database = db.Database(f"sqlite:///{os.path.join(tmpdir, 'bench.db')}", db_create=True)
+    generate(database, n_packages, n_classes, n_attributes)
+
+    serial_dir, parallel_dir = os.path.join(tmpdir, "serial"), os.path.join(tmpdir, "parallel")
+    serial_seconds = _render(database, serial_dir, 1)
+    parallel_seconds = _render(database, parallel_dir, jobs)
+    files = sorted(os.listdir(serial_dir))
+    _, mismatch, errors = filecmp.cmpfiles(serial_dir, parallel_dir, files, shallow=False)
+    return {
+        "files": len(files),
+        "serial_seconds": serial_seconds,
+        "parallel_seconds": parallel_seconds,
+        "identical": not (mismatch or errors) and files == sorted(os.listdir(parallel_dir)),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--packages", type=int, default=200, help="Number of model packages")
+    ap.add_argument("--classes", type=int, default=20, help="Classes per package")
+    ap.add_argument("--attributes", type=int, default=10, help="Attributes per class")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Worker processes of the parallel render")
+    args = ap.parse_args()
+
+    result = run(args.packages, args.classes, args.attributes, args.jobs)
+    print(
+        f"{result['files']} files on {os.cpu_count()} cores: one process {result['serial_seconds']:.2f} s,"
+        f" {args.jobs} jobs {result['parallel_seconds']:.2f} s"
+        f" -> {result['serial_seconds'] / result['parallel_seconds']:.1f}x"
+    )
+    if not result["identical"]:
+        sys.exit("The parallel render differs from the render in one process")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""Benchmark for the QEA parser.
+
+Imports an Enterprise Architect ``.qea`` repository — by default a synthetic
+repository the size of a full municipal data model, built from the table
+definitions of ``test/data/Monumenten.qea`` (classes with attributes and
+tagged values, enumerations with literals, associations, generalizations and
+diagrams showing all of them) — into a scratch SQLite database and reports
+the median time of ``QEAParser.parse`` over a number of runs.
+
+Results can be stored with ``--save`` and compared with an earlier run with
+``--baseline``, for instance between two commits:
+
+    git stash; .venv/bin/python tools/benchmark_qea_import.py --save /tmp/qea_before.json; git stash pop
+    .venv/bin/python tools/benchmark_qea_import.py --baseline /tmp/qea_before.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+import crunch_uml.db as db
+import crunch_uml.schema as sch
+from crunch_uml.parsers.qeaparser import QEAParser
+
+logging.basicConfig(level=logging.WARNING)
+logging.getLogger().setLevel(logging.WARNING)
+
+TEMPLATE = os.path.join(os.path.dirname(__file__), "..", "test", "data", "Monumenten.qea")
+ATTRIBUTES_PER_CLASS = 6
+TAGS_PER_CLASS = 8
+TAGS_PER_ATTRIBUTE = 2
+CLASSES_PER_ENUMERATION = 10
+LITERALS_PER_ENUMERATION = 5
+CLASSES_PER_DIAGRAM = 20
+TABLES = (
+    "t_package",
+    "t_object",
+    "t_attribute",
+    "t_connector",
+    "t_objectproperties",
+    "t_attributetag",
+    "t_connectortag",
+    "t_diagram",
+    "t_diagramobjects",
+    "t_diagramlinks",
+)
+
+
+def _guid(kind: int, i: int) -> str:
+    return f"{{{kind:08X}-0000-0000-0000-{i:012X}}}"
+
+
+def generate_qea(path: str, n_classes: int) -> None:
+    """Writes a synthetic QEA repository with ``n_classes`` classes to ``path``."""
+    shutil.copyfile(TEMPLATE, path)
+    con = sqlite3.connect(path)
+    for table in TABLES:
+        con.execute(f"DELETE FROM {table}")
+    con.execute(
+        "INSERT INTO t_package (Package_ID, Name, Parent_ID, ea_guid, Notes) VALUES (1, 'Model', 0, ?, NULL),"
+        " (2, 'Benchmark', 1, ?, 'Benchmark package')",
+        (_guid(1, 1), _guid(1, 2)),
+    )
+    n_enums = max(1, n_classes // CLASSES_PER_ENUMERATION)
+    objects, attributes, connectors, object_tags, attribute_tags, connector_tags = [], [], [], [], [], []
+    for e in range(n_enums):
+        objects.append((1 + e, "Enumeration", f"Enum{e}", 2, _guid(2, e), f"Enumeratie {e}."))
+        for v in range(LITERALS_PER_ENUMERATION):
+            attributes.append((len(attributes) + 1, 1 + e, f"waarde{v}", "", "0", v, _guid(3, len(attributes))))
+    for c in range(n_classes):
+        obj_id = 1 + n_enums + c
+        objects.append((obj_id, "Class", f"Class{c}", 2, _guid(4, c), f"Definitie van Class{c}."))
+        for t in range(TAGS_PER_CLASS):
+            object_tags.append((len(object_tags) + 1, obj_id, ("bron", "toelichting", "synoniemen")[t % 3], f"w{t}"))
+        for a in range(ATTRIBUTES_PER_CLASS):
+            attr_id = len(attributes) + 1
+            classifier = str(1 + c % n_enums) if a == 0 else "0"
+            attributes.append((attr_id, obj_id, f"attribuut{a}", "CharacterString", classifier, a, _guid(5, attr_id)))
+            for t in range(TAGS_PER_ATTRIBUTE):
+                attribute_tags.append((len(attribute_tags) + 1, attr_id, ("lengte", "patroon")[t], f"w{t}"))
+        target = 1 + n_enums + (c + 1) % n_classes
+        connectors.append((len(connectors) + 1, "verwijst", "Association", "1", "0..*", obj_id, target, c))
+        connector_tags.append((len(connector_tags) + 1, len(connectors), "toelichting", f"Associatie {c}"))
+        if c % 5 == 4:
+            connectors.append((len(connectors) + 1, None, "Generalization", None, None, obj_id, obj_id - 1, c))
+    con.executemany(
+        "INSERT INTO t_object (Object_ID, Object_Type, Name, Package_ID, ea_guid, Note) VALUES (?, ?, ?, ?, ?, ?)",
+        objects,
+    )
+    con.executemany(
+        "INSERT INTO t_attribute (ID, Object_ID, Name, Type, Classifier, Pos, ea_guid) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        attributes,
+    )
+    con.executemany(
+        "INSERT INTO t_connector (Connector_ID, Name, Connector_Type, SourceCard, DestCard, Start_Object_ID,"
+        " End_Object_ID, ea_guid) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        [row[:-1] + (_guid(6, row[0]),) for row in connectors],
+    )
+    con.executemany(
+        "INSERT INTO t_objectproperties (PropertyID, Object_ID, Property, Value) VALUES (?, ?, ?, ?)", object_tags
+    )
+    con.executemany(
+        "INSERT INTO t_attributetag (PropertyID, ElementID, Property, VALUE) VALUES (?, ?, ?, ?)", attribute_tags
+    )
+    con.executemany(
+        "INSERT INTO t_connectortag (PropertyID, ElementID, Property, VALUE) VALUES (?, ?, ?, ?)", connector_tags
+    )
+
+    diagram_objects, diagram_links = [], []
+    diagrams = list(range(0, n_classes, CLASSES_PER_DIAGRAM))
+    for d, first in enumerate(diagrams):
+        members = range(first, min(first + CLASSES_PER_DIAGRAM, n_classes))
+        for i, c in enumerate(members):
+            diagram_objects.append(
+                (len(diagram_objects) + 1, d + 1, 1 + n_enums + c, i * 150, -20, i * 150 + 120, -90, i)
+            )
+            diagram_links.append((len(diagram_links) + 1, d + 1, c + 1, "SX=0;SY=0;EX=0;EY=0;", "Mode=3;", 0, None))
+    con.executemany(
+        "INSERT INTO t_diagram (Diagram_ID, Package_ID, Name, ea_guid, AttPub, AttPri, AttPro, ShowForeign, ShowBorder,"
+        " ShowPackageContents, Locked) VALUES (?, 2, ?, ?, 1, 1, 1, 1, 1, 1, 0)",
+        [(d + 1, f"Diagram {d}", _guid(7, d)) for d in range(len(diagrams))],
+    )
+    con.executemany(
+        "INSERT INTO t_diagramobjects (Instance_ID, Diagram_ID, Object_ID, RectLeft, RectTop, RectRight, RectBottom,"
+        " Sequence) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        diagram_objects,
+    )
+    con.executemany(
+        "INSERT INTO t_diagramlinks (Instance_ID, DiagramID, ConnectorID, Geometry, Style, Hidden, Path)"
+        " VALUES (?, ?, ?, ?, ?, ?, ?)",
+        diagram_links,
+    )
+    con.commit()
+    con.close()
+
+
+def run(source: Optional[str], n_classes: int, repeat: int, bulk_insert: bool = False) -> Dict[str, object]:
+    tmpdir = tempfile.mkdtemp(prefix="crunch_uml_bench_")
+    if source is None:
+        source = os.path.join(tmpdir, "benchmark.qea")
+        generate_qea(source, n_classes)
+    database = db.Database(f"sqlite:///{os.path.join(tmpdir, 'bench.db')}", db_create=True)
+    parser = QEAParser()
+
+    timings: List[float] = []
+    for i in range(repeat):
+        schema = sch.Schema(database, schema_name=f"bench_{i}")
+        start = time.perf_counter()
+        with schema.bulk_insert() if bulk_insert else contextlib.nullcontext():
+            parser.parse(SimpleNamespace(inputfile=source), schema)
+        timings.append(time.perf_counter() - start)
+        database.commit()
+
+    return {
+        "source": source if n_classes is None else f"synthetic:{n_classes}",
+        "classes": schema.count_class(),
+        "attributes": schema.count_attribute(),
+        "parse_seconds": statistics.median(timings),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--file", help="QEA repository to benchmark instead of the synthetic one")
+    ap.add_argument("--classes", type=int, default=1000, help="Number of classes of the synthetic repository")
+    ap.add_argument("--repeat", type=int, default=3, help="Runs per measurement, the median is reported")
+    ap.add_argument("--bulk_insert", action="store_true", help="Import with the bulk-insert write path")
+    ap.add_argument("--save", help="Write the results to this JSON file")
+    ap.add_argument("--baseline", help="JSON file of an earlier run to compare with")
+    args = ap.parse_args()
+
+    result = run(args.file, None if args.file else args.classes, args.repeat, args.bulk_insert)
+    print(
+        f"{result['source']}: {result['classes']} classes, {result['attributes']} attributes,"
+        f" parse {result['parse_seconds']:.3f} s"
+    )
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline["source"] != result["source"]:
+            sys.exit(f"Baseline was measured on {baseline['source']}, not on {result['source']}")
+        speedup = baseline["parse_seconds"] / result["parse_seconds"]
+        print(f"baseline: parse {baseline['parse_seconds']:.3f} s -> {speedup:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
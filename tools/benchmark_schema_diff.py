@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Benchmark for the schema diff (``diff_md``).
+
+Imports the synthetic QEA repository of ``benchmark_qea_import.py`` twice,
+as an old and a new version, edits the new one (renamed classes, rewritten
+definitions, retyped and deleted attributes) and times
+``SchemaDiffMarkdownRenderer.render`` between the two. The diff reads both
+schemas as lightweight rows; the same render over full ORM entities (the
+former loading) is timed too, and both must write the same Markdown. The
+peak of Python allocations during the row-based render is reported as well:
+
+    .venv/bin/python tools/benchmark_schema_diff.py --classes 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+from typing import Dict
+
+from sqlalchemy import text
+
+import crunch_uml.db as db
+import crunch_uml.schema as sch
+from crunch_uml.parsers.qeaparser import QEAParser
+from crunch_uml.renderers.pandasrenderer import SchemaDiffMarkdownRenderer
+
+sys.path.insert(0, os.path.dirname(__file__))
+from benchmark_qea_import import generate_qea  # noqa: E402
+
+logging.basicConfig(level=logging.WARNING)
+logging.getLogger().setLevel(logging.WARNING)
+
+EDITS = [
+    "UPDATE classes SET name = name || 'Nieuw' WHERE schema_id = 'new' AND rowid % 50 = 0",
+    "UPDATE classes SET definitie = 'Herschreven: ' || coalesce(definitie, '') WHERE schema_id = 'new'"
+    " AND rowid % 10 = 0",
+    "UPDATE attributes SET primitive = 'Integer' WHERE schema_id = 'new' AND rowid % 7 = 0",
+    "DELETE FROM attributes WHERE schema_id = 'new' AND rowid % 20 = 0",
+]
+
+
+class OrmEntities(SchemaDiffMarkdownRenderer):
+    """The diff over full ORM entities, as loaded before the row-based diff."""
+
+    def _load_entities(self, schema):
+        return {
+            "packages": list(schema.get_all_packages()),
+            "classes": list(schema.get_all_classes()),
+            "enums": list(schema.get_all_enumerations()),
+            "attrs": list(schema.get_all_attributes()),
+            "literals": list(schema.get_all_literals()),
+            "assocs": list(schema.get_all_associations()),
+            "gens": list(schema.get_all_generalizations()),
+        }
+
+
+def _render(renderer, database, outputfile) -> float:
+    database.session.expire_all()
+    args = SimpleNamespace(outputfile=outputfile, compare_schema_name="old", compare_title=None)
+    start = time.perf_counter()
+    renderer.render(args, sch.Schema(database, schema_name="new"))
+    return time.perf_counter() - start
+
+
+def run(n_classes: int) -> Dict[str, object]:
+    tmpdir = tempfile.mkdtemp(prefix="crunch_uml_bench_")
+    source = os.path.join(tmpdir, "benchmark.qea")
+    generate_qea(source, n_classes)
+    database = db.Database(f"sqlite:///{os.path.join(tmpdir, 'bench.db')}", db_create=True)
+    for name in ("old", "new"):
+        QEAParser().parse(SimpleNamespace(inputfile=source), sch.Schema(database, schema_name=name))
+        database.commit()
+    for edit in EDITS:
+        database.session.execute(text(edit))
+    database.commit()
+
+    rows_file = os.path.join(tmpdir, "rows.md")
+    orm_file = os.path.join(tmpdir, "orm.md")
+    orm_seconds = _render(OrmEntities(), database, orm_file)
+    rows_seconds = _render(SchemaDiffMarkdownRenderer(), database, rows_file)
+    tracemalloc.start()
+    _render(SchemaDiffMarkdownRenderer(), database, rows_file)
+    peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+
+    with open(rows_file, encoding="utf-8") as f, open(orm_file, encoding="utf-8") as g:
+        rows_md, orm_md = f.read(), g.read()
+    return {
+        "classes": sch.Schema(database, schema_name="new").count_class(),
+        "attributes": sch.Schema(database, schema_name="new").count_attribute(),
+        "lines": rows_md.count("\n"),
+        "orm_seconds": orm_seconds,
+        "rows_seconds": rows_seconds,
+        "peak_mb": peak_mb,
+        "identical": rows_md == orm_md,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--classes", type=int, default=5000, help="Number of classes of the synthetic repository")
+    args = ap.parse_args()
+
+    result = run(args.classes)
+    print(
+        f"{result['classes']} classes, {result['attributes']} attributes, diff of {result['lines']} lines:"
+        f" ORM entities {result['orm_seconds']:.2f} s, rows {result['rows_seconds']:.2f} s"
+        f" -> {result['orm_seconds'] / result['rows_seconds']:.1f}x faster; peak {result['peak_mb']:.0f} MB"
+    )
+    if not result["identical"]:
+        sys.exit("The row-based diff differs from the diff over ORM entities")
+
+
+if __name__ == "__main__":
+    main()
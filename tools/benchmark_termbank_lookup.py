@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Benchmark for the fuzzy lookup of the termbank index.
+
+Builds a synthetic termbank — by default one million Dutch-looking labels
+with an English translation each — in a ``TermbankIndex`` and times
+``lookup`` for near misses (a character dropped, doubled or swapped), which
+all take the fuzzy route. The same queries are then matched with a full
+``difflib.get_close_matches`` scan over every label of the language, the
+lookup before the n-gram index, on a sample because one such scan takes
+seconds; both must return the same labels in the same order. Finally the
+termbank is written to a compiled cache (``compile_termbank``), opened as a
+warm run would, and queried again; its candidates must equal those of the
+in-memory index:
+
+    .venv/bin/python tools/benchmark_termbank_lookup.py --labels 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import difflib
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+from crunch_uml.translation.termbank import (
+    FUZZY_CUTOFF,
+    FUZZY_MATCHES,
+    CompiledTermbank,
+    Concept,
+    TermbankIndex,
+    _norm,
+    compile_termbank,
+)
+
+logging.basicConfig(level=logging.WARNING)
+
+_ONSETS = ("", "b", "d", "g", "h", "k", "l", "m", "n", "p", "r", "s", "t", "v", "w", "z", "br", "gr", "kl", "sch", "st")
+_VOWELS = ("a", "e", "i", "o", "u", "aa", "ee", "oo", "ij", "ui", "ou", "ie", "eu")
+_CODAS = ("", "", "n", "r", "l", "s", "t", "k", "ng", "rd", "st", "ft", "cht", "nd", "rk")
+
+
+def generate_labels(count: int, seed: int) -> List[str]:
+    """Unique labels of one to three words of one to four syllables; the
+    syllables follow a Zipf distribution, like the words of a real
+    termbank."""
+    rnd = random.Random(seed)
+    syllables = [onset + vowel + coda for onset in _ONSETS for vowel in _VOWELS for coda in _CODAS]
+    rnd.shuffle(syllables)
+    weights = [1 / rank for rank in range(1, len(syllables) + 1)]
+    labels = set()
+    while len(labels) < count:
+        words = ["".join(rnd.choices(syllables, weights, k=rnd.randint(1, 4))) for _ in range(rnd.randint(1, 3))]
+        labels.add(" ".join(words))
+    return sorted(labels)
+
+
+def near_miss(label: str, rnd: random.Random) -> str:
+    chars = list(label)
+    position = rnd.randrange(len(chars))
+    edit = rnd.choice(("drop", "double", "swap"))
+    if edit == "drop" and len(chars) > 1:
+        del chars[position]
+    elif edit == "swap" and position + 1 < len(chars):
+        chars[position], chars[position + 1] = chars[position + 1], chars[position]
+    else:
+        chars.insert(position, chars[position])
+    return "".join(chars)
+
+
+def run(n_labels: int, n_queries: int, n_verify: int, seed: int) -> Dict[str, object]:
+    labels = generate_labels(n_labels, seed)
+    concepts = [
+        Concept(uri=f"urn:bench:{i}", source="bench", priority=0, labels={"nl": [label], "en": [f"term {i}"]})
+        for i, label in enumerate(labels)
+    ]
+    started = time.perf_counter()
+    index = TermbankIndex()
+    index.add_concepts(concepts)
+    build_seconds = time.perf_counter() - started
+
+    rnd = random.Random(seed + 1)
+    queries = [near_miss(rnd.choice(labels), rnd) for _ in range(n_queries)]
+    started = time.perf_counter()
+    results = [index.lookup(query, "nl", "en") for query in queries]
+    index_seconds = time.perf_counter() - started
+
+    keys = [_norm(label) for label in labels]
+    identical = True
+    started = time.perf_counter()
+    for query in queries[:n_verify]:
+        expected = difflib.get_close_matches(_norm(query), keys, n=FUZZY_MATCHES, cutoff=FUZZY_CUTOFF)
+        actual = index._fuzzy["nl"].close_matches(_norm(query), n=FUZZY_MATCHES, cutoff=FUZZY_CUTOFF)
+        identical = identical and expected == actual
+    scan_seconds = time.perf_counter() - started
+
+    with tempfile.TemporaryDirectory() as tmp:
+        target = os.path.join(tmp, "bench.crunchtb")
+        started = time.perf_counter()
+        compile_termbank(concepts, target, {})
+        compile_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        compiled = TermbankIndex()
+        compiled.add_compiled(CompiledTermbank.open(target, {}, "bench", 0))
+        open_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        compiled_results = [compiled.lookup(query, "nl", "en") for query in queries]
+        compiled_seconds = time.perf_counter() - started
+        cache_mb = os.path.getsize(target) / 1e6
+
+    return {
+        "labels": len(labels),
+        "build_seconds": build_seconds,
+        "queries": len(queries),
+        "hits": sum(1 for candidates in results if candidates),
+        "index_per_second": len(queries) / index_seconds,
+        "scan_per_second": min(n_verify, len(queries)) / scan_seconds if scan_seconds else 0.0,
+        "identical": identical,
+        "compile_seconds": compile_seconds,
+        "cache_mb": cache_mb,
+        "open_seconds": open_seconds,
+        "compiled_per_second": len(queries) / compiled_seconds,
+        "compiled_identical": compiled_results == results,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--labels", type=int, default=1_000_000, help="Number of labels in the synthetic termbank")
+    ap.add_argument("--queries", type=int, default=200, help="Fuzzy lookups timed against the index")
+    ap.add_argument("--verify", type=int, default=10, help="Queries also matched with a full scan")
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    result = run(args.labels, args.queries, args.verify, args.seed)
+    print(
+        f"{result['labels']} labels, index built in {result['build_seconds']:.1f} s;"
+        f" {result['queries']} fuzzy lookups ({result['hits']} with candidates):"
+        f" n-gram index {result['index_per_second']:.1f}/s, full scan {result['scan_per_second']:.2f}/s"
+        f" -> {result['index_per_second'] / result['scan_per_second']:.0f}x faster"
+    )
+    print(
+        f"compiled cache: {result['cache_mb']:.0f} MB written in {result['compile_seconds']:.1f} s,"
+        f" opened in {result['open_seconds'] * 1000:.1f} ms; {result['compiled_per_second']:.1f} fuzzy lookups/s"
+    )
+    if not result["identical"]:
+        sys.exit("The n-gram index returns other matches than the full scan")
+    if not result["compiled_identical"]:
+        sys.exit("The compiled cache returns other candidates than the in-memory index")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,7 +17,11 @@ database, then scores one or more Ollama models on it:
 
 Every call goes through the pipeline's own ``translate_element_once`` —
 temperature 0, fixed seed, JSON schema — so the benchmark measures the real
-call path, not a simplified one.
+call path, not a simplified one. With ``--batch_size N`` the name-only
+attributes and literals of one owner go through ``translate_batch_once``
+instead, N per call, with the same per-element fallback as the pipeline;
+the result is stored as ``"<model> (batch N)"`` next to the unbatched run,
+so the summary table shows the throughput/quality trade-off side by side.
 
 Results are merged into a JSON file so each model can be benchmarked in a
 separate invocation (Ollama loads one model at a time); the summary table
@@ -42,6 +46,7 @@ import json
 import logging
 import sqlite3
 import sys
+import threading
 import time
 from collections import Counter
 from concurrent.futures import ThreadPoolExecutor
@@ -53,8 +58,10 @@ from crunch_uml.translation.llm import (
     _term_in_text,
     glossary_violations,
     names_agree,
+    translate_batch_once,
     translate_element_once,
 )
+from crunch_uml.translation.pipeline import BATCH_SECTIONS
 
 logging.basicConfig(level=logging.WARNING)
 
@@ -63,6 +70,8 @@ logging.basicConfig(level=logging.WARNING)
 SECTION_SAMPLES = {"classes": 30, "attributes": 20, "enumerationliterals": 10}
 MIN_DEFINITION_CHARS = 20
 MAX_GLOSSARY_ENTRIES = 10
+# Owner per section: batches only group siblings of the same owner.
+OWNER_COLUMNS = {"classes": "package_id", "attributes": "clazz_id", "enumerationliterals": "enumeratie_id"}
 
 
 # ---------------------------------------------------------------------------
@@ -127,11 +136,12 @@ def build_golden_set(db_path: str, schema: str, i18n_path: str, language: str) -
     for section, sample_size in SECTION_SAMPLES.items():
         refs = _index_i18n_section(i18n, language, section)
         rows = conn.execute(
-            f"SELECT id, name, definitie FROM {section} WHERE schema_id=? AND name IS NOT NULL ORDER BY id",
+            f"SELECT id, name, definitie, {OWNER_COLUMNS[section]} FROM {section}"
+            " WHERE schema_id=? AND name IS NOT NULL ORDER BY id",
             (schema,),
         ).fetchall()
         candidates = []
-        for guid, name, definitie in rows:
+        for guid, name, definitie, owner in rows:
             ref = refs.get(guid) or {}
             if not name or not ref.get("name"):
                 continue
@@ -151,6 +161,7 @@ def build_golden_set(db_path: str, schema: str, i18n_path: str, language: str) -
                 {
                     "section": section,
                     "guid": guid,
+                    "owner": owner,
                     "fields": fields,
                     "reference": {"name": ref["name"], **({"definitie": ref_def} if has_def else {})},
                     "glossary": glossary,
@@ -171,22 +182,65 @@ def build_golden_set(db_path: str, schema: str, i18n_path: str, language: str) -
 # ---------------------------------------------------------------------------
 
 
-def run_model(model: str, golden: List[Dict], config: TranslationConfig, workers: int) -> Dict:
-    def _one(item: Dict) -> Tuple[Dict, Optional[Dict[str, str]], float]:
-        element = Element(section=item["section"], key=item["guid"], fields=dict(item["fields"]))
-        start = time.time()
+def group_calls(golden: List[Dict], batch_size: int) -> List[List[Dict]]:
+    """The golden items per LLM call: name-only attributes and literals of
+    one owner ``batch_size`` at a time (like the pipeline), the rest alone."""
+    calls: List[List[Dict]] = []
+    groups: Dict[Tuple[str, str], List[Dict]] = {}
+    for item in golden:
+        if batch_size > 1 and item["section"] in BATCH_SECTIONS and list(item["fields"]) == ["name"]:
+            groups.setdefault((item["section"], item.get("owner") or ""), []).append(item)
+        else:
+            calls.append([item])
+    for group in groups.values():
+        calls.extend(group[i : i + batch_size] for i in range(0, len(group), batch_size))
+    return calls
+
+
+def run_model(model: str, golden: List[Dict], config: TranslationConfig, workers: int, batch_size: int = 1) -> Dict:
+    counts = Counter()
+    lock = threading.Lock()
+
+    def _count(name: str, n: int = 1) -> None:
+        with lock:
+            counts[name] += n
+
+    def _element(item: Dict) -> Element:
+        return Element(section=item["section"], key=item["guid"], fields=dict(item["fields"]))
+
+    def _single(item: Dict) -> Optional[Dict[str, str]]:
+        _count("calls")
         try:
-            result = translate_element_once(
-                element, "en", "nl", model=model, config=config, glossary=item["glossary"] or None
+            return translate_element_once(
+                _element(item), "en", "nl", model=model, config=config, glossary=item["glossary"] or None
             )
         except Exception as e:
             print(f"  FOUT bij {item['guid']}: {e}", file=sys.stderr)
-            return item, None, time.time() - start
-        return item, result, time.time() - start
+            return None
+
+    def _one(batch: List[Dict]) -> List[Tuple[Dict, Optional[Dict[str, str]], float]]:
+        start = time.time()
+        if len(batch) == 1:
+            results = [_single(batch[0])]
+        else:
+            _count("calls")
+            glossary = dict(sorted({k: v for item in batch for k, v in item["glossary"].items()}.items()))
+            try:
+                parsed = translate_batch_once(
+                    [_element(item) for item in batch], "en", "nl", model=model, config=config, glossary=glossary
+                )
+            except Exception as e:
+                print(f"  FOUT bij batch {batch[0]['guid']} (+{len(batch) - 1}): {e}", file=sys.stderr)
+                parsed = [None] * len(batch)
+            _count("batch_fallbacks", sum(1 for r in parsed if r is None))
+            results = [r if r is not None else _single(item) for item, r in zip(batch, parsed)]
+        # De tijd van een gebundelde call telt gelijk verdeeld over zijn elementen.
+        seconds = (time.time() - start) / len(batch)
+        return [(item, result, seconds) for item, result in zip(batch, results)]
 
     started = time.time()
     with ThreadPoolExecutor(max_workers=workers) as pool:
-        outcomes = list(pool.map(_one, golden))
+        outcomes = [outcome for batch in pool.map(_one, group_calls(golden, batch_size)) for outcome in batch]
     wall = time.time() - started
 
     per_element = []
@@ -222,7 +276,10 @@ def run_model(model: str, golden: List[Dict], config: TranslationConfig, workers
 
     return {
         "model": model,
+        "batch_size": batch_size,
         "elements": len(golden),
+        "calls": counts["calls"],
+        "batch_fallbacks": counts["batch_fallbacks"],
         "failures": failures,
         "name_accuracy": round(name_hits / name_total, 4) if name_total else None,
         "chrf_mean": round(sum(chrf_scores) / len(chrf_scores), 4) if chrf_scores else None,
@@ -235,15 +292,20 @@ def run_model(model: str, golden: List[Dict], config: TranslationConfig, workers
 
 
 def print_summary(results: Dict[str, Dict]) -> None:
-    print("\n| model | naam-accuraat | chrF (definities) | glossarium-naleving | sec/element |")
-    print("|---|---|---|---|---|")
+    print("\n| model | naam-accuraat | chrF (definities) | glossarium-naleving | calls | sec/element |")
+    print("|---|---|---|---|---|---|")
     for model, r in results.items():
         gloss = (
             f"{r['glossary_compliance']:.0%} (n={r['glossary_tested']})"
             if r["glossary_compliance"] is not None
             else "—"
         )
-        print(f"| {model} | {r['name_accuracy']:.0%} | {r['chrf_mean']:.3f} | {gloss} | {r['seconds_per_element']} |")
+        # Resultaten van voor --batch_size kennen geen calls: één per element.
+        calls = r.get("calls", r["elements"])
+        print(
+            f"| {model} | {r['name_accuracy']:.0%} | {r['chrf_mean']:.3f} | {gloss} | {calls}"
+            f" | {r['seconds_per_element']} |"
+        )
 
 
 def print_disagreements(result: Dict, limit: int = 5) -> None:
@@ -272,6 +334,12 @@ def main() -> int:
     parser.add_argument("--out", default="benchmark_results.json", help="JSON-resultaten (wordt samengevoegd)")
     parser.add_argument("--workers", type=int, default=4)
     parser.add_argument("--timeout", type=int, default=300)
+    parser.add_argument(
+        "--batch_size",
+        type=int,
+        default=1,
+        help="aantal naam-only attributen/literals per call (1 = elk element apart, zoals zonder bundeling)",
+    )
     args = parser.parse_args()
 
     golden, class_glossary = build_golden_set(args.db, args.schema, args.i18n, args.language)
@@ -291,13 +359,14 @@ def main() -> int:
     config = TranslationConfig(ollama_timeout=args.timeout, workers=args.workers)
     for model in args.models:
         print(f"\nBenchmark {model}: {len(golden)} elementen...")
-        result = run_model(model, golden, config, args.workers)
-        all_results[model] = result
+        result = run_model(model, golden, config, args.workers, batch_size=args.batch_size)
+        all_results[model if args.batch_size <= 1 else f"{model} (batch {args.batch_size})"] = result
         with open(args.out, "w", encoding="utf-8") as f:
             json.dump(all_results, f, ensure_ascii=False, indent=2)
         print(
             f"Klaar in {result['wall_seconds']}s — naam {result['name_accuracy']:.0%},"
-            f" chrF {result['chrf_mean']:.3f}, mislukt: {result['failures']}"
+            f" chrF {result['chrf_mean']:.3f}, {result['calls']} calls"
+            f" ({result['batch_fallbacks']} terugvallers naar losse calls), mislukt: {result['failures']}"
         )
         print_disagreements(result)
 
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Scaling benchmark for phase 2 of the XMI parser.
+
+Generates synthetic XMI models of increasing size — classes with a primitive,
+an enumeration-typed and a class-typed attribute, one association and every
+fifth class a generalization — imports phase 1 into a scratch SQLite
+database and times ``XMIParser.phase2_process_connectors`` per model. The
+doubling sizes make the scaling behaviour directly visible: with the shared
+type-reference index the time per class should stay flat, where the former
+per-type ``.//type[@xmi:idref=...]`` scan made it grow with the document.
+
+With ``--legacy`` the former per-type xpath lookups are timed as well
+(lookups only, no database work) for models up to ``--legacy-max`` classes;
+this part is quadratic, so keep the limit modest. Example:
+
+    .venv/bin/python tools/benchmark_xmi_phase2.py --sizes 1250 2500 5000 10000 --legacy
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+from typing import List
+
+from lxml import etree
+
+import crunch_uml.db as db
+import crunch_uml.schema as sch
+from crunch_uml import const
+from crunch_uml.parsers.xmiparser import XMIParser, build_type_reference_index
+
+logging.basicConfig(level=logging.WARNING)
+logging.getLogger().setLevel(logging.WARNING)
+
+ENUMS_PER_CLASS = 0.1
+DATATYPES_PER_CLASS = 0.05
+
+
+def _id(kind: str, i: int) -> str:
+    return f"EAID_{kind}{i:08d}_0000_0000_0000_000000000000"
+
+
+def generate_xmi(n_classes: int) -> bytes:
+    """Builds a synthetic XMI 2.1 document with ``n_classes`` classes."""
+    n_enums = max(1, int(n_classes * ENUMS_PER_CLASS))
+    n_datatypes = max(1, int(n_classes * DATATYPES_PER_CLASS))
+    lines = [
+        "<?xml version='1.0' encoding='utf-8'?>",
+        f'<xmi:XMI xmi:version="2.1" xmlns:uml="{const.NS_UML}" xmlns:xmi="{const.NS_XMI}">',
+        '<uml:Model xmi:type="uml:Model" name="Benchmark">',
+        f'<packagedElement xmi:type="uml:Package" xmi:id="{_id("PKG", 0)}" name="Benchmark">',
+    ]
+    for e in range(n_enums):
+        lines.append(f'<packagedElement xmi:type="uml:Enumeration" xmi:id="{_id("ENU", e)}" name="Enum{e}">')
+        for v in range(3):
+            lines.append(
+                f'<ownedLiteral xmi:type="uml:EnumerationLiteral" xmi:id="{_id("LIT", e * 3 + v)}" name="v{v}"/>'
+            )
+        lines.append("</packagedElement>")
+    for d in range(n_datatypes):
+        lines.append(f'<packagedElement xmi:type="uml:DataType" xmi:id="{_id("DTY", d)}" name="Datatype{d}"/>')
+    for c in range(n_classes):
+        target = (c + 1) % n_classes
+        lines.append(f'<packagedElement xmi:type="uml:Class" xmi:id="{_id("CLS", c)}" name="Class{c}">')
+        lines.append(f'<ownedAttribute xmi:type="uml:Property" xmi:id="{_id("ATP", c)}" name="naam">')
+        lines.append('<type xmi:idref="EAJava_String"/></ownedAttribute>')
+        lines.append(f'<ownedAttribute xmi:type="uml:Property" xmi:id="{_id("ATE", c)}" name="soort">')
+        lines.append(f'<type xmi:idref="{_id("ENU", c % n_enums)}"/></ownedAttribute>')
+        lines.append(f'<ownedAttribute xmi:type="uml:Property" xmi:id="{_id("ATD", c)}" name="waarde">')
+        lines.append(f'<type xmi:idref="{_id("DTY", c % n_datatypes)}"/></ownedAttribute>')
+        lines.append(
+            f'<ownedAttribute xmi:type="uml:Property" xmi:id="{_id("dst", c)}" name="verwijst"'
+            f' association="{_id("ASS", c)}">'
+        )
+        lines.append(f'<type xmi:idref="{_id("CLS", target)}"/>')
+        lines.append('<lowerValue xmi:type="uml:LiteralInteger" value="0"/>')
+        lines.append('<upperValue xmi:type="uml:LiteralUnlimitedNatural" value="-1"/></ownedAttribute>')
+        if c % 5 == 4:
+            lines.append(
+                f'<generalization xmi:type="uml:Generalization" xmi:id="{_id("GEN", c)}" general="{_id("CLS", c - 1)}"/>'
+            )
+        lines.append("</packagedElement>")
+        lines.append(f'<packagedElement xmi:type="uml:Association" xmi:id="{_id("ASS", c)}" name="verwijst">')
+        lines.append(f'<memberEnd xmi:idref="{_id("dst", c)}"/><memberEnd xmi:idref="{_id("src", c)}"/>')
+        lines.append(
+            f'<ownedEnd xmi:type="uml:Property" xmi:id="{_id("src", c)}" association="{_id("ASS", c)}">'
+            f'<type xmi:idref="{_id("CLS", c)}"/></ownedEnd>'
+        )
+        lines.append("</packagedElement>")
+    lines += ["</packagedElement>", "</uml:Model>", "</xmi:XMI>"]
+    return "\n".join(lines).encode("utf-8")
+
+
+def time_legacy_lookups(model, ns, schema: sch.Schema) -> float:
+    """Times the former per-type ``.//type[@xmi:idref=...]`` scans of phase 2 (lookups only)."""
+    ids = [e.id for e in schema.get_all_enumerations()] + [c.id for c in schema.get_all_classes()]
+    start = time.perf_counter()
+    for id in ids:
+        model.xpath(".//type[@xmi:idref='" + id + "']", namespaces=ns)
+    return time.perf_counter() - start
+
+
+def run(sizes: List[int], legacy: bool, legacy_max: int) -> None:
+    tmpdir = tempfile.mkdtemp(prefix="crunch_uml_bench_")
+    database = db.Database(f"sqlite:///{os.path.join(tmpdir, 'bench.db')}", db_create=True)
+    parser = XMIParser()
+
+    print(f"{'classes':>8} {'elements':>9} {'index s':>8} {'phase2 s':>9} {'us/class':>9} {'legacy s':>9}")
+    for size in sizes:
+        root = etree.fromstring(generate_xmi(size))
+        ns = dict(root.nsmap)
+        model = root.find("uml:Model", namespaces=ns)
+        schema = sch.Schema(database, schema_name=f"bench_{size}")
+        parser.phase1_process_packages_classes(model, ns, schema)
+        database.commit()
+
+        start = time.perf_counter()
+        build_type_reference_index(model, ns)
+        index_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        parser.phase2_process_connectors(model, ns, schema)
+        database.session.flush()
+        phase2_seconds = time.perf_counter() - start
+        database.commit()
+
+        legacy_column = "-"
+        if legacy and size <= legacy_max:
+            legacy_column = f"{time_legacy_lookups(model, ns, schema):.2f}"
+
+        elements = sum(1 for _ in model.iter())
+        print(
+            f"{size:>8} {elements:>9} {index_seconds:>8.3f} {phase2_seconds:>9.2f}"
+            f" {phase2_seconds / size * 1e6:>9.0f} {legacy_column:>9}"
+        )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1250, 2500, 5000, 10000], help="Number of classes")
+    ap.add_argument("--legacy", action="store_true", help="Also time the former per-type xpath lookups")
+    ap.add_argument("--legacy-max", type=int, default=2500, help="Largest model for --legacy")
+    args = ap.parse_args()
+    run(args.sizes, args.legacy, args.legacy_max)
+
+
+if __name__ == "__main__":
+    main()